@@ -1,74 +1,332 @@
 import argparse
 import asyncio
 import json
-from logging import Logger
+import time
+from logging import Logger, getLevelName
+from typing import TYPE_CHECKING, Any, Dict, List
 
-from backend.gpu.dispatcher.dispatcher import GPUDispatcher
-from backend.k8s.kubeai import apply_kubeai_model_custom_resource
-from backend.llm.models import OllamaBuiltinModel
-from frontend.llm.auth import auth_signin, generate_openai_api_key
-from frontend.llm.chat import chat_completions
-from shared.config import parse_config, Config
-from shared.utils.logger import KubeAIKubernetesClientLogger
+from shared.utils.logger import KubeAIKubernetesClientLogger, LazyJSON
+
+# 各相依套件 (langchain_openai、kubernetes、ollama) 只在使用到的路徑才載入，縮短 CLI 啟動時間
+if TYPE_CHECKING:
+    from frontend.llm.cache import StreamCoalescer
+    from frontend.llm.routing import PrefixRouter
+    from backend.store import TelemetryStore
+    from frontend.load.types import LoadProfile, RequestMetrics
+    from shared.config import Config
 
 
 async def run(
     logger: Logger,
-    config: Config,
+    config: "Config",
     system_prompt: str,
     user_prompt: str,
-    model_name: str
+    model_name: str,
+    priority: int = 0,
+    load_profile: "LoadProfile" = None,
+    prompts: List[str] = None,
+    load_report_path: str = None,
+    coalescer: "StreamCoalescer" = None,
+    prefix_router: "PrefixRouter" = None,
+    use_gateway: bool = True,
+    fallback_urls: List[str] = None,
+    dry_run: bool = False,
+    telemetry: str = "prometheus",
+    scrape_interval: float = None,
+    gpu_wait: float = 0.0,
+    store: "TelemetryStore" = None,
+    image_pull_bandwidth: float = None,
+    tensor_split: bool = False
 ):
-    async def _run(
+    from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+    from backend.llm.models import OllamaBuiltinModel
+    from backend.replay import SchedulingRecorder
+    from shared.utils.metrics import StreamMetrics, get_stream_metrics_collector
+
+    async def _stream(
         system_prompt: str,
         user_prompt: str,
         api_key: str,
-        base_url: str
+        base_url: str,
+        model_name: str,
+        placement_metrics: StreamMetrics = None
     ):
         # 3-1: Get KubeAI model Custom Resource YAML
 
+        arrival_time = time.time()
+        timings: Dict[str, float] = {}
+
         model = OllamaBuiltinModel(model_name)
         logger.info(f"Model Name: {model.value}")
-        logger.info(f"Model YAML:\n{json.dumps(model.yaml, indent=4)}")
+        logger.debug("Model YAML:\n%s", LazyJSON(model.yaml))
 
         # 3-2. Get Available GPU resources (e.g., NVIDIA GPU)
+        # The decision and its record use the same telemetry snapshot, the concurrent requests only replace the latest one
 
-        gpu_dispatcher = GPUDispatcher(
-            logger=logger,
-            ollama_parameters_worker_url=config.ollama_parameters_worker_url
-        )
-        available_gpus = await gpu_dispatcher.get_available_gpus(model.value)
-        logger.debug(
-            f"Available GPUs:\n{available_gpus.model_dump_json(indent=4)}"
-        )
+        start_time = time.perf_counter()
+        snapshot = await gpu_dispatcher.get_snapshot()
+        timings["telemetry"] = time.perf_counter() - start_time
+
+        available_gpus = await gpu_dispatcher.get_available_gpus(model.value, timings, snapshot)
+
+        # 3-2-0. Evict the lower priority models if there is no available GPU resources
+        if available_gpus is None or len(available_gpus.gpu_nodes) < 1:
+            from backend.gpu.dispatcher.eviction import EvictionPlanner
+
+            eviction_planner = EvictionPlanner(
+                logger=logger,
+                gpu_dispatcher=gpu_dispatcher
+            )
 
-        if len(available_gpus.gpu_nodes) < 1:
+            # Dry run only plans the eviction, the resident models are kept
+            if dry_run:
+                eviction_report = await eviction_planner.plan(model.value, priority)
+                logger.info("Eviction Plan (dry run):\n%s", LazyJSON(eviction_report))
+                raise RuntimeError("No available GPU resources without eviction")
+
+            eviction_report = await eviction_planner.evict(model.value, priority)
+            logger.info("Eviction Report:\n%s", LazyJSON(eviction_report))
+
+            timings["eviction"] = eviction_report.latency
+
+            if eviction_report.success:
+                snapshot = await gpu_dispatcher.get_snapshot()
+                available_gpus = await gpu_dispatcher.get_available_gpus(model.value, timings, snapshot)
+
+        # 3-2-0-1. Queue the request until a GPU frees enough memory, woken up by the telemetry change events
+        if (available_gpus is None or len(available_gpus.gpu_nodes) < 1) and gpu_wait > 0:
+            estimate_vram = await gpu_dispatcher.estimate_model_vram(model.value)
+
+            if estimate_vram:
+                logger.info(f"Waiting up to {gpu_wait} s for a GPU with {estimate_vram} MiB free")
+
+                start_time = time.perf_counter()
+                event = await gpu_dispatcher.wait_for_free_memory(estimate_vram, gpu_wait, model_name=model.value)
+                timings["wait"] = time.perf_counter() - start_time
+
+                if event is not None:
+                    logger.info(f"GPU freed: {event.node_name} ({event.type.value})")
+                    snapshot = gpu_dispatcher.snapshot
+                    available_gpus = await gpu_dispatcher.get_available_gpus(model.value, timings, snapshot)
+
+        if available_gpus is None or len(available_gpus.gpu_nodes) < 1:
             logger.error("No available GPU resources")
-            return
+            if dry_run:
+                raise RuntimeError("No available GPU resources")
+
+            recorder.record_decision(
+                gpu_dispatcher=gpu_dispatcher,
+                model_name=model.value,
+                timings=timings,
+                priority=priority,
+                outcome="no_gpu",
+                timestamp=arrival_time,
+                snapshot=snapshot
+            )
+            raise RuntimeError("No available GPU resources")
+
+        logger.debug("Available GPUs:\n%s", LazyJSON(available_gpus))
 
         # 3-2-1. Get the resource profile of the available GPU resources
 
+        start_time = time.perf_counter()
         resourceProfile = gpu_dispatcher.convert_to_kubeai_gpu_resources_name(
             selected_gpu=available_gpus.gpu_nodes[-1]
         )
+        timings["profile"] = time.perf_counter() - start_time
         logger.info(f"Selected resource profile: {resourceProfile}")
 
+        # 3-2-1-1. Apply the model and send the requests to the federated cluster of the selected GPU resources
+        cluster = gpu_dispatcher.get_cluster(available_gpus.gpu_nodes[-1])
+        if cluster is not None:
+            logger.info(f"Selected cluster: {cluster.name}")
+            base_url = cluster.base_url
+
         # 3-2-2. Set the resource profile of the available GPU resources to the KubeAI model Custom Resource YAML
         patch_model_yaml = model.yaml
         patch_model_yaml["spec"]["resourceProfile"] = resourceProfile
 
+        # 3-2-3. Route the requests sharing a prompt prefix to the same model pod to reuse the KV cache
+        if prefix_router is not None:
+            patch_model_yaml["spec"]["loadBalancing"] = prefix_router.kubeai_load_balancing()
+
+        # 3-2-4. Dry run stops after the scheduling, the KubeAI model is not applied and the LLM client is not loaded
+        if dry_run:
+            print(json.dumps(patch_model_yaml, indent=4))
+            return
+
         # 3-3. Patch KubeAI model Custom Resource to Kubernetes Cluster
-        apply_kubeai_model_custom_resource(patch_model_yaml)
-
-        # 3-4. Send a request to the KubeAI API server to inference using the created model
-        async for chunk in chat_completions(
-            model=patch_model_yaml["metadata"]["name"],
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            api_key=api_key,
-            base_url=base_url,
-        ):
-            print(chunk.content, end="")
+        from backend.k8s.kubeai import apply_kubeai_model_custom_resource
+        from frontend.llm.chat import chat_completions
+        from frontend.llm.gateway import ollama_num_parallel
+
+        start_time = time.perf_counter()
+        # A model evicted before gets its previous `minReplicas` back instead of the manifest one,
+        # and a pre-warmed model is taken over so that the pre-warming controller does not scale it down
+        from backend.gpu.dispatcher.eviction import restore_evicted_min_replicas
+        from backend.gpu.dispatcher.prewarm import release_prewarmed_model
+
+        def on_existing(existing: Dict[str, Any]):
+            restore_evicted_min_replicas(patch_model_yaml, existing, logger)
+            release_prewarmed_model(patch_model_yaml, existing)
+
+        apply_kubeai_model_custom_resource(
+            patch_model_yaml,
+            cluster.kube_context if cluster is not None else None,
+            on_existing=on_existing
+        )
+        timings["apply"] = time.perf_counter() - start_time
+
+        # 3-3-1. Record the scheduling input and outcome for the offline replay
+        recorder.record_decision(
+            gpu_dispatcher=gpu_dispatcher,
+            model_name=model.value,
+            available_gpus=available_gpus,
+            resource_profile=resourceProfile,
+            timings=timings,
+            priority=priority,
+            timestamp=arrival_time,
+            snapshot=snapshot
+        )
+
+        # 3-4. Send a request to the KubeAI API server to inference using the created model,
+        # its latencies are recorded with the placement by the caller's measurement
+        if placement_metrics is not None:
+            placement_metrics.resource_profile = resourceProfile
+            placement_metrics.node_name = available_gpus.gpu_nodes[-1].node_name
+
+        gateway = gateways.get(base_url)
+        if gateway is not None:
+            gateway.num_parallel.setdefault(patch_model_yaml["metadata"]["name"], ollama_num_parallel(patch_model_yaml))
+            stream = gateway.stream(patch_model_yaml["metadata"]["name"], system_prompt, user_prompt)
+        else:
+            stream = chat_completions(
+                model=patch_model_yaml["metadata"]["name"],
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                api_key=api_key,
+                base_url=base_url
+            )
+
+        async for chunk in stream:
+            yield chunk
+
+    async def _run(
+        system_prompt: str,
+        user_prompt: str,
+        api_key: str,
+        base_url: str,
+        model_name: str
+    ) -> "RequestMetrics":
+        from frontend.llm.cache import prompt_cache_key
+        from frontend.load.driver import measure_chat_stream
+
+        model = OllamaBuiltinModel(model_name)
+
+        # Tagged with the placement by the upstream stream, a response served from the cache has none
+        placement_metrics = StreamMetrics(model=model.value)
+
+        def _upstream():
+            return _stream(system_prompt, user_prompt, api_key, base_url, model.value, placement_metrics)
+
+        # Identical requests are served from the response cache, or share the in-flight upstream stream
+        if coalescer is not None:
+            stream = coalescer.stream(prompt_cache_key(model.value, system_prompt, user_prompt), _upstream)
+        else:
+            stream = _upstream()
+
+        async def _print(stream):
+            async for chunk in stream:
+                print(chunk.content, end="")
+                yield chunk
+
+        # The load driver only collects the metrics, the response is printed otherwise
+        request_metrics = await measure_chat_stream(
+            model.value,
+            stream if load_profile else _print(stream),
+            stream_metrics=placement_metrics,
+            collector=stream_metrics
+        )
+
+        # Persist the request latencies for the offline calibration, only enqueued on the event loop
+        if store is not None:
+            from backend.store import RequestRecord
+
+            store.append_request(RequestRecord(
+                timestamp=request_metrics.start,
+                model=request_metrics.model,
+                ttft=request_metrics.ttft,
+                inter_token_latency=(
+                    sum(request_metrics.inter_token_latencies) / len(request_metrics.inter_token_latencies)
+                    if request_metrics.inter_token_latencies else None
+                ),
+                e2e=request_metrics.e2e,
+                output_tokens=request_metrics.output_tokens,
+                error=request_metrics.error
+            ))
+
+        # Only the load driver reports the failed requests in its metrics, a single request fails the run
+        if load_profile is None and request_metrics.error is not None:
+            raise RuntimeError(f"Failed to chat with {model.value}: {request_metrics.error}")
+
+        return request_metrics
+
+    # The decisions (and the telemetry snapshots they were made on) are also appended to the telemetry store
+    recorder = SchedulingRecorder("logs/scheduling.jsonl", store=store)
+
+    # Streaming throughput per resource profile, persisted across the runs as the placement signal
+    stream_metrics = get_stream_metrics_collector()
+    stream_metrics.load("logs/stream_metrics.json")
+
+    # Container images cached on the nodes, to prefer the nodes which already have the model image
+    image_cache = None
+    if image_pull_bandwidth is not None:
+        from backend.gpu.dispatcher.images import ImageCache
+
+        image_cache = ImageCache(
+            logger=logger,
+            contexts={cluster.name: cluster.kube_context for cluster in config.clusters} or None,
+            pull_bandwidth=image_pull_bandwidth
+        )
+        # 無法列出映像檔的 cluster 只會記錄警告，不影響排程
+        await image_cache.refresh()
+
+    # Multi-GPU placements with the layer split of the model, on the GPU topology of the annotated nodes
+    tensor_split_planner = None
+    if tensor_split:
+        from backend.gpu.dispatcher.tensor_split import TensorSplitPlanner, load_topology
+
+        topology = {}
+        try:
+            topology = await load_topology({cluster.name: cluster.kube_context for cluster in config.clusters} or None)
+        except Exception as e:
+            logger.warning(
+                "Failed to list the GPU topology, all GPUs are considered connected through PCIe (%s)", repr(e)
+            )
+        tensor_split_planner = TensorSplitPlanner(topology=topology)
+
+    # One GPU Dispatcher (and its Prometheus and Ollama clients) shared by the concurrent requests
+    gpu_dispatcher = GPUDispatcher(
+        logger=logger,
+        ollama_parameters_worker_url=config.ollama_parameters_worker_url,
+        stream_metrics=stream_metrics,
+        clusters=config.clusters,
+        telemetry=telemetry,
+        scrape_interval=scrape_interval,
+        image_cache=image_cache,
+        tensor_split=tensor_split_planner
+    )
+
+    # 0. Dry run: schedule the model once and print the patched KubeAI Model, without signing in
+    if dry_run:
+        async for _ in _stream(system_prompt, user_prompt, None, config.base_url, model_name):
+            pass
+        return
+
+    from frontend.llm.auth import auth_signin, generate_openai_api_key
+    from frontend.llm.gateway import ChatGateway
+    from frontend.llm.resilience import ResilientChat
+    from frontend.load.driver import LoadDriver, write_load_report
 
     # 1. Get OpenAI API key
     token = await auth_signin(config)
@@ -78,20 +336,78 @@ async def run(
     if api_key is None:
         api_key = token
 
-    # 2. Concurrently run the inference tasks
-    tasks = [
-        _run(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            api_key=api_key,
-            base_url=config.base_url
-        ) for _ in range(config.concurrent)
-    ]
+    # Concurrent requests of the same model share a pooled client with bounded parallelism,
+    # sent with latency-aware timeouts, hedging to the fallback endpoints, circuit breakers and retries.
+    # Every federated cluster has its own gateway, the resilient requests go through its pooled clients
+    gateways: Dict[str, ChatGateway] = {}
+    if use_gateway:
+        for base_url in dict.fromkeys([config.base_url, *(cluster.base_url for cluster in config.clusters)]):
+            # A hedged or fallback request may race each forwarded request, outside the `OLLAMA_NUM_PARALLEL` lane
+            gateway = ChatGateway(api_key=api_key, base_url=base_url, racing_requests=2)
+            resilient_chat = ResilientChat(
+                endpoints=[base_url, *(fallback_urls or [])],
+                api_key=api_key,
+                http_client=gateway.http_client
+            )
+            gateway.stream_factory = resilient_chat.stream
+            gateways[base_url] = gateway
+
+    request_errors: List[Exception] = []
 
-    await asyncio.gather(*tasks)
+    # 2-1. Drive the inference tasks with the load profile
+    if load_profile is not None:
+        load_driver = LoadDriver(
+            logger=logger,
+            profile=load_profile,
+            prompts=prompts or [user_prompt],
+            request=lambda model_name, user_prompt: _run(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                api_key=api_key,
+                base_url=config.base_url,
+                model_name=model_name
+            )
+        )
+        load_report = await load_driver.run()
+        logger.info("Load Report:\n%s", LazyJSON(load_report))
+
+        if load_report_path:
+            write_load_report(load_report, load_report_path)
+    else:
+        # 2-2. Concurrently run the inference tasks, the failed ones are raised after the cleanup
+        tasks = [
+            _run(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                api_key=api_key,
+                base_url=config.base_url,
+                model_name=model_name
+            ) for _ in range(config.concurrent)
+        ]
 
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error("Inference task failed: %s", result)
+                request_errors.append(result)
 
-async def main(args: argparse.Namespace, config: Config):
+    for base_url, gateway in gateways.items():
+        logger.info(f"Gateway Batches ({base_url}): {gateway.batches}")
+        await gateway.aclose()
+
+    if coalescer is not None and coalescer.cache is not None:
+        logger.info(
+            f"Response Cache: {coalescer.cache.hits} hit(s), {coalescer.cache.misses} miss(es), "
+            f"{coalescer.coalesced} coalesced request(s)"
+        )
+
+    logger.info("Streaming Metrics:\n%s", LazyJSON(stream_metrics.summary()))
+    stream_metrics.dump("logs/stream_metrics.json")
+
+    if request_errors:
+        raise RuntimeError(f"{len(request_errors)} inference task(s) failed") from request_errors[-1]
+
+
+async def main(args: argparse.Namespace, config: "Config"):
     """Main function
 
     Args:
@@ -100,17 +416,81 @@ async def main(args: argparse.Namespace, config: Config):
     """
 
     # Get Logger instance
-    logger = KubeAIKubernetesClientLogger()
+    logger = KubeAIKubernetesClientLogger(
+        json_lines=args.log_json,
+        console_level=getLevelName(args.log_level),
+        file_level=getLevelName(args.log_level)
+    )
     logger = logger.getLogger()
 
     # Running
     logger.info("Start Running...")
+    logger.debug("Config:\n%s", LazyJSON(config.model_dump(exclude={"user"})))
+
+    from backend.llm.models import OllamaBuiltinModel
+    from frontend.llm.cache import ResponseCache, StreamCoalescer
+    from frontend.llm.routing import PrefixRouter
+    from frontend.load.driver import load_prompts, parse_model_weights
+    from frontend.load.types import LoadProfile
 
     system_prompt: str = args.system_prompt
     user_prompt: str = args.user_prompt
     model: str = args.model
+    priority: int = args.priority
+
+    load_profile: "LoadProfile" = None
+    prompts: List[str] = None
+
+    if args.load is not None:
+        model_weights = parse_model_weights(args.mix) if args.mix else {model: 1.0}
+        # Validate the model names of the mix
+        for model_name in model_weights:
+            OllamaBuiltinModel(model_name)
+
+        load_profile = LoadProfile(
+            mode=args.load,
+            arrival_rate=args.rate,
+            users=args.users,
+            think_time=args.think_time,
+            duration=args.duration,
+            max_requests=args.max_requests,
+            model_weights=model_weights
+        )
+
+        if args.prompts:
+            prompts = load_prompts(args.prompts)
+
+    store: "TelemetryStore" = None
+    if not args.no_store and not args.dry_run:
+        from backend.store import TelemetryStore
+
+        store = TelemetryStore(args.store_dir, retention_days=args.store_retention, logger=logger)
+
+    coalescer: "StreamCoalescer" = None
+    if args.cache and not args.dry_run:
+        coalescer = StreamCoalescer(ResponseCache(cache_dir=args.cache_dir))
 
-    await run(logger, config, system_prompt, user_prompt, model)
+    try:
+        await run(
+            logger, config, system_prompt, user_prompt, model, priority,
+            load_profile=load_profile,
+            prompts=prompts,
+            load_report_path=args.report,
+            coalescer=coalescer,
+            prefix_router=PrefixRouter(prefix_tokens=args.prefix_tokens) if args.prefix_routing else None,
+            use_gateway=not args.no_gateway,
+            fallback_urls=args.fallback_urls,
+            dry_run=args.dry_run,
+            telemetry=args.telemetry,
+            scrape_interval=args.scrape_interval,
+            gpu_wait=args.gpu_wait,
+            store=store,
+            image_pull_bandwidth=args.image_pull_bandwidth,
+            tensor_split=args.tensor_split
+        )
+    finally:
+        if store is not None:
+            store.close()
 
 
 def parsed_args():
@@ -123,20 +503,205 @@ def parsed_args():
     parser.add_argument(
         "--user_prompt",
         type=str,
-        required=True
+        default=None
     )
     parser.add_argument(
         "-m", "--model",
         type=str,
         default="gemma2:9b",
     )
+    parser.add_argument(
+        "--priority",
+        type=int,
+        default=0,
+        help="Priority of the model, the resident models with lower priority can be evicted to make room for it"
+    )
+
+    # Response cache
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Serve the identical requests from the response cache and coalesce the identical in-flight requests, "
+        "every request is sent to the GPU by default"
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=None,
+        help="Directory of the on-disk response cache (`--cache`), the responses are only cached in memory by default"
+    )
+
+    # Micro-batching gateway
+    parser.add_argument(
+        "--no_gateway",
+        action="store_true",
+        help="Send every request with a dedicated client instead of the per-model micro-batching gateway"
+    )
+    parser.add_argument(
+        "--fallback_urls",
+        type=str,
+        nargs="*",
+        default=None,
+        help="OpenAI API base URLs of the other placements, the late or failed requests are hedged or retried there"
+    )
+
+    # Prefix-aware routing
+    parser.add_argument(
+        "--prefix_routing",
+        action="store_true",
+        help="Route the requests sharing a prompt prefix to the same model pod (bounded-load consistent hashing)"
+    )
+    parser.add_argument(
+        "--prefix_tokens",
+        type=int,
+        default=16,
+        help="Number of the leading user prompt tokens in the routing prefix"
+    )
+
+    # Load driver mode
+    parser.add_argument(
+        "--load",
+        type=str,
+        choices=["open", "closed"],
+        default=None,
+        help="Load driver mode, `open` (open-loop Poisson arrivals) or `closed` (closed-loop N users)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="Arrival rate of the open-loop mode, unit: requests/s"
+    )
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=1,
+        help="Number of concurrent users of the closed-loop mode"
+    )
+    parser.add_argument(
+        "--think_time",
+        type=float,
+        default=0.0,
+        help="Think time of each user between the requests of the closed-loop mode, unit: s"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=60.0,
+        help="Duration to issue the requests, unit: s"
+    )
+    parser.add_argument(
+        "--max_requests",
+        type=int,
+        default=None,
+        help="Max number of requests"
+    )
+    parser.add_argument(
+        "--mix",
+        type=str,
+        default=None,
+        help="Model mix, Like `gemma2:2b=3,llama3.2:3b=1`. Defaults to `--model`"
+    )
+    parser.add_argument(
+        "--prompts",
+        type=str,
+        default=None,
+        help="User prompts file, a prompt per line or `.jsonl` with a `prompt` field"
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        help="Write the load report as JSON (`.json`) or CSV (`.csv`)"
+    )
 
-    return parser.parse_args()
+    # GPU telemetry
+    parser.add_argument(
+        "--telemetry",
+        type=str,
+        choices=["prometheus", "scrape"],
+        default="prometheus",
+        help="GPU telemetry source, `prometheus` (query Prometheus) or `scrape` (scrape the DCGM Exporters directly)"
+    )
+    parser.add_argument(
+        "--scrape_interval",
+        type=float,
+        default=None,
+        help="Background scrape interval of the `scrape` telemetry, unit: s. Scrape on every decision by default"
+    )
+    parser.add_argument(
+        "--gpu_wait",
+        type=float,
+        default=0.0,
+        help="Max time a request without available GPU resources waits for a GPU to free enough memory, unit: s"
+    )
+    parser.add_argument(
+        "--image_pull_bandwidth",
+        type=float,
+        default=None,
+        help="Image pull bandwidth of a node, unit: MiB/s. Prefer the nodes which cache the model image if given"
+    )
+    parser.add_argument(
+        "--tensor_split",
+        action="store_true",
+        help="Plan the multi-GPU placements with the layer split of the model and the GPU topology annotations"
+    )
+
+    # Telemetry store
+    parser.add_argument(
+        "--no_store",
+        action="store_true",
+        help="Do not persist the telemetry snapshots, scheduling decisions and request latencies to the telemetry store"
+    )
+    parser.add_argument(
+        "--store_dir",
+        type=str,
+        default="logs/store",
+        help="Directory of the telemetry store, a SQLite database per day"
+    )
+    parser.add_argument(
+        "--store_retention",
+        type=int,
+        default=30,
+        help="Days to keep the telemetry store partitions"
+    )
+
+    parser.add_argument(
+        "--dry_run",
+        action="store_true",
+        help="Stop after the scheduling and print the patched KubeAI Model, without applying it or loading the LLM client"
+    )
+    parser.add_argument(
+        "--log_json",
+        action="store_true",
+        help="Write the log file as JSON lines"
+    )
+    parser.add_argument(
+        "--log_level",
+        type=str,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="DEBUG",
+        help="Logging level, the per-node scheduling details are logged at `DEBUG`"
+    )
+
+    args = parser.parse_args()
+    if args.prompts is not None and args.load is None:
+        parser.error("--prompts requires --load")
+    if args.user_prompt is None and args.prompts is None and not args.dry_run:
+        parser.error("--user_prompt is required unless --prompts is given")
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+    if args.users < 1:
+        parser.error("--users must be at least 1")
+
+    return args
 
 
 if __name__ == "__main__":
     args = parsed_args()
 
+    from shared.config import parse_config
+
     # Parse configuration file
     parsed_config = parse_config()
 
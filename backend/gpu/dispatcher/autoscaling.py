@@ -0,0 +1,643 @@
+import argparse
+import asyncio
+import heapq
+import math
+import random
+import statistics
+import time
+from collections import defaultdict
+from logging import Logger
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from backend.gpu.dispatcher.types import (
+    AutoscalingEvaluation,
+    AutoscalingRecommendation,
+    AutoscalingSettings,
+    ModelLoadProfile
+)
+from backend.k8s.kubeai import list_kubeai_model_custom_resource, patch_kubeai_model_custom_resource
+from backend.llm.models import OllamaBuiltinModel
+from backend.store.types import RequestRecord
+from frontend.load.driver import summarize
+
+
+def load_request_trace(log_file_path: str) -> List[RequestRecord]:
+    """Load the request latencies from a JSON Lines trace, Like the output of `python -m backend.store requests`.
+
+    Args:
+        log_file_path (`str`): Request trace file path
+
+    Returns:
+        requests (`List[RequestRecord]`): Request latencies sorted by the timestamp
+    """
+
+    requests: List[RequestRecord] = []
+
+    with open(log_file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                requests.append(RequestRecord.model_validate_json(line))
+
+    return sorted(requests, key=lambda x: x.timestamp)
+
+
+def synthetic_request_trace(hours: float = 6.0, seed: int = 1) -> List[RequestRecord]:
+    """Generate a request trace of a bursty and a sparse model, to evaluate the tuner without a recorded load.
+
+    `gemma2:2b` alternates between 0.8 and 0.2 requests/s every 30 minutes, `llama3.1:8b` receives a request every
+    10 minutes on average. Both are served by a single replica with 4 Ollama slots, so the bursts queue.
+
+    Args:
+        hours (`float`): Duration of the trace, unit: h. Default is `6.0`
+        seed (`int`): Random seed. Default is `1`
+
+    Returns:
+        requests (`List[RequestRecord]`): Request latencies sorted by the timestamp
+    """
+
+    rng = random.Random(seed)
+    start_time = 1.7e9
+    end_time = start_time + hours * 3600
+    requests: List[RequestRecord] = []
+
+    def _serve(model_name: str, arrivals: List[float], slots: int, service_seconds: float, warm_ttft: float):
+        free_at = [0.0] * slots
+        for arrival in arrivals:
+            # 佔用最早空出的 slot，等待時間計入 TTFT
+            start = max(arrival, heapq.heappop(free_at))
+            duration = rng.expovariate(1 / service_seconds)
+            heapq.heappush(free_at, start + duration)
+            requests.append(RequestRecord(
+                timestamp=arrival,
+                model=model_name,
+                ttft=start - arrival + warm_ttft,
+                e2e=start - arrival + duration,
+                output_tokens=100
+            ))
+
+    def _arrivals(rate: Callable[[float], float]) -> List[float]:
+        arrivals: List[float] = []
+        timestamp = start_time
+        while timestamp < end_time:
+            timestamp += rng.expovariate(rate(timestamp))
+            arrivals.append(timestamp)
+        return arrivals
+
+    _serve("gemma2:2b", _arrivals(lambda x: 0.8 if int((x - start_time) // 1800) % 2 == 0 else 0.2), 4, 4.0, 0.3)
+    _serve("llama3.1:8b", _arrivals(lambda x: 1 / 600), 4, 8.0, 0.5)
+
+    return sorted(requests, key=lambda x: x.timestamp)
+
+
+def autoscaling_settings(model_cr_yaml: Dict) -> AutoscalingSettings:
+    """Get the autoscaling settings of a KubeAI Model Custom Resource, the KubeAI defaults if unset.
+
+    Args:
+        model_cr_yaml (`Dict`): KubeAI Model Custom Resource YAML
+
+    Returns:
+        settings (`AutoscalingSettings`): Autoscaling settings
+    """
+
+    spec = model_cr_yaml.get("spec", {})
+    defaults = AutoscalingSettings()
+
+    return AutoscalingSettings(
+        target_requests=spec.get("targetRequests", defaults.target_requests),
+        scale_down_delay_seconds=spec.get("scaleDownDelaySeconds", defaults.scale_down_delay_seconds),
+        min_replicas=spec.get("minReplicas", defaults.min_replicas)
+    )
+
+
+def evaluate_autoscaling(
+    requests: List[RequestRecord],
+    settings: AutoscalingSettings,
+    capacity: int,
+    load_seconds: float = 30.0,
+    gpus: int = 1,
+    warm_ttft: Optional[float] = None
+) -> AutoscalingEvaluation:
+    """Replay the requests of a model offline on the KubeAI autoscaler and evaluate the cold starts, the queueing and
+    the GPU hours.
+
+    Like KubeAI, the desired replicas are the in-flight requests divided by `target_requests` (rounded up), and the
+    model keeps the peak desired replicas of the last `scale_down_delay_seconds` (at least `min_replicas`). A new
+    replica is ready `load_seconds` after it is scaled up. A request is a cold start if no replica is ready (it waits
+    for the first one), and queued if the in-flight requests exceed `capacity` per ready replica.
+
+    Args:
+        requests (`List[RequestRecord]`): Requests of the model, the `e2e` latency is the service time
+        settings (`AutoscalingSettings`): Autoscaling settings
+        capacity (`int`): In-flight requests a replica serves without queueing
+        load_seconds (`float`): Cold start time of a replica, unit: s. Default is `30.0`
+        gpus (`int`): GPU count held by a replica. Default is `1`
+        warm_ttft (`Optional[float]`): Time to first token without queueing, the recorded wait above it is removed
+            from the service time. Default is `None` (the `e2e` latency as is)
+
+    Returns:
+        evaluation (`AutoscalingEvaluation`): Evaluation result
+    """
+
+    evaluation = AutoscalingEvaluation(requests=len(requests))
+    if not requests:
+        return evaluation
+
+    def _service_seconds(request: RequestRecord) -> float:
+        # 錄製時的排隊 (或冷啟動) 等待不屬於服務時間
+        wait = max(request.ttft - warm_ttft, 0.0) if warm_ttft is not None and request.ttft is not None else 0.0
+        return max((request.e2e or 0.0) - wait, 0.0)
+
+    arrivals = sorted((request.timestamp, _service_seconds(request)) for request in requests)
+    start_time = arrivals[0][0]
+    end_time = max(timestamp + duration for timestamp, duration in arrivals)
+
+    completions: List[float] = []
+    # 過去 `scale_down_delay_seconds` 內的期望 replica 數 (-desired, expiry)
+    window: List[Tuple[int, float]] = []
+    expiries: List[float] = []
+    # 每個 replica 的 ready 時間 (依照 scale up 的順序)
+    replicas: List[float] = [start_time] * settings.min_replicas
+
+    inflight = 0
+    desired = 0
+    last_time = start_time
+    gpu_seconds = 0.0
+    i = 0
+
+    def _scale(now: float, new_desired: int):
+        nonlocal desired
+
+        if new_desired < desired:
+            heapq.heappush(window, (-desired, now + settings.scale_down_delay_seconds))
+            heapq.heappush(expiries, now + settings.scale_down_delay_seconds)
+        desired = new_desired
+
+        while window and window[0][1] <= now:
+            heapq.heappop(window)
+
+        target_replicas = max(settings.min_replicas, desired, -window[0][0] if window else 0)
+        while len(replicas) < target_replicas:
+            replicas.append(now + load_seconds)
+        # 優先移除最後 scale up 的 replica
+        del replicas[target_replicas:]
+
+    while i < len(arrivals) or completions or expiries:
+        next_arrival = arrivals[i][0] if i < len(arrivals) else math.inf
+        now = min(next_arrival, completions[0] if completions else math.inf, expiries[0] if expiries else math.inf)
+
+        if now > last_time:
+            gpu_seconds += len(replicas) * (min(now, end_time) - last_time) * gpus
+            last_time = min(now, end_time)
+
+        if completions and completions[0] == now:
+            heapq.heappop(completions)
+            inflight -= 1
+            _scale(now, math.ceil(inflight / settings.target_requests))
+        elif expiries and expiries[0] == now:
+            heapq.heappop(expiries)
+            _scale(now, desired)
+        else:
+            timestamp, duration = arrivals[i]
+            i += 1
+            inflight += 1
+            _scale(now, math.ceil(inflight / settings.target_requests))
+
+            ready = sum(1 for ready_at in replicas if ready_at <= now)
+            wait = 0.0
+            if ready == 0:
+                wait = min(replicas) - now
+                evaluation.cold_starts += 1
+                evaluation.cold_start_wait_seconds += wait
+            elif inflight > ready * capacity:
+                evaluation.queued += 1
+
+            # 冷啟動的請求要等到 replica ready 才開始處理
+            heapq.heappush(completions, timestamp + wait + duration)
+            end_time = max(end_time, timestamp + wait + duration)
+
+    evaluation.gpu_hours = gpu_seconds / 3600
+
+    return evaluation
+
+
+class AutoscalingTuner:
+    """Tune the KubeAI autoscaling settings (`targetRequests`、`scaleDownDelaySeconds`、`minReplicas`) of the models on
+    their observed load."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        namespace: str = "default",
+        load_seconds: float = 30.0,
+        cold_start_penalty: float = 1.0,
+        ttft_slack: float = 1.5,
+        min_samples: int = 5,
+        baseline_quantile: float = 0.1,
+        min_scale_down_delay: int = 10,
+        max_scale_down_delay: int = 3600,
+        gpus_per_model: Dict[str, int] = None
+    ):
+        """Initializes the autoscaling tuner.
+
+        Args:
+            logger (`Logger`): Logger
+            namespace (`str`): Kubernetes Namespace of the KubeAI Models. Default is `default`
+            load_seconds (`float`): Cold start time of a replica if no cold start is observed, unit: s. Default is `30.0`
+            cold_start_penalty (`float`): GPU seconds worth one second of cold start wait, the trade-off of the
+                scale-down delay. Default is `1.0`
+            ttft_slack (`float`): A per-replica concurrency queues if its median time to first token exceeds the one
+                of a single request by this factor. Default is `1.5`
+            min_samples (`int`): Min number of requests of a concurrency level to judge its queueing. Default is `5`
+            baseline_quantile (`float`): Time quantile of the in-flight requests kept by `minReplicas`, Like `0.1`
+                keeps the replicas of the load exceeded 90% of the time. Default is `0.1`
+            min_scale_down_delay (`int`): Min recommended scale-down delay, shorter delays are below the autoscaling
+                interval of KubeAI, unit: s. Default is `10`
+            max_scale_down_delay (`int`): Max recommended scale-down delay, unit: s. Default is `3600`
+            gpus_per_model (`Dict[str, int]`): Ollama model name to the GPU count of a replica. Default is `None` (1 GPU)
+        """
+
+        self.logger = logger
+        self.namespace = namespace
+        self.load_seconds = load_seconds
+        self.cold_start_penalty = cold_start_penalty
+        self.ttft_slack = ttft_slack
+        self.min_samples = min_samples
+        self.baseline_quantile = baseline_quantile
+        self.min_scale_down_delay = min_scale_down_delay
+        self.max_scale_down_delay = max_scale_down_delay
+        self.gpus_per_model = gpus_per_model or {}
+
+    # ============================== Public Methods ==============================
+
+    def recommend(
+        self,
+        requests: List[RequestRecord],
+        current: Mapping[str, AutoscalingSettings] = None
+    ) -> List[AutoscalingRecommendation]:
+        """Recommend the autoscaling settings of every Ollama builtin model with observed requests.
+
+        Args:
+            requests (`List[RequestRecord]`): Observed requests of all the models
+            current (`Mapping[str, AutoscalingSettings]`): Ollama model name to its current autoscaling settings.
+                Default is `None` (the settings of the KubeAI Model manifests)
+
+        Returns:
+            recommendations (`List[AutoscalingRecommendation]`): Recommendation per model
+        """
+
+        model_requests: Dict[str, List[RequestRecord]] = defaultdict(list)
+        for request in requests:
+            model_requests[request.model].append(request)
+
+        builtin_models = {model.value: model for model in OllamaBuiltinModel}
+        recommendations: List[AutoscalingRecommendation] = []
+
+        for model_name, records in sorted(model_requests.items()):
+            model = builtin_models.get(model_name)
+            if model is None:
+                self.logger.warning("Skip the autoscaling of %s, not an Ollama builtin model", model_name)
+                continue
+
+            model_yaml = model.yaml
+            current_settings = (current or {}).get(model_name) or autoscaling_settings(model_yaml)
+            records.sort(key=lambda x: x.timestamp)
+
+            load, recommended_settings = self._tune(model_name, records, current_settings)
+            # 未觀察到排隊時，以觀察到的最大並行數作為 replica 的容量
+            capacity = load.capacity or max(
+                current_settings.target_requests, recommended_settings.target_requests, int(load.concurrency["max"])
+            )
+            gpus = self.gpus_per_model.get(model_name, 1)
+
+            recommendations.append(AutoscalingRecommendation(
+                model_name=model_name,
+                name=model_yaml["metadata"]["name"],
+                current=current_settings,
+                recommended=recommended_settings,
+                load=load,
+                current_evaluation=evaluate_autoscaling(
+                    records, current_settings, capacity, load.cold_start_seconds, gpus, load.warm_ttft
+                ),
+                recommended_evaluation=evaluate_autoscaling(
+                    records, recommended_settings, capacity, load.cold_start_seconds, gpus, load.warm_ttft
+                )
+            ))
+
+        return recommendations
+
+    async def current_settings(self, context: str = None) -> Dict[str, AutoscalingSettings]:
+        """Get the autoscaling settings of the deployed KubeAI Models.
+
+        Args:
+            context (`str`): kubeconfig context of the cluster. Default is `None` (the current context)
+
+        Returns:
+            settings (`Dict[str, AutoscalingSettings]`): Ollama model name to the autoscaling settings
+        """
+
+        kubeai_models = await asyncio.to_thread(list_kubeai_model_custom_resource, self.namespace, context)
+        model_names = {model.yaml["metadata"]["name"]: model.value for model in OllamaBuiltinModel}
+
+        return {
+            model_names[kubeai_model["metadata"]["name"]]: autoscaling_settings(kubeai_model)
+            for kubeai_model in kubeai_models if kubeai_model["metadata"]["name"] in model_names
+        }
+
+    async def apply(self, recommendations: List[AutoscalingRecommendation], context: str = None):
+        """Patch the recommended autoscaling settings to the KubeAI Models, the unchanged ones are skipped.
+
+        Args:
+            recommendations (`List[AutoscalingRecommendation]`): Recommendations of `recommend`
+            context (`str`): kubeconfig context of the cluster. Default is `None` (the current context)
+        """
+
+        for recommendation in recommendations:
+            if recommendation.recommended == recommendation.current:
+                continue
+
+            model_yaml = OllamaBuiltinModel(recommendation.model_name).yaml
+            model_yaml["metadata"]["namespace"] = self.namespace
+
+            try:
+                await asyncio.to_thread(
+                    patch_kubeai_model_custom_resource,
+                    model_yaml,
+                    {
+                        "spec": {
+                            "targetRequests": recommendation.recommended.target_requests,
+                            "scaleDownDelaySeconds": recommendation.recommended.scale_down_delay_seconds,
+                            "minReplicas": recommendation.recommended.min_replicas
+                        }
+                    },
+                    context
+                )
+            except Exception as e:
+                # Model 不存在 (404) 等錯誤只略過該 Model，其餘照常 patch
+                self.logger.warning("Failed to patch the autoscaling of %s (%s)", recommendation.name, repr(e))
+                continue
+            recommendation.applied = True
+
+            self.logger.info(
+                "Patched the autoscaling of %s: %s -> %s",
+                recommendation.name,
+                recommendation.current.model_dump(),
+                recommendation.recommended.model_dump()
+            )
+
+    # ============================== Private Methods ==============================
+
+    def _tune(
+        self,
+        model_name: str,
+        requests: List[RequestRecord],
+        current: AutoscalingSettings
+    ) -> Tuple[ModelLoadProfile, AutoscalingSettings]:
+        """Profile the observed load of a model and tune its autoscaling settings.
+
+        - `targetRequests`: the largest per-replica concurrency without queueing (kept if no queueing is observed)
+        - `scaleDownDelaySeconds`: the delay minimizing the GPU seconds held over the idle gaps plus the penalty of
+          the cold starts after the gaps longer than the delay (ski rental)
+        - `minReplicas`: `1` if keeping the model warm through every idle gap is cheaper, and at least the replicas of
+          the baseline in-flight requests
+
+        Args:
+            model_name (`str`): Ollama model name
+            requests (`List[RequestRecord]`): Observed requests of the model sorted by the timestamp
+            current (`AutoscalingSettings`): Current autoscaling settings
+
+        Returns:
+            load (`ModelLoadProfile`): Observed load of the model
+            recommended (`AutoscalingSettings`): Recommended autoscaling settings
+        """
+
+        inflight_at_arrival, idle_gaps, level_seconds = self._sweep(requests)
+        load = ModelLoadProfile(
+            requests=len(requests),
+            concurrency=_distribution(inflight_at_arrival),
+            idle_gaps=len([gap for gap in idle_gaps if gap is not None])
+        )
+
+        # 以目前設定下 KubeAI 會執行的 replica 數，換算每個 replica 的並行請求數
+        per_replica: List[int] = [
+            math.ceil(inflight / max(current.min_replicas, math.ceil(inflight / current.target_requests), 1))
+            for inflight in inflight_at_arrival
+        ]
+        # 目前設定下，閒置超過 scale-down delay 後抵達的請求為冷啟動
+        cold: List[bool] = [
+            current.min_replicas == 0 and gap is not None and gap > current.scale_down_delay_seconds
+            for gap in idle_gaps
+        ]
+
+        ttft_levels: Dict[int, List[float]] = defaultdict(list)
+        for request, level, is_cold in zip(requests, per_replica, cold):
+            if request.ttft is not None and request.error is None and not is_cold:
+                ttft_levels[level].append(request.ttft)
+
+        # 容量：單一請求的 TTFT 中位數放大 `ttft_slack` 倍以內的最大並行數
+        levels = sorted(level for level, ttfts in ttft_levels.items() if len(ttfts) >= self.min_samples)
+        target_requests = current.target_requests
+        if levels:
+            baseline_ttft = statistics.median(ttft_levels[levels[0]])
+            load.warm_ttft = baseline_ttft
+            load.queue_wait = _distribution([
+                max(ttft - baseline_ttft, 0.0) for ttfts in ttft_levels.values() for ttft in ttfts
+            ])
+
+            capacity = levels[0]
+            for level in levels[1:]:
+                if statistics.median(ttft_levels[level]) > baseline_ttft * self.ttft_slack:
+                    load.capacity = capacity
+                    target_requests = capacity
+                    break
+                capacity = level
+
+        cold_ttfts = [
+            request.ttft for request, is_cold in zip(requests, cold)
+            if is_cold and request.ttft is not None and request.error is None
+        ]
+        if cold_ttfts and load.warm_ttft is not None:
+            load.cold_start_seconds = max(statistics.median(cold_ttfts) - load.warm_ttft, 0.0)
+            load.cold_start_observed = True
+        else:
+            load.cold_start_seconds = self.load_seconds
+
+        scale_down_delay, keep_warm = self._scale_down_delay(
+            [gap for gap in idle_gaps if gap is not None],
+            load.cold_start_seconds,
+            self.gpus_per_model.get(model_name, 1)
+        )
+
+        baseline_inflight = _time_weighted_quantile(level_seconds, self.baseline_quantile)
+        min_replicas = max(int(keep_warm), math.ceil(baseline_inflight / target_requests))
+
+        recommended = AutoscalingSettings(
+            target_requests=target_requests,
+            scale_down_delay_seconds=scale_down_delay,
+            min_replicas=min_replicas
+        )
+
+        self.logger.debug(
+            "Autoscaling of %s: capacity %s, cold start %.1f s, %s -> %s",
+            model_name, load.capacity, load.cold_start_seconds, current.model_dump(), recommended.model_dump()
+        )
+
+        return load, recommended
+
+    def _sweep(
+        self,
+        requests: List[RequestRecord]
+    ) -> Tuple[List[int], List[Optional[float]], Dict[int, float]]:
+        """Sweep the requests of a model in time order.
+
+        Returns:
+            inflight_at_arrival (`List[int]`): In-flight requests at each arrival, including itself
+            idle_gaps (`List[Optional[float]]`): Idle time before each arrival, `None` if the model was busy (or it is
+                the first request), unit: s
+            level_seconds (`Dict[int, float]`): In-flight requests to the time spent at that level, unit: s
+        """
+
+        inflight_at_arrival: List[int] = []
+        idle_gaps: List[Optional[float]] = []
+        level_seconds: Dict[int, float] = defaultdict(float)
+
+        completions: List[float] = []
+        idle_since: Optional[float] = None
+        last_time = requests[0].timestamp
+
+        def _advance(now: float):
+            nonlocal last_time
+            level_seconds[len(completions)] += now - last_time
+            last_time = now
+
+        for request in requests:
+            while completions and completions[0] <= request.timestamp:
+                completed_at = completions[0]
+                _advance(completed_at)
+                heapq.heappop(completions)
+                if not completions:
+                    idle_since = completed_at
+
+            _advance(request.timestamp)
+            idle_gaps.append(request.timestamp - idle_since if not completions and idle_since is not None else None)
+
+            heapq.heappush(completions, request.timestamp + (request.e2e or 0.0))
+            inflight_at_arrival.append(len(completions))
+
+        while completions:
+            _advance(completions[0])
+            heapq.heappop(completions)
+
+        return inflight_at_arrival, idle_gaps, dict(level_seconds)
+
+    def _scale_down_delay(self, idle_gaps: List[float], cold_start_seconds: float, gpus: int) -> Tuple[int, bool]:
+        """Choose the scale-down delay minimizing the idle GPU seconds plus the cold start penalty over the gaps.
+
+        Returns:
+            scale_down_delay (`int`): Recommended scale-down delay, unit: s
+            keep_warm (`bool`): Keeping the model warm through every gap is the cheapest, the scale-down delay then
+                only applies to the additional replicas
+        """
+
+        if not idle_gaps:
+            return self._clamp_delay(cold_start_seconds), False
+
+        gaps = sorted(idle_gaps)
+        cold_cost = self.cold_start_penalty * cold_start_seconds
+
+        # 只需要在 0 與每個 gap 長度上評估 (成本為分段線性)
+        best_delay, best_cost = 0.0, cold_cost * len(gaps)
+        held_seconds = 0.0
+        for i, gap in enumerate(gaps):
+            held_seconds += gap
+            cost = (held_seconds + gap * (len(gaps) - i - 1)) * gpus + cold_cost * (len(gaps) - i - 1)
+            if cost < best_cost:
+                best_delay, best_cost = gap, cost
+
+        keep_warm = best_delay >= gaps[-1]
+        # 常駐時 scale-down delay 只影響額外的 replica，以冷啟動時間作為損益平衡點
+        scale_down_delay = self._clamp_delay(cold_start_seconds if keep_warm else best_delay)
+
+        return scale_down_delay, keep_warm
+
+    def _clamp_delay(self, seconds: float) -> int:
+        return int(min(max(math.ceil(seconds), self.min_scale_down_delay), self.max_scale_down_delay))
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    distribution = summarize(values)
+    if distribution:
+        distribution["max"] = max(values)
+
+    return distribution
+
+
+def _time_weighted_quantile(level_seconds: Dict[int, float], quantile: float) -> int:
+    total_seconds = sum(level_seconds.values())
+    if total_seconds <= 0:
+        return 0
+
+    elapsed = 0.0
+    for level in sorted(level_seconds):
+        elapsed += level_seconds[level]
+        if elapsed >= total_seconds * quantile:
+            return level
+
+    return max(level_seconds)
+
+
+if __name__ == "__main__":
+    from logging import INFO
+
+    from shared.utils.logger import KubeAIKubernetesClientLogger
+
+    parser = argparse.ArgumentParser(
+        description="Tune the KubeAI autoscaling settings of the models on their observed load"
+    )
+    source_group = parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument("--trace", type=str, help="JSON Lines request trace (`python -m backend.store requests`)")
+    source_group.add_argument("--store", type=str, help="Telemetry store directory, the latencies of its requests")
+    source_group.add_argument(
+        "--synthetic",
+        type=float,
+        metavar="HOURS",
+        help="Synthetic trace of a bursty and a sparse model (`synthetic_request_trace`)"
+    )
+    parser.add_argument("--hours", type=float, default=None, help="Only the requests of the last N hours (`--store`)")
+    parser.add_argument("--namespace", type=str, default="default")
+    parser.add_argument("--context", type=str, default=None, help="kubeconfig context of the cluster")
+    parser.add_argument("--load_seconds", type=float, default=30.0, help="Default cold start time, unit: s")
+    parser.add_argument("--cold_start_penalty", type=float, default=1.0, help="GPU seconds per cold start second")
+    parser.add_argument("--live", action="store_true", help="Compare against the deployed KubeAI Models")
+    parser.add_argument("--apply", action="store_true", help="Patch the recommended settings (dry run if not set)")
+    args = parser.parse_args()
+
+    if args.trace:
+        observed_requests = load_request_trace(args.trace)
+    elif args.synthetic is not None:
+        observed_requests = synthetic_request_trace(args.synthetic)
+    else:
+        from backend.store.store import TelemetryStore
+
+        observed_requests = TelemetryStore(args.store, retention_days=None).query_requests(
+            time.time() - args.hours * 3600 if args.hours is not None else None
+        )
+
+    autoscaling_tuner = AutoscalingTuner(
+        logger=KubeAIKubernetesClientLogger(console_level=INFO, file_level=INFO).getLogger(),
+        namespace=args.namespace,
+        load_seconds=args.load_seconds,
+        cold_start_penalty=args.cold_start_penalty
+    )
+
+    async def _main():
+        current = await autoscaling_tuner.current_settings(args.context) if args.live or args.apply else None
+        recommendations = autoscaling_tuner.recommend(observed_requests, current)
+
+        if args.apply:
+            await autoscaling_tuner.apply(recommendations, args.context)
+
+        for recommendation in recommendations:
+            print(recommendation.model_dump_json())
+
+    asyncio.run(_main())
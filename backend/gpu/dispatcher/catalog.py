@@ -0,0 +1,206 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from backend.gpu.dispatcher.parser import GPU_MODELS_FILE_PATH, parse_gpu_models
+from backend.gpu.dispatcher.profiles import kubeai_resource_profile_stem
+from backend.gpu.dispatcher.types import GPUModel, GPUModelList
+
+
+def normalize_gpu_model_name(gpu_name: str) -> str:
+    """Normalize the GPU model name for the catalog lookup.
+
+    Args:
+        gpu_name (`str`): GPU model name, Like `NVIDIA GeForce RTX 4090`
+
+    Returns:
+        normalized_gpu_name (`str`): Normalized GPU model name, Like `nvidia geforce rtx 4090`
+    """
+
+    return " ".join(gpu_name.split()).lower()
+
+
+class GPUCatalog:
+    """GPU Model Mapping table indexed by the DCGM `modelName` label."""
+
+    _gpu_model_list: GPUModelList = None
+    """List of GPU Models"""
+
+    _index: Dict[str, GPUModel] = None
+    """Normalized GPU model name (and aliases) to GPU model"""
+
+    _profile_stems: Dict[Tuple[str, Optional[str], bool], str] = None
+    """(GPU model name, MIG profile, shared) to KubeAI resource profile stem"""
+
+    def __init__(self, gpu_model_list: GPUModelList):
+        """Initializes the GPU catalog, validates the GPU models and builds the lookup index.
+
+        Args:
+            gpu_model_list (`GPUModelList`): List of GPU Models
+
+        Raises:
+            ValueError: If the GPU Model Mapping table is invalid
+        """
+
+        self._gpu_model_list = gpu_model_list
+        self._index = {}
+        self._profile_stems = {}
+
+        self._validate()
+
+        for gpu_model in gpu_model_list.gpu_models:
+            for name in [gpu_model.model, *gpu_model.aliases]:
+                self._index[normalize_gpu_model_name(name)] = gpu_model
+
+            # 預先計算所有 KubeAI resource profile 名稱，避免每次選擇 GPU 時重新組合字串
+            self._profile_stems[(gpu_model.model, None, False)] = kubeai_resource_profile_stem(gpu_model)
+            if gpu_model.time_slicing_replicas > 1:
+                self._profile_stems[(gpu_model.model, None, True)] = kubeai_resource_profile_stem(
+                    gpu_model, shared=True
+                )
+            for mig_profile in gpu_model.mig_profiles:
+                self._profile_stems[(gpu_model.model, mig_profile.name, False)] = kubeai_resource_profile_stem(
+                    gpu_model, mig_profile=mig_profile.name
+                )
+
+    # ============================== Properties ==============================
+
+    @property
+    def gpu_models(self) -> List[GPUModel]:
+        """List of GPU Models"""
+
+        return self._gpu_model_list.gpu_models
+
+    @property
+    def gpu_model_list(self) -> GPUModelList:
+        """List of GPU Models"""
+
+        return self._gpu_model_list
+
+    # ============================== Public Methods ==============================
+
+    def get(self, gpu_name: str) -> Optional[GPUModel]:
+        """Get the GPU model by the GPU model name or its aliases.
+
+        Args:
+            gpu_name (`str`): GPU model name, Like `NVIDIA GeForce RTX 4090`
+
+        Returns:
+            gpu_model (`Optional[GPUModel]`): GPU model, `None` if the GPU model is not supported
+        """
+
+        return self._index.get(normalize_gpu_model_name(gpu_name))
+
+    def profile_name(
+        self,
+        gpu_name: str,
+        count: int = 1,
+        mig_profile: Optional[str] = None,
+        shared: bool = False
+    ) -> str:
+        """Get the KubeAI resource profile name.
+
+        Args:
+            gpu_name (`str`): GPU model name, Like `NVIDIA GeForce RTX 4090`
+            count (`int`): GPU count. Default is `1`
+            mig_profile (`Optional[str]`): MIG instance profile, Like `1g.10gb`. Default is `None` (whole GPU)
+            shared (`bool`): Use the time-sliced share of the GPU or not. Default is `False`
+
+        Returns:
+            kubeai_gpu_resources_name (`str`): KubeAI GPU resources name, Like `nvidia-gpu-4070-12gb:2`
+
+        Raises:
+            ValueError: If the GPU model, MIG profile or time-slicing is not supported
+        """
+
+        gpu_model = self.get(gpu_name)
+        if gpu_model is None:
+            raise ValueError(f"Unsupported GPU model: {gpu_name}")
+
+        profile_stem = self._profile_stems.get(
+            (gpu_model.model, mig_profile, shared and mig_profile is None)
+        )
+        if profile_stem is None:
+            raise ValueError(
+                f"Unsupported resource profile of GPU model: {gpu_name} (MIG: {mig_profile}, Shared: {shared})"
+            )
+
+        return f"{profile_stem}:{count}"
+
+    # ============================== Private Methods ==============================
+
+    def _validate(self):
+        """Validate the GPU Model Mapping table.
+
+        Raises:
+            ValueError: If the GPU Model Mapping table is invalid
+        """
+
+        names: Dict[str, str] = {}
+        profile_stems: Dict[Tuple[str, int], str] = {}
+
+        for gpu_model in self._gpu_model_list.gpu_models:
+            if gpu_model.vram <= 0:
+                raise ValueError(f"Invalid VRAM of GPU model: {gpu_model.model}")
+
+            if not re.fullmatch(r"[a-z0-9]+", gpu_model.profile):
+                raise ValueError(
+                    f"Invalid profile `{gpu_model.profile}` of GPU model: {gpu_model.model}, only [a-z0-9] is allowed"
+                )
+
+            if gpu_model.time_slicing_replicas < 1:
+                raise ValueError(f"Invalid time-slicing replicas of GPU model: {gpu_model.model}")
+
+            if gpu_model.memory_bandwidth < 0:
+                raise ValueError(f"Invalid memory bandwidth of GPU model: {gpu_model.model}")
+
+            for name in [gpu_model.model, *gpu_model.aliases]:
+                normalized_name = normalize_gpu_model_name(name)
+                if normalized_name in names:
+                    raise ValueError(
+                        f"Duplicated GPU model name `{name}` of GPU model: {gpu_model.model} and {names[normalized_name]}"
+                    )
+                names[normalized_name] = gpu_model.model
+
+            # 不同 GPU 型號不能產生相同的 KubeAI resource profile 名稱
+            profile_key = (gpu_model.profile, gpu_model.vram)
+            if profile_key in profile_stems:
+                raise ValueError(
+                    f"Duplicated profile `{gpu_model.profile}` ({gpu_model.vram}GiB) of GPU model: "
+                    f"{gpu_model.model} and {profile_stems[profile_key]}, use `aliases` instead"
+                )
+            profile_stems[profile_key] = gpu_model.model
+
+            mig_names = set()
+            for mig_profile in gpu_model.mig_profiles:
+                if mig_profile.name in mig_names:
+                    raise ValueError(
+                        f"Duplicated MIG profile `{mig_profile.name}` of GPU model: {gpu_model.model}"
+                    )
+                if not 0 < mig_profile.memory <= gpu_model.vram:
+                    raise ValueError(
+                        f"Invalid memory of MIG profile `{mig_profile.name}` of GPU model: {gpu_model.model}"
+                    )
+                mig_names.add(mig_profile.name)
+
+
+@lru_cache(maxsize=None)
+def get_gpu_catalog(file_path: str = GPU_MODELS_FILE_PATH) -> GPUCatalog:
+    """Get the GPU catalog, the GPU Model Mapping table is loaded only once per file.
+
+    Args:
+        file_path (`str`): GPU models YAML file path. Defaults to the `gpu_models.yaml` in this package.
+
+    Returns:
+        gpu_catalog (`GPUCatalog`): GPU catalog
+
+    Raises:
+        ValueError: If the GPU Model Mapping table is invalid
+    """
+
+    try:
+        gpu_model_list = parse_gpu_models(file_path)
+    except KeyError as e:
+        raise ValueError(f"Missing required field {e} in GPU Model Mapping table: {file_path}")
+
+    return GPUCatalog(gpu_model_list)
@@ -0,0 +1,591 @@
+import argparse
+import asyncio
+import dataclasses
+import math
+import threading
+import time
+from collections import defaultdict
+from logging import Logger
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from shared.config.types import ClusterConfig
+
+from backend.gpu.dispatcher.catalog import get_gpu_catalog
+from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+from backend.gpu.dispatcher.inventory import GPUInventory, NodeState
+from backend.gpu.dispatcher.types import (
+    DeploymentPlan,
+    DeploymentReport,
+    ModelDeployment,
+    ReplicaPlacement
+)
+from backend.k8s.kubeai import (
+    create_kubeai_model_custom_resource,
+    list_kubeai_model_custom_resource,
+    patch_kubeai_model_custom_resource,
+    watch_kubeai_ollama_model_ready_pods
+)
+from backend.llm.models import OllamaBuiltinModel
+
+
+GPUKey = Tuple[Optional[str], str, str, Optional[str]]
+"""(cluster, node name, GPU UUID, MIG instance ID) of a GPU in the free memory ledger of a plan"""
+
+
+class KubeAIModelClient:
+    """KubeAI Model Custom Resources and Ollama Model Pods of a cluster, the Kubernetes API calls run in threads."""
+
+    def __init__(self, namespace: str = "default", context: str = None):
+        """Initializes the KubeAI Model client.
+
+        Args:
+            namespace (`str`): Kubernetes Namespace of the KubeAI Models. Default is `default`
+            context (`str`): kubeconfig context of the cluster. Default is `None` (the current context)
+        """
+
+        self.namespace = namespace
+        self.context = context
+
+    async def list_models(self) -> Dict[str, Dict[str, Any]]:
+        """List the KubeAI Model Custom Resources.
+
+        Returns:
+            kubeai_models (`Dict[str, Dict[str, Any]]`): KubeAI Model name to the KubeAI Model Custom Resource
+        """
+
+        kubeai_models = await asyncio.to_thread(list_kubeai_model_custom_resource, self.namespace, self.context)
+
+        return {kubeai_model["metadata"]["name"]: kubeai_model for kubeai_model in kubeai_models}
+
+    async def apply_model(self, model_cr_yaml: Dict[str, Any], existing: Dict[str, Any] = None):
+        """Create the KubeAI Model Custom Resource, or patch it if it already exists.
+
+        Args:
+            model_cr_yaml (`Dict[str, Any]`): KubeAI Model Custom Resource YAML
+            existing (`Dict[str, Any]`): Existing KubeAI Model Custom Resource. Default is `None` (create)
+        """
+
+        if existing is None:
+            await asyncio.to_thread(create_kubeai_model_custom_resource, model_cr_yaml, self.context)
+        else:
+            await asyncio.to_thread(patch_kubeai_model_custom_resource, existing, model_cr_yaml, self.context)
+
+    async def wait_ready(
+        self,
+        replicas: Mapping[str, int],
+        timeout: float = 600.0,
+        on_ready: Callable[[str], None] = None,
+        created_after: Mapping[str, float] = None
+    ) -> Set[str]:
+        """Wait for the Ollama Model Pods of several KubeAI Models with one shared watch.
+
+        Args:
+            replicas (`Mapping[str, int]`): KubeAI Model name to the number of ready Pods to wait for
+            timeout (`float`): Timeout, unit: s. Default is `600.0`
+            on_ready (`Callable[[str], None]`): Called with the KubeAI Model name when its Pods are ready.
+                Default is `None`
+            created_after (`Mapping[str, float]`): KubeAI Model name to the Unix timestamp, its Pods created earlier
+                are not counted. Default is `None` (all the Pods)
+
+        Returns:
+            ready_models (`Set[str]`): KubeAI Model names whose Pods are ready
+        """
+
+        stop = threading.Event()
+
+        try:
+            return await asyncio.to_thread(
+                watch_kubeai_ollama_model_ready_pods,
+                replicas,
+                self.namespace,
+                self.context,
+                timeout,
+                on_ready,
+                stop,
+                created_after
+            )
+        finally:
+            # 取消等待時一併停止 watch 執行緒
+            stop.set()
+
+
+def parse_model_replicas(values: Iterable[str]) -> Dict[str, int]:
+    """Parse the desired models, Like `["gemma2:2b=2", "llama3.1:8b"]`.
+
+    Args:
+        values (`Iterable[str]`): Ollama model names with an optional `=REPLICAS` suffix (default `1`)
+
+    Returns:
+        desired (`Dict[str, int]`): Ollama model name to the number of replicas
+
+    Raises:
+        ValueError: If the model is not an Ollama builtin model or the number of replicas is invalid
+    """
+
+    desired: Dict[str, int] = {}
+
+    for value in values:
+        model_name, _, replicas = value.partition("=")
+        # 驗證為 Ollama builtin model
+        OllamaBuiltinModel(model_name)
+
+        if replicas and (not replicas.isdigit() or int(replicas) < 1):
+            raise ValueError(f"Invalid number of replicas of {model_name}: {replicas}")
+
+        desired[model_name] = desired.get(model_name, 0) + (int(replicas) if replicas else 1)
+
+    return desired
+
+
+class DeploymentPlanner:
+    """Plan and deploy a set of KubeAI Models jointly, to warm up a cluster in parallel."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        gpu_dispatcher: GPUDispatcher,
+        namespace: str = "default",
+        max_parallel: int = 4,
+        ready_timeout: float = 600.0,
+        kubeai_clients: Mapping[Optional[str], Any] = None
+    ):
+        """Initializes the deployment planner.
+
+        Args:
+            logger (`Logger`): Logger
+            gpu_dispatcher (`GPUDispatcher`): GPU Dispatcher to get the GPU resources and estimate the model VRAM
+            namespace (`str`): Kubernetes Namespace of the KubeAI Models. Default is `default`
+            max_parallel (`int`): Max number of concurrent KubeAI Model applies. Default is `4`
+            ready_timeout (`float`): Timeout to wait for the Ollama Model Pods ready, unit: s. Default is `600.0`
+            kubeai_clients (`Mapping[Optional[str], Any]`): Federated cluster name (`None` if not federated) to its
+                KubeAI Model client (`list_models`, `apply_model`, `wait_ready`). Default is `None`
+                (a `KubeAIModelClient` per cluster)
+
+        Raises:
+            ValueError: If `max_parallel` is less than 1
+        """
+
+        if max_parallel < 1:
+            raise ValueError(f"max_parallel must be at least 1, got {max_parallel}")
+
+        self.logger = logger
+        self.gpu_dispatcher = gpu_dispatcher
+        self.namespace = namespace
+        self.max_parallel = max_parallel
+        self.ready_timeout = ready_timeout
+
+        self._kubeai_clients: Dict[Optional[str], Any] = dict(kubeai_clients or {})
+
+    # ============================== Public Methods ==============================
+
+    async def plan(self, desired: Mapping[str, int]) -> DeploymentPlan:
+        """Place the replicas of all the desired models jointly on the current GPU inventory.
+
+        The replicas are placed from the largest model (first-fit decreasing), on the GPUs that leave the least free
+        memory (best-fit), and every placed replica holds its GPUs in the plan, so the models do not compete for the
+        same devices. All the replicas of a model use the same resource profile and cluster.
+
+        Args:
+            desired (`Mapping[str, int]`): Ollama model name to the number of replicas
+
+        Returns:
+            deployment_plan (`DeploymentPlan`): Deployment plan
+
+        Raises:
+            ValueError: If the model is not an Ollama builtin model or the number of replicas is less than 1
+        """
+
+        for model_name, replicas in desired.items():
+            OllamaBuiltinModel(model_name)
+            if replicas < 1:
+                raise ValueError(f"Invalid number of replicas of {model_name}: {replicas}")
+
+        snapshot = await self.gpu_dispatcher.get_snapshot()
+        model_names = list(desired)
+        estimates = dict(zip(
+            model_names,
+            await asyncio.gather(*[self.gpu_dispatcher.estimate_model_vram(model_name) for model_name in model_names])
+        ))
+
+        # 規劃中的剩餘 VRAM，每個放置的 replica 都會扣除其 VRAM
+        free_memory: Dict[GPUKey, int] = {
+            self._gpu_key(gpu_node, gpu): gpu.free_memory
+            for gpu_node in snapshot.inventory.nodes for gpu in gpu_node.gpus
+        }
+
+        deployment_plan = DeploymentPlan()
+
+        # 大模型優先放置 (first-fit decreasing)，避免小模型把大 GPU 切碎
+        for model_name in sorted(model_names, key=lambda x: estimates[x] or 0, reverse=True):
+            estimate_vram = estimates[model_name]
+            if not estimate_vram:
+                self.logger.warning("Cannot estimate the required VRAM of %s", model_name)
+                deployment_plan.unplaced[model_name] = desired[model_name]
+                continue
+
+            deployment = ModelDeployment(
+                model_name=model_name,
+                name=OllamaBuiltinModel(model_name).yaml["metadata"]["name"],
+                estimate_vram=estimate_vram
+            )
+
+            for _ in range(desired[model_name]):
+                selected = self._select_replica(
+                    snapshot.inventory,
+                    free_memory,
+                    estimate_vram,
+                    deployment.resource_profile,
+                    deployment.cluster,
+                    model_name
+                )
+                if selected is None:
+                    break
+
+                selected_gpu, resource_profile = selected
+                if deployment.resource_profile is None:
+                    deployment.resource_profile = resource_profile
+                    deployment.cluster = selected_gpu.cluster
+
+                self._reserve(selected_gpu, free_memory, estimate_vram)
+                deployment.placements.append(ReplicaPlacement(
+                    node_name=selected_gpu.node_name,
+                    gpus=[gpu.index for gpu in selected_gpu.gpus]
+                ))
+                deployment.replicas += 1
+
+            if deployment.replicas:
+                deployment_plan.deployments.append(deployment)
+            if deployment.replicas < desired[model_name]:
+                deployment_plan.unplaced[model_name] = desired[model_name] - deployment.replicas
+
+        self.logger.info(
+            "Deployment plan: %d model(s), %d replica(s), unplaced: %s",
+            len(deployment_plan.deployments),
+            sum(deployment.replicas for deployment in deployment_plan.deployments),
+            deployment_plan.unplaced or None
+        )
+
+        return deployment_plan
+
+    async def deploy(self, deployment_plan: DeploymentPlan) -> DeploymentReport:
+        """Apply all the KubeAI Models of the plan concurrently and wait for them with one watch per cluster.
+
+        The KubeAI Models of a cluster are listed once, the applies run with at most `max_parallel` in flight, and
+        the readiness watch starts before the first apply so that no Pod event is missed.
+
+        Args:
+            deployment_plan (`DeploymentPlan`): Deployment plan
+
+        Returns:
+            deployment_report (`DeploymentReport`): Deployment report
+        """
+
+        deployment_report = self._new_report("parallel", deployment_plan)
+        start_time = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_parallel)
+
+        cluster_deployments: Dict[Optional[str], List[ModelDeployment]] = defaultdict(list)
+        for deployment in deployment_plan.deployments:
+            cluster_deployments[deployment.cluster].append(deployment)
+
+        def _on_ready(name: str):
+            deployment_report.ready_seconds[name] = time.perf_counter() - start_time
+
+        async def _apply(kubeai_client: Any, deployment: ModelDeployment, existing: Optional[Dict[str, Any]],
+                         replicas: Dict[str, int]):
+            async with semaphore:
+                try:
+                    await kubeai_client.apply_model(self._model_yaml(deployment), existing)
+                except Exception as e:
+                    self.logger.error("Failed to apply KubeAI Model %s: %s", deployment.name, e)
+                    deployment_report.errors[deployment.name] = str(e)
+                    # 不再等待套用失敗的模型
+                    replicas.pop(deployment.name, None)
+
+        async def _deploy_cluster(cluster: Optional[str], deployments: List[ModelDeployment]) -> Optional[asyncio.Future]:
+            kubeai_client = self._kubeai_client(cluster)
+            replicas = {deployment.name: deployment.replicas for deployment in deployments}
+            watcher: Optional[asyncio.Future] = None
+
+            try:
+                kubeai_models = await kubeai_client.list_models()
+                deployment_report.list_calls += 1
+
+                watcher = asyncio.ensure_future(kubeai_client.wait_ready(
+                    replicas, self.ready_timeout, _on_ready, self._created_after(deployments, kubeai_models)
+                ))
+
+                await asyncio.gather(*[
+                    _apply(kubeai_client, deployment, kubeai_models.get(deployment.name), replicas)
+                    for deployment in deployments
+                ])
+            except Exception as e:
+                # 單一叢集失敗不影響其他叢集的部署
+                self.logger.error("Failed to deploy the KubeAI Models of cluster %s: %s", cluster, e)
+                if watcher is not None:
+                    watcher.cancel()
+                for deployment in deployments:
+                    deployment_report.errors.setdefault(deployment.name, str(e))
+                return None
+
+            return watcher
+
+        watchers = await asyncio.gather(*[
+            _deploy_cluster(cluster, deployments) for cluster, deployments in cluster_deployments.items()
+        ])
+        watchers = [watcher for watcher in watchers if watcher is not None]
+        deployment_report.apply_seconds = time.perf_counter() - start_time
+
+        for result in await asyncio.gather(*watchers, return_exceptions=True):
+            if isinstance(result, BaseException):
+                self.logger.error("Failed to watch the KubeAI Ollama Model Pods: %s", result)
+
+        return self._finish_report(deployment_report, deployment_plan, start_time)
+
+    async def deploy_sequential(self, deployment_plan: DeploymentPlan) -> DeploymentReport:
+        """Apply the KubeAI Models of the plan one by one, each waits for its own Pods, Like `app.py` does per request.
+
+        Args:
+            deployment_plan (`DeploymentPlan`): Deployment plan
+
+        Returns:
+            deployment_report (`DeploymentReport`): Deployment report, the baseline of `deploy`
+        """
+
+        deployment_report = self._new_report("sequential", deployment_plan)
+        start_time = time.perf_counter()
+
+        def _on_ready(name: str):
+            deployment_report.ready_seconds[name] = time.perf_counter() - start_time
+
+        for deployment in deployment_plan.deployments:
+            kubeai_client = self._kubeai_client(deployment.cluster)
+            apply_start_time = time.perf_counter()
+
+            # 與 `apply_kubeai_model_custom_resource` 相同，每次套用前都列出既有的 KubeAI Model
+            try:
+                kubeai_models = await kubeai_client.list_models()
+                deployment_report.list_calls += 1
+                created_after = self._created_after([deployment], kubeai_models)
+
+                await kubeai_client.apply_model(self._model_yaml(deployment), kubeai_models.get(deployment.name))
+            except Exception as e:
+                self.logger.error("Failed to apply KubeAI Model %s: %s", deployment.name, e)
+                deployment_report.errors[deployment.name] = str(e)
+                continue
+            finally:
+                deployment_report.apply_seconds += time.perf_counter() - apply_start_time
+
+            try:
+                await kubeai_client.wait_ready(
+                    {deployment.name: deployment.replicas}, self.ready_timeout, _on_ready, created_after
+                )
+            except Exception as e:
+                self.logger.error("Failed to watch the Ollama Model Pods of %s: %s", deployment.name, e)
+
+        return self._finish_report(deployment_report, deployment_plan, start_time)
+
+    # ============================== Private Methods ==============================
+
+    def _gpu_key(self, gpu_node: NodeState, gpu: Any) -> GPUKey:
+        return (gpu_node.cluster, gpu_node.node_name, gpu.uuid, gpu.mig_instance_id)
+
+    def _select_replica(
+        self,
+        gpu_inventory: GPUInventory,
+        free_memory: Dict[GPUKey, int],
+        estimate_vram: int,
+        resource_profile: Optional[str] = None,
+        cluster: Optional[str] = None,
+        model_name: str = None
+    ) -> Optional[Tuple[NodeState, str]]:
+        """Select the GPUs of a replica on the free memory left by the plan.
+
+        Args:
+            gpu_inventory (`GPUInventory`): GPU inventory of the snapshot
+            free_memory (`Dict[GPUKey, int]`): Free memory ledger of the plan, unit: MiB
+            estimate_vram (`int`): Estimated VRAM of the replica, unit: MiB
+            resource_profile (`Optional[str]`): Resource profile of the placed replicas. Default is `None` (any)
+            cluster (`Optional[str]`): Cluster of the placed replicas, only used with `resource_profile`
+            model_name (`str`): Ollama model name of the replica, for the tensor split. Default is `None`
+
+        Returns:
+            selected (`Optional[Tuple[NodeState, str]]`): Selected GPUs and their resource profile,
+                `None` if the replica does not fit
+        """
+
+        gpu_catalog = get_gpu_catalog()
+        best: Optional[Tuple[Tuple[int, int], NodeState, str]] = None
+
+        for gpu_node in gpu_inventory.nodes:
+            if resource_profile is not None and gpu_node.cluster != cluster:
+                continue
+
+            # 已被其他 replica 整張佔用的 GPU 不再列入選擇
+            gpus = tuple(
+                dataclasses.replace(gpu, free_memory=free_memory[self._gpu_key(gpu_node, gpu)])
+                for gpu in gpu_node.gpus if self._gpu_key(gpu_node, gpu) in free_memory
+            )
+            if not gpus or sum(gpu.free_memory for gpu in gpus) < estimate_vram:
+                continue
+
+            selected_gpu = self.gpu_dispatcher.select_node_gpus(
+                dataclasses.replace(gpu_node, gpus=gpus), estimate_vram, model_name
+            )
+            if selected_gpu is None:
+                continue
+
+            try:
+                selected_profile = gpu_catalog.profile_name(
+                    selected_gpu.gpus[-1].name,
+                    count=len(selected_gpu.gpus),
+                    mig_profile=selected_gpu.gpus[-1].mig_profile,
+                    shared=selected_gpu.shared
+                )
+            except ValueError:
+                continue
+
+            # 同一模型的所有 replica 必須使用相同的 resource profile
+            if resource_profile is not None and selected_profile != resource_profile:
+                continue
+
+            # 剩餘 VRAM 最少者優先 (best-fit)，其次為 GPU 數量較少者
+            score = (sum(gpu.free_memory for gpu in selected_gpu.gpus) - estimate_vram, len(selected_gpu.gpus))
+            if best is None or score < best[0]:
+                best = (score, selected_gpu, selected_profile)
+
+        return (best[1], best[2]) if best is not None else None
+
+    def _reserve(self, selected_gpu: NodeState, free_memory: Dict[GPUKey, int], estimate_vram: int):
+        """Hold the selected GPUs of a placed replica in the free memory ledger.
+
+        The Pod of a whole GPU or MIG profile is allocated the entire devices, so they are removed from the ledger,
+        only a time-sliced share holds just the VRAM of the replica.
+        """
+
+        for gpu in selected_gpu.gpus:
+            gpu_key = self._gpu_key(selected_gpu, gpu)
+            if selected_gpu.shared:
+                free_memory[gpu_key] = max(free_memory[gpu_key] - estimate_vram, 0)
+            else:
+                del free_memory[gpu_key]
+
+    def _model_yaml(self, deployment: ModelDeployment) -> Dict[str, Any]:
+        """KubeAI Model Custom Resource YAML of a planned model, all of its replicas are kept warm."""
+
+        model_yaml = OllamaBuiltinModel(deployment.model_name).yaml
+        model_yaml["metadata"]["namespace"] = self.namespace
+        model_yaml["spec"]["resourceProfile"] = deployment.resource_profile
+        model_yaml["spec"]["replicas"] = deployment.replicas
+        model_yaml["spec"]["minReplicas"] = deployment.replicas
+
+        return model_yaml
+
+    def _created_after(
+        self,
+        deployments: List[ModelDeployment],
+        kubeai_models: Mapping[str, Dict[str, Any]]
+    ) -> Dict[str, float]:
+        """Models whose resource profile changes, to the time before the apply. KubeAI replaces their Pods, so the
+        Pods still Ready on the previous resource profile are not counted."""
+
+        # creationTimestamp 只精確到秒
+        applied_at = math.floor(time.time())
+
+        return {
+            deployment.name: applied_at
+            for deployment in deployments
+            if deployment.name in kubeai_models
+            and kubeai_models[deployment.name].get("spec", {}).get("resourceProfile") != deployment.resource_profile
+        }
+
+    def _kubeai_client(self, cluster: Optional[str]) -> Any:
+        """Get the KubeAI Model client of the federated cluster."""
+
+        if cluster not in self._kubeai_clients:
+            clusters: Dict[str, ClusterConfig] = {cluster.name: cluster for cluster in self.gpu_dispatcher.clusters}
+            self._kubeai_clients[cluster] = KubeAIModelClient(
+                namespace=self.namespace,
+                context=clusters[cluster].kube_context if cluster is not None else None
+            )
+
+        return self._kubeai_clients[cluster]
+
+    def _new_report(self, mode: str, deployment_plan: DeploymentPlan) -> DeploymentReport:
+        return DeploymentReport(
+            mode=mode,
+            models=len(deployment_plan.deployments),
+            replicas=sum(deployment.replicas for deployment in deployment_plan.deployments)
+        )
+
+    def _finish_report(
+        self,
+        deployment_report: DeploymentReport,
+        deployment_plan: DeploymentPlan,
+        start_time: float
+    ) -> DeploymentReport:
+        deployment_report.not_ready = [
+            deployment.name for deployment in deployment_plan.deployments
+            if deployment.name not in deployment_report.ready_seconds and deployment.name not in deployment_report.errors
+        ]
+        deployment_report.warmup_seconds = time.perf_counter() - start_time
+
+        self.logger.info(
+            "Deployed %d model(s) (%s) in %.1f s, not ready: %s",
+            deployment_report.models,
+            deployment_report.mode,
+            deployment_report.warmup_seconds,
+            deployment_report.not_ready or None
+        )
+
+        return deployment_report
+
+
+if __name__ == "__main__":
+    from logging import INFO
+
+    from shared.config import parse_config
+    from shared.utils.logger import KubeAIKubernetesClientLogger
+
+    parser = argparse.ArgumentParser(
+        description="Plan the desired KubeAI Models jointly on the GPU inventory and warm up the cluster in parallel"
+    )
+    parser.add_argument(
+        "--models",
+        type=str,
+        nargs="+",
+        required=True,
+        metavar="MODEL[=REPLICAS]",
+        help="Desired Ollama builtin models, Like `gemma2:2b=2 llama3.1:8b`"
+    )
+    parser.add_argument("--namespace", type=str, default="default")
+    parser.add_argument("--max_parallel", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=600.0, help="Readiness timeout, unit: s")
+    parser.add_argument("--plan_only", action="store_true", help="Print the plan without applying it")
+    parser.add_argument("--sequential", action="store_true", help="Deploy the models one by one (baseline)")
+    args = parser.parse_args()
+
+    parsed_config = parse_config()
+    deployment_logger = KubeAIKubernetesClientLogger(console_level=INFO, file_level=INFO).getLogger()
+
+    async def _main():
+        deployment_planner = DeploymentPlanner(
+            logger=deployment_logger,
+            gpu_dispatcher=GPUDispatcher(
+                logger=deployment_logger,
+                ollama_parameters_worker_url=parsed_config.ollama_parameters_worker_url,
+                clusters=parsed_config.clusters
+            ),
+            namespace=args.namespace,
+            max_parallel=args.max_parallel,
+            ready_timeout=args.timeout
+        )
+
+        deployment_plan = await deployment_planner.plan(parse_model_replicas(args.models))
+        print(deployment_plan.model_dump_json())
+
+        if not args.plan_only:
+            deploy = deployment_planner.deploy_sequential if args.sequential else deployment_planner.deploy
+            print((await deploy(deployment_plan)).model_dump_json())
+
+    asyncio.run(_main())
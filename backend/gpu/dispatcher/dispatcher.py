@@ -1,57 +1,102 @@
+import asyncio
 import math
 import re
+import time
 from logging import Logger
-from typing import Dict, List
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 from shared.const.format import iB
-from backend.gpu.dispatcher.parser import parse_gpu_models
+from backend.gpu.dispatcher.catalog import GPUCatalog, get_gpu_catalog
+from backend.gpu.dispatcher.events import TelemetryEvent, TelemetryEventChannel, TelemetryEventType, diff_inventory
+from backend.gpu.dispatcher.inventory import GPUInventory, GPUSnapshot, GPUState, NodeState
 from backend.gpu.dispatcher.types import (
     GPU,
-    GPUModelList,
+    GPUModel,
     GPUNode,
     GPUNodeList,
     ParsedModelDetails
 )
+from backend.gpu.monitoring.decoding import VectorSample
 from backend.gpu.monitoring.prometheus import PrometheusClient
+from backend.gpu.monitoring.scraper import DCGMExporterClient
 from backend.llm.ollama import ModelDetails
 from backend.llm.ollama.client import OllamaClient
+from shared.config.types import ClusterConfig
+from shared.utils.logger import LazyJSON
+from shared.utils.metrics import StreamMetricsCollector
+
+if TYPE_CHECKING:
+    from backend.gpu.dispatcher.images import ImageCache
+    from backend.gpu.dispatcher.tensor_split import TensorSplitPlanner
+
+
+TELEMETRY_MODES = ("prometheus", "scrape")
+"""Telemetry sources of the GPU Dispatcher, querying Prometheus or scraping the DCGM Exporters directly"""
 
 
 class GPUDispatcher:
+    """Dispatch the GPU resources of the Kubernetes GPU Nodes to the LLM inference.
 
-    _instance = None
+    The clients are built once per instance, and the telemetry is kept in an immutable `GPUSnapshot` which every
+    refresh replaces as a whole, so the concurrent scheduling decisions can share one instance.
+    """
 
-    def __new__(cls, *args, **kwargs):
-        '''
-        GPU Dispatcher Singleton Instance
-        '''
+    _snapshot: GPUSnapshot = None
+    """Latest telemetry snapshot, replaced as a whole by every refresh (copy-on-write)"""
+
+    _refresh: "asyncio.Future[GPUSnapshot]" = None
+    """In-flight refresh shared by the concurrent callers, `None` if no refresh is running"""
 
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
+    _version: int = 0
+    """Sequence number of the latest refresh"""
 
-        return cls._instance
+    _events: TelemetryEventChannel = None
+    """Channel of the changes between the snapshots, published by every refresh"""
 
-    _node_gpu_info: Dict[str, Dict] = {}
-    """Raw Node GPU Information from Prometheus"""
+    _watch: "asyncio.Task" = None
+    """Background refresh of the snapshot while requests wait for GPU resources, `None` if not running"""
 
-    _gpu_node_list: GPUNodeList = None
-    """List of Kubernetes GPU Node Information"""
+    _waiters: int = 0
+    """Number of the requests waiting for GPU resources"""
 
-    _gpu_model_list: GPUModelList = None
-    """List of GPU Models"""
+    _gpu_catalog: GPUCatalog = None
+    """GPU Model Mapping table indexed by the GPU model name"""
 
     _prometheus_client: PrometheusClient = None
     """Prometheus Client to interact with Prometheus Server"""
 
+    _clusters: Dict[str, ClusterConfig] = None
+    """Federated cluster name to the cluster descriptor, empty if the GPU Dispatcher is not federated"""
+
+    _cluster_prometheus_clients: Dict[Optional[str], PrometheusClient] = None
+    """Federated cluster name to the Prometheus Client of the cluster"""
+
     _ollama_client: OllamaClient = None
     """Ollama Client to interact with Ollama Parameters Worker"""
 
+    _ollama_model_details: Dict[str, ModelDetails] = None
+    """Ollama model name to the model details used by the last VRAM estimation"""
+
+    _stream_metrics: StreamMetricsCollector = None
+    """Observed streaming throughput per KubeAI resource profile, used as the placement signal"""
+
     def __init__(
         self,
         logger: Logger,
         ollama_parameters_worker_url: str,
         prometheus_server_port: int = 30090,
-        prometheus_client_timeout: float = 60.0
+        prometheus_client_timeout: float = 60.0,
+        prometheus_client: PrometheusClient = None,
+        ollama_client: OllamaClient = None,
+        stream_metrics: StreamMetricsCollector = None,
+        clusters: List[ClusterConfig] = None,
+        prometheus_clients: Dict[str, PrometheusClient] = None,
+        telemetry: str = "prometheus",
+        scrape_interval: float = None,
+        free_memory_thresholds: List[int] = None,
+        image_cache: "ImageCache" = None,
+        tensor_split: "TensorSplitPlanner" = None
     ):
         '''Initializes the GPU Dispatcher to dispatch the GPU resources.
 
@@ -60,54 +105,172 @@ class GPUDispatcher:
             ollama_parameters_worker_url (`str`): Ollama Parameters Worker URL
             prometheus_server_port (`int`): Prometheus Server Port. Default is `30090`
             prometheus_client_timeout (`float`): Prometheus Client Timeout. Default is `60.0`
+            prometheus_client (`PrometheusClient`): Prometheus Client to use instead of connecting to the Prometheus Server,
+                Like the fake client of the replay harness. Default is `None`
+            ollama_client (`OllamaClient`): Ollama Client to use instead of connecting to the Ollama Parameters Worker.
+                Default is `None`
+            stream_metrics (`StreamMetricsCollector`): Observed streaming throughput to prefer the faster placement
+                among the available GPUs. Default is `None` (keep the VRAM-based order)
+            clusters (`List[ClusterConfig]`): Federated GPU clusters, the telemetry of all clusters is merged into one
+                inventory. Default is `None` (a single cluster with the Prometheus Server on `prometheus_server_port`)
+            prometheus_clients (`Dict[str, PrometheusClient]`): Cluster name to the Prometheus Client to use instead of
+                connecting to the Prometheus Server of the cluster, Like the simulated clusters. Default is `None`
+            telemetry (`str`): Telemetry source, `prometheus` (query Prometheus) or `scrape` (scrape the `/metrics` of
+                the DCGM Exporters discovered from Prometheus). Default is `prometheus`
+            scrape_interval (`float`): Scrape interval of the `scrape` telemetry, the samples are kept up to date in
+                the background, unit: s. Default is `None` (scrape on every snapshot refresh)
+            free_memory_thresholds (`List[int]`): GPU free memory thresholds whose crossings are published as
+                events, besides the ones of the subscriptions, unit: MiB. Default is `None`
+            image_cache (`ImageCache`): Container images cached on the nodes to prefer the placements which do not
+                pull the model image. Default is `None` (ignore the image pull time)
+            tensor_split (`TensorSplitPlanner`): Plan the whole GPUs of a node with the layer split of the model, so
+                that every GPU holds its share and the faster interconnects are preferred. Default is `None` (sum the
+                free memory of the GPUs from the smallest)
+
+        Raises:
+            ValueError: If the cluster names are not unique or the telemetry source is not supported
         '''
 
         self.logger = logger
 
-        self._prometheus_client = PrometheusClient(
-            url=f"http://0.0.0.0:{prometheus_server_port}",
-            timeout=prometheus_client_timeout
-        )
+        if telemetry not in TELEMETRY_MODES:
+            raise ValueError(f"Unsupported telemetry: {telemetry}, expected one of {TELEMETRY_MODES}")
+
+        if clusters:
+            self._clusters = {cluster.name: cluster for cluster in clusters}
+            if len(self._clusters) != len(clusters):
+                raise ValueError(f"Duplicate cluster names: {[cluster.name for cluster in clusters]}")
+
+            prometheus_clients = prometheus_clients or {}
+            self._cluster_prometheus_clients = {
+                cluster.name: prometheus_clients.get(cluster.name) or PrometheusClient(
+                    url=cluster.prometheus_url,
+                    timeout=cluster.prometheus_timeout
+                ) for cluster in clusters
+            }
+            self._prometheus_client = None
+        else:
+            self._clusters = {}
+            self._prometheus_client = prometheus_client or PrometheusClient(
+                url=f"http://0.0.0.0:{prometheus_server_port}",
+                timeout=prometheus_client_timeout
+            )
+            self._cluster_prometheus_clients = {None: self._prometheus_client}
+
+        if telemetry == "scrape":
+            # 不經過 Prometheus 的 scrape 週期與查詢，直接 scrape 各 cluster 的 DCGM Exporter
+            self._cluster_prometheus_clients = {
+                name: DCGMExporterClient(prometheus_client=prometheus_client, interval=scrape_interval)
+                for name, prometheus_client in self._cluster_prometheus_clients.items()
+            }
+            if self._prometheus_client is not None:
+                self._prometheus_client = self._cluster_prometheus_clients[None]
 
-        self._ollama_client = OllamaClient(ollama_parameters_worker_url)
+        self._ollama_client = ollama_client or OllamaClient(ollama_parameters_worker_url)
+        self._ollama_model_details = {}
+
+        self._events = TelemetryEventChannel(free_memory_thresholds or ())
+
+        self._stream_metrics = stream_metrics
+
+        self._image_cache = image_cache
+
+        self._tensor_split = tensor_split
 
     # ============================== Properties ==============================
 
     @property
-    def node_gpu_info(self):
-        """Raw Node GPU Information from Prometheus"""
+    def snapshot(self) -> Optional[GPUSnapshot]:
+        """Latest telemetry snapshot, `None` before the first refresh"""
 
-        return self._node_gpu_info
+        return self._snapshot
 
-    @node_gpu_info.setter
-    def node_gpu_info(self, value: Dict[str, Dict]):
-        self._node_gpu_info = value
+    @property
+    def node_gpu_info(self) -> Mapping[str, Sequence[VectorSample]]:
+        """Node GPU Information of the latest snapshot, PromQL query to the vector samples (read-only)"""
+
+        return self._snapshot.node_gpu_info if self._snapshot is not None else MappingProxyType({})
 
     @property
     def gpu_node_list(self):
         """List of Kubernetes GPU Node Information"""
 
-        return self._gpu_node_list
+        return self._snapshot.inventory.to_model() if self._snapshot is not None else None
 
-    @gpu_node_list.setter
-    def gpu_node_list(self, value: GPUNodeList):
-        self._gpu_node_list = value
+    @property
+    def gpu_inventory(self) -> GPUInventory:
+        """GPU inventory of the latest snapshot"""
+
+        return self._snapshot.inventory if self._snapshot is not None else None
+
+    @property
+    def events(self) -> TelemetryEventChannel:
+        """Channel of the changes between the snapshots, Like a GPU removed or its free memory crossing a threshold"""
+
+        return self._events
+
+    @property
+    def clusters(self) -> List[ClusterConfig]:
+        """Federated GPU clusters, empty if the GPU Dispatcher is not federated"""
+
+        return list(self._clusters.values())
+
+    @property
+    def cluster_gpu_info(self) -> Mapping[Optional[str], Mapping[str, Sequence[VectorSample]]]:
+        """Node GPU Information per federated cluster of the latest snapshot, the unreachable clusters are missing"""
+
+        return self._snapshot.cluster_gpu_info if self._snapshot is not None else MappingProxyType({})
+
+    @property
+    def ollama_model_details(self) -> Dict[str, ModelDetails]:
+        """Ollama model name to the model details used by the VRAM estimation"""
+
+        return self._ollama_model_details
 
     # ============================== Public Methods ==============================
 
-    async def get_available_gpus(self, model_name: str) -> GPUNodeList:
-        gpu_node_list = await self._get_gpu_node_list()
+    async def get_available_gpus(
+        self,
+        model_name: str,
+        timings: Dict[str, float] = None,
+        snapshot: GPUSnapshot = None
+    ) -> GPUNodeList:
+        """Get the available GPUs based on the free memory and the estimated VRAM.
+
+        Args:
+            model_name (`str`): Model name for LLM inference
+            timings (`Dict[str, float]`): Dictionary to store the per-stage timings
+                (`telemetry`, `estimate`, `select`), unit: s. Default is `None`
+            snapshot (`GPUSnapshot`): Telemetry snapshot to decide on, Like to record the decision with the same
+                snapshot, `telemetry` is not timed then. Default is `None` (refresh the snapshot)
+
+        Returns:
+            available_gpus (`GPUNodeList`): Available GPUs, `None` if no GPU is available
+        """
 
-        available_gpus: GPUNodeList = None
+        timings = {} if timings is None else timings
+
+        if snapshot is None:
+            start_time = time.perf_counter()
+            snapshot = await self.get_snapshot()
+            timings["telemetry"] = time.perf_counter() - start_time
+
+        # 整個決策只讀取同一份 snapshot，其他請求的 refresh 只會替換 `_snapshot`，不會修改這份資料
+        gpu_inventory = snapshot.inventory
+
+        candidates: List[NodeState] = []
+
+        start_time = time.perf_counter()
         estimate_vram = await self._calc_model_estimate_vram(model_name)
+        timings["estimate"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
 
-        for gpu_node in gpu_node_list.gpu_nodes:
-            # 依照 VRAM 大小排序 GPU (從小到大)
-            sorted_gpus = sorted(gpu_node.gpus, key=lambda x: x.free_memory)
+        for gpu_node in gpu_inventory.nodes:
             total_node_vram = sum(gpu.free_memory for gpu in gpu_node.gpus)
 
-            self.logger.info(
-                f"Node: {gpu_node.node_name}, Total VRAM: {total_node_vram}, Required VRAM: {estimate_vram}"
+            self.logger.debug(
+                "Node: %s, Total VRAM: %s, Required VRAM: %s", gpu_node.node_name, total_node_vram, estimate_vram
             )
 
             # 如果無法估算 LLM 模型所需的 GPU VRAM，則不進行 GPU 選擇
@@ -115,36 +278,250 @@ class GPUDispatcher:
                 self.logger.warning("Cannot estimate the required VRAM")
                 break
 
-            # 檢查節點總 VRAM 是否足夠
-            if total_node_vram >= estimate_vram:
-                required_gpus = []
-                current_vram = 0
+            selected_gpu = self.select_node_gpus(gpu_node, estimate_vram, model_name)
+            if selected_gpu is None:
+                continue
+
+            candidates.append(selected_gpu)
+
+            if selected_gpu.shared or selected_gpu.gpus[0].is_mig:
+                self.logger.info(
+                    "Node %s: Selected %s (MIG: %s, Shared: %s)",
+                    gpu_node.node_name,
+                    selected_gpu.gpus[0].index,
+                    selected_gpu.gpus[0].mig_profile,
+                    selected_gpu.shared
+                )
+            else:
+                self.logger.debug(
+                    "Node %s: Selected %d GPU(s)", gpu_node.node_name, len(selected_gpu.gpus)
+                )
+
+        # 每次排程決策只輸出一筆 INFO log，逐節點的細節為 DEBUG
+        self.logger.info(
+            "Model %s: %d candidate node(s)",
+            model_name,
+            len(candidates),
+            extra={
+                "model": model_name,
+                "estimate_vram": estimate_vram,
+                "candidates": len(candidates),
+                "clusters": sorted({gpu_node.cluster for gpu_node in candidates if gpu_node.cluster is not None}),
+            }
+        )
+
+        if candidates and self._stream_metrics is not None:
+            candidates = self._rank_by_throughput(model_name, candidates)
+
+        if candidates and self._image_cache is not None:
+            candidates = self._rank_by_pull_cost(model_name, candidates, estimate_vram)
+
+        timings["select"] = time.perf_counter() - start_time
+
+        # 只在回傳給呼叫端時轉換為 pydantic model
+        return GPUInventory(nodes=tuple(candidates)).to_model() if candidates else None
+
+    async def get_snapshot(self) -> GPUSnapshot:
+        """Refresh the telemetry snapshot from Prometheus.
+
+        The concurrent callers share the in-flight refresh instead of querying Prometheus again, and a caller being
+        cancelled does not cancel the refresh of the others.
+
+        Returns:
+            snapshot (`GPUSnapshot`): Telemetry snapshot
+        """
+
+        refresh = self._refresh
+        if refresh is None:
+            refresh = self._refresh = asyncio.ensure_future(self._refresh_snapshot())
+
+        return await asyncio.shield(refresh)
+
+    async def get_gpu_inventory(self) -> GPUInventory:
+        """Get the latest GPU inventory snapshot from Prometheus.
+
+        Returns:
+            gpu_inventory (`GPUInventory`): GPU inventory
+        """
+
+        return (await self.get_snapshot()).inventory
+
+    async def get_gpu_node_list(self) -> GPUNodeList:
+        """Get the latest List of Kubernetes GPU Node Information from Prometheus.
+
+        Returns:
+            gpu_node_list (`GPUNodeList`): List of Kubernetes GPU Node Information
+        """
+
+        return (await self.get_snapshot()).inventory.to_model()
+
+    async def watch(self, interval: float = 1.0):
+        """Refresh the telemetry snapshot every `interval` to publish the changes, until cancelled.
+
+        Args:
+            interval (`float`): Refresh interval, unit: s. Default is `1.0`
+        """
+
+        while True:
+            try:
+                await self.get_snapshot()
+            except Exception as e:
+                self.logger.warning("Failed to refresh the telemetry snapshot (%s)", repr(e))
+
+            await asyncio.sleep(interval)
+
+    async def wait_for_free_memory(
+        self,
+        free_memory: int,
+        timeout: float,
+        interval: float = 1.0,
+        model_name: str = None
+    ) -> Optional[TelemetryEvent]:
+        """Wait until a node has the GPUs with at least `free_memory` free, Like a request queued for GPU resources.
+
+        The snapshot is refreshed in the background while any request waits, and the request wakes up on the change
+        event instead of polling the available GPUs. The node of the event must fit the model by `select_node_gpus`,
+        so the free memory of several whole GPUs is summed.
+
+        Args:
+            free_memory (`int`): Required GPU free memory, unit: MiB
+            timeout (`float`): Max waiting time, unit: s
+            interval (`float`): Refresh interval of the snapshot while waiting, unit: s. Default is `1.0`
+            model_name (`str`): Model name to look up the number of layers of the tensor split. Default is `None`
+
+        Returns:
+            event (`Optional[TelemetryEvent]`): Change event of the GPU or the node, `None` if the timeout is exceeded
+        """
+
+        def _fits(event: TelemetryEvent) -> bool:
+            # 事件發布前 snapshot 已替換，節點狀態即為事件當下的狀態
+            gpu_node = next(
+                (
+                    gpu_node for gpu_node in self.gpu_inventory.nodes
+                    if gpu_node.cluster == event.cluster and gpu_node.node_name == event.node_name
+                ),
+                None
+            )
+            return gpu_node is not None and self.select_node_gpus(gpu_node, free_memory, model_name) is not None
+
+        async def _wait(subscription) -> TelemetryEvent:
+            async for event in subscription:
+                if _fits(event):
+                    return event
+
+        with self._events.subscribe(
+            types=(
+                TelemetryEventType.GPU_ADDED,
+                TelemetryEventType.FREE_MEMORY_ROSE,
+                TelemetryEventType.NODE_FREE_MEMORY_ROSE
+            ),
+            free_memory_threshold=free_memory
+        ) as subscription:
+            self._waiters += 1
+            if self._watch is None:
+                self._watch = asyncio.ensure_future(self.watch(interval))
+
+            try:
+                return await asyncio.wait_for(_wait(subscription), timeout)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                # 最後一個等待的請求結束時停止背景 refresh
+                self._waiters -= 1
+                if not self._waiters and self._watch is not None:
+                    self._watch.cancel()
+                    self._watch = None
+
+    def select_node_gpus(
+        self,
+        gpu_node: NodeState,
+        estimate_vram: int,
+        model_name: str = None
+    ) -> Optional[NodeState]:
+        """Select the GPUs of a node for a model, Like a candidate placement of `get_available_gpus`.
+
+        A single MIG instance or time-sliced share is preferred, so that several models share the same GPU.
+        Otherwise the whole GPUs are selected from the smallest free memory until they fit the model, or by the
+        tensor split planner if given.
+
+        Args:
+            gpu_node (`NodeState`): Kubernetes GPU Node state
+            estimate_vram (`int`): Estimated VRAM required for the LLM inference, unit: MiB
+            model_name (`str`): Model name to look up the number of layers of the tensor split. Default is `None`
+
+        Returns:
+            selected_gpu (`Optional[NodeState]`): Selected GPUs of the node, `None` if the model does not fit
+        """
+
+        # 小模型優先放置於單一 MIG instance 或 time-slicing share，讓多個模型共用同一張 GPU
+        fractional_gpu = self._select_fractional_gpu(gpu_node, estimate_vram)
+        if fractional_gpu is not None:
+            return fractional_gpu
+
+        if self._tensor_split is not None:
+            tensor_split = self._tensor_split.select(gpu_node, estimate_vram, model_name)
+            if tensor_split is None:
+                return None
+
+            self.logger.debug(
+                "Node %s: Split %s layers across %s (%s), %.1f tokens/s",
+                gpu_node.node_name,
+                tensor_split.layers,
+                [gpu.index for gpu in tensor_split.gpus],
+                tensor_split.links,
+                tensor_split.tokens_per_second
+            )
+
+            return tensor_split.node_state
+
+        # MIG instance 無法與其他 GPU 合併進行推理，只使用完整的 GPU (依照 VRAM 大小排序，從小到大)
+        whole_gpus = sorted((gpu for gpu in gpu_node.gpus if not gpu.is_mig), key=lambda x: x.free_memory)
+
+        # 檢查節點總 VRAM 是否足夠
+        if sum(gpu.free_memory for gpu in whole_gpus) < estimate_vram:
+            return None
+
+        required_gpus: List[GPUState] = []
+        current_vram = 0
+
+        # 從 VRAM 較小的 GPU 開始選擇
+        for gpu in whole_gpus:
+            required_gpus.append(gpu)
+            current_vram += gpu.free_memory
+
+            if current_vram >= estimate_vram:
+                # 找到足夠的 GPU 組合
+                return NodeState(
+                    node_name=gpu_node.node_name,
+                    gpus=tuple(required_gpus),
+                    cluster=gpu_node.cluster
+                )
 
-                # 從 VRAM 較小的 GPU 開始選擇
-                for gpu in sorted_gpus:
-                    required_gpus.append(gpu)
-                    current_vram += gpu.free_memory
+        return None
 
-                    if current_vram >= estimate_vram:
-                        # 找到足夠的 GPU 組合
-                        existing_node = GPUNode(
-                            node_name=gpu_node.node_name,
-                            gpus=[]
-                        )
-                        existing_node.gpus.extend(required_gpus)
+    def get_cluster(self, selected_gpu: GPUNode) -> Optional[ClusterConfig]:
+        """Get the federated cluster of the selected GPU resources, to apply the KubeAI Model and send the requests to.
+
+        Args:
+            selected_gpu (`GPUNode`): Selected GPU resources
+
+        Returns:
+            cluster (`Optional[ClusterConfig]`): Cluster descriptor, `None` if the GPU Dispatcher is not federated
+        """
 
-                        if available_gpus is None:
-                            available_gpus = GPUNodeList()
+        return self._clusters.get(selected_gpu.cluster) if selected_gpu.cluster is not None else None
 
-                        available_gpus.gpu_nodes.append(existing_node)
+    async def estimate_model_vram(self, model_name: str) -> int:
+        """Estimate the VRAM required for the LLM inference.
 
-                        self.logger.info(
-                            f"Node {gpu_node.node_name}: Selected {len(available_gpus.gpu_nodes[0].gpus)} GPU(s)"
-                        )
+        Args:
+            model_name (`str`): Model name for LLM inference, Like `gemma2:2b`
 
-                        break
+        Returns:
+            estimate_vram (`int`): Estimated VRAM, unit: MiB. `None` if the model is not found
+        """
 
-        return available_gpus
+        return await self._calc_model_estimate_vram(model_name)
 
     # async def get_available_gpus(
     #     self,
@@ -217,33 +594,29 @@ class GPUDispatcher:
         )
 
         # GPU Model Mapping 表
-        if self._gpu_model_list is None:
-            self._gpu_model_list = parse_gpu_models()
-
-        model_number = None
-        vram = None
-
-        for gpu in self._gpu_model_list.gpu_models:
-            if gpu.model == selected_gpu_model:
-                model_number = selected_gpu_model.split("RTX")[1].strip()
-                model_number = model_number.replace(" ", "").lower()
-                vram = gpu.vram
-                break
-
-        if not model_number or not vram:
-            raise ValueError(f"Unsupported GPU model: {selected_gpu_model}")
-
-        kubeai_gpu_resources_name = f"nvidia-gpu-{model_number}-{vram}gb:{selected_gpu_count}"
+        kubeai_gpu_resources_name = self._get_gpu_catalog().profile_name(
+            selected_gpu_model,
+            count=selected_gpu_count,
+            mig_profile=selected_gpu.gpus[-1].mig_profile,
+            shared=selected_gpu.shared
+        )
 
         return kubeai_gpu_resources_name
 
     # ============================== Private Methods ==============================
 
-    async def _get_gpu_metrics_from_prometheus(self):
-        """Get GPU metrics from Prometheus.
+    async def _get_gpu_metrics_from_prometheus(self) -> Dict[Optional[str], Dict[str, List[VectorSample]]]:
+        """Get GPU metrics from the Prometheus of every federated cluster concurrently.
+
+        A cluster which fails or exceeds its timeout is left out of the snapshot, so one slow Prometheus does not
+        stall the scheduling decision.
 
         Returns:
-            gpu_metrics (`Dict[str, Dict]`): GPU metrics
+            cluster_gpu_info (`Dict[Optional[str], Dict[str, List[VectorSample]]]`): Federated cluster name to the
+                PromQL query to the vector samples
+
+        Raises:
+            Exception: The error of the first cluster if no cluster responds
         """
 
         queries = [
@@ -254,9 +627,39 @@ class GPUDispatcher:
             "DCGM_FI_DEV_POWER_USAGE"
         ]
 
-        node_gpu_info = await self._prometheus_client.execute_multiple_queries(queries)
+        async def _fetch(cluster_name: Optional[str], prometheus_client: PrometheusClient):
+            # 直接解碼為只保留所需 label 的 VectorSample，不保留 Prometheus 回應的完整 dict
+            fetch = prometheus_client.execute_multiple_vector_queries(queries)
+            if cluster_name is None:
+                return await fetch
+
+            return await asyncio.wait_for(fetch, self._clusters[cluster_name].prometheus_timeout)
 
-        self.node_gpu_info = node_gpu_info
+        results = await asyncio.gather(
+            *[_fetch(name, client) for name, client in self._cluster_prometheus_clients.items()],
+            return_exceptions=True
+        )
+
+        cluster_gpu_info: Dict[Optional[str], Dict[str, List[VectorSample]]] = {}
+        errors: List[BaseException] = []
+
+        for cluster_name, result in zip(self._cluster_prometheus_clients, results):
+            if isinstance(result, BaseException):
+                errors.append(result)
+                self.logger.warning(
+                    "Cluster %s: Failed to get the GPU metrics (%s), skipped",
+                    cluster_name,
+                    repr(result),
+                    extra={"cluster": cluster_name}
+                )
+                continue
+
+            cluster_gpu_info[cluster_name] = result
+
+        if not cluster_gpu_info:
+            raise errors[0]
+
+        return cluster_gpu_info
 
     def _prometheus_metrics_name_mapping(self, metrics_name: str) -> str:
         """Mapping Prometheus metrics name to the GPU metrics name.
@@ -275,68 +678,270 @@ class GPUDispatcher:
             case "DCGM_FI_DEV_GPU_UTIL": return "memory_usage"
             case "DCGM_FI_DEV_POWER_USAGE": return "power_usage"
 
-    async def _get_gpu_node_list(self) -> GPUNodeList:
-        """Get the List of Kubernetes GPU Node Information.
+    async def _refresh_snapshot(self) -> GPUSnapshot:
+        """Build a new telemetry snapshot and publish it, the in-flight refresh shared by `get_snapshot`.
 
         Returns:
-            gpu_node_list (`GPUNodeList`): List of Kubernetes GPU Node Information
+            snapshot (`GPUSnapshot`): Published telemetry snapshot
+        """
+
+        try:
+            snapshot = await self._build_snapshot()
+
+            # 以單一參照替換整份 snapshot，讀取端不會看到建立到一半的資料
+            self._snapshot = snapshot
+
+            # 先替換 snapshot 再發布事件，訂閱者收到事件時讀到的是新的 snapshot
+            if snapshot.events:
+                self.logger.debug("Snapshot %s: %s change event(s)", snapshot.version, len(snapshot.events))
+                self._events.publish(snapshot.events)
+
+            return snapshot
+        finally:
+            self._refresh = None
+
+    async def _build_snapshot(self) -> GPUSnapshot:
+        """Build the telemetry snapshot of the Kubernetes GPU Nodes, only from local state until it is complete.
+
+        Returns:
+            snapshot (`GPUSnapshot`): Telemetry snapshot
         """
 
         # Get GPU metrics from Prometheus
-        await self._get_gpu_metrics_from_prometheus()
+        cluster_gpu_info = await self._get_gpu_metrics_from_prometheus()
+
+        # 各叢集分別建立，不同叢集的同名節點不會被合併
+        gpu_inventory = GPUInventory(nodes=tuple(
+            gpu_node
+            for cluster_name, node_gpu_info in cluster_gpu_info.items()
+            for gpu_node in self._build_gpu_inventory(node_gpu_info, cluster_name).nodes
+        ))
+
+        # 單一叢集時直接沿用其 samples；多個叢集時依 PromQL query 合併
+        if len(cluster_gpu_info) == 1:
+            node_gpu_info = next(iter(cluster_gpu_info.values()))
+        else:
+            node_gpu_info: Dict[str, List[VectorSample]] = {}
+            for gpu_info in cluster_gpu_info.values():
+                for query, samples in gpu_info.items():
+                    node_gpu_info.setdefault(query, []).extend(samples)
+
+        self._version += 1
+
+        # 與上一份 snapshot 逐張 GPU 比對，沿用沒有變化的狀態並產生變更事件
+        previous = self._snapshot
+        inventory_diff = diff_inventory(
+            previous.inventory if previous is not None else None,
+            gpu_inventory,
+            self._version,
+            self._events.free_memory_thresholds
+        )
 
-        gpu_node_list: GPUNodeList = GPUNodeList()
+        return GPUSnapshot(
+            version=self._version,
+            timestamp=time.time(),
+            inventory=inventory_diff.inventory,
+            node_gpu_info=MappingProxyType({query: tuple(samples) for query, samples in node_gpu_info.items()}),
+            cluster_gpu_info=MappingProxyType({
+                cluster_name: MappingProxyType({query: tuple(samples) for query, samples in gpu_info.items()})
+                for cluster_name, gpu_info in cluster_gpu_info.items()
+            }),
+            events=inventory_diff.events
+        )
 
-        for query, response in self.node_gpu_info.items():
-            for node in response["data"]["result"]:
-                node_name = node["metric"]["kubernetes_node"]
-                value = node["value"][1]
+    def _build_gpu_inventory(
+        self,
+        node_gpu_info: Mapping[str, Sequence[VectorSample]],
+        cluster: Optional[str] = None
+    ) -> GPUInventory:
+        """Build the GPU inventory snapshot from the DCGM Exporter samples.
 
-                existing_node = next(
-                    (
-                        node for node in gpu_node_list.gpu_nodes if node.node_name == node_name
-                    ), None
-                )
-                if existing_node:
-                    gpu_node = existing_node
-                else:
-                    gpu_node = GPUNode(node_name=node_name, gpus=[])
-                    gpu_node_list.gpu_nodes.append(gpu_node)
-
-                gpu_index = node["metric"]["gpu"]
-                gpu_uuid = node["metric"]["UUID"]
-                gpu_name = node["metric"]["modelName"]
-
-                gpu_info = next(
-                    (
-                        gpu for gpu in gpu_node.gpus if gpu.index == f"cuda:{gpu_index}"
-                    ), None
+        Args:
+            node_gpu_info (`Mapping[str, Sequence[VectorSample]]`): PromQL query to the vector samples
+            cluster (`Optional[str]`): Federated cluster name of the samples. Default is `None`
+
+        Returns:
+            gpu_inventory (`GPUInventory`): GPU inventory
+        """
+
+        # Kubernetes Node name -> (GPU index, MIG instance ID) -> GPU 欄位，以 dict 索引避免逐一搜尋節點與 GPU
+        nodes: Dict[str, Dict[Tuple[str, Optional[str]], Dict[str, Any]]] = {}
+        shares: Dict[str, int] = {}
+
+        for query, samples in node_gpu_info.items():
+            metrics_name = self._prometheus_metrics_name_mapping(query)
+
+            for sample in samples:
+                gpus = nodes.get(sample.node_name)
+                if gpus is None:
+                    gpus = nodes[sample.node_name] = {}
+
+                # 啟用 MIG 時，DCGM 會以 `GPU_I_ID` 與 `GPU_I_PROFILE` label 區分同一張 GPU 上的 MIG instance
+                gpu_key = (sample.gpu, sample.mig_instance_id)
+                gpu_fields = gpus.get(gpu_key)
+
+                if gpu_fields is None:
+                    if sample.model_name not in shares:
+                        gpu_model = self._get_gpu_model(sample.model_name)
+                        shares[sample.model_name] = gpu_model.time_slicing_replicas if gpu_model else 1
+
+                    gpu_fields = gpus[gpu_key] = {
+                        "index": f"cuda:{sample.gpu}",
+                        "uuid": sample.uuid,
+                        "name": sample.model_name,
+                        "mig_profile": sample.mig_profile,
+                        "mig_instance_id": sample.mig_instance_id,
+                        "shares": shares[sample.model_name] if not sample.mig_profile else 1,
+                    }
+
+                gpu_fields[metrics_name] = int(sample.value)
+
+        return GPUInventory(nodes=tuple(
+            NodeState(
+                node_name=node_name,
+                gpus=tuple(GPUState(**gpu_fields) for gpu_fields in gpus.values()),
+                cluster=cluster
+            ) for node_name, gpus in nodes.items()
+        ))
+
+    def _get_gpu_model(self, gpu_name: str) -> Optional[GPUModel]:
+        """Get the GPU model from the GPU Model Mapping table.
+
+        Args:
+            gpu_name (`str`): GPU model name, Like `NVIDIA GeForce RTX 4090`
+
+        Returns:
+            gpu_model (`Optional[GPUModel]`): GPU model, `None` if the GPU model is not supported
+        """
+
+        return self._get_gpu_catalog().get(gpu_name)
+
+    def _get_gpu_catalog(self) -> GPUCatalog:
+        """Get the GPU Model Mapping table, the table is loaded only once.
+
+        Returns:
+            gpu_catalog (`GPUCatalog`): GPU Model Mapping table
+        """
+
+        if self._gpu_catalog is None:
+            self._gpu_catalog = get_gpu_catalog()
+
+        return self._gpu_catalog
+
+    def _rank_by_throughput(self, model_name: str, candidates: List[NodeState]) -> List[NodeState]:
+        """Reorder the candidate placements, the placement with the highest observed throughput is the last one.
+
+        The placements without enough observations keep their VRAM-based order in front of the observed ones.
+
+        Args:
+            model_name (`str`): Model name for LLM inference
+            candidates (`List[NodeState]`): Candidate placements
+
+        Returns:
+            ranked_candidates (`List[NodeState]`): Candidate placements ordered by the observed throughput
+        """
+
+        def throughput(gpu_node: NodeState) -> float:
+            try:
+                resource_profile = self._get_gpu_catalog().profile_name(
+                    gpu_node.gpus[-1].name,
+                    count=len(gpu_node.gpus),
+                    mig_profile=gpu_node.gpus[-1].mig_profile,
+                    shared=gpu_node.shared
                 )
+            except ValueError:
+                return 0.0
+
+            return self._stream_metrics.throughput(model_name, resource_profile) or 0.0
+
+        # `sorted` 為穩定排序，沒有觀測資料的節點維持原本的順序
+        ranked_candidates = sorted(candidates, key=throughput)
+
+        self.logger.info(
+            "Ranked by throughput: %s",
+            [f"{gpu_node.cluster}/{gpu_node.node_name}" if gpu_node.cluster else gpu_node.node_name
+             for gpu_node in ranked_candidates]
+        )
+
+        return ranked_candidates
+
+    def _rank_by_pull_cost(self, model_name: str, candidates: List[NodeState], estimate_vram: int) -> List[NodeState]:
+        """Reorder the candidate placements by the estimated time to pull the model image, the placements whose node
+        caches the image are the last ones.
 
-                if not gpu_info:
-                    gpu_info = GPU(
-                        index=f"cuda:{gpu_index}",
-                        uuid=gpu_uuid,
-                        name=gpu_name,
-                        free_memory=0,
-                        used_memory=0,
-                        temperature=0,
-                        memory_usage=0,
-                        power_usage=0
-                    )
+        The placements with the same pull time keep their previous order, so the pull time outweighs the throughput
+        and the VRAM-based order.
 
-                    gpu_node.gpus.append(gpu_info)
+        Args:
+            model_name (`str`): Model name for LLM inference
+            candidates (`List[NodeState]`): Candidate placements
+            estimate_vram (`int`): Estimated VRAM, the image size if no node caches the image, unit: MiB
+
+        Returns:
+            ranked_candidates (`List[NodeState]`): Candidate placements ordered by the image pull time
+        """
 
-                for gpu_info in gpu_node.gpus:
-                    if gpu_info.index == f"cuda:{gpu_index}":
-                        gpu_info.__setattr__(
-                            self._prometheus_metrics_name_mapping(query),
-                            int(float(value))
-                        )
+        from backend.gpu.dispatcher.images import model_image
 
-        self._gpu_node_list = gpu_node_list
+        image = model_image(model_name)
+        if image is None:
+            return candidates
 
-        return gpu_node_list
+        pull_seconds = {
+            id(gpu_node): self._image_cache.pull_seconds(gpu_node.cluster, gpu_node.node_name, image, estimate_vram)
+            for gpu_node in candidates
+        }
+
+        # `sorted` 為穩定排序，拉取時間相同的節點維持原本的順序
+        ranked_candidates = sorted(candidates, key=lambda gpu_node: pull_seconds[id(gpu_node)], reverse=True)
+
+        self.logger.info(
+            "Ranked by image pull time: %s",
+            [f"{gpu_node.cluster}/{gpu_node.node_name}" if gpu_node.cluster else gpu_node.node_name
+             for gpu_node in ranked_candidates]
+        )
+
+        return ranked_candidates
+
+    def _select_fractional_gpu(self, gpu_node: NodeState, estimate_vram: int) -> Optional[NodeState]:
+        """Select a MIG instance or a time-sliced share of a GPU that fits the estimated VRAM.
+
+        The smallest fitting device is selected (best-fit), so that the larger devices are kept for the larger models.
+
+        Args:
+            gpu_node (`NodeState`): Kubernetes GPU Node state
+            estimate_vram (`int`): Estimated VRAM required for the LLM inference, unit: MiB
+
+        Returns:
+            fractional_gpu (`Optional[NodeState]`): Selected fractional GPU, `None` if no fractional GPU fits
+        """
+
+        candidates: List[GPUState] = []
+
+        for gpu in gpu_node.gpus:
+            if gpu.free_memory < estimate_vram:
+                continue
+
+            if gpu.is_mig:
+                candidates.append(gpu)
+            elif gpu.is_shared:
+                gpu_model = self._get_gpu_model(gpu.name)
+                # 每個 time-slicing share 可使用的 VRAM (MiB)
+                share_vram = (gpu_model.vram * iB) // gpu.shares
+                if estimate_vram <= share_vram:
+                    candidates.append(gpu)
+
+        if not candidates:
+            return None
+
+        selected_gpu = min(candidates, key=lambda x: x.free_memory)
+
+        return NodeState(
+            node_name=gpu_node.node_name,
+            gpus=(selected_gpu,),
+            shared=not selected_gpu.is_mig,
+            cluster=gpu_node.cluster
+        )
 
     def _filter_available_gpus(
         self,
@@ -411,12 +1016,11 @@ class GPUDispatcher:
             return parsed_model_details
 
         ollama_models = await self._ollama_client.list()
-        self.logger.info(
-            f"Ollama Models:\n{ollama_models.model_dump_json(indent=4)}"
-        )
+        self.logger.debug("Ollama Models:\n%s", LazyJSON(ollama_models))
 
         for model in ollama_models.models:
             if model.model == model_name:
+                self._ollama_model_details[model_name] = model.details
                 parsed_model_details = parse_model_details(model.details)
                 parameter_size = parsed_model_details.parameter_size
                 quantization_level = parsed_model_details.quantization_level
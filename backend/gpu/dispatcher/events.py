@@ -0,0 +1,393 @@
+import asyncio
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.gpu.dispatcher.inventory import GPUInventory, GPUState, NodeState
+
+
+class TelemetryEventType(Enum):
+    """Type of a change between two telemetry snapshots"""
+
+    GPU_ADDED = "gpu_added"
+    """A GPU (or MIG instance) appeared"""
+
+    GPU_REMOVED = "gpu_removed"
+    """A GPU (or MIG instance) disappeared"""
+
+    NODE_ADDED = "node_added"
+    """A Kubernetes GPU Node appeared"""
+
+    NODE_REMOVED = "node_removed"
+    """A Kubernetes GPU Node disappeared, its GPUs are removed as well"""
+
+    FREE_MEMORY_ROSE = "free_memory_rose"
+    """The free memory of a GPU rose to or above a threshold"""
+
+    FREE_MEMORY_FELL = "free_memory_fell"
+    """The free memory of a GPU fell below a threshold"""
+
+    NODE_FREE_MEMORY_ROSE = "node_free_memory_rose"
+    """The summed free memory of the whole GPUs of a Kubernetes GPU Node rose to or above a threshold"""
+
+    NODE_FREE_MEMORY_FELL = "node_free_memory_fell"
+    """The summed free memory of the whole GPUs of a Kubernetes GPU Node fell below a threshold"""
+
+
+@dataclass(frozen=True, slots=True)
+class TelemetryEvent:
+    """Change of a Kubernetes GPU Node or a GPU between two telemetry snapshots."""
+
+    type: TelemetryEventType
+    """Type of the change"""
+
+    version: int
+    """Version of the snapshot showing the change"""
+
+    node_name: str
+    """Kubernetes Node name"""
+
+    cluster: Optional[str] = None
+    """Federated cluster name of the node, `None` if the GPU Dispatcher is not federated"""
+
+    gpu: Optional[GPUState] = None
+    """GPU state, the last known one if the GPU is removed. `None` for the node events"""
+
+    previous_free_memory: Optional[int] = None
+    """GPU (or summed node) free memory of the previous snapshot for the threshold events, unit: MiB"""
+
+    threshold: Optional[int] = None
+    """Crossed free memory threshold for the threshold events, unit: MiB"""
+
+
+@dataclass(frozen=True, slots=True)
+class InventoryDiff:
+    """GPU inventory rebuilt on the previous one, and the changes between them."""
+
+    inventory: GPUInventory
+    """GPU inventory sharing the unchanged node and GPU states of the previous inventory"""
+
+    events: Tuple[TelemetryEvent, ...] = ()
+    """Changes since the previous inventory"""
+
+    changed: int = 0
+    """Number of the added or changed GPU states"""
+
+    reused: int = 0
+    """Number of the unchanged GPU states reused from the previous inventory"""
+
+
+def diff_inventory(
+    previous: Optional[GPUInventory],
+    current: GPUInventory,
+    version: int,
+    thresholds: Iterable[int] = ()
+) -> InventoryDiff:
+    """Diff the GPU inventory against the previous one per GPU UUID (and MIG instance).
+
+    The unchanged GPU and node states are taken from the previous inventory instead of the rebuilt ones, so the
+    new inventory only allocates the changed fields, and the consumers can compare the states by identity.
+
+    Args:
+        previous (`Optional[GPUInventory]`): Previous GPU inventory, `None` for the first snapshot (no event)
+        current (`GPUInventory`): GPU inventory rebuilt from the latest samples
+        version (`int`): Version of the snapshot of the current inventory
+        thresholds (`Iterable[int]`): Free memory thresholds of the threshold events, unit: MiB. Default is `()`
+
+    Returns:
+        inventory_diff (`InventoryDiff`): GPU inventory sharing the unchanged states, and the changes
+    """
+
+    if previous is None:
+        return InventoryDiff(
+            inventory=current,
+            changed=sum(len(gpu_node.gpus) for gpu_node in current.nodes)
+        )
+
+    thresholds = sorted(set(thresholds))
+    events: List[TelemetryEvent] = []
+    changed = 0
+    reused = 0
+
+    # (cluster, Kubernetes Node name) -> 節點狀態；(cluster, UUID, MIG instance ID) -> GPU 狀態
+    previous_nodes: Dict[Tuple[Optional[str], str], NodeState] = {
+        (gpu_node.cluster, gpu_node.node_name): gpu_node for gpu_node in previous.nodes
+    }
+    previous_gpus: Dict[Tuple[Optional[str], str, Optional[str]], Tuple[NodeState, GPUState]] = {
+        (gpu_node.cluster, gpu.uuid, gpu.mig_instance_id): (gpu_node, gpu)
+        for gpu_node in previous.nodes for gpu in gpu_node.gpus
+    }
+    seen_gpus: Set[Tuple[Optional[str], str, Optional[str]]] = set()
+
+    nodes: List[NodeState] = []
+    for gpu_node in current.nodes:
+        previous_node = previous_nodes.pop((gpu_node.cluster, gpu_node.node_name), None)
+        if previous_node is None:
+            events.append(TelemetryEvent(TelemetryEventType.NODE_ADDED, version, gpu_node.node_name, gpu_node.cluster))
+
+        gpus: List[GPUState] = []
+        for gpu in gpu_node.gpus:
+            gpu_key = (gpu_node.cluster, gpu.uuid, gpu.mig_instance_id)
+            seen_gpus.add(gpu_key)
+            previous_gpu = previous_gpus.get(gpu_key, (None, None))[1]
+
+            if previous_gpu is None:
+                changed += 1
+                gpus.append(gpu)
+                events.append(TelemetryEvent(
+                    TelemetryEventType.GPU_ADDED, version, gpu_node.node_name, gpu_node.cluster, gpu
+                ))
+                continue
+
+            if previous_gpu == gpu:
+                reused += 1
+                gpus.append(previous_gpu)
+                continue
+
+            changed += 1
+            gpus.append(gpu)
+
+            for threshold in thresholds:
+                if previous_gpu.free_memory < threshold <= gpu.free_memory:
+                    event_type = TelemetryEventType.FREE_MEMORY_ROSE
+                elif gpu.free_memory < threshold <= previous_gpu.free_memory:
+                    event_type = TelemetryEventType.FREE_MEMORY_FELL
+                else:
+                    continue
+
+                events.append(TelemetryEvent(
+                    event_type, version, gpu_node.node_name, gpu_node.cluster, gpu, previous_gpu.free_memory, threshold
+                ))
+
+        # 節點的所有 GPU 都沒有變化時沿用原本的節點狀態
+        if (
+            previous_node is not None
+            and previous_node.shared == gpu_node.shared
+            and len(previous_node.gpus) == len(gpus)
+            and all(node_gpu is previous_node_gpu for node_gpu, previous_node_gpu in zip(gpus, previous_node.gpus))
+        ):
+            nodes.append(previous_node)
+            continue
+
+        nodes.append(replace(gpu_node, gpus=tuple(gpus)))
+
+        if previous_node is None or not thresholds:
+            continue
+
+        # 多張 GPU 合併放置時比較的是節點完整 GPU 的 free memory 總和 (與 `select_node_gpus` 相同)
+        previous_free_memory = sum(gpu.free_memory for gpu in previous_node.gpus if not gpu.is_mig)
+        free_memory = sum(gpu.free_memory for gpu in gpus if not gpu.is_mig)
+
+        for threshold in thresholds:
+            if previous_free_memory < threshold <= free_memory:
+                event_type = TelemetryEventType.NODE_FREE_MEMORY_ROSE
+            elif free_memory < threshold <= previous_free_memory:
+                event_type = TelemetryEventType.NODE_FREE_MEMORY_FELL
+            else:
+                continue
+
+            events.append(TelemetryEvent(
+                event_type, version, gpu_node.node_name, gpu_node.cluster, None, previous_free_memory, threshold
+            ))
+
+    for gpu_key, (gpu_node, gpu) in previous_gpus.items():
+        if gpu_key not in seen_gpus:
+            events.append(TelemetryEvent(
+                TelemetryEventType.GPU_REMOVED, version, gpu_node.node_name, gpu_node.cluster, gpu
+            ))
+
+    for gpu_node in previous_nodes.values():
+        events.append(TelemetryEvent(TelemetryEventType.NODE_REMOVED, version, gpu_node.node_name, gpu_node.cluster))
+
+    # 整份 inventory 都沒有變化時沿用原本的 inventory
+    if len(nodes) == len(previous.nodes) and all(
+        gpu_node is previous_node for gpu_node, previous_node in zip(nodes, previous.nodes)
+    ):
+        inventory = previous
+    else:
+        inventory = GPUInventory(nodes=tuple(nodes))
+
+    return InventoryDiff(inventory=inventory, events=tuple(events), changed=changed, reused=reused)
+
+
+class TelemetrySubscription:
+    """Subscription to the telemetry events, an async iterator over the matching events."""
+
+    def __init__(
+        self,
+        channel: "TelemetryEventChannel",
+        types: Iterable[TelemetryEventType] = None,
+        free_memory_threshold: int = None,
+        maxsize: int = 1024
+    ):
+        """Initializes the subscription, use `TelemetryEventChannel.subscribe` instead.
+
+        Args:
+            channel (`TelemetryEventChannel`): Telemetry event channel
+            types (`Iterable[TelemetryEventType]`): Delivered event types. Default is `None` (all)
+            free_memory_threshold (`int`): Only deliver the threshold events of this free memory threshold, the
+                channel diffs the snapshots against it while subscribed, unit: MiB. Default is `None` (all thresholds)
+            maxsize (`int`): Max number of the undelivered events, the oldest are dropped. Default is `1024`
+        """
+
+        self.types = frozenset(types) if types is not None else None
+        self.free_memory_threshold = free_memory_threshold
+        self.closed = False
+
+        self.dropped = 0
+        """Number of the events dropped because the subscriber was too slow"""
+
+        self._channel = channel
+        self._queue: "asyncio.Queue[Optional[TelemetryEvent]]" = asyncio.Queue(maxsize)
+
+    def __enter__(self) -> "TelemetrySubscription":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __aiter__(self) -> "TelemetrySubscription":
+        return self
+
+    async def __anext__(self) -> TelemetryEvent:
+        if self.closed and self._queue.empty():
+            raise StopAsyncIteration
+
+        event = await self._queue.get()
+        if event is None:
+            raise StopAsyncIteration
+
+        return event
+
+    def matches(self, event: TelemetryEvent) -> bool:
+        """Whether the event is delivered to the subscription.
+
+        Args:
+            event (`TelemetryEvent`): Telemetry event
+
+        Returns:
+            matches (`bool`): Whether the event matches the types and the free memory threshold
+        """
+
+        if self.types is not None and event.type not in self.types:
+            return False
+
+        return (
+            event.threshold is None
+            or self.free_memory_threshold is None
+            or event.threshold == self.free_memory_threshold
+        )
+
+    def deliver(self, event: Optional[TelemetryEvent]):
+        """Enqueue an event without waiting, the oldest event is dropped if the queue is full.
+
+        Args:
+            event (`Optional[TelemetryEvent]`): Telemetry event, `None` to end the iteration
+        """
+
+        # 發布端 (snapshot refresh) 不等待慢的訂閱者，佇列滿時丟棄最舊的事件
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+
+        self._queue.put_nowait(event)
+
+    def close(self):
+        """Unsubscribe, the pending events are still delivered before the iteration ends."""
+
+        if self.closed:
+            return
+
+        self.closed = True
+        self._channel.unsubscribe(self)
+        self.deliver(None)
+
+
+class TelemetryEventChannel:
+    """Async publish/subscribe channel of the telemetry events, published by every snapshot refresh."""
+
+    def __init__(self, free_memory_thresholds: Iterable[int] = ()):
+        """Initializes the telemetry event channel.
+
+        Args:
+            free_memory_thresholds (`Iterable[int]`): Free memory thresholds always diffed, besides the ones of the
+                subscriptions, unit: MiB. Default is `()`
+        """
+
+        self._free_memory_thresholds = tuple(free_memory_thresholds)
+        self._subscriptions: List[TelemetrySubscription] = []
+
+        self.published = 0
+        """Number of the published events"""
+
+    @property
+    def subscriptions(self) -> int:
+        """Number of the active subscriptions"""
+
+        return len(self._subscriptions)
+
+    @property
+    def free_memory_thresholds(self) -> Tuple[int, ...]:
+        """Free memory thresholds to diff the snapshots against, unit: MiB"""
+
+        return tuple(sorted({
+            *self._free_memory_thresholds,
+            *(
+                subscription.free_memory_threshold for subscription in self._subscriptions
+                if subscription.free_memory_threshold is not None
+            ),
+        }))
+
+    def subscribe(
+        self,
+        types: Iterable[TelemetryEventType] = None,
+        free_memory_threshold: int = None,
+        maxsize: int = 1024
+    ) -> TelemetrySubscription:
+        """Subscribe to the telemetry events, Like `with channel.subscribe(...) as subscription: async for ...`.
+
+        Args:
+            types (`Iterable[TelemetryEventType]`): Delivered event types. Default is `None` (all)
+            free_memory_threshold (`int`): Free memory threshold of the delivered threshold events, unit: MiB.
+                Default is `None` (all thresholds)
+            maxsize (`int`): Max number of the undelivered events, the oldest are dropped. Default is `1024`
+
+        Returns:
+            subscription (`TelemetrySubscription`): Subscription
+        """
+
+        subscription = TelemetrySubscription(self, types, free_memory_threshold, maxsize)
+        self._subscriptions.append(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: TelemetrySubscription):
+        """Remove the subscription, use `TelemetrySubscription.close` instead.
+
+        Args:
+            subscription (`TelemetrySubscription`): Subscription
+        """
+
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def publish(self, events: Iterable[TelemetryEvent]) -> int:
+        """Deliver the events to the matching subscriptions without waiting.
+
+        Args:
+            events (`Iterable[TelemetryEvent]`): Telemetry events
+
+        Returns:
+            deliveries (`int`): Number of the delivered events over all subscriptions
+        """
+
+        deliveries = 0
+
+        for event in events:
+            self.published += 1
+            for subscription in list(self._subscriptions):
+                if subscription.matches(event):
+                    subscription.deliver(event)
+                    deliveries += 1
+
+        return deliveries
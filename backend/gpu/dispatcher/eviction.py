@@ -0,0 +1,477 @@
+import asyncio
+import itertools
+import time
+from datetime import datetime
+from logging import Logger
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.config.types import ClusterConfig
+
+from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+from backend.gpu.dispatcher.inventory import NodeState
+from backend.gpu.dispatcher.types import (
+    EvictionDecision,
+    EvictionReport,
+    ResidentModel
+)
+from backend.k8s.kubeai import (
+    list_kubeai_model_custom_resource,
+    list_kubeai_ollama_model_pod,
+    patch_kubeai_model_custom_resource
+)
+
+
+PRIORITY_ANNOTATION = "gpu-delegater/priority"
+"""KubeAI Model Custom Resource annotation of the model priority, Like `"10"`"""
+
+LAST_USED_ANNOTATION = "gpu-delegater/last-used"
+"""KubeAI Model Custom Resource annotation of the last used time (ISO 8601 or Unix timestamp)"""
+
+EVICTED_MIN_REPLICAS_ANNOTATION = "gpu-delegater/evicted-min-replicas"
+"""KubeAI Model Custom Resource annotation of the `minReplicas` before the eviction, restored by
+`restore_evicted_min_replicas`"""
+
+
+def restore_evicted_min_replicas(
+    model_cr_yaml: Dict[str, Any],
+    existing: Dict[str, Any],
+    logger: Logger = None
+) -> Optional[int]:
+    """Restore the `minReplicas` of an evicted KubeAI Model in the YAML to apply, the annotation is removed.
+
+    Pass it as `on_existing` of `apply_kubeai_model_custom_resource`, so the existing KubeAI Model listed by the
+    apply is reused.
+
+    Args:
+        model_cr_yaml (`Dict[str, Any]`): KubeAI Model Custom Resource YAML to apply, updated in place
+        existing (`Dict[str, Any]`): Existing KubeAI Model Custom Resource
+        logger (`Logger`): Logger of the invalid annotation. Default is `None`
+
+    Returns:
+        min_replicas (`Optional[int]`): Restored `minReplicas`, `None` if the model was not evicted
+    """
+
+    value = (existing["metadata"].get("annotations") or {}).get(EVICTED_MIN_REPLICAS_ANNOTATION)
+    if value is None:
+        return None
+
+    try:
+        min_replicas = int(value)
+    except ValueError:
+        if logger is not None:
+            logger.warning(f"Invalid {EVICTED_MIN_REPLICAS_ANNOTATION} annotation: {value}")
+        min_replicas = model_cr_yaml["spec"].get("minReplicas", 0)
+
+    model_cr_yaml["spec"]["minReplicas"] = min_replicas
+    # merge patch 以 null 刪除 annotation
+    model_cr_yaml["metadata"].setdefault("annotations", {})[EVICTED_MIN_REPLICAS_ANNOTATION] = None
+
+    return min_replicas
+
+
+class EvictionPlanner:
+    """Plan and execute the eviction (scale down to zero) of low-priority KubeAI Models to make room for a new model."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        gpu_dispatcher: GPUDispatcher,
+        namespace: str = "default",
+        load_bandwidth: float = 512.0,
+        startup_seconds: float = 10.0,
+        max_exact_candidates: int = 16,
+        termination_timeout: float = 120.0,
+        termination_poll_interval: float = 1.0
+    ):
+        """Initializes the eviction planner.
+
+        Args:
+            logger (`Logger`): Logger
+            gpu_dispatcher (`GPUDispatcher`): GPU Dispatcher to get the GPU resources and estimate the model VRAM
+            namespace (`str`): Kubernetes Namespace of the KubeAI Models. Default is `default`
+            load_bandwidth (`float`): Model weights loading bandwidth to estimate the reload cost, unit: MiB/s. Default is `512.0`
+            startup_seconds (`float`): KubeAI model pod startup time to estimate the reload cost, unit: s. Default is `10.0`
+            max_exact_candidates (`int`): Max number of candidates on a node to search the cheapest set exactly,
+                greedy search is used if exceeded. Default is `16`
+            termination_timeout (`float`): Timeout to wait for the evicted pods terminated, unit: s. Default is `120.0`
+            termination_poll_interval (`float`): Interval to poll the evicted pods, unit: s. Default is `1.0`
+        """
+
+        self.logger = logger
+        self.gpu_dispatcher = gpu_dispatcher
+        self.namespace = namespace
+        self.load_bandwidth = load_bandwidth
+        self.startup_seconds = startup_seconds
+        self.max_exact_candidates = max_exact_candidates
+        self.termination_timeout = termination_timeout
+        self.termination_poll_interval = termination_poll_interval
+
+    # ============================== Public Methods ==============================
+
+    async def plan(
+        self,
+        model_name: str,
+        priority: int = 0,
+        last_used: Dict[str, float] = None
+    ) -> EvictionReport:
+        """Compute the cheapest set of resident models to evict so that the model fits on a node.
+
+        Only the models with lower priority than the new model are evicted.
+
+        Args:
+            model_name (`str`): Ollama model name that requires the VRAM, Like `gemma2:27b`
+            priority (`int`): Priority of the new model. Default is `0`
+            last_used (`Dict[str, float]`): KubeAI Model name to the last used Unix timestamp,
+                overrides the `gpu-delegater/last-used` annotation. Default is `None`
+
+        Returns:
+            eviction_report (`EvictionReport`): Eviction plan, `node_name` is `None` if no plan is found
+        """
+
+        eviction_report = EvictionReport(model_name=model_name)
+
+        estimate_vram = await self.gpu_dispatcher.estimate_model_vram(model_name)
+        if not estimate_vram:
+            self.logger.warning(f"Cannot estimate the required VRAM of {model_name}")
+            return eviction_report
+
+        gpu_inventory = await self.gpu_dispatcher.get_gpu_inventory()
+
+        # 只列出回應遙測的叢集上的常駐模型
+        clusters = {gpu_node.cluster for gpu_node in gpu_inventory.nodes}
+        resident_models = [
+            resident_model
+            for cluster_resident_models in await asyncio.gather(*[
+                self._list_resident_models(last_used or {}, cluster) for cluster in clusters
+            ])
+            for resident_model in cluster_resident_models
+        ]
+
+        best_plan: Optional[Tuple[float, NodeState, int, List[ResidentModel]]] = None
+
+        for gpu_node in gpu_inventory.nodes:
+            # MIG instance 無法與其他 GPU 合併，只計算完整 GPU 的 free VRAM
+            free_vram = sum(gpu.free_memory for gpu in gpu_node.gpus if not gpu.is_mig)
+            node_residents = [
+                resident for resident in resident_models
+                if resident.node_name == gpu_node.node_name and resident.cluster == gpu_node.cluster
+            ]
+            node_vram = free_vram + sum(resident.vram for resident in node_residents)
+            required_vram = estimate_vram - free_vram
+
+            if required_vram <= 0 or node_vram < estimate_vram:
+                continue
+
+            candidates = [resident for resident in node_residents if resident.priority < priority]
+
+            selected = self._select_cheapest(candidates, required_vram)
+            if selected is None:
+                continue
+
+            cost = sum(self._eviction_cost(resident) for resident in selected)
+            if best_plan is None or cost < best_plan[0]:
+                best_plan = (cost, gpu_node, required_vram, selected)
+
+        if best_plan is None:
+            self.logger.warning(f"No eviction plan found for {model_name} (priority: {priority})")
+            return eviction_report
+
+        cost, gpu_node, required_vram, selected = best_plan
+
+        eviction_report.node_name = gpu_node.node_name
+        eviction_report.cluster = gpu_node.cluster
+        eviction_report.required_vram = required_vram
+        eviction_report.reclaimed_vram = sum(resident.vram for resident in selected)
+        eviction_report.cost = cost
+        eviction_report.decisions = [
+            EvictionDecision(
+                name=resident.name,
+                model_name=resident.model_name,
+                vram=resident.vram,
+                priority=resident.priority,
+                idle_seconds=resident.idle_seconds,
+                reload_seconds=resident.reload_seconds,
+                cost=self._eviction_cost(resident)
+            ) for resident in selected
+        ]
+
+        return eviction_report
+
+    async def evict(
+        self,
+        model_name: str,
+        priority: int = 0,
+        last_used: Dict[str, float] = None
+    ) -> EvictionReport:
+        """Plan the eviction, then scale the selected KubeAI Models to zero and wait for their pods terminated.
+
+        KubeAI scales a Model as a whole, so the replicas of the selected models on the other nodes are scaled down too.
+        Their `minReplicas` is kept in the `gpu-delegater/evicted-min-replicas` annotation and restored by
+        `restore_evicted_min_replicas` when the model is applied again.
+
+        Args:
+            model_name (`str`): Ollama model name that requires the VRAM, Like `gemma2:27b`
+            priority (`int`): Priority of the new model. Default is `0`
+            last_used (`Dict[str, float]`): KubeAI Model name to the last used Unix timestamp. Default is `None`
+
+        Returns:
+            eviction_report (`EvictionReport`): Executed eviction report
+        """
+
+        eviction_report = await self.plan(model_name, priority, last_used)
+        if not eviction_report.success:
+            return eviction_report
+
+        start_time = time.perf_counter()
+        context = self._kube_context(eviction_report.cluster)
+
+        resident_model_crs = {
+            kubeai_model["metadata"]["name"]: kubeai_model
+            for kubeai_model in await asyncio.to_thread(list_kubeai_model_custom_resource, self.namespace, context)
+        }
+
+        def _eviction_patch(model_cr: Dict[str, Any]) -> Dict[str, Any]:
+            annotations: Dict[str, str] = model_cr["metadata"].get("annotations") or {}
+            # 已被驅逐過 (尚未復原) 的模型保留最初的 minReplicas
+            min_replicas = annotations.get(
+                EVICTED_MIN_REPLICAS_ANNOTATION, str(model_cr.get("spec", {}).get("minReplicas", 0))
+            )
+
+            return {
+                "metadata": {"annotations": {EVICTED_MIN_REPLICAS_ANNOTATION: min_replicas}},
+                "spec": {"minReplicas": 0, "replicas": 0}
+            }
+
+        await asyncio.gather(*[
+            asyncio.to_thread(
+                patch_kubeai_model_custom_resource,
+                resident_model_crs[decision.name],
+                _eviction_patch(resident_model_crs[decision.name]),
+                context
+            ) for decision in eviction_report.decisions
+        ])
+
+        await self._wait_for_terminated(
+            [decision.name for decision in eviction_report.decisions],
+            eviction_report.node_name,
+            context
+        )
+
+        eviction_report.latency = time.perf_counter() - start_time
+        eviction_report.executed = True
+
+        self.logger.info(
+            f"Evicted {[decision.name for decision in eviction_report.decisions]} on {eviction_report.node_name}, "
+            f"Reclaimed VRAM: {eviction_report.reclaimed_vram} MiB, Added Latency: {eviction_report.latency:.2f} s"
+        )
+
+        return eviction_report
+
+    # ============================== Private Methods ==============================
+
+    def _kube_context(self, cluster: Optional[str]) -> Optional[str]:
+        """Get the kubeconfig context of the federated cluster.
+
+        Args:
+            cluster (`Optional[str]`): Federated cluster name, `None` if the GPU Dispatcher is not federated
+
+        Returns:
+            context (`Optional[str]`): kubeconfig context, `None` uses the current context
+        """
+
+        clusters: Dict[str, ClusterConfig] = {cluster.name: cluster for cluster in self.gpu_dispatcher.clusters}
+
+        return clusters[cluster].kube_context if cluster is not None else None
+
+    async def _list_resident_models(self, last_used: Dict[str, float], cluster: str = None) -> List[ResidentModel]:
+        """List the KubeAI Models which hold the VRAM on the nodes of the cluster.
+
+        Args:
+            last_used (`Dict[str, float]`): KubeAI Model name to the last used Unix timestamp
+            cluster (`str`): Federated cluster name. Default is `None` (the GPU Dispatcher is not federated)
+
+        Returns:
+            resident_models (`List[ResidentModel]`): Resident models, one per model and node
+        """
+
+        context = self._kube_context(cluster)
+        kubeai_models, model_pods = await asyncio.gather(
+            asyncio.to_thread(list_kubeai_model_custom_resource, self.namespace, context),
+            asyncio.to_thread(list_kubeai_ollama_model_pod, self.namespace, context)
+        )
+
+        now = time.time()
+        estimate_vram_cache: Dict[str, int] = {}
+        resident_models: List[ResidentModel] = []
+
+        for kubeai_model in kubeai_models:
+            name = kubeai_model["metadata"]["name"]
+            annotations: Dict[str, str] = kubeai_model["metadata"].get("annotations") or {}
+            model_name = str(kubeai_model["spec"].get("url", "")).removeprefix("ollama://")
+
+            if model_name not in estimate_vram_cache:
+                estimate_vram_cache[model_name] = await self.gpu_dispatcher.estimate_model_vram(model_name)
+            vram = estimate_vram_cache[model_name]
+            if not vram:
+                continue
+
+            last_used_time = last_used.get(name, self._parse_last_used(annotations.get(LAST_USED_ANNOTATION)))
+            priority = self._parse_priority(name, annotations.get(PRIORITY_ANNOTATION))
+            idle_seconds = max(now - last_used_time, 0.0) if last_used_time else 0.0
+
+            # 同一個 Model 在同一個節點上可能有多個 replica，合併計算其占用的 VRAM
+            node_pod_count: Dict[str, int] = {}
+            for pod in model_pods:
+                if (pod.metadata.labels or {}).get("model") != name or pod.status.phase != "Running":
+                    continue
+
+                node_pod_count[pod.spec.node_name] = node_pod_count.get(pod.spec.node_name, 0) + 1
+
+            for node_name, pod_count in node_pod_count.items():
+                resident_models.append(ResidentModel(
+                    name=name,
+                    model_name=model_name,
+                    node_name=node_name,
+                    cluster=cluster,
+                    vram=vram * pod_count,
+                    priority=priority,
+                    idle_seconds=idle_seconds,
+                    reload_seconds=self.startup_seconds + vram / self.load_bandwidth,
+                    model_cr=kubeai_model
+                ))
+
+        return resident_models
+
+    def _select_cheapest(
+        self,
+        candidates: List[ResidentModel],
+        required_vram: int
+    ) -> Optional[List[ResidentModel]]:
+        """Select the cheapest set of candidates whose VRAM covers the required VRAM.
+
+        Args:
+            candidates (`List[ResidentModel]`): Eviction candidates on the same node
+            required_vram (`int`): Required VRAM, unit: MiB
+
+        Returns:
+            selected (`Optional[List[ResidentModel]]`): Cheapest set, `None` if the candidates can not cover the required VRAM
+        """
+
+        if sum(candidate.vram for candidate in candidates) < required_vram:
+            return None
+
+        # 候選數量少時窮舉所有組合，找出成本最低 (相同成本時回收最少 VRAM) 的組合
+        if len(candidates) <= self.max_exact_candidates:
+            best: Optional[Tuple[float, int, List[ResidentModel]]] = None
+
+            for count in range(1, len(candidates) + 1):
+                for combination in itertools.combinations(candidates, count):
+                    vram = sum(candidate.vram for candidate in combination)
+                    if vram < required_vram:
+                        continue
+
+                    cost = sum(self._eviction_cost(candidate) for candidate in combination)
+                    if best is None or (cost, vram) < (best[0], best[1]):
+                        best = (cost, vram, list(combination))
+
+            return best[2]
+
+        # 候選數量過多時，依照每 MiB 的驅逐成本由低到高選擇
+        selected: List[ResidentModel] = []
+        reclaimed_vram = 0
+
+        for candidate in sorted(candidates, key=lambda x: self._eviction_cost(x) / x.vram):
+            selected.append(candidate)
+            reclaimed_vram += candidate.vram
+
+            if reclaimed_vram >= required_vram:
+                break
+
+        return selected
+
+    def _eviction_cost(self, resident_model: ResidentModel) -> float:
+        """Eviction cost of the resident model.
+
+        Higher priority and larger reload cost make the eviction more expensive, longer idle time makes it cheaper.
+
+        Args:
+            resident_model (`ResidentModel`): Resident model
+
+        Returns:
+            cost (`float`): Eviction cost
+        """
+
+        return (1 + max(resident_model.priority, 0)) * resident_model.reload_seconds / (
+            1 + resident_model.idle_seconds / 60
+        )
+
+    def _parse_priority(self, name: str, value: Optional[str]) -> int:
+        """Parse the `gpu-delegater/priority` annotation.
+
+        Args:
+            name (`str`): KubeAI Model name
+            value (`Optional[str]`): Integer priority
+
+        Returns:
+            priority (`int`): Priority, `0` if the annotation is missing or invalid
+        """
+
+        if value is None:
+            return 0
+
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            self.logger.warning(f"Invalid {PRIORITY_ANNOTATION} annotation of {name}: {value}")
+            return 0
+
+    def _parse_last_used(self, value: Optional[str]) -> Optional[float]:
+        """Parse the `gpu-delegater/last-used` annotation.
+
+        Args:
+            value (`Optional[str]`): ISO 8601 datetime or Unix timestamp
+
+        Returns:
+            last_used (`Optional[float]`): Unix timestamp, `None` if the annotation is missing or invalid
+        """
+
+        if not value:
+            return None
+
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            self.logger.warning(f"Invalid {LAST_USED_ANNOTATION} annotation: {value}")
+            return None
+
+    async def _wait_for_terminated(self, names: List[str], node_name: str, context: str = None):
+        """Wait for the pods of the evicted KubeAI Models on the node terminated.
+
+        Args:
+            names (`List[str]`): Evicted KubeAI Model names
+            node_name (`str`): Kubernetes Node name
+            context (`str`): kubeconfig context of the cluster. Default is `None` (the current context)
+        """
+
+        deadline = time.perf_counter() + self.termination_timeout
+
+        while time.perf_counter() < deadline:
+            model_pods: List[Any] = await asyncio.to_thread(
+                list_kubeai_ollama_model_pod, self.namespace, context
+            )
+            remaining = [
+                pod.metadata.name for pod in model_pods
+                if (pod.metadata.labels or {}).get("model") in names and pod.spec.node_name == node_name
+            ]
+
+            if not remaining:
+                return
+
+            await asyncio.sleep(self.termination_poll_interval)
+
+        self.logger.warning(f"Timeout waiting for the evicted pods terminated on {node_name}")
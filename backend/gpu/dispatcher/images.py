@@ -0,0 +1,550 @@
+import argparse
+import asyncio
+import dataclasses
+import time
+from logging import Logger
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from shared.const.format import MiB
+
+from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+from backend.gpu.dispatcher.inventory import NodeState
+from backend.gpu.dispatcher.types import PrePullReport, PrePullTask
+from backend.k8s import (
+    corev1_api_create_namespaced_pod,
+    corev1_api_delete_namespaced_pod,
+    corev1_api_list_node,
+    corev1_api_read_namespaced_pod
+)
+from backend.llm.models import OllamaBuiltinModel
+
+
+NodeKey = Tuple[Optional[str], str]
+"""(federated cluster name, Kubernetes Node name) of a node in the image cache"""
+
+PREPULL_LABELS: Dict[str, str] = {
+    "app.kubernetes.io/managed-by": "gpu-delegater",
+    "app.kubernetes.io/component": "image-prepull",
+}
+"""Labels of the image pre-pull Pods"""
+
+
+def normalize_image(image: str) -> str:
+    """Normalize a container image reference as the kubelet reports it, Like `ollama/ollama` to
+    `docker.io/ollama/ollama:latest`.
+
+    Args:
+        image (`str`): Container image reference
+
+    Returns:
+        normalized_image (`str`): Image reference with the registry and the tag (or digest)
+    """
+
+    components = image.split("/")
+    if len(components) == 1 or not ("." in components[0] or ":" in components[0] or components[0] == "localhost"):
+        # Docker Hub 的映像檔省略了 registry (以及官方映像檔的 `library/`)
+        components = ["docker.io"] + (["library"] if len(components) == 1 else []) + components
+
+    if "@" not in components[-1] and ":" not in components[-1]:
+        components[-1] += ":latest"
+
+    return "/".join(components)
+
+
+def model_image(model_name: str) -> Optional[str]:
+    """Container image of an Ollama builtin model, the weights are baked into the image.
+
+    Args:
+        model_name (`str`): Ollama model name, Like `gemma2:2b`
+
+    Returns:
+        image (`Optional[str]`): Normalized image reference, `None` if the model is not an Ollama builtin model
+    """
+
+    try:
+        return normalize_image(OllamaBuiltinModel(model_name).yaml["spec"]["image"])
+    except ValueError:
+        return None
+
+
+def list_node_images(context: str = None) -> Dict[str, Dict[str, int]]:
+    """List the container images cached on the Kubernetes Nodes.
+
+    Args:
+        context (`str`): kubeconfig context of the cluster. Default is `None` (the current context)
+
+    Returns:
+        node_images (`Dict[str, Dict[str, int]]`): Kubernetes Node name to the image references (tags and digests)
+            and their sizes, unit: MiB
+    """
+
+    node_images: Dict[str, Dict[str, int]] = {}
+
+    for node in corev1_api_list_node(context).items:
+        images: Dict[str, int] = {}
+        for container_image in (node.status.images or []) if node.status is not None else []:
+            for name in container_image.names or []:
+                images[normalize_image(name)] = (container_image.size_bytes or 0) // MiB
+        node_images[node.metadata.name] = images
+
+    return node_images
+
+
+class ImageCache:
+    """Container images cached on the Kubernetes Nodes (Node `status.images`), to estimate the image pull time of a
+    placement.
+
+    The cache is replaced as a whole by every refresh (copy-on-write), so the scheduling decisions read it without
+    calling the Kubernetes API.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        contexts: Mapping[Optional[str], Optional[str]] = None,
+        pull_bandwidth: float = 50.0,
+        node_lister: Callable[[Optional[str]], Dict[str, Dict[str, int]]] = None
+    ):
+        """Initializes the image cache.
+
+        Args:
+            logger (`Logger`): Logger
+            contexts (`Mapping[Optional[str], Optional[str]]`): Federated cluster name to its kubeconfig context.
+                Default is `None` (a single cluster with the current context)
+            pull_bandwidth (`float`): Image pull bandwidth of a node, unit: MiB/s. Default is `50.0`
+            node_lister (`Callable[[Optional[str]], Dict[str, Dict[str, int]]]`): List the images of the nodes of a
+                kubeconfig context. Default is `None` (`list_node_images`)
+
+        Raises:
+            ValueError: If `pull_bandwidth` is not positive
+        """
+
+        if pull_bandwidth <= 0:
+            raise ValueError(f"pull_bandwidth must be positive, got {pull_bandwidth}")
+
+        self.logger = logger
+        self.contexts: Dict[Optional[str], Optional[str]] = dict(contexts or {None: None})
+        self.pull_bandwidth = pull_bandwidth
+
+        self._node_lister = node_lister or list_node_images
+        self._images: Mapping[NodeKey, Mapping[str, int]] = MappingProxyType({})
+        self._image_sizes: Mapping[str, int] = MappingProxyType({})
+        self._updated_at: Optional[float] = None
+
+    # ============================== Properties ==============================
+
+    @property
+    def updated_at(self) -> Optional[float]:
+        """Unix timestamp of the last refresh, `None` before the first refresh"""
+
+        return self._updated_at
+
+    @property
+    def images(self) -> Mapping[NodeKey, Mapping[str, int]]:
+        """(cluster, node) to the cached image references and their sizes (MiB), read-only"""
+
+        return self._images
+
+    # ============================== Public Methods ==============================
+
+    async def refresh(self) -> int:
+        """List the cached images of the nodes of every cluster, a cluster failed to list keeps its previous images.
+
+        Returns:
+            nodes (`int`): Number of nodes in the cache
+        """
+
+        cluster_names = list(self.contexts)
+        results = await asyncio.gather(
+            *[asyncio.to_thread(self._node_lister, self.contexts[cluster]) for cluster in cluster_names],
+            return_exceptions=True
+        )
+
+        images: Dict[NodeKey, Mapping[str, int]] = {}
+        for cluster, result in zip(cluster_names, results):
+            if isinstance(result, BaseException):
+                self.logger.warning("Failed to list the node images of cluster %s (%s)", cluster, repr(result))
+                images.update({key: value for key, value in self._images.items() if key[0] == cluster})
+                continue
+
+            for node_name, node_images in result.items():
+                images[(cluster, node_name)] = MappingProxyType(dict(node_images))
+
+        self._swap(images)
+        self._updated_at = time.time()
+
+        return len(images)
+
+    async def run(self, interval: float = 60.0):
+        """Refresh the image cache every `interval`, until cancelled.
+
+        Args:
+            interval (`float`): Refresh interval, unit: s. Default is `60.0`
+        """
+
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.logger.warning("Failed to refresh the image cache (%s)", repr(e))
+
+            await asyncio.sleep(interval)
+
+    def has_image(self, cluster: Optional[str], node_name: str, image: str) -> bool:
+        """Check whether the image is cached on the node.
+
+        Args:
+            cluster (`Optional[str]`): Federated cluster name, `None` if the GPU Dispatcher is not federated
+            node_name (`str`): Kubernetes Node name
+            image (`str`): Image reference
+
+        Returns:
+            cached (`bool`): The image is cached on the node
+        """
+
+        return normalize_image(image) in self._images.get((cluster, node_name), {})
+
+    def image_size(self, image: str) -> Optional[int]:
+        """Size of the image reported by any node which caches it.
+
+        Args:
+            image (`str`): Image reference
+
+        Returns:
+            image_size (`Optional[int]`): Image size, unit: MiB. `None` if no node caches the image
+        """
+
+        return self._image_sizes.get(normalize_image(image))
+
+    def pull_seconds(self, cluster: Optional[str], node_name: str, image: str, default_size: int = 0) -> float:
+        """Estimate the time to pull the image on the node.
+
+        Args:
+            cluster (`Optional[str]`): Federated cluster name, `None` if the GPU Dispatcher is not federated
+            node_name (`str`): Kubernetes Node name
+            image (`str`): Image reference
+            default_size (`int`): Image size if no node caches the image, unit: MiB. Default is `0`
+
+        Returns:
+            pull_seconds (`float`): Estimated pull time, `0` if the image is cached on the node, unit: s
+        """
+
+        if self.has_image(cluster, node_name, image):
+            return 0.0
+
+        return (self.image_size(image) or default_size) / self.pull_bandwidth
+
+    def mark_pulled(self, cluster: Optional[str], node_name: str, image: str, image_size: int = None):
+        """Record that the image is cached on the node before the next refresh, Like after a pre-pull.
+
+        Args:
+            cluster (`Optional[str]`): Federated cluster name, `None` if the GPU Dispatcher is not federated
+            node_name (`str`): Kubernetes Node name
+            image (`str`): Image reference
+            image_size (`int`): Image size, unit: MiB. Default is `None` (the known size, or `0`)
+        """
+
+        image = normalize_image(image)
+        size = image_size if image_size is not None else (self.image_size(image) or 0)
+
+        images = dict(self._images)
+        images[(cluster, node_name)] = MappingProxyType({**images.get((cluster, node_name), {}), image: size})
+        self._swap(images)
+
+    # ============================== Private Methods ==============================
+
+    def _swap(self, images: Dict[NodeKey, Mapping[str, int]]):
+        image_sizes: Dict[str, int] = {}
+        for node_images in images.values():
+            for image, size in node_images.items():
+                image_sizes[image] = max(image_sizes.get(image, 0), size)
+
+        self._images = MappingProxyType(images)
+        self._image_sizes = MappingProxyType(image_sizes)
+
+
+class ImagePrePuller:
+    """Pre-pull the model images onto the nodes the models can be placed on, so that the first placement on a node
+    does not pull gigabytes of image.
+
+    A pre-pull is a Pod pinned to the node (`nodeName`) which runs the model image with a no-op command and without
+    GPU requests, and is deleted once completed.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        gpu_dispatcher: GPUDispatcher,
+        image_cache: ImageCache,
+        namespace: str = "default",
+        nodes_per_model: int = 2,
+        max_parallel: int = 2,
+        pull_timeout: float = 1800.0,
+        poll_interval: float = 5.0
+    ):
+        """Initializes the image pre-puller.
+
+        Args:
+            logger (`Logger`): Logger
+            gpu_dispatcher (`GPUDispatcher`): GPU Dispatcher to get the GPU resources and estimate the model VRAM
+            image_cache (`ImageCache`): Image cache of the nodes
+            namespace (`str`): Kubernetes Namespace of the pre-pull Pods. Default is `default`
+            nodes_per_model (`int`): Number of nodes which should cache the image of each model. Default is `2`
+            max_parallel (`int`): Max number of concurrent pre-pulls. Default is `2`
+            pull_timeout (`float`): Timeout of a pre-pull, unit: s. Default is `1800.0`
+            poll_interval (`float`): Interval to poll the pre-pull Pod, unit: s. Default is `5.0`
+
+        Raises:
+            ValueError: If `nodes_per_model` or `max_parallel` is less than 1
+        """
+
+        if nodes_per_model < 1 or max_parallel < 1:
+            raise ValueError(
+                f"nodes_per_model and max_parallel must be at least 1, got {nodes_per_model} and {max_parallel}"
+            )
+
+        self.logger = logger
+        self.gpu_dispatcher = gpu_dispatcher
+        self.image_cache = image_cache
+        self.namespace = namespace
+        self.nodes_per_model = nodes_per_model
+        self.max_parallel = max_parallel
+        self.pull_timeout = pull_timeout
+        self.poll_interval = poll_interval
+
+    # ============================== Public Methods ==============================
+
+    async def plan(self, model_names: Iterable[str]) -> List[PrePullTask]:
+        """Plan the pre-pulls so that the image of every model is cached on `nodes_per_model` of its nodes.
+
+        A model can be placed on a node if its total VRAM (free and used) fits the model, and the uncached nodes with
+        the least VRAM left over are pulled first (the GPU Dispatcher places the models best-fit).
+
+        Args:
+            model_names (`Iterable[str]`): Ollama model names, in the order of priority
+
+        Returns:
+            tasks (`List[PrePullTask]`): Planned pre-pulls
+        """
+
+        snapshot = await self.gpu_dispatcher.get_snapshot()
+        tasks: List[PrePullTask] = []
+
+        for model_name in model_names:
+            image = model_image(model_name)
+            estimate_vram = await self.gpu_dispatcher.estimate_model_vram(model_name)
+            if image is None or not estimate_vram:
+                self.logger.warning("Skip the pre-pull of %s, no image or VRAM estimation", model_name)
+                continue
+
+            cached = 0
+            uncached: List[Tuple[int, NodeState]] = []
+
+            for gpu_node in snapshot.inventory.nodes:
+                # 以總 VRAM 判斷模型能否放置於該節點，不受目前的使用量影響
+                idle_node = dataclasses.replace(gpu_node, gpus=tuple(
+                    dataclasses.replace(gpu, free_memory=gpu.free_memory + gpu.used_memory) for gpu in gpu_node.gpus
+                ))
+                selected_gpu = self.gpu_dispatcher.select_node_gpus(idle_node, estimate_vram, model_name)
+                if selected_gpu is None:
+                    continue
+
+                if self.image_cache.has_image(gpu_node.cluster, gpu_node.node_name, image):
+                    cached += 1
+                else:
+                    leftover = sum(gpu.free_memory for gpu in selected_gpu.gpus) - estimate_vram
+                    uncached.append((leftover, gpu_node))
+
+            uncached.sort(key=lambda x: x[0])
+            image_size = self.image_cache.image_size(image) or estimate_vram
+
+            for _, gpu_node in uncached[:max(self.nodes_per_model - cached, 0)]:
+                tasks.append(PrePullTask(
+                    model_name=model_name,
+                    image=image,
+                    node_name=gpu_node.node_name,
+                    cluster=gpu_node.cluster,
+                    image_size=image_size,
+                    pull_seconds=self.image_cache.pull_seconds(gpu_node.cluster, gpu_node.node_name, image, image_size)
+                ))
+
+        self.logger.info(
+            "Image pre-pull plan: %d pull(s), %d MiB",
+            len(tasks),
+            sum(task.image_size for task in tasks)
+        )
+
+        return tasks
+
+    async def pull(self, tasks: List[PrePullTask]) -> PrePullReport:
+        """Run the pre-pulls with at most `max_parallel` in flight.
+
+        Args:
+            tasks (`List[PrePullTask]`): Planned pre-pulls
+
+        Returns:
+            pre_pull_report (`PrePullReport`): Pre-pull report
+        """
+
+        pre_pull_report = PrePullReport(tasks=tasks)
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        start_time = time.perf_counter()
+
+        async def _pull(task: PrePullTask):
+            key = f"{task.node_name}/{task.image}"
+            async with semaphore:
+                try:
+                    await self._pull_on_node(task)
+                except Exception as e:
+                    self.logger.warning("Failed to pre-pull %s (%s)", key, repr(e))
+                    pre_pull_report.failed[key] = repr(e)
+                    return
+
+            self.image_cache.mark_pulled(task.cluster, task.node_name, task.image, task.image_size)
+            pre_pull_report.pulled.append(key)
+
+        await asyncio.gather(*[_pull(task) for task in tasks])
+        pre_pull_report.seconds = time.perf_counter() - start_time
+
+        return pre_pull_report
+
+    async def run(self, model_names: List[str], interval: float = 600.0):
+        """Refresh the image cache, plan and run the pre-pulls every `interval`, until cancelled.
+
+        Args:
+            model_names (`List[str]`): Ollama model names, in the order of priority
+            interval (`float`): Interval between the pre-pull rounds, unit: s. Default is `600.0`
+        """
+
+        while True:
+            try:
+                await self.image_cache.refresh()
+                tasks = await self.plan(model_names)
+                if tasks:
+                    pre_pull_report = await self.pull(tasks)
+                    self.logger.info(
+                        "Pre-pulled %d image(s), %d failed", len(pre_pull_report.pulled), len(pre_pull_report.failed)
+                    )
+            except Exception as e:
+                self.logger.warning("Failed to pre-pull the model images (%s)", repr(e))
+
+            await asyncio.sleep(interval)
+
+    # ============================== Private Methods ==============================
+
+    async def _pull_on_node(self, task: PrePullTask):
+        """Run a pre-pull Pod on the node until it completes, then delete it.
+
+        Args:
+            task (`PrePullTask`): Pre-pull
+
+        Raises:
+            RuntimeError: If the Pod failed or did not complete before the timeout
+        """
+
+        context = self.image_cache.contexts.get(task.cluster)
+        pod_manifest = {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {
+                "generateName": "image-prepull-",
+                "namespace": self.namespace,
+                "labels": dict(PREPULL_LABELS),
+            },
+            "spec": {
+                "nodeName": task.node_name,
+                "restartPolicy": "Never",
+                "tolerations": [{"operator": "Exists"}],
+                "containers": [{
+                    "name": "prepull",
+                    "image": task.image,
+                    "imagePullPolicy": "IfNotPresent",
+                    "command": ["/bin/sh", "-c", "exit 0"],
+                    "resources": {"requests": {"cpu": "10m", "memory": "16Mi"}},
+                }],
+            },
+        }
+
+        pod = await asyncio.to_thread(corev1_api_create_namespaced_pod, pod_manifest, self.namespace, context)
+        pod_name = pod.metadata.name
+        deadline = time.monotonic() + self.pull_timeout
+
+        try:
+            while True:
+                pod = await asyncio.to_thread(corev1_api_read_namespaced_pod, pod_name, self.namespace, context)
+                phase = pod.status.phase if pod.status is not None else None
+
+                if phase == "Succeeded":
+                    return
+                if phase == "Failed":
+                    raise RuntimeError(f"Pre-pull Pod {pod_name} failed")
+                if time.monotonic() >= deadline:
+                    raise RuntimeError(f"Pre-pull Pod {pod_name} did not complete in {self.pull_timeout} s")
+
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            await asyncio.to_thread(corev1_api_delete_namespaced_pod, pod_name, self.namespace, context)
+
+
+if __name__ == "__main__":
+    from logging import INFO
+
+    from shared.config import parse_config
+    from shared.utils.logger import KubeAIKubernetesClientLogger
+
+    parser = argparse.ArgumentParser(
+        description="Pre-pull the model images onto the nodes the models can be placed on"
+    )
+    parser.add_argument(
+        "--models",
+        type=str,
+        nargs="*",
+        default=None,
+        help="Ollama builtin models in the order of priority. Default is all the enabled builtin models"
+    )
+    parser.add_argument("--namespace", type=str, default="default")
+    parser.add_argument("--nodes_per_model", type=int, default=2)
+    parser.add_argument("--max_parallel", type=int, default=2)
+    parser.add_argument("--pull_bandwidth", type=float, default=50.0, help="Image pull bandwidth, unit: MiB/s")
+    parser.add_argument("--plan_only", action="store_true", help="Print the plan without pulling")
+    parser.add_argument("--interval", type=float, default=None, help="Run every N seconds in the background")
+    args = parser.parse_args()
+
+    parsed_config = parse_config()
+    images_logger = KubeAIKubernetesClientLogger(console_level=INFO, file_level=INFO).getLogger()
+    prepull_models = args.models or [model.value for model in OllamaBuiltinModel.allCases()]
+
+    async def _main():
+        gpu_dispatcher = GPUDispatcher(
+            logger=images_logger,
+            ollama_parameters_worker_url=parsed_config.ollama_parameters_worker_url,
+            clusters=parsed_config.clusters
+        )
+        image_cache = ImageCache(
+            logger=images_logger,
+            contexts={cluster.name: cluster.kube_context for cluster in gpu_dispatcher.clusters} or None,
+            pull_bandwidth=args.pull_bandwidth
+        )
+        image_pre_puller = ImagePrePuller(
+            logger=images_logger,
+            gpu_dispatcher=gpu_dispatcher,
+            image_cache=image_cache,
+            namespace=args.namespace,
+            nodes_per_model=args.nodes_per_model,
+            max_parallel=args.max_parallel
+        )
+
+        if args.interval is not None:
+            await image_pre_puller.run(prepull_models, args.interval)
+            return
+
+        await image_cache.refresh()
+        tasks = await image_pre_puller.plan(prepull_models)
+        for task in tasks:
+            print(task.model_dump_json())
+
+        if not args.plan_only:
+            print((await image_pre_puller.pull(tasks)).model_dump_json())
+
+    asyncio.run(_main())
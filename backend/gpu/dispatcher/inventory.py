@@ -0,0 +1,210 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, Optional, Sequence, Tuple
+
+from backend.gpu.dispatcher.types import GPU, GPUNode, GPUNodeList
+from backend.gpu.monitoring.decoding import VectorSample
+
+if TYPE_CHECKING:
+    from backend.gpu.dispatcher.events import TelemetryEvent
+
+
+@dataclass(frozen=True, slots=True)
+class GPUState:
+    """Lightweight GPU state of the GPU Dispatcher snapshot, converted to `GPU` only at the API and logging boundary."""
+
+    index: str
+    """GPU Index, Like `cuda:0`、`cuda:1`"""
+
+    uuid: str
+    """GPU UUID, Prefix start with `GPU-` if not enabled MIG instance else `MIG-`"""
+
+    name: str
+    """GPU model name, Like `NVIDIA GeForce RTX 4090`"""
+
+    free_memory: int = 0
+    """GPU free memory, unit: MiB"""
+
+    used_memory: int = 0
+    """GPU used memory, unit: MiB"""
+
+    memory_usage: int = 0
+    """GPU memory usage"""
+
+    temperature: int = 0
+    """GPU temperature, unit: Celsius"""
+
+    power_usage: int = 0
+    """GPU power usage, unit: W"""
+
+    mig_profile: Optional[str] = None
+    """MIG instance profile, Like `1g.10gb`. `None` if the device is a whole GPU"""
+
+    mig_instance_id: Optional[str] = None
+    """MIG GPU instance ID (DCGM `GPU_I_ID` label). `None` if the device is a whole GPU"""
+
+    shares: int = 1
+    """Number of time-sliced shares advertised for the GPU by the NVIDIA device plugin"""
+
+    @property
+    def is_mig(self) -> bool:
+        """Whether the device is a MIG instance instead of a whole GPU"""
+
+        return self.mig_profile is not None
+
+    @property
+    def is_shared(self) -> bool:
+        """Whether the GPU is shared by time-slicing"""
+
+        return self.shares > 1
+
+    @classmethod
+    def from_model(cls, gpu: GPU) -> "GPUState":
+        """Convert the pydantic GPU information.
+
+        Args:
+            gpu (`GPU`): GPU information
+
+        Returns:
+            gpu_state (`GPUState`): GPU state
+        """
+
+        return cls(
+            index=gpu.index,
+            uuid=gpu.uuid,
+            name=gpu.name,
+            free_memory=gpu.free_memory,
+            used_memory=gpu.used_memory,
+            memory_usage=gpu.memory_usage,
+            temperature=gpu.temperature,
+            power_usage=gpu.power_usage,
+            mig_profile=gpu.mig_profile,
+            mig_instance_id=gpu.mig_instance_id,
+            shares=gpu.shares
+        )
+
+    def to_model(self) -> GPU:
+        """Convert to the pydantic GPU information, the fields are already typed so they are not validated again.
+
+        Returns:
+            gpu (`GPU`): GPU information
+        """
+
+        return GPU.model_construct(
+            index=self.index,
+            uuid=self.uuid,
+            name=self.name,
+            free_memory=self.free_memory,
+            used_memory=self.used_memory,
+            memory_usage=self.memory_usage,
+            temperature=self.temperature,
+            power_usage=self.power_usage,
+            mig_profile=self.mig_profile,
+            mig_instance_id=self.mig_instance_id,
+            shares=self.shares
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class NodeState:
+    """Lightweight Kubernetes GPU Node state of the GPU Dispatcher snapshot."""
+
+    node_name: str
+    """Kubernetes Node name, Like `ubuntu-d830mt`、`ubuntu-ms-7d98`"""
+
+    gpus: Tuple[GPUState, ...]
+    """All GPU states of the node"""
+
+    shared: bool = False
+    """Whether the GPUs are requested as time-sliced shares instead of whole GPUs"""
+
+    cluster: Optional[str] = None
+    """Federated cluster name of the node, `None` if the GPU Dispatcher is not federated"""
+
+    @classmethod
+    def from_model(cls, gpu_node: GPUNode) -> "NodeState":
+        """Convert the pydantic Kubernetes GPU Node information.
+
+        Args:
+            gpu_node (`GPUNode`): Kubernetes GPU Node information
+
+        Returns:
+            node_state (`NodeState`): Kubernetes GPU Node state
+        """
+
+        return cls(
+            node_name=gpu_node.node_name,
+            gpus=tuple(GPUState.from_model(gpu) for gpu in gpu_node.gpus),
+            shared=gpu_node.shared,
+            cluster=gpu_node.cluster
+        )
+
+    def to_model(self) -> GPUNode:
+        """Convert to the pydantic Kubernetes GPU Node information.
+
+        Returns:
+            gpu_node (`GPUNode`): Kubernetes GPU Node information
+        """
+
+        return GPUNode.model_construct(
+            node_name=self.node_name,
+            gpus=[gpu.to_model() for gpu in self.gpus],
+            shared=self.shared,
+            cluster=self.cluster
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class GPUInventory:
+    """Immutable snapshot of the Kubernetes GPU Nodes built from the DCGM Exporter metrics."""
+
+    nodes: Tuple[NodeState, ...] = ()
+    """Kubernetes GPU Node states"""
+
+    @classmethod
+    def from_model(cls, gpu_node_list: GPUNodeList) -> "GPUInventory":
+        """Convert the pydantic List of Kubernetes GPU Node Information.
+
+        Args:
+            gpu_node_list (`GPUNodeList`): List of Kubernetes GPU Node Information
+
+        Returns:
+            gpu_inventory (`GPUInventory`): GPU inventory
+        """
+
+        return cls(nodes=tuple(NodeState.from_model(gpu_node) for gpu_node in gpu_node_list.gpu_nodes))
+
+    def to_model(self) -> GPUNodeList:
+        """Convert to the pydantic List of Kubernetes GPU Node Information.
+
+        Returns:
+            gpu_node_list (`GPUNodeList`): List of Kubernetes GPU Node Information
+        """
+
+        return GPUNodeList.model_construct(gpu_nodes=[node.to_model() for node in self.nodes])
+
+
+@dataclass(frozen=True, slots=True)
+class GPUSnapshot:
+    """Immutable telemetry snapshot of the GPU Dispatcher.
+
+    Every refresh builds a new snapshot and replaces the previous one as a whole (copy-on-write), so a reader
+    always sees the inventory and the samples of the same refresh.
+    """
+
+    version: int
+    """Refresh sequence number, increasing"""
+
+    timestamp: float
+    """Unix timestamp of the refresh"""
+
+    inventory: GPUInventory
+    """GPU inventory built from the samples"""
+
+    node_gpu_info: Mapping[str, Sequence[VectorSample]]
+    """PromQL query to the vector samples, merged over the federated clusters (read-only)"""
+
+    cluster_gpu_info: Mapping[Optional[str], Mapping[str, Sequence[VectorSample]]]
+    """Federated cluster name to the PromQL query to the vector samples (read-only), without the unreachable clusters"""
+
+    events: Tuple["TelemetryEvent", ...] = ()
+    """Changes since the previous snapshot, the unchanged node and GPU states are shared with it"""
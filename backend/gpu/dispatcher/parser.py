@@ -1,15 +1,20 @@
+import os
 from typing import Any, Dict, List
 
 import yaml
 
-from backend.gpu.dispatcher.types import GPUModel, GPUModelList
+from backend.gpu.dispatcher.types import GPUModel, GPUModelList, MIGProfile
 
 
-def parse_gpu_models(file_path: str = "backend/gpu/dispatcher/gpu_models.yaml") -> GPUModelList:
+GPU_MODELS_FILE_PATH = os.path.join(os.path.dirname(__file__), "gpu_models.yaml")
+"""GPU Model Mapping table path, relative to this package"""
+
+
+def parse_gpu_models(file_path: str = GPU_MODELS_FILE_PATH) -> GPUModelList:
     """Parse GPU models from YAML file
 
     Args:
-        file_path (str): GPU models YAML file path
+        file_path (str): GPU models YAML file path. Defaults to the `gpu_models.yaml` in this package.
 
     Returns:
         parsed_gpu_models (`GPUModelList`): Parsed GPU models
@@ -23,7 +28,17 @@ def parse_gpu_models(file_path: str = "backend/gpu/dispatcher/gpu_models.yaml")
         gpu_models=[
             GPUModel(
                 model=str(gpu["model"]),
-                vram=int(gpu["vram"])
+                vram=int(gpu["vram"]),
+                profile=str(gpu["profile"]),
+                aliases=[str(alias) for alias in gpu.get("aliases", [])],
+                time_slicing_replicas=int(gpu.get("time_slicing_replicas", 1)),
+                memory_bandwidth=int(gpu.get("memory_bandwidth", 0)),
+                mig_profiles=[
+                    MIGProfile(
+                        name=str(mig["name"]),
+                        memory=int(mig["memory"])
+                    ) for mig in gpu.get("mig_profiles", [])
+                ]
             ) for gpu in gpu_models
         ]
     )
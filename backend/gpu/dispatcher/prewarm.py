@@ -0,0 +1,565 @@
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import defaultdict, deque
+from logging import Logger
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+from backend.gpu.dispatcher.types import PrewarmDecision, PrewarmEvaluation
+from backend.k8s.kubeai import (
+    create_kubeai_model_custom_resource,
+    list_kubeai_model_custom_resource,
+    patch_kubeai_model_custom_resource
+)
+from backend.llm.models import OllamaBuiltinModel
+from shared.utils.logger import LazyJSON
+
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+PREWARMED_ANNOTATION = "gpu-delegater/prewarmed"
+"""Annotation of the KubeAI Models applied by the pre-warming controller, removed once the user traffic applies them"""
+
+
+def release_prewarmed_model(model_cr_yaml: Dict[str, Any], existing: Dict[str, Any]) -> bool:
+    """Take over a pre-warmed KubeAI Model in the YAML to apply, the annotation is removed.
+
+    Pass it as `on_existing` of `apply_kubeai_model_custom_resource`, so the pre-warming controller does not
+    scale down a model which the user traffic applied.
+
+    Args:
+        model_cr_yaml (`Dict[str, Any]`): KubeAI Model Custom Resource YAML to apply, updated in place
+        existing (`Dict[str, Any]`): Existing KubeAI Model Custom Resource
+
+    Returns:
+        prewarmed (`bool`): The model was pre-warmed or not
+    """
+
+    if PREWARMED_ANNOTATION not in (existing["metadata"].get("annotations") or {}):
+        return False
+
+    # merge patch 以 null 刪除 annotation
+    model_cr_yaml["metadata"].setdefault("annotations", {})[PREWARMED_ANNOTATION] = None
+
+    return True
+
+
+def load_arrivals(log_file_path: str) -> Dict[str, List[float]]:
+    """Load the request arrivals from a JSON Lines log.
+
+    Every line is a JSON object with at least `timestamp` (Unix timestamp) and `model` (Ollama model name).
+
+    Args:
+        log_file_path (`str`): Arrival log file path
+
+    Returns:
+        arrivals (`Dict[str, List[float]]`): Ollama model name to the sorted arrival timestamps
+    """
+
+    arrivals: Dict[str, List[float]] = defaultdict(list)
+
+    with open(log_file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            record = json.loads(line)
+            if "timestamp" not in record or "model" not in record:
+                continue
+
+            arrivals[record["model"]].append(float(record["timestamp"]))
+
+    for timestamps in arrivals.values():
+        timestamps.sort()
+
+    return dict(arrivals)
+
+
+class ArrivalForecaster:
+    """Forecast the per-model request arrival rate.
+
+    The rate is a blend of the sliding-window rate (recent trend) and the time-of-day seasonal rate
+    (same time bucket on the previous days).
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 900.0,
+        bucket_seconds: float = 3600.0,
+        alpha: float = 0.5,
+        utc_offset_seconds: float = 0.0
+    ):
+        """Initializes the arrival forecaster.
+
+        Args:
+            window_seconds (`float`): Sliding window size, unit: s. Default is `900.0`
+            bucket_seconds (`float`): Time-of-day bucket size, unit: s. Default is `3600.0`
+            alpha (`float`): Weight of the sliding-window rate, `1 - alpha` for the seasonal rate. Default is `0.5`
+            utc_offset_seconds (`float`): UTC offset of the time-of-day buckets, unit: s. Default is `0.0`
+        """
+
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.alpha = alpha
+        self.utc_offset_seconds = utc_offset_seconds
+
+        self._window: Dict[str, Deque[float]] = defaultdict(deque)
+        self._bucket_counts: Dict[str, List[int]] = defaultdict(
+            lambda: [0] * math.ceil(SECONDS_PER_DAY / bucket_seconds)
+        )
+        self._first_timestamp: Optional[float] = None
+
+    def observe(self, model_name: str, timestamp: float):
+        """Observe a request arrival.
+
+        Args:
+            model_name (`str`): Ollama model name
+            timestamp (`float`): Unix timestamp of the arrival
+        """
+
+        if self._first_timestamp is None or timestamp < self._first_timestamp:
+            self._first_timestamp = timestamp
+
+        self._window[model_name].append(timestamp)
+        self._bucket_counts[model_name][self._bucket(timestamp)] += 1
+
+    def rate(self, model_name: str, now: float, horizon: float = 0.0) -> float:
+        """Forecast the arrival rate of the model.
+
+        Args:
+            model_name (`str`): Ollama model name
+            now (`float`): Unix timestamp of the forecast
+            horizon (`float`): Forecast horizon, the seasonal rate is taken at the middle of the horizon, unit: s. Default is `0.0`
+
+        Returns:
+            rate (`float`): Forecast arrival rate, unit: requests/s
+        """
+
+        window = self._window[model_name]
+        while window and window[0] < now - self.window_seconds:
+            window.popleft()
+
+        window_rate = len(window) / self.window_seconds
+
+        if self._first_timestamp is None:
+            return window_rate
+
+        # 每個時間區間已經觀察過的天數
+        observed_days = max((now - self._first_timestamp) / SECONDS_PER_DAY, 1.0)
+        seasonal_count = self._bucket_counts[model_name][self._bucket(now + horizon / 2)]
+        seasonal_rate = seasonal_count / (math.floor(observed_days) * self.bucket_seconds)
+
+        return self.alpha * window_rate + (1 - self.alpha) * seasonal_rate
+
+    def probability(self, model_name: str, now: float, horizon: float) -> float:
+        """Forecast the probability of at least one request arriving within the horizon (Poisson arrivals).
+
+        Args:
+            model_name (`str`): Ollama model name
+            now (`float`): Unix timestamp of the forecast
+            horizon (`float`): Forecast horizon, unit: s
+
+        Returns:
+            probability (`float`): Probability of at least one arrival
+        """
+
+        return 1 - math.exp(-self.rate(model_name, now, horizon) * horizon)
+
+    def _bucket(self, timestamp: float) -> int:
+        """Time-of-day bucket index of the timestamp."""
+
+        return int(((timestamp + self.utc_offset_seconds) % SECONDS_PER_DAY) // self.bucket_seconds)
+
+
+class PrewarmController:
+    """Pre-apply KubeAI Models onto the best GPU before the demand arrives, and scale them down when the forecast drops."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        gpu_dispatcher: GPUDispatcher,
+        forecaster: ArrivalForecaster,
+        models: List[OllamaBuiltinModel] = None,
+        horizon: float = 300.0,
+        warm_threshold: float = 0.5,
+        cool_threshold: float = 0.2,
+        keep_alive: str = "5m"
+    ):
+        """Initializes the pre-warming controller.
+
+        Args:
+            logger (`Logger`): Logger
+            gpu_dispatcher (`GPUDispatcher`): GPU Dispatcher to select the GPU resources
+            forecaster (`ArrivalForecaster`): Arrival forecaster
+            models (`List[OllamaBuiltinModel]`): Models to pre-warm. Default is `None` (`OllamaBuiltinModel.allCases()`)
+            horizon (`float`): Forecast horizon, should cover the model cold start time, unit: s. Default is `300.0`
+            warm_threshold (`float`): Arrival probability to pre-warm the model. Default is `0.5`
+            cool_threshold (`float`): Arrival probability to scale down the pre-warmed model. Default is `0.2`
+            keep_alive (`str`): `OLLAMA_KEEP_ALIVE` of the pre-warmed model, so that the weights stay in VRAM. Default is `5m`
+        """
+
+        self.logger = logger
+        self.gpu_dispatcher = gpu_dispatcher
+        self.forecaster = forecaster
+        self.models = models or OllamaBuiltinModel.allCases()
+        self.horizon = horizon
+        self.warm_threshold = warm_threshold
+        self.cool_threshold = cool_threshold
+        self.keep_alive = keep_alive
+
+        # Ollama model name -> 預熱所在叢集的 kubeconfig context
+        self._warm_models: Dict[str, Optional[str]] = {}
+
+    @property
+    def warm_models(self) -> Set[str]:
+        """Ollama model names which are pre-warmed"""
+
+        return set(self._warm_models)
+
+    async def step(self, now: float = None) -> List[PrewarmDecision]:
+        """Forecast the arrivals and pre-warm / cool down the models.
+
+        Args:
+            now (`float`): Unix timestamp of the forecast. Default is `None` (now)
+
+        Returns:
+            decisions (`List[PrewarmDecision]`): Pre-warming decisions of this step
+        """
+
+        now = time.time() if now is None else now
+        decisions: List[PrewarmDecision] = []
+
+        for model in self.models:
+            probability = self.forecaster.probability(model.value, now, self.horizon)
+
+            if probability >= self.warm_threshold and model.value not in self._warm_models:
+                resource_profile = await self._warm(model)
+                if resource_profile is not None:
+                    decisions.append(PrewarmDecision(
+                        model_name=model.value,
+                        action="warm",
+                        probability=probability,
+                        resource_profile=resource_profile
+                    ))
+            elif probability < self.cool_threshold and model.value in self._warm_models:
+                if await self._cool(model):
+                    decisions.append(PrewarmDecision(
+                        model_name=model.value,
+                        action="cool",
+                        probability=probability
+                    ))
+
+        return decisions
+
+    def observe_arrivals(self, arrivals: Dict[str, List[float]]):
+        """Feed the request arrivals to the forecaster.
+
+        Args:
+            arrivals (`Dict[str, List[float]]`): Ollama model name to the arrival timestamps, Like
+                `TelemetryStore.arrivals`
+        """
+
+        for model_name, timestamps in arrivals.items():
+            for timestamp in timestamps:
+                self.forecaster.observe(model_name, timestamp)
+
+    async def run(
+        self,
+        interval: float = 60.0,
+        arrivals: Callable[[float, float], Dict[str, List[float]]] = None,
+        history_seconds: float = 7 * SECONDS_PER_DAY
+    ):
+        """Run the pre-warming loop forever.
+
+        Args:
+            interval (`float`): Interval between the forecasts, unit: s. Default is `60.0`
+            arrivals (`Callable[[float, float], Dict[str, List[float]]]`): Query the request arrivals of a time range
+                [start, end), Like `TelemetryStore.arrivals`. The new arrivals are observed before every forecast.
+                Default is `None` (the arrivals are observed by the caller)
+            history_seconds (`float`): Arrivals of the last seconds to seed the forecaster with, unit: s.
+                Default is 7 days
+        """
+
+        observed_until = time.time() - history_seconds
+
+        while True:
+            try:
+                now = time.time()
+                if arrivals is not None:
+                    self.observe_arrivals(await asyncio.to_thread(arrivals, observed_until, now))
+                    observed_until = now
+
+                decisions = await self.step(now)
+                for decision in decisions:
+                    self.logger.info("Pre-warming Decision: %s", LazyJSON(decision, indent=None))
+            except Exception as e:
+                self.logger.warning("Failed to pre-warm the models (%s)", repr(e))
+
+            await asyncio.sleep(interval)
+
+    async def _warm(self, model: OllamaBuiltinModel) -> Optional[str]:
+        """Apply the KubeAI Model onto the best GPU with one replica, annotated as pre-warmed.
+
+        Args:
+            model (`OllamaBuiltinModel`): Model to pre-warm
+
+        Returns:
+            resource_profile (`Optional[str]`): Selected KubeAI resource profile, `None` if no GPU is available
+                or the model is already deployed
+        """
+
+        available_gpus = await self.gpu_dispatcher.get_available_gpus(model.value)
+        if available_gpus is None or len(available_gpus.gpu_nodes) < 1:
+            self.logger.warning(f"No available GPU resources to pre-warm {model.value}")
+            return None
+
+        resource_profile = self.gpu_dispatcher.convert_to_kubeai_gpu_resources_name(
+            selected_gpu=available_gpus.gpu_nodes[-1]
+        )
+
+        model_yaml = model.yaml
+        model_yaml["spec"]["resourceProfile"] = resource_profile
+        model_yaml["spec"]["minReplicas"] = 1
+        model_yaml["spec"]["replicas"] = 1
+        model_yaml["spec"].setdefault("env", {})["OLLAMA_KEEP_ALIVE"] = self.keep_alive
+
+        model_yaml["metadata"].setdefault("annotations", {})[PREWARMED_ANNOTATION] = "true"
+
+        cluster = self.gpu_dispatcher.get_cluster(available_gpus.gpu_nodes[-1])
+        context = cluster.kube_context if cluster is not None else None
+
+        existing = await self._get_model_custom_resource(model, context)
+        if existing is None:
+            await asyncio.to_thread(create_kubeai_model_custom_resource, model_yaml, context)
+        elif existing["spec"].get("minReplicas", 0) > 0 or existing["spec"].get("replicas", 0) > 0:
+            # 已由使用者流量部署的模型不需要預熱，也不能覆寫其 resource profile 與 replicas
+            self.logger.info(f"{model.value} is already deployed, skip pre-warming")
+            return None
+        else:
+            await asyncio.to_thread(patch_kubeai_model_custom_resource, existing, model_yaml, context)
+
+        self._warm_models[model.value] = context
+
+        return resource_profile
+
+    async def _cool(self, model: OllamaBuiltinModel) -> bool:
+        """Scale the pre-warmed KubeAI Model down to zero, unless the user traffic has applied it since.
+
+        Args:
+            model (`OllamaBuiltinModel`): Model to cool down
+
+        Returns:
+            cooled (`bool`): The model is scaled down or not
+        """
+
+        context = self._warm_models.pop(model.value, None)
+
+        existing = await self._get_model_custom_resource(model, context)
+        if existing is None or PREWARMED_ANNOTATION not in (existing["metadata"].get("annotations") or {}):
+            self.logger.info(f"{model.value} is not pre-warmed anymore, skip cooling down")
+            return False
+
+        await asyncio.to_thread(
+            patch_kubeai_model_custom_resource,
+            existing,
+            {"metadata": {"annotations": {PREWARMED_ANNOTATION: None}}, "spec": {"minReplicas": 0, "replicas": 0}},
+            context
+        )
+
+        return True
+
+    async def _get_model_custom_resource(
+        self,
+        model: OllamaBuiltinModel,
+        context: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        name = model.yaml["metadata"]["name"]
+        kubeai_models = await asyncio.to_thread(list_kubeai_model_custom_resource, context=context)
+
+        return next((kubeai_model for kubeai_model in kubeai_models if kubeai_model["metadata"]["name"] == name), None)
+
+
+def evaluate_prewarm(
+    arrivals: Dict[str, List[float]],
+    policy: str = "predictive",
+    forecaster_factory: Callable[[], ArrivalForecaster] = ArrivalForecaster,
+    step: float = 60.0,
+    horizon: float = 300.0,
+    warm_threshold: float = 0.5,
+    cool_threshold: float = 0.2,
+    keep_alive: float = 30.0,
+    load_seconds: float = 30.0,
+    gpus_per_model: Dict[str, int] = None
+) -> PrewarmEvaluation:
+    """Replay the request arrivals offline and evaluate the cold-start fraction against the GPU hours.
+
+    Every model holds its GPUs while it is warm. A request arriving while the model is not warm (or still loading)
+    is a cold start, and the model stays warm for `keep_alive` seconds after each request (KubeAI `scaleDownDelaySeconds`).
+
+    Args:
+        arrivals (`Dict[str, List[float]]`): Ollama model name to the sorted arrival timestamps
+        policy (`str`): `reactive` (never pre-warm), `always` (always warm) or `predictive`. Default is `predictive`
+        forecaster_factory (`Callable[[], ArrivalForecaster]`): Factory of the arrival forecaster. Default is `ArrivalForecaster`
+        step (`float`): Interval between the forecasts, unit: s. Default is `60.0`
+        horizon (`float`): Forecast horizon, unit: s. Default is `300.0`
+        warm_threshold (`float`): Arrival probability to pre-warm the model. Default is `0.5`
+        cool_threshold (`float`): Arrival probability to scale down the pre-warmed model. Default is `0.2`
+        keep_alive (`float`): Seconds the model stays warm after a request, unit: s. Default is `30.0`
+        load_seconds (`float`): Cold start time of the model, unit: s. Default is `30.0`
+        gpus_per_model (`Dict[str, int]`): Ollama model name to the GPU count it holds. Default is `None` (1 GPU)
+
+    Returns:
+        evaluation (`PrewarmEvaluation`): Evaluation result
+    """
+
+    if policy not in ("reactive", "always", "predictive"):
+        raise ValueError(f"Invalid pre-warming policy: {policy}")
+
+    evaluation = PrewarmEvaluation(policy=policy)
+    all_timestamps = [timestamp for timestamps in arrivals.values() for timestamp in timestamps]
+    if not all_timestamps:
+        return evaluation
+
+    start_time = min(all_timestamps)
+    end_time = max(all_timestamps) + keep_alive
+    gpu_seconds = 0.0
+
+    for model_name, timestamps in arrivals.items():
+        forecaster = forecaster_factory()
+        gpus = (gpus_per_model or {}).get(model_name, 1)
+
+        active_since: Optional[float] = None
+        ready_at = 0.0
+        keep_until = -math.inf
+        prewarm_until = -math.inf
+        wants_warm = policy == "always"
+
+        if wants_warm:
+            active_since, ready_at, prewarm_until = start_time, start_time, math.inf
+
+        i = 0
+        decision_time = start_time
+
+        while decision_time <= end_time:
+            window_end = decision_time + step
+
+            while i < len(timestamps) and timestamps[i] < window_end:
+                timestamp = timestamps[i]
+
+                # 模型已超過 keep-alive 且沒有預熱需求，先在對應時間點釋放 GPU
+                if active_since is not None and timestamp >= max(keep_until, prewarm_until):
+                    gpu_seconds += (max(keep_until, prewarm_until) - active_since) * gpus
+                    active_since = None
+
+                evaluation.requests += 1
+                if active_since is None:
+                    active_since, ready_at = timestamp, timestamp + load_seconds
+                    evaluation.cold_starts += 1
+                elif timestamp < ready_at:
+                    evaluation.cold_starts += 1
+
+                keep_until = max(keep_until, timestamp + keep_alive)
+                forecaster.observe(model_name, timestamp)
+                i += 1
+
+            decision_time = window_end
+
+            if policy == "predictive":
+                probability = forecaster.probability(model_name, decision_time, horizon)
+                if probability >= warm_threshold or (wants_warm and probability >= cool_threshold):
+                    wants_warm = True
+                    prewarm_until = decision_time + step
+                    if active_since is None:
+                        active_since, ready_at = decision_time, decision_time + load_seconds
+                else:
+                    wants_warm = False
+
+            if active_since is not None and decision_time >= max(keep_until, prewarm_until):
+                gpu_seconds += (max(keep_until, prewarm_until) - active_since) * gpus
+                active_since = None
+
+        if active_since is not None:
+            gpu_seconds += (min(max(keep_until, prewarm_until), end_time) - active_since) * gpus
+
+    evaluation.gpu_hours = gpu_seconds / 3600
+
+    return evaluation
+
+
+if __name__ == "__main__":
+    from logging import INFO
+
+    from shared.config import parse_config
+    from shared.utils.logger import KubeAIKubernetesClientLogger
+
+    parser = argparse.ArgumentParser(
+        description="Evaluate the pre-warming policies offline on a replayed request arrival log, "
+        "or pre-warm the models on the arrivals of the telemetry store"
+    )
+    source_group = parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument("--log", type=str, help="JSON Lines arrival log (`timestamp`, `model`)")
+    source_group.add_argument("--store", type=str, help="Telemetry store directory, the arrivals of its decisions")
+    parser.add_argument("--hours", type=float, default=None, help="Only the arrivals of the last N hours (`--store`)")
+    parser.add_argument("--step", type=float, default=60.0)
+    parser.add_argument("--horizon", type=float, default=300.0)
+    parser.add_argument("--keep_alive", type=float, default=30.0)
+    parser.add_argument("--load_seconds", type=float, default=30.0)
+    parser.add_argument(
+        "--run",
+        action="store_true",
+        help="Pre-warm the models every `--step` seconds on the arrivals of `--store`, seeded with the last `--hours`"
+    )
+    args = parser.parse_args()
+
+    if args.run:
+        if not args.store:
+            parser.error("`--run` requires `--store`")
+
+        from backend.store.store import TelemetryStore
+
+        parsed_config = parse_config()
+        prewarm_logger = KubeAIKubernetesClientLogger(console_level=INFO, file_level=INFO).getLogger()
+        telemetry_store = TelemetryStore(args.store, retention_days=None)
+
+        async def _run():
+            prewarm_controller = PrewarmController(
+                logger=prewarm_logger,
+                gpu_dispatcher=GPUDispatcher(
+                    logger=prewarm_logger,
+                    ollama_parameters_worker_url=parsed_config.ollama_parameters_worker_url,
+                    clusters=parsed_config.clusters
+                ),
+                forecaster=ArrivalForecaster(),
+                horizon=args.horizon
+            )
+            await prewarm_controller.run(
+                interval=args.step,
+                arrivals=telemetry_store.arrivals,
+                history_seconds=(args.hours if args.hours is not None else 168) * 3600
+            )
+
+        asyncio.run(_run())
+    else:
+        if args.log:
+            replayed_arrivals = load_arrivals(args.log)
+        else:
+            from backend.store.store import TelemetryStore
+
+            replayed_arrivals = TelemetryStore(args.store, retention_days=None).arrivals(
+                time.time() - args.hours * 3600 if args.hours is not None else None
+            )
+
+        for prewarm_policy in ("reactive", "predictive", "always"):
+            result = evaluate_prewarm(
+                replayed_arrivals,
+                policy=prewarm_policy,
+                step=args.step,
+                horizon=args.horizon,
+                keep_alive=args.keep_alive,
+                load_seconds=args.load_seconds
+            )
+            print(result.model_dump_json())
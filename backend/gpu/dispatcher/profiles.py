@@ -0,0 +1,102 @@
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from backend.gpu.dispatcher.parser import parse_gpu_models
+from backend.gpu.dispatcher.types import GPUModel, GPUModelList
+
+
+def kubeai_resource_profile_stem(
+    gpu_model: GPUModel,
+    mig_profile: Optional[str] = None,
+    shared: bool = False
+) -> str:
+    """Get the KubeAI resource profile name (without the GPU count) of the GPU model.
+
+    Args:
+        gpu_model (`GPUModel`): GPU model in the GPU Model Mapping table
+        mig_profile (`Optional[str]`): MIG instance profile, Like `1g.10gb`. Default is `None` (whole GPU)
+        shared (`bool`): Use the time-sliced share of the GPU or not. Default is `False`
+
+    Returns:
+        profile_stem (`str`): KubeAI resource profile name, Like `nvidia-gpu-4070-12gb`、`nvidia-gpu-a100-40gb-mig-1g10gb`
+    """
+
+    profile_stem = f"nvidia-gpu-{gpu_model.profile}-{gpu_model.vram}gb"
+
+    if mig_profile is not None:
+        profile_stem = f"{profile_stem}-mig-{mig_profile.replace('.', '')}"
+    elif shared:
+        profile_stem = f"{profile_stem}-shared"
+
+    return profile_stem
+
+
+def generate_kubeai_resource_profiles(gpu_model_list: GPUModelList = None) -> Dict[str, Dict[str, Any]]:
+    """Generate the KubeAI `resourceProfiles` Helm values from the GPU Model Mapping table.
+
+    Whole GPUs request `nvidia.com/gpu`, time-sliced GPUs request `nvidia.com/gpu.shared`
+    (NVIDIA device plugin `renameByDefault: true`) and MIG instances request
+    `nvidia.com/mig-<profile>` (MIG `mixed` strategy).
+
+    Args:
+        gpu_model_list (`GPUModelList`): GPU Model Mapping table. Default is `None` (parse `gpu_models.yaml`)
+
+    Returns:
+        resource_profiles (`Dict[str, Dict[str, Any]]`): KubeAI resource profiles
+    """
+
+    if gpu_model_list is None:
+        gpu_model_list = parse_gpu_models()
+
+    resource_profiles: Dict[str, Dict[str, Any]] = {}
+
+    for gpu_model in gpu_model_list.gpu_models:
+        # GPU Feature Discovery 的 `nvidia.com/gpu.product` label 會將空白轉換成 `-`，
+        # 同一款 GPU 的 aliases (Like PCIe / SXM) 在節點上有各自的 label，全部都需要符合
+        products = list(dict.fromkeys(name.replace(" ", "-") for name in [gpu_model.model, *gpu_model.aliases]))
+
+        resource_profiles[kubeai_resource_profile_stem(gpu_model)] = {
+            "imageName": "nvidia-gpu",
+            "limits": {"nvidia.com/gpu": "1"},
+            "affinity": _gpu_product_affinity(products),
+        }
+
+        if gpu_model.time_slicing_replicas > 1:
+            resource_profiles[kubeai_resource_profile_stem(gpu_model, shared=True)] = {
+                "imageName": "nvidia-gpu",
+                "limits": {"nvidia.com/gpu.shared": "1"},
+                "affinity": _gpu_product_affinity([f"{product}-SHARED" for product in products]),
+            }
+
+        for mig_profile in gpu_model.mig_profiles:
+            resource_profiles[kubeai_resource_profile_stem(gpu_model, mig_profile.name)] = {
+                "imageName": "nvidia-gpu",
+                "limits": {f"nvidia.com/mig-{mig_profile.name}": "1"},
+                "affinity": _gpu_product_affinity(products),
+            }
+
+    return resource_profiles
+
+
+def _gpu_product_affinity(products: List[str]) -> Dict[str, Any]:
+    return {
+        "nodeAffinity": {
+            "requiredDuringSchedulingIgnoredDuringExecution": {
+                "nodeSelectorTerms": [{
+                    "matchExpressions": [{
+                        "key": "nvidia.com/gpu.product",
+                        "operator": "In",
+                        "values": products,
+                    }],
+                }],
+            },
+        },
+    }
+
+
+if __name__ == "__main__":
+    print(yaml.safe_dump(
+        {"resourceProfiles": generate_kubeai_resource_profiles()},
+        sort_keys=False
+    ))
@@ -0,0 +1,485 @@
+import argparse
+import asyncio
+import itertools
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+from shared.const.format import MiB
+
+from backend.gpu.dispatcher.catalog import get_gpu_catalog
+from backend.gpu.dispatcher.inventory import GPUInventory, GPUState, NodeState
+from backend.gpu.dispatcher.types import TensorSplitPlacement
+from backend.k8s import corev1_api_list_node
+
+
+MODEL_LAYERS: Dict[str, int] = {
+    "gemma2:2b": 26,
+    "gemma2:9b": 42,
+    "gemma2:27b": 46,
+    "llama3.1:8b": 32,
+    "llama3.2:3b": 28,
+    "llama3.3:70b": 80,
+}
+"""Ollama model name to the number of repeating layers (`block_count` of the GGUF)"""
+
+DEFAULT_MODEL_LAYERS = 32
+"""Number of layers of the models not in `MODEL_LAYERS`"""
+
+GRAPH_FRACTION = 1 / 12
+"""Fraction of the estimated VRAM reserved on every GPU of the split for the compute graph, the rest (weights and KV
+cache) is split by layer. With the 20% headroom of the VRAM estimation, half of the headroom is the compute graph"""
+
+LINK_SECONDS: Dict[str, float] = {
+    "nvlink": 0.00005,
+    "pcie_switch": 0.0001,
+    "pcie": 0.0003,
+}
+"""Interconnect to the latency added per generated token by a hop between two GPUs of the split, unit: s"""
+
+DEFAULT_MEMORY_BANDWIDTH = 500
+"""Memory bandwidth of the GPU models without `memory_bandwidth` in the GPU Model Mapping table, unit: GB/s"""
+
+NVLINK_ANNOTATION = "gpu-delegater/nvlink"
+"""Kubernetes Node annotation of the GPUs connected by NVLink, Like `0,1,2,3;4,5,6,7`"""
+
+PCIE_SWITCH_ANNOTATION = "gpu-delegater/pcie-switch"
+"""Kubernetes Node annotation of the GPUs behind the same PCIe switch, Like `0,1;2,3`"""
+
+
+@dataclass(frozen=True, slots=True)
+class NodeTopology:
+    """GPU interconnect topology of a Kubernetes Node, the GPUs are identified by their index, Like `cuda:0`."""
+
+    nvlink: Tuple[FrozenSet[str], ...] = ()
+    """Groups of GPUs connected by NVLink"""
+
+    pcie_switches: Tuple[FrozenSet[str], ...] = ()
+    """Groups of GPUs behind the same PCIe switch"""
+
+    def link(self, gpu_index: str, other_gpu_index: str) -> str:
+        """Interconnect between two GPUs of the node.
+
+        Args:
+            gpu_index (`str`): GPU index, Like `cuda:0`
+            other_gpu_index (`str`): GPU index, Like `cuda:1`
+
+        Returns:
+            link (`str`): `nvlink`, `pcie_switch` or `pcie` (through the CPU root complex)
+        """
+
+        if any(gpu_index in group and other_gpu_index in group for group in self.nvlink):
+            return "nvlink"
+        if any(gpu_index in group and other_gpu_index in group for group in self.pcie_switches):
+            return "pcie_switch"
+
+        return "pcie"
+
+
+def parse_gpu_groups(value: str) -> Tuple[FrozenSet[str], ...]:
+    """Parse the GPU groups of a topology annotation, Like `0,1;2,3`.
+
+    Args:
+        value (`str`): Groups separated by `;`, of GPU indices separated by `,`
+
+    Returns:
+        gpu_groups (`Tuple[FrozenSet[str], ...]`): Groups of GPU indices, Like `cuda:0`
+
+    Raises:
+        ValueError: If a GPU index is not a number
+    """
+
+    gpu_groups: List[FrozenSet[str]] = []
+    for group in value.split(";"):
+        indices = [index.strip() for index in group.split(",") if index.strip()]
+        if not all(index.isdigit() for index in indices):
+            raise ValueError(f"Invalid GPU group: {group}, expected the GPU indices separated by `,`")
+        if len(indices) > 1:
+            gpu_groups.append(frozenset(f"cuda:{index}" for index in indices))
+
+    return tuple(gpu_groups)
+
+
+def parse_node_topology(annotations: Mapping[str, str]) -> Optional[NodeTopology]:
+    """Parse the GPU interconnect topology from the annotations of a Kubernetes Node.
+
+    Args:
+        annotations (`Mapping[str, str]`): Kubernetes Node annotations
+
+    Returns:
+        node_topology (`Optional[NodeTopology]`): GPU interconnect topology, `None` if the node is not annotated
+
+    Raises:
+        ValueError: If an annotation is invalid
+    """
+
+    if NVLINK_ANNOTATION not in annotations and PCIE_SWITCH_ANNOTATION not in annotations:
+        return None
+
+    return NodeTopology(
+        nvlink=parse_gpu_groups(annotations.get(NVLINK_ANNOTATION, "")),
+        pcie_switches=parse_gpu_groups(annotations.get(PCIE_SWITCH_ANNOTATION, ""))
+    )
+
+
+def list_node_topology(context: str = None) -> Dict[str, NodeTopology]:
+    """List the GPU interconnect topology of the annotated Kubernetes Nodes.
+
+    Args:
+        context (`str`): kubeconfig context of the cluster. Default is `None` (the current context)
+
+    Returns:
+        node_topology (`Dict[str, NodeTopology]`): Kubernetes Node name to its GPU interconnect topology
+
+    Raises:
+        ValueError: If a topology annotation is invalid
+    """
+
+    node_topology: Dict[str, NodeTopology] = {}
+
+    for node in corev1_api_list_node(context).items:
+        try:
+            topology = parse_node_topology(node.metadata.annotations or {})
+        except ValueError as e:
+            raise ValueError(f"Invalid GPU topology of node {node.metadata.name}: {e}") from e
+
+        if topology is not None:
+            node_topology[node.metadata.name] = topology
+
+    return node_topology
+
+
+@dataclass(frozen=True, slots=True)
+class TensorSplit:
+    """Layer split of a model across the GPUs of a node, as Ollama assigns the layers."""
+
+    node_name: str
+    """Kubernetes Node name"""
+
+    gpus: Tuple[GPUState, ...]
+    """GPUs in the order of the layers"""
+
+    layers: Tuple[int, ...]
+    """Number of layers assigned to each GPU"""
+
+    memory: Tuple[int, ...]
+    """VRAM allocated on each GPU (layers and compute graph), unit: MiB"""
+
+    links: Tuple[str, ...]
+    """Interconnect between the consecutive GPUs"""
+
+    tokens_per_second: float
+    """Estimated token generation throughput, unit: tokens/s"""
+
+    cluster: Optional[str] = None
+    """Federated cluster name of the node, `None` if the GPU Dispatcher is not federated"""
+
+    @property
+    def node_state(self) -> NodeState:
+        """Selected GPUs of the node, Like a candidate placement of `get_available_gpus`"""
+
+        return NodeState(node_name=self.node_name, gpus=self.gpus, cluster=self.cluster)
+
+    def to_model(self, model_name: str) -> TensorSplitPlacement:
+        """Convert to the pydantic tensor split placement.
+
+        Args:
+            model_name (`str`): Ollama model name
+
+        Returns:
+            tensor_split_placement (`TensorSplitPlacement`): Tensor split placement
+        """
+
+        return TensorSplitPlacement(
+            model_name=model_name,
+            node_name=self.node_name,
+            cluster=self.cluster,
+            gpus=[gpu.index for gpu in self.gpus],
+            layers=list(self.layers),
+            memory=list(self.memory),
+            links=list(self.links),
+            tokens_per_second=self.tokens_per_second
+        )
+
+
+class TensorSplitPlanner:
+    """Plan the multi-GPU placements of a model with its layer split across the GPUs of a node.
+
+    Ollama assigns the layers round-robin to the GPUs sorted by free memory, and every GPU of the split holds its own
+    copy of the compute graph, so the free memory of the GPUs can not simply be summed: a GPU takes no more layers once
+    its share is full, and the memory left over is smaller than a layer is wasted. The fewest GPUs which hold all the
+    layers are selected, and among them the split with the highest estimated throughput, so the GPUs connected by
+    NVLink or behind the same PCIe switch are preferred when the node topology is known.
+
+    The token generation is memory-bound, so the throughput is estimated from the weights read per token over the
+    memory bandwidth of each GPU, plus the latency of every hop between the GPUs.
+    """
+
+    def __init__(
+        self,
+        topology: Mapping[Tuple[Optional[str], str], NodeTopology] = None,
+        model_layers: Mapping[str, int] = None,
+        decode_efficiency: float = 0.7,
+        max_gpus: int = 8
+    ):
+        """Initializes the tensor split planner.
+
+        Args:
+            topology (`Mapping[Tuple[Optional[str], str], NodeTopology]`): (cluster, Kubernetes Node name) to the GPU
+                interconnect topology of the node. Default is `None` (all the GPUs are connected through PCIe)
+            model_layers (`Mapping[str, int]`): Ollama model name to the number of layers. Default is `None`
+                (`MODEL_LAYERS`)
+            decode_efficiency (`float`): Fraction of the memory bandwidth achieved by the token generation.
+                Default is `0.7`
+            max_gpus (`int`): Max number of GPUs of a split. Default is `8`
+
+        Raises:
+            ValueError: If `decode_efficiency` is not in (0, 1] or `max_gpus` is less than 1
+        """
+
+        if not 0 < decode_efficiency <= 1:
+            raise ValueError(f"decode_efficiency must be in (0, 1], got {decode_efficiency}")
+        if max_gpus < 1:
+            raise ValueError(f"max_gpus must be at least 1, got {max_gpus}")
+
+        self.topology: Dict[Tuple[Optional[str], str], NodeTopology] = dict(topology or {})
+        self.model_layers: Dict[str, int] = dict(MODEL_LAYERS if model_layers is None else model_layers)
+        self.decode_efficiency = decode_efficiency
+        self.max_gpus = max_gpus
+
+        self._memory_bandwidths: Dict[str, int] = {}
+
+    # ============================== Public Methods ==============================
+
+    def select(self, gpu_node: NodeState, estimate_vram: int, model_name: str = None) -> Optional[TensorSplit]:
+        """Select the whole GPUs of a node for a model and split its layers across them.
+
+        Args:
+            gpu_node (`NodeState`): Kubernetes GPU Node state
+            estimate_vram (`int`): Estimated VRAM required for the LLM inference, unit: MiB
+            model_name (`str`): Ollama model name to look up the number of layers. Default is `None`
+                (`DEFAULT_MODEL_LAYERS`)
+
+        Returns:
+            tensor_split (`Optional[TensorSplit]`): Layer split of the model, `None` if the model does not fit
+        """
+
+        # MIG instance 無法與其他 GPU 合併進行推理，只使用完整的 GPU
+        whole_gpus = [gpu for gpu in gpu_node.gpus if not gpu.is_mig]
+        if sum(gpu.free_memory for gpu in whole_gpus) < estimate_vram:
+            return None
+
+        layers = self.model_layers.get(model_name, DEFAULT_MODEL_LAYERS)
+        graph = estimate_vram * GRAPH_FRACTION
+
+        # 單張 GPU 放得下時不需要模擬切分，選擇頻寬最高、剩餘 VRAM 最少的 GPU
+        single_gpus = [gpu for gpu in whole_gpus if gpu.free_memory >= estimate_vram]
+        if single_gpus:
+            gpu = max(single_gpus, key=lambda x: (self._memory_bandwidth(x), -x.free_memory))
+            return self.split(gpu_node, (gpu,), estimate_vram, layers)
+
+        for count in range(2, min(len(whole_gpus), self.max_gpus) + 1):
+            best_split: Optional[TensorSplit] = None
+
+            for gpus in itertools.combinations(whole_gpus, count):
+                # 每張 GPU 都需要保留 compute graph，總 free memory 不足時不需要模擬分配
+                if sum(gpu.free_memory for gpu in gpus) < estimate_vram + graph * (count - 1):
+                    continue
+
+                tensor_split = self.split(gpu_node, gpus, estimate_vram, layers)
+                if tensor_split is None:
+                    continue
+
+                # 吞吐量最高者優先，相同時選擇剩餘 VRAM 最少的組合 (best-fit)
+                if best_split is None or (
+                    tensor_split.tokens_per_second,
+                    -sum(gpu.free_memory for gpu in tensor_split.gpus)
+                ) > (
+                    best_split.tokens_per_second,
+                    -sum(gpu.free_memory for gpu in best_split.gpus)
+                ):
+                    best_split = tensor_split
+
+            # 使用最少的 GPU 數量，減少 layer 之間的傳輸與重複的 compute graph
+            if best_split is not None:
+                return best_split
+
+        return None
+
+    def split(
+        self,
+        gpu_node: NodeState,
+        gpus: Sequence[GPUState],
+        estimate_vram: int,
+        layers: int = DEFAULT_MODEL_LAYERS
+    ) -> Optional[TensorSplit]:
+        """Split the layers of a model across the GPUs as Ollama does.
+
+        The GPUs are sorted by free memory (from large to small), every GPU reserves the compute graph, and the layers
+        (and the output layer) are assigned round-robin to the GPUs which still have space for a layer. The GPUs
+        without any layer are left out of the split.
+
+        Args:
+            gpu_node (`NodeState`): Kubernetes GPU Node state of the GPUs
+            gpus (`Sequence[GPUState]`): GPUs to split the layers across
+            estimate_vram (`int`): Estimated VRAM required for the LLM inference, unit: MiB
+            layers (`int`): Number of repeating layers of the model. Default is `DEFAULT_MODEL_LAYERS`
+
+        Returns:
+            tensor_split (`Optional[TensorSplit]`): Layer split of the model, `None` if the layers do not fit
+        """
+
+        ordered_gpus = sorted(gpus, key=lambda x: x.free_memory, reverse=True)
+        graph = estimate_vram * GRAPH_FRACTION
+        layer_size = (estimate_vram - graph) / (layers + 1)
+
+        allocations = [graph] * len(ordered_gpus)
+        layer_counts = [0] * len(ordered_gpus)
+        gpus_with_space = list(range(len(ordered_gpus)))
+
+        if len(ordered_gpus) == 1:
+            # 單張 GPU 時所有 layer 都放在同一張，不需要逐層模擬
+            if ordered_gpus[0].free_memory < estimate_vram:
+                return None
+            allocations[0] = estimate_vram
+            layer_counts[0] = layers + 1
+            gpus_with_space = []
+
+        # 與 Ollama 相同，依序將每個 layer 放置到下一張仍有空間的 GPU
+        for i in range(layers + 1 if gpus_with_space else 0):
+            while gpus_with_space:
+                g = gpus_with_space[i % len(gpus_with_space)]
+                # 容許浮點誤差，避免剛好放得下的 layer 被判定為放不下
+                if ordered_gpus[g].free_memory >= allocations[g] + layer_size - 1e-6:
+                    allocations[g] += layer_size
+                    layer_counts[g] += 1
+                    break
+                gpus_with_space.remove(g)
+            else:
+                return None
+
+        selected = [g for g in range(len(ordered_gpus)) if layer_counts[g] > 0]
+        selected_gpus = tuple(ordered_gpus[g] for g in selected)
+
+        topology = self.topology.get((gpu_node.cluster, gpu_node.node_name), NodeTopology())
+        links = tuple(
+            topology.link(gpu.index, next_gpu.index) for gpu, next_gpu in zip(selected_gpus, selected_gpus[1:])
+        )
+
+        # 每個 token 需讀取一次所有 layer 的權重 (不含 KV cache 與 compute graph)
+        weights_per_layer = estimate_vram / 1.2 / (layers + 1) * MiB
+        seconds_per_token = sum(
+            layer_counts[g] * weights_per_layer / (self._memory_bandwidth(ordered_gpus[g]) * 1e9)
+            for g in selected
+        ) / self.decode_efficiency + sum(LINK_SECONDS[link] for link in links)
+
+        return TensorSplit(
+            node_name=gpu_node.node_name,
+            gpus=selected_gpus,
+            layers=tuple(layer_counts[g] for g in selected),
+            memory=tuple(int(round(allocations[g])) for g in selected),
+            links=links,
+            tokens_per_second=1 / seconds_per_token,
+            cluster=gpu_node.cluster
+        )
+
+    def plan(self, gpu_inventory: GPUInventory, model_name: str, estimate_vram: int) -> List[TensorSplit]:
+        """Plan the layer split of a model on every node of the inventory.
+
+        Args:
+            gpu_inventory (`GPUInventory`): GPU inventory
+            model_name (`str`): Ollama model name
+            estimate_vram (`int`): Estimated VRAM required for the LLM inference, unit: MiB
+
+        Returns:
+            tensor_splits (`List[TensorSplit]`): Layer splits of the nodes the model fits, from the highest estimated
+                throughput
+        """
+
+        tensor_splits = [
+            tensor_split for tensor_split in (
+                self.select(gpu_node, estimate_vram, model_name) for gpu_node in gpu_inventory.nodes
+            ) if tensor_split is not None
+        ]
+
+        return sorted(tensor_splits, key=lambda x: x.tokens_per_second, reverse=True)
+
+    # ============================== Private Methods ==============================
+
+    def _memory_bandwidth(self, gpu: GPUState) -> int:
+        memory_bandwidth = self._memory_bandwidths.get(gpu.name)
+        if memory_bandwidth is None:
+            gpu_model = get_gpu_catalog().get(gpu.name)
+            memory_bandwidth = self._memory_bandwidths[gpu.name] = (
+                gpu_model.memory_bandwidth if gpu_model is not None and gpu_model.memory_bandwidth
+                else DEFAULT_MEMORY_BANDWIDTH
+            )
+
+        return memory_bandwidth
+
+
+async def load_topology(
+    contexts: Mapping[Optional[str], Optional[str]] = None
+) -> Dict[Tuple[Optional[str], str], NodeTopology]:
+    """List the GPU interconnect topology of the annotated nodes of every cluster.
+
+    Args:
+        contexts (`Mapping[Optional[str], Optional[str]]`): Federated cluster name to its kubeconfig context.
+            Default is `None` (a single cluster with the current context)
+
+    Returns:
+        topology (`Dict[Tuple[Optional[str], str], NodeTopology]`): (cluster, Kubernetes Node name) to the GPU
+            interconnect topology of the node
+
+    Raises:
+        ValueError: If a topology annotation is invalid
+    """
+
+    contexts = dict(contexts or {None: None})
+    results = await asyncio.gather(
+        *[asyncio.to_thread(list_node_topology, context) for context in contexts.values()]
+    )
+
+    return {
+        (cluster, node_name): node_topology
+        for cluster, node_topologies in zip(contexts, results)
+        for node_name, node_topology in node_topologies.items()
+    }
+
+
+if __name__ == "__main__":
+    from logging import INFO
+
+    from shared.config import parse_config
+    from shared.utils.logger import KubeAIKubernetesClientLogger
+
+    from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+
+    parser = argparse.ArgumentParser(
+        description="Plan the multi-GPU layer split of a model on every node, with the estimated throughput"
+    )
+    parser.add_argument("-m", "--model", type=str, required=True, help="Ollama model name, Like `llama3.3:70b`")
+    parser.add_argument("--max_gpus", type=int, default=8, help="Max number of GPUs of a split")
+    parser.add_argument("--no_topology", action="store_true", help="Do not read the GPU topology annotations")
+    args = parser.parse_args()
+
+    parsed_config = parse_config()
+    tensor_split_logger = KubeAIKubernetesClientLogger(console_level=INFO, file_level=INFO).getLogger()
+
+    async def _main():
+        gpu_dispatcher = GPUDispatcher(
+            logger=tensor_split_logger,
+            ollama_parameters_worker_url=parsed_config.ollama_parameters_worker_url,
+            clusters=parsed_config.clusters
+        )
+        topology = {} if args.no_topology else await load_topology(
+            {cluster.name: cluster.kube_context for cluster in gpu_dispatcher.clusters} or None
+        )
+        planner = TensorSplitPlanner(topology=topology, max_gpus=args.max_gpus)
+
+        gpu_inventory = await gpu_dispatcher.get_gpu_inventory()
+        estimate_vram = await gpu_dispatcher.estimate_model_vram(args.model)
+
+        for tensor_split in planner.plan(gpu_inventory, args.model, estimate_vram):
+            print(tensor_split.to_model(args.model).model_dump_json())
+
+    asyncio.run(_main())
@@ -1,6 +1,6 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 
 
 class GPU(BaseModel):
@@ -29,6 +29,27 @@ class GPU(BaseModel):
     power_usage: int
     """GPU power usage, unit: W"""
 
+    mig_profile: Optional[str] = None
+    """MIG instance profile, Like `1g.10gb`. `None` if the device is a whole GPU"""
+
+    mig_instance_id: Optional[str] = None
+    """MIG GPU instance ID (DCGM `GPU_I_ID` label). `None` if the device is a whole GPU"""
+
+    shares: int = 1
+    """Number of time-sliced shares advertised for the GPU by the NVIDIA device plugin"""
+
+    @property
+    def is_mig(self) -> bool:
+        """Whether the device is a MIG instance instead of a whole GPU"""
+
+        return self.mig_profile is not None
+
+    @property
+    def is_shared(self) -> bool:
+        """Whether the GPU is shared by time-slicing"""
+
+        return self.shares > 1
+
 
 class GPUNode(BaseModel):
 
@@ -38,6 +59,12 @@ class GPUNode(BaseModel):
     gpus: List[GPU]
     """All GPU information of the node"""
 
+    shared: bool = False
+    """Whether the GPUs are requested as time-sliced shares instead of whole GPUs"""
+
+    cluster: Optional[str] = None
+    """Federated cluster name of the node, `None` if the GPU Dispatcher is not federated"""
+
 
 class GPUNodeList(BaseModel):
 
@@ -54,6 +81,15 @@ class ParsedModelDetails(BaseModel):
     """LLM Quantization Level"""
 
 
+class MIGProfile(BaseModel):
+
+    name: str
+    """MIG instance profile name, Like `1g.10gb`"""
+
+    memory: int
+    """MIG instance memory size, unit: GiB"""
+
+
 class GPUModel(BaseModel):
 
     model: str
@@ -62,8 +98,384 @@ class GPUModel(BaseModel):
     vram: int
     """GPU VRAM Size, unit: GiB"""
 
+    profile: str
+    """KubeAI resource profile stem, Like `4070`、`a100`"""
+
+    aliases: List[str] = Field(default_factory=list)
+    """Other GPU model names of the same GPU, Like `NVIDIA A100-PCIE-40GB`"""
+
+    time_slicing_replicas: int = 1
+    """Time-slicing replicas advertised by the NVIDIA device plugin, `1` means disabled"""
+
+    memory_bandwidth: int = 0
+    """GPU memory bandwidth to estimate the token generation throughput, unit: GB/s. `0` if unknown"""
+
+    mig_profiles: List[MIGProfile] = Field(default_factory=list)
+    """Supported MIG instance profiles"""
+
 
 class GPUModelList(BaseModel):
 
     gpu_models: List[GPUModel] = Field(default_factory=list)
     """GPU Model List"""
+
+
+class ResidentModel(BaseModel):
+
+    name: str
+    """KubeAI Model Custom Resource name, Like `gemma2-2b`"""
+
+    model_name: str
+    """Ollama model name, Like `gemma2:2b`"""
+
+    node_name: str
+    """Kubernetes Node name where the model pod is running"""
+
+    cluster: Optional[str] = None
+    """Federated cluster name of the node, `None` if the GPU Dispatcher is not federated"""
+
+    vram: int
+    """Estimated VRAM held by the model, unit: MiB"""
+
+    priority: int
+    """Model priority, the higher the more important"""
+
+    idle_seconds: float
+    """Seconds since the model was last used, unit: s"""
+
+    reload_seconds: float
+    """Estimated seconds to reload the model after eviction, unit: s"""
+
+    model_cr: Dict[str, Any] = Field(default_factory=dict, repr=False)
+    """KubeAI Model Custom Resource"""
+
+
+class EvictionDecision(BaseModel):
+
+    name: str
+    """Evicted KubeAI Model Custom Resource name"""
+
+    model_name: str
+    """Evicted Ollama model name"""
+
+    vram: int
+    """Reclaimed VRAM, unit: MiB"""
+
+    priority: int
+    """Model priority"""
+
+    idle_seconds: float
+    """Seconds since the model was last used, unit: s"""
+
+    reload_seconds: float
+    """Estimated seconds to reload the model, unit: s"""
+
+    cost: float
+    """Eviction cost, the lower the cheaper"""
+
+
+class EvictionReport(BaseModel):
+
+    model_name: str
+    """Ollama model name that requires the VRAM"""
+
+    node_name: Optional[str] = None
+    """Kubernetes Node name where the models are evicted, `None` if no eviction plan is found"""
+
+    cluster: Optional[str] = None
+    """Federated cluster name of the node, `None` if the GPU Dispatcher is not federated"""
+
+    required_vram: int = 0
+    """VRAM required on the node in addition to the free VRAM, unit: MiB"""
+
+    reclaimed_vram: int = 0
+    """VRAM reclaimed by the eviction, unit: MiB"""
+
+    decisions: List[EvictionDecision] = Field(default_factory=list)
+    """Eviction decisions"""
+
+    cost: float = 0.0
+    """Total eviction cost"""
+
+    latency: float = 0.0
+    """Latency added by the eviction (scale down and wait for the pods terminated), unit: s"""
+
+    executed: bool = False
+    """Whether the eviction is executed"""
+
+    @property
+    def success(self) -> bool:
+        """Whether an eviction plan is found"""
+
+        return self.node_name is not None
+
+
+class PrewarmDecision(BaseModel):
+
+    model_name: str
+    """Ollama model name, Like `gemma2:2b`"""
+
+    action: str
+    """Pre-warming action, `warm` or `cool`"""
+
+    probability: float
+    """Forecast probability of at least one request arriving within the horizon"""
+
+    resource_profile: Optional[str] = None
+    """KubeAI resource profile of the pre-warmed model, `None` if the model is cooled down"""
+
+
+class PrewarmEvaluation(BaseModel):
+
+    policy: str
+    """Pre-warming policy, Like `reactive`、`predictive`、`always`"""
+
+    requests: int = 0
+    """Number of replayed requests"""
+
+    cold_starts: int = 0
+    """Number of requests which arrived while the model was not ready"""
+
+    gpu_hours: float = 0.0
+    """GPU hours used by the warm models, unit: h"""
+
+    @computed_field
+    @property
+    def cold_start_fraction(self) -> float:
+        """Fraction of the requests which arrived while the model was not ready"""
+
+        return self.cold_starts / self.requests if self.requests else 0.0
+
+
+class ReplicaPlacement(BaseModel):
+
+    node_name: str
+    """Kubernetes Node name of the replica"""
+
+    gpus: List[str] = Field(default_factory=list)
+    """GPU indexes of the replica, Like `cuda:0`"""
+
+
+class ModelDeployment(BaseModel):
+
+    model_name: str
+    """Ollama model name, Like `gemma2:2b`"""
+
+    name: str
+    """KubeAI Model name, Like `gemma2-2b`"""
+
+    replicas: int = 0
+    """Number of placed replicas"""
+
+    estimate_vram: int = 0
+    """Estimated VRAM per replica, unit: MiB"""
+
+    resource_profile: Optional[str] = None
+    """KubeAI resource profile of all replicas, Like `nvidia-gpu-4070-12gb:1`"""
+
+    cluster: Optional[str] = None
+    """Federated cluster name of all replicas, `None` if the GPU Dispatcher is not federated"""
+
+    placements: List[ReplicaPlacement] = Field(default_factory=list)
+    """Planned GPUs of every replica. KubeAI schedules the pods on any node of the resource profile,
+    the placements only reserve the capacity of the joint plan"""
+
+
+class DeploymentPlan(BaseModel):
+
+    deployments: List[ModelDeployment] = Field(default_factory=list)
+    """Models with at least one placed replica"""
+
+    unplaced: Dict[str, int] = Field(default_factory=dict)
+    """Ollama model name to the number of replicas which do not fit in the inventory"""
+
+
+class DeploymentReport(BaseModel):
+
+    mode: str
+    """Deployment mode, `parallel` (concurrent applies and one shared watch) or `sequential`"""
+
+    models: int = 0
+    """Number of deployed models"""
+
+    replicas: int = 0
+    """Number of deployed replicas"""
+
+    list_calls: int = 0
+    """Number of KubeAI Model list calls"""
+
+    apply_seconds: float = 0.0
+    """Wall time until every KubeAI Model is applied, unit: s"""
+
+    ready_seconds: Dict[str, float] = Field(default_factory=dict)
+    """KubeAI Model name to the time until all of its replicas are ready, unit: s"""
+
+    not_ready: List[str] = Field(default_factory=list)
+    """KubeAI Model names which are not ready before the timeout"""
+
+    errors: Dict[str, str] = Field(default_factory=dict)
+    """KubeAI Model name to the error of its apply"""
+
+    warmup_seconds: float = 0.0
+    """Total warm-up time, from the first apply until every model is ready (or timed out), unit: s"""
+
+
+class AutoscalingSettings(BaseModel):
+
+    target_requests: int = 50
+    """KubeAI `targetRequests`, in-flight requests per replica before scaling up"""
+
+    scale_down_delay_seconds: int = 30
+    """KubeAI `scaleDownDelaySeconds`, the replicas are kept for the peak demand of this window, unit: s"""
+
+    min_replicas: int = 1
+    """KubeAI `minReplicas`, `0` scales the model to zero when idle"""
+
+
+class ModelLoadProfile(BaseModel):
+
+    requests: int = 0
+    """Number of observed requests"""
+
+    concurrency: Dict[str, float] = Field(default_factory=dict)
+    """Mean, percentiles (`p50`、`p95`) and max of the in-flight requests at the arrivals"""
+
+    warm_ttft: Optional[float] = None
+    """Median time to first token of the requests served by a warm replica without queueing, unit: s"""
+
+    queue_wait: Dict[str, float] = Field(default_factory=dict)
+    """Mean, percentiles (`p50`、`p95`) and max of the time to first token above `warm_ttft`, unit: s"""
+
+    capacity: Optional[int] = None
+    """Largest in-flight requests per replica without queueing, `None` if the queueing is never observed"""
+
+    cold_start_seconds: float = 0.0
+    """Cold start cost of the model, unit: s"""
+
+    cold_start_observed: bool = False
+    """`cold_start_seconds` is measured on the cold requests, otherwise it is the configured default"""
+
+    idle_gaps: int = 0
+    """Number of idle periods between the requests"""
+
+
+class AutoscalingEvaluation(BaseModel):
+
+    requests: int = 0
+    """Number of replayed requests"""
+
+    cold_starts: int = 0
+    """Number of requests which arrived while no replica was ready"""
+
+    cold_start_wait_seconds: float = 0.0
+    """Total wait of the cold-start requests until the first replica was ready, unit: s"""
+
+    queued: int = 0
+    """Number of requests which arrived while the ready replicas were beyond their capacity"""
+
+    gpu_hours: float = 0.0
+    """GPU hours held by the replicas, unit: h"""
+
+    @computed_field
+    @property
+    def cold_start_fraction(self) -> float:
+        """Fraction of the requests which arrived while no replica was ready"""
+
+        return self.cold_starts / self.requests if self.requests else 0.0
+
+    @computed_field
+    @property
+    def queued_fraction(self) -> float:
+        """Fraction of the requests which were queued behind the capacity of the ready replicas"""
+
+        return self.queued / self.requests if self.requests else 0.0
+
+
+class AutoscalingRecommendation(BaseModel):
+
+    model_name: str
+    """Ollama model name, Like `gemma2:2b`"""
+
+    name: str
+    """KubeAI Model name, Like `gemma2-2b`"""
+
+    current: AutoscalingSettings
+    """Current autoscaling settings of the KubeAI Model"""
+
+    recommended: AutoscalingSettings
+    """Autoscaling settings tuned on the observed load"""
+
+    load: ModelLoadProfile
+    """Observed load of the model"""
+
+    current_evaluation: AutoscalingEvaluation
+    """Replay of the observed requests with the current settings"""
+
+    recommended_evaluation: AutoscalingEvaluation
+    """Replay of the observed requests with the recommended settings"""
+
+    applied: bool = False
+    """The recommended settings are patched to the KubeAI Model"""
+
+
+class PrePullTask(BaseModel):
+
+    model_name: str
+    """Ollama model name, Like `gemma2:2b`"""
+
+    image: str
+    """Container image of the model, Like `ghcr.io/leoho0722/ollama-builtin-gemma2-2b:0.1.0`"""
+
+    node_name: str
+    """Kubernetes Node name to pull the image on"""
+
+    cluster: Optional[str] = None
+    """Federated cluster name of the node, `None` if the GPU Dispatcher is not federated"""
+
+    image_size: int = 0
+    """Estimated image size, unit: MiB"""
+
+    pull_seconds: float = 0.0
+    """Estimated pull time, unit: s"""
+
+
+class PrePullReport(BaseModel):
+
+    tasks: List[PrePullTask] = Field(default_factory=list)
+    """Planned pre-pulls"""
+
+    pulled: List[str] = Field(default_factory=list)
+    """`<node>/<image>` of the completed pre-pulls"""
+
+    failed: Dict[str, str] = Field(default_factory=dict)
+    """`<node>/<image>` to the error of the failed pre-pulls"""
+
+    seconds: float = 0.0
+    """Wall time of the pre-pulls, unit: s"""
+
+
+class TensorSplitPlacement(BaseModel):
+
+    model_name: str
+    """Ollama model name, Like `llama3.3:70b`"""
+
+    node_name: str
+    """Kubernetes Node name"""
+
+    cluster: Optional[str] = None
+    """Federated cluster name of the node, `None` if the GPU Dispatcher is not federated"""
+
+    gpus: List[str] = Field(default_factory=list)
+    """GPU indices in the order of the layers, Like `["cuda:1", "cuda:0"]`"""
+
+    layers: List[int] = Field(default_factory=list)
+    """Number of layers assigned to each GPU"""
+
+    memory: List[int] = Field(default_factory=list)
+    """VRAM allocated on each GPU (layers and compute graph), unit: MiB"""
+
+    links: List[str] = Field(default_factory=list)
+    """Interconnect between the consecutive GPUs, `nvlink`, `pcie_switch` or `pcie`"""
+
+    tokens_per_second: float = 0.0
+    """Estimated token generation throughput, unit: tokens/s"""
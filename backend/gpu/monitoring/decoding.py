@@ -0,0 +1,252 @@
+import argparse
+import copy
+import json
+import os
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+JSON_DECODERS = tuple(
+    decoder for decoder, module in (("msgspec", msgspec), ("orjson", orjson), ("json", json)) if module is not None
+)
+"""Installed JSON decoders, from the fastest"""
+
+
+class VectorSample(NamedTuple):
+    """Sample of a Prometheus vector result, with only the DCGM Exporter labels used by the GPU Dispatcher."""
+
+    node_name: str
+    """Kubernetes Node name (`kubernetes_node` label)"""
+
+    gpu: str
+    """GPU index on the node (`gpu` label), Like `0`"""
+
+    uuid: str
+    """GPU UUID (`UUID` label)"""
+
+    model_name: str
+    """GPU model name (`modelName` label), Like `NVIDIA GeForce RTX 4070`"""
+
+    mig_instance_id: Optional[str]
+    """MIG GPU instance ID (`GPU_I_ID` label), `None` if MIG is disabled"""
+
+    mig_profile: Optional[str]
+    """MIG profile (`GPU_I_PROFILE` label), Like `1g.10gb`, `None` if MIG is disabled"""
+
+    timestamp: float
+    """Evaluation timestamp of the sample"""
+
+    value: float
+    """Sample value"""
+
+
+if msgspec is not None:
+
+    class _MsgspecLabels(msgspec.Struct):
+        kubernetes_node: str
+        gpu: str
+        UUID: str
+        modelName: str
+        GPU_I_ID: Optional[str] = None
+        GPU_I_PROFILE: Optional[str] = None
+
+    class _MsgspecSample(msgspec.Struct):
+        metric: _MsgspecLabels
+        value: Tuple[float, float]
+
+    class _MsgspecData(msgspec.Struct):
+        result: List[_MsgspecSample] = []
+
+    class _MsgspecResponse(msgspec.Struct):
+        status: str
+        data: Optional[_MsgspecData] = None
+        error: Optional[str] = None
+
+    # 未宣告的 label 於解碼時直接略過，不會建立中間的 dict；`strict=False` 讓字串的 sample value 直接轉為 float
+    _msgspec_decoder = msgspec.json.Decoder(_MsgspecResponse, strict=False)
+
+
+def vector_samples(response: Dict) -> List[VectorSample]:
+    """Convert a decoded Prometheus vector query response to the typed samples.
+
+    Args:
+        response (`Dict`): Query result in the Prometheus HTTP API format
+
+    Returns:
+        samples (`List[VectorSample]`): Samples of the vector result
+
+    Raises:
+        ValueError: If the query failed
+    """
+
+    if response.get("status") != "success":
+        raise ValueError(f"Prometheus query failed: {response.get('error')}")
+
+    samples: List[VectorSample] = []
+
+    for result in response["data"]["result"]:
+        metric = result["metric"]
+        timestamp, value = result["value"]
+
+        samples.append(VectorSample(
+            metric["kubernetes_node"],
+            metric["gpu"],
+            metric["UUID"],
+            metric["modelName"],
+            metric.get("GPU_I_ID"),
+            metric.get("GPU_I_PROFILE"),
+            timestamp,
+            float(value)
+        ))
+
+    return samples
+
+
+def decode_vector_response(content: Union[bytes, str], decoder: str = None) -> List[VectorSample]:
+    """Decode a Prometheus vector query response body to the typed samples.
+
+    `msgspec` decodes the body straight into the samples without building the dictionaries of the dropped labels,
+    `orjson` and `json` decode the body to dictionaries first.
+
+    Args:
+        content (`Union[bytes, str]`): Response body
+        decoder (`str`): JSON decoder, `msgspec`, `orjson` or `json`. Default is `None` (the fastest installed decoder)
+
+    Returns:
+        samples (`List[VectorSample]`): Samples of the vector result
+
+    Raises:
+        ValueError: If the JSON decoder is not installed, the body is not valid or the query failed
+    """
+
+    decoder = decoder or JSON_DECODERS[0]
+    if decoder not in JSON_DECODERS:
+        raise ValueError(f"JSON decoder is not installed: {decoder}")
+
+    if decoder == "msgspec":
+        try:
+            response = _msgspec_decoder.decode(content)
+        except msgspec.DecodeError as e:
+            raise ValueError(f"Invalid Prometheus response: {e}") from e
+
+        if response.status != "success" or response.data is None:
+            raise ValueError(f"Prometheus query failed: {response.error}")
+
+        return [
+            VectorSample(
+                sample.metric.kubernetes_node,
+                sample.metric.gpu,
+                sample.metric.UUID,
+                sample.metric.modelName,
+                sample.metric.GPU_I_ID,
+                sample.metric.GPU_I_PROFILE,
+                sample.value[0],
+                sample.value[1]
+            ) for sample in response.data.result
+        ]
+
+    loads = orjson.loads if decoder == "orjson" else json.loads
+    try:
+        response = loads(content)
+    except ValueError as e:
+        raise ValueError(f"Invalid Prometheus response: {e}") from e
+
+    return vector_samples(response)
+
+
+def scale_vector_response(response: Dict, scale: int) -> Dict:
+    """Replicate the samples of a vector query response on `scale` times as many nodes.
+
+    Args:
+        response (`Dict`): Query result in the Prometheus HTTP API format
+        scale (`int`): Replication factor
+
+    Returns:
+        scaled_response (`Dict`): Query result with the replicated samples
+    """
+
+    scaled_response = copy.deepcopy(response)
+    results = response["data"]["result"]
+
+    scaled_response["data"]["result"] = [
+        {
+            **result,
+            "metric": {
+                **result["metric"],
+                "kubernetes_node": f"{result['metric']['kubernetes_node']}-{i:04d}",
+                "Hostname": f"{result['metric'].get('Hostname', '')}-{i:04d}",
+            }
+        } for i in range(scale) for result in results
+    ]
+
+    return scaled_response
+
+
+def benchmark_decoding(fixture_path: str, scale: int = 1000, repeat: int = 5) -> List[Dict[str, Any]]:
+    """Benchmark the decoders on the DCGM Exporter fixture scaled to `scale` times as many nodes.
+
+    `json` is the baseline, the standard library decoder used by `httpx.Response.json()`.
+
+    Args:
+        fixture_path (`str`): PromQL query to the Prometheus response fixture, Like `backend/dcgm_gpu_info.json`
+        scale (`int`): Replication factor of the nodes. Default is `1000`
+        repeat (`int`): Number of repetitions, the best one is reported. Default is `5`
+
+    Returns:
+        results (`List[Dict[str, Any]]`): Decoder, response size, samples and best decoding time per decoder
+    """
+
+    with open(fixture_path, "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+
+    bodies = [json.dumps(scale_vector_response(response, scale)).encode() for response in fixture.values()]
+
+    decoders = [
+        (decoder, lambda content, decoder=decoder: decode_vector_response(content, decoder))
+        for decoder in JSON_DECODERS
+    ]
+
+    results: List[Dict[str, Any]] = []
+    for name, decode in decoders:
+        best = float("inf")
+        samples = 0
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            samples = sum(len(decode(body)) for body in bodies)
+            best = min(best, time.perf_counter() - start_time)
+
+        results.append({
+            "decoder": name,
+            "bytes": sum(len(body) for body in bodies),
+            "samples": samples,
+            "seconds": best,
+        })
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Prometheus response decoders on the DCGM Exporter fixture"
+    )
+    parser.add_argument(
+        "--fixture",
+        type=str,
+        default=os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "dcgm_gpu_info.json")
+    )
+    parser.add_argument("--scale", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for result in benchmark_decoding(args.fixture, args.scale, args.repeat):
+        print(json.dumps(result))
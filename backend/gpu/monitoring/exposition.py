@@ -0,0 +1,359 @@
+import argparse
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from backend.gpu.monitoring.decoding import JSON_DECODERS, VectorSample, decode_vector_response, scale_vector_response
+
+
+DCGM_METRICS = (
+    "DCGM_FI_DEV_FB_FREE",
+    "DCGM_FI_DEV_FB_USED",
+    "DCGM_FI_DEV_GPU_TEMP",
+    "DCGM_FI_DEV_GPU_UTIL",
+    "DCGM_FI_DEV_POWER_USAGE",
+)
+"""DCGM Exporter metrics used by the GPU Dispatcher"""
+
+DCGM_EXTRA_METRICS = (
+    "DCGM_FI_DEV_SM_CLOCK",
+    "DCGM_FI_DEV_MEM_CLOCK",
+    "DCGM_FI_DEV_MEMORY_TEMP",
+    "DCGM_FI_DEV_TOTAL_ENERGY_CONSUMPTION",
+    "DCGM_FI_DEV_PCIE_REPLAY_COUNTER",
+    "DCGM_FI_DEV_MEM_COPY_UTIL",
+    "DCGM_FI_DEV_ENC_UTIL",
+    "DCGM_FI_DEV_DEC_UTIL",
+    "DCGM_FI_DEV_XID_ERRORS",
+)
+"""Other metrics of the default DCGM Exporter counters, exposed on `/metrics` but skipped by the parser"""
+
+LABEL_CACHE_SIZE = 65536
+"""Max number of the label sets kept by the label cache of a parser"""
+
+_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="([^"]*)"')
+
+_ESCAPED_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="([^"\\]*(?:\\.[^"\\]*)*)"')
+
+_LABEL_ESCAPES = {"\\\\": "\\", '\\"': '"', "\\n": "\n"}
+
+
+def _unescape(value: str) -> str:
+    return re.sub(r'\\[\\"n]', lambda match: _LABEL_ESCAPES[match.group(0)], value)
+
+
+def _parse_labels(labels: str) -> Dict[str, str]:
+    if "\\" not in labels:
+        return dict(_LABEL.findall(labels))
+
+    return {
+        name: _unescape(value) if "\\" in value else value
+        for name, value in _ESCAPED_LABEL.findall(labels)
+    }
+
+
+class ExpositionParser:
+    """Incremental parser of the Prometheus text exposition format (`/metrics` of the DCGM Exporter).
+
+    The body is fed chunk by chunk as it is received, only the complete lines are parsed and the last partial line
+    is kept for the next chunk. The lines of the other metric families are skipped by `str.find` without
+    splitting or parsing them.
+    """
+
+    def __init__(
+        self,
+        node_name: str = None,
+        metrics: Iterable[str] = DCGM_METRICS,
+        timestamp: float = None,
+        label_cache: Dict[str, Optional[Tuple]] = None
+    ):
+        """Initializes the exposition parser.
+
+        Args:
+            node_name (`str`): Kubernetes Node name of the scrape target, used if the sample has no `kubernetes_node`
+                label (Prometheus adds it by relabeling, the DCGM Exporter only exposes `Hostname`). Default is `None`
+                (the `Hostname` label)
+            metrics (`Iterable[str]`): Parsed metric names. Default is `DCGM_METRICS`
+            timestamp (`float`): Timestamp of the samples without an explicit timestamp. Default is `None`
+                (the time the parser is created, Like the scrape time)
+            label_cache (`Dict[str, Optional[Tuple]]`): Label set to the decoded labels of the sample, shared by the
+                scrapes of the same target since the label sets of a GPU rarely change. Default is `None` (a new cache)
+        """
+
+        self.node_name = node_name
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+        self._metrics = tuple(dict.fromkeys(metrics))
+        self._label_cache = {} if label_cache is None else label_cache
+        self._pending = b""
+        self._samples: Dict[str, List[VectorSample]] = {metric: [] for metric in self._metrics}
+
+        self.lines = 0
+        """Number of parsed lines"""
+
+    def feed(self, chunk: bytes):
+        """Parse the complete lines of a chunk of the body.
+
+        Args:
+            chunk (`bytes`): Chunk of the body
+        """
+
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            self._pending += chunk
+            return
+
+        content = self._pending + chunk[:end]
+        self._pending = chunk[end + 1:]
+
+        self._parse_lines(content.decode("utf-8"))
+
+    def close(self) -> Dict[str, List[VectorSample]]:
+        """Parse the last line of the body.
+
+        Returns:
+            metrics_samples (`Dict[str, List[VectorSample]]`): Metric name to the samples
+        """
+
+        if self._pending:
+            self._parse_lines(self._pending.decode("utf-8"))
+            self._pending = b""
+
+        return self._samples
+
+    def _parse_lines(self, content: str):
+        label_cache = self._label_cache
+        self.lines += content.count("\n") + 1
+
+        # 以 `str.find` (C 層) 直接跳到所需 metric 的行，其他 metric family 與註解的行不進入 Python
+        content = "\n" + content
+        for name in self._metrics:
+            samples = self._samples[name]
+            prefix = "\n" + name
+            offset = len(prefix)
+
+            start = content.find(prefix)
+            while start >= 0:
+                end = content.find("\n", start + offset)
+                line = content[start + offset:end] if end >= 0 else content[start + offset:]
+                start = content.find(prefix, end) if end >= 0 else -1
+
+                # 排除名稱以此 metric 為前綴的其他 metric，Like `DCGM_FI_DEV_FB_USED_PERCENT`
+                if line[:1] == "{":
+                    close = line.rfind("}")
+                    labels = line[1:close]
+                    fields = line[close + 1:].split()
+                elif line[:1] in (" ", "\t"):
+                    labels = ""
+                    fields = line.split()
+                else:
+                    continue
+
+                # 同一張 GPU 的各個 metric 共用同一組 label，每組 label 只解析一次
+                gpu_labels = label_cache.get(labels, False)
+                if gpu_labels is False:
+                    if len(label_cache) >= LABEL_CACHE_SIZE:
+                        label_cache.clear()
+                    gpu_labels = label_cache[labels] = self._gpu_labels(labels)
+
+                if gpu_labels is None or not fields:
+                    continue
+
+                samples.append(VectorSample(
+                    *gpu_labels,
+                    # 時間戳記 (可省略) 的單位為 ms
+                    float(fields[1]) / 1000 if len(fields) > 1 else self.timestamp,
+                    float(fields[0])
+                ))
+
+    def _gpu_labels(self, labels: str) -> Optional[Tuple[str, str, str, str, Optional[str], Optional[str]]]:
+        labels = _parse_labels(labels)
+
+        node_name = labels.get("kubernetes_node") or self.node_name or labels.get("Hostname")
+        if not node_name or "gpu" not in labels or "UUID" not in labels:
+            return None
+
+        return (
+            node_name,
+            labels["gpu"],
+            labels["UUID"],
+            labels.get("modelName", ""),
+            labels.get("GPU_I_ID"),
+            labels.get("GPU_I_PROFILE")
+        )
+
+
+def parse_exposition(
+    content: Union[bytes, str],
+    node_name: str = None,
+    metrics: Iterable[str] = DCGM_METRICS,
+    timestamp: float = None,
+    label_cache: Dict[str, Optional[Tuple]] = None
+) -> Dict[str, List[VectorSample]]:
+    """Parse a whole `/metrics` body of the DCGM Exporter to the typed samples.
+
+    Args:
+        content (`Union[bytes, str]`): Body in the Prometheus text exposition format
+        node_name (`str`): Kubernetes Node name of the scrape target. Default is `None` (the `Hostname` label)
+        metrics (`Iterable[str]`): Parsed metric names. Default is `DCGM_METRICS`
+        timestamp (`float`): Timestamp of the samples without an explicit timestamp. Default is `None` (now)
+        label_cache (`Dict[str, Optional[Tuple]]`): Label cache of the previous scrapes of the target.
+            Default is `None` (a new cache)
+
+    Returns:
+        metrics_samples (`Dict[str, List[VectorSample]]`): Metric name to the samples
+    """
+
+    parser = ExpositionParser(node_name, metrics, timestamp, label_cache)
+    parser.feed(content.encode("utf-8") if isinstance(content, str) else content)
+
+    return parser.close()
+
+
+def render_exposition(
+    metrics_samples: Dict[str, List[VectorSample]],
+    extra_metrics: Iterable[str] = DCGM_EXTRA_METRICS
+) -> str:
+    """Render the samples as a `/metrics` body of the DCGM Exporter, Like the simulated exporters.
+
+    The samples are labeled like the DCGM Exporter (`Hostname` instead of `kubernetes_node`), and the extra metrics
+    are rendered for every GPU with the value `0` so the body has the size and the mix of a real one.
+
+    Args:
+        metrics_samples (`Dict[str, List[VectorSample]]`): Metric name to the samples
+        extra_metrics (`Iterable[str]`): Other metric names to render. Default is `DCGM_EXTRA_METRICS`
+
+    Returns:
+        content (`str`): Body in the Prometheus text exposition format
+    """
+
+    gpus: Dict[str, str] = {}
+    lines: List[str] = []
+
+    for metric, samples in metrics_samples.items():
+        lines.append(f"# HELP {metric} {metric}.")
+        lines.append(f"# TYPE {metric} gauge")
+
+        for sample in samples:
+            labels = (
+                f'gpu="{sample.gpu}",UUID="{sample.uuid}",device="nvidia{sample.gpu}",'
+                f'modelName="{sample.model_name}",Hostname="{sample.node_name}"'
+            )
+            if sample.mig_instance_id is not None:
+                labels += f',GPU_I_PROFILE="{sample.mig_profile}",GPU_I_ID="{sample.mig_instance_id}"'
+
+            gpus.setdefault(sample.uuid, labels)
+            lines.append(f"{metric}{{{labels}}} {sample.value:g}")
+
+    for metric in extra_metrics:
+        lines.append(f"# HELP {metric} {metric}.")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.extend(f"{metric}{{{labels}}} 0" for labels in gpus.values())
+
+    return "\n".join(lines) + "\n"
+
+
+def benchmark_exposition(
+    fixture_path: str,
+    scale: int = 1000,
+    repeat: int = 5,
+    chunk_size: int = 65536
+) -> List[Dict[str, Any]]:
+    """Benchmark the exposition parser against the Prometheus response decoders on the same samples.
+
+    The DCGM Exporter fixture is scaled to `scale` times as many nodes, and rendered once as the `/metrics` bodies
+    (a body per node, with the extra DCGM metrics) and once as the Prometheus query responses of the polling path.
+    `exposition-warm` is a later scrape of the same targets, with the label sets already in the label cache.
+
+    Args:
+        fixture_path (`str`): PromQL query to the Prometheus response fixture, Like `backend/dcgm_gpu_info.json`
+        scale (`int`): Replication factor of the nodes. Default is `1000`
+        repeat (`int`): Number of repetitions, the best one is reported. Default is `5`
+        chunk_size (`int`): Size of the chunks fed to the incremental parser, unit: bytes. Default is `65536`
+
+    Returns:
+        results (`List[Dict[str, Any]]`): Parser or decoder, body size, samples and best parsing time
+    """
+
+    with open(fixture_path, "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+
+    responses = [scale_vector_response(response, scale) for response in fixture.values()]
+    bodies = [json.dumps(response).encode() for response in responses]
+
+    node_samples: Dict[str, Dict[str, List[VectorSample]]] = {}
+    for query, body in zip(fixture, bodies):
+        for sample in decode_vector_response(body, "json"):
+            node_samples.setdefault(sample.node_name, {}).setdefault(query, []).append(sample)
+    expositions = [render_exposition(samples).encode() for samples in node_samples.values()]
+
+    def _parse_chunked(content: bytes) -> int:
+        parser = ExpositionParser()
+        for start in range(0, len(content), chunk_size):
+            parser.feed(content[start:start + chunk_size])
+
+        return sum(len(samples) for samples in parser.close().values())
+
+    # 同一個 target 的後續 scrape：label cache 已經有上一次 scrape 的 label
+    label_caches = [{} for _ in expositions]
+    for content, label_cache in zip(expositions, label_caches):
+        parse_exposition(content, label_cache=label_cache)
+
+    exposition_size = sum(len(content) for content in expositions)
+    parsers = [
+        ("exposition", lambda: sum(
+            sum(len(samples) for samples in parse_exposition(content).values()) for content in expositions
+        ), exposition_size),
+        ("exposition-warm", lambda: sum(
+            sum(len(samples) for samples in parse_exposition(content, label_cache=label_cache).values())
+            for content, label_cache in zip(expositions, label_caches)
+        ), exposition_size),
+        (f"exposition-chunked-{chunk_size}", lambda: sum(
+            _parse_chunked(content) for content in expositions
+        ), exposition_size),
+        *[
+            (f"prometheus-{decoder}", lambda decoder=decoder: sum(
+                len(decode_vector_response(body, decoder)) for body in bodies
+            ), sum(len(body) for body in bodies)) for decoder in JSON_DECODERS
+        ],
+    ]
+
+    results: List[Dict[str, Any]] = []
+    for name, parse, size in parsers:
+        best = float("inf")
+        samples = 0
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            samples = parse()
+            best = min(best, time.perf_counter() - start_time)
+
+        results.append({
+            "parser": name,
+            "bytes": size,
+            "samples": samples,
+            "seconds": best,
+            "samples_per_second": samples / best if best else 0.0,
+            "megabytes_per_second": size / best / 1e6 if best else 0.0,
+        })
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the `/metrics` exposition parser against the Prometheus response decoders"
+    )
+    parser.add_argument(
+        "--fixture",
+        type=str,
+        default=os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "dcgm_gpu_info.json")
+    )
+    parser.add_argument("--scale", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunk_size", type=int, default=65536)
+    args = parser.parse_args()
+
+    for result in benchmark_exposition(args.fixture, args.scale, args.repeat, args.chunk_size):
+        print(json.dumps(result))
@@ -3,6 +3,8 @@ from typing import Dict, List
 
 import httpx
 
+from backend.gpu.monitoring.decoding import VectorSample, decode_vector_response
+
 
 class PrometheusClient:
     """Prometheus client to interact with the Prometheus server."""
@@ -89,3 +91,32 @@ class PrometheusClient:
             queries_response[query] = futures[i]
 
         return queries_response
+
+    async def execute_vector_query(self, query: str) -> List[VectorSample]:
+        """Execute an instant vector query and decode the response straight into the typed samples.
+
+        Args:
+            query (`str`): PromQL query to execute
+
+        Returns:
+            samples (`List[VectorSample]`): Samples of the vector result
+        """
+
+        response = await self._aclient.get(f"{self.url}/api/v1/query", params={"query": query})
+        response.raise_for_status()
+
+        return decode_vector_response(response.content)
+
+    async def execute_multiple_vector_queries(self, queries: List[str]) -> Dict[str, List[VectorSample]]:
+        """Execute multiple instant vector queries on the Prometheus server.
+
+        Args:
+            queries (`List[str]`): List of PromQL queries to execute
+
+        Returns:
+            queries_samples (`Dict[str, List[VectorSample]]`): Dictionary of the samples of the vector results
+        """
+
+        futures = await asyncio.gather(*[self.execute_vector_query(query) for query in queries])
+
+        return dict(zip(queries, futures))
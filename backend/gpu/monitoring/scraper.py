@@ -0,0 +1,279 @@
+import asyncio
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import httpx
+
+from backend.gpu.monitoring.decoding import VectorSample
+from backend.gpu.monitoring.exposition import DCGM_METRICS, ExpositionParser
+from backend.gpu.monitoring.prometheus import PrometheusClient
+
+
+class ScrapeTarget(NamedTuple):
+    """`/metrics` endpoint of a DCGM Exporter pod."""
+
+    url: str
+    """Scrape URL, Like `http://10.244.0.80:9400/metrics`"""
+
+    node_name: Optional[str] = None
+    """Kubernetes Node name of the exporter pod (`kubernetes_node` target label), `None` to use the `Hostname` label"""
+
+
+class _TargetState(NamedTuple):
+    """Samples of the last scrape of a DCGM Exporter endpoint."""
+
+    timestamp: float
+    """Unix timestamp of the scrape"""
+
+    samples: Dict[str, List[VectorSample]]
+    """Metric name to the samples of the scrape"""
+
+
+class DCGMExporterClient:
+    """Telemetry client scraping the `/metrics` endpoints of the DCGM Exporters directly, without Prometheus.
+
+    It answers the same vector queries as the `PrometheusClient` (the DCGM metric names), so it plugs into the
+    GPU Dispatcher as its Prometheus Client. The samples of every target are kept in an in-memory table which each
+    scrape of the target updates on its own, the body being parsed incrementally while it is received.
+
+    With an `interval`, a background task keeps scraping the targets and the queries are answered from the table
+    without any round trip, so the telemetry is at most `interval` old instead of the Prometheus scrape interval plus
+    the query latency. Without it, every query scrapes the targets on demand.
+    """
+
+    def __init__(
+        self,
+        targets: List[ScrapeTarget] = None,
+        prometheus_client: PrometheusClient = None,
+        job: str = "gpu-metrics",
+        interval: float = None,
+        timeout: float = 5.0,
+        discovery_interval: float = 60.0
+    ):
+        """Initializes the DCGM Exporter client.
+
+        Args:
+            targets (`List[ScrapeTarget]`): DCGM Exporter endpoints. Default is `None` (discovered from Prometheus)
+            prometheus_client (`PrometheusClient`): Prometheus Client to discover the DCGM Exporter endpoints
+                (`/api/v1/targets`), required without `targets`. Default is `None`
+            job (`str`): Prometheus job of the DCGM Exporters. Default is `gpu-metrics`
+            interval (`float`): Scrape interval of the background task, unit: s. Default is `None` (scrape on demand)
+            timeout (`float`): Timeout of a scrape, unit: s. Default is `5.0`
+            discovery_interval (`float`): Interval to discover the endpoints again, unit: s. Default is `60.0`
+
+        Raises:
+            ValueError: If neither the targets nor the Prometheus Client are given, or the interval is not positive
+        """
+
+        if targets is None and prometheus_client is None:
+            raise ValueError("Either the DCGM Exporter targets or the Prometheus Client is required")
+        if interval is not None and interval <= 0:
+            raise ValueError(f"Scrape interval must be positive: {interval}")
+
+        self._targets = list(targets) if targets is not None else None
+        self._discovered = targets is None
+        self._prometheus_client = prometheus_client
+        self.job = job
+        self.interval = interval
+        self.timeout = timeout
+        self.discovery_interval = discovery_interval
+
+        self._aclient = httpx.AsyncClient(timeout=httpx.Timeout(timeout))
+        self._discovered_at: float = None
+        self._table: Dict[str, _TargetState] = {}
+        self._label_caches: Dict[str, Dict[str, Optional[Tuple]]] = {}
+        self._task: asyncio.Task = None
+
+        self.scrapes = 0
+        """Number of successful target scrapes"""
+
+    # ============================== Properties ==============================
+
+    @property
+    def targets(self) -> Optional[List[ScrapeTarget]]:
+        """DCGM Exporter endpoints, `None` before the discovery"""
+
+        return self._targets
+
+    @property
+    def running(self) -> bool:
+        """Whether the background scrape task is running"""
+
+        return self._task is not None and not self._task.done()
+
+    @property
+    def age(self) -> Optional[float]:
+        """Age of the oldest target samples in the table, unit: s. `None` if the table is empty"""
+
+        if not self._table:
+            return None
+
+        return time.time() - min(state.timestamp for state in self._table.values())
+
+    # ============================== Public Methods ==============================
+
+    async def discover_targets(self) -> List[ScrapeTarget]:
+        """Discover the DCGM Exporter endpoints from the active targets of the Prometheus job.
+
+        Returns:
+            targets (`List[ScrapeTarget]`): DCGM Exporter endpoints
+        """
+
+        response = await self._prometheus_client.get_targets()
+
+        targets: Dict[str, ScrapeTarget] = {}
+        for target in response["data"]["activeTargets"]:
+            labels = target.get("labels", {})
+            if labels.get("job") != self.job:
+                continue
+
+            targets.setdefault(target["scrapeUrl"], ScrapeTarget(target["scrapeUrl"], labels.get("kubernetes_node")))
+
+        self._targets = list(targets.values())
+        self._discovered_at = time.monotonic()
+
+        # 移除已不存在的 target 的樣本
+        for url in set(self._table) - set(targets):
+            self._table.pop(url, None)
+            self._label_caches.pop(url, None)
+
+        return self._targets
+
+    async def scrape_target(self, target: ScrapeTarget) -> Dict[str, List[VectorSample]]:
+        """Scrape a DCGM Exporter endpoint and replace its samples in the table.
+
+        Args:
+            target (`ScrapeTarget`): DCGM Exporter endpoint
+
+        Returns:
+            metrics_samples (`Dict[str, List[VectorSample]]`): Metric name to the samples of the target
+        """
+
+        timestamp = time.time()
+        parser = ExpositionParser(
+            node_name=target.node_name,
+            metrics=DCGM_METRICS,
+            timestamp=timestamp,
+            label_cache=self._label_caches.setdefault(target.url, {})
+        )
+
+        # 邊接收邊解析 body，不需等待整個 body 或保留完整的文字
+        async with self._aclient.stream("GET", target.url) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+
+        metrics_samples = parser.close()
+
+        # 只替換這個 target 的樣本，其他 target 的樣本不受影響
+        self._table[target.url] = _TargetState(timestamp, metrics_samples)
+        self.scrapes += 1
+
+        return metrics_samples
+
+    async def scrape(self):
+        """Scrape all DCGM Exporter endpoints concurrently.
+
+        A target which fails is removed from the table until it responds again, like the staleness marker of
+        Prometheus.
+
+        Raises:
+            Exception: The error of the first target if no target responds
+        """
+
+        # 由 Prometheus 取得的 target 定期重新取得，跟上 DCGM Exporter pod 的增減
+        if self._discovered and (
+            self._discovered_at is None or time.monotonic() - self._discovered_at >= self.discovery_interval
+        ):
+            await self.discover_targets()
+
+        results = await asyncio.gather(
+            *[self.scrape_target(target) for target in self._targets],
+            return_exceptions=True
+        )
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        for target, result in zip(self._targets, results):
+            if isinstance(result, BaseException):
+                self._table.pop(target.url, None)
+
+        if errors and len(errors) == len(results):
+            raise errors[0]
+
+    async def execute_multiple_vector_queries(self, queries: List[str]) -> Dict[str, List[VectorSample]]:
+        """Answer the instant vector queries of the DCGM metrics from the scraped samples.
+
+        Only the bare metric names are supported, like the queries of the GPU Dispatcher.
+
+        Args:
+            queries (`List[str]`): DCGM metric names
+
+        Returns:
+            queries_samples (`Dict[str, List[VectorSample]]`): Dictionary of the samples of the vector results
+
+        Raises:
+            ValueError: If a query is not a DCGM metric name
+        """
+
+        unsupported = [query for query in queries if query not in DCGM_METRICS]
+        if unsupported:
+            raise ValueError(f"Unsupported queries of the DCGM Exporter client: {unsupported}")
+
+        if self.interval is None or not self._table:
+            # 第一次查詢 (或所有 target 都失敗) 時同步 scrape，之後由背景 task 持續更新
+            await self.scrape()
+
+        if self.interval is not None and not self.running:
+            self.start()
+
+        return {
+            query: [sample for state in self._table.values() for sample in state.samples.get(query, ())]
+            for query in queries
+        }
+
+    def start(self):
+        """Start the background scrape task, scraping the targets every `interval`.
+
+        Raises:
+            ValueError: If the client has no scrape interval
+        """
+
+        if self.interval is None:
+            raise ValueError("The DCGM Exporter client scrapes on demand, no scrape interval")
+
+        if not self.running:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Stop the background scrape task."""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def aclose(self):
+        """Stop the background scrape task and close the HTTP client."""
+
+        await self.stop()
+        await self._aclient.aclose()
+
+    # ============================== Private Methods ==============================
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            start_time = loop.time()
+
+            try:
+                await self.scrape()
+            except Exception:
+                # 所有 target 都失敗時保留空的表，下一輪再試
+                pass
+
+            # 以固定的間隔 scrape，扣除本輪 scrape 的時間
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - start_time)))
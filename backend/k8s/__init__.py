@@ -1,18 +1,52 @@
-from .api import (
-    corev1_api_list_namespaced_pod,
-    corev1_api_read_namespaced_pod_log,
-    watch_corev1_api_namespaced_pod,
-    get_pod_ip
-)
-from .client import get_k8s_api_client, get_k8s_dynamic_client
-from .exception import KubernetesPodException
+from typing import TYPE_CHECKING
 
+from shared.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .api import (
+        corev1_api_list_namespaced_pod,
+        corev1_api_read_namespaced_pod_log,
+        watch_corev1_api_namespaced_pod,
+        corev1_api_read_namespaced_pod,
+        corev1_api_create_namespaced_pod,
+        corev1_api_delete_namespaced_pod,
+        corev1_api_list_node,
+        get_pod_ip
+    )
+    from .client import get_k8s_api_client, get_k8s_dynamic_client
+    from .exception import KubernetesNodeException, KubernetesPodException
+
+# 子模組 (以及其相依套件) 於第一次使用時才載入
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".api": [
+        "corev1_api_list_namespaced_pod",
+        "corev1_api_read_namespaced_pod_log",
+        "watch_corev1_api_namespaced_pod",
+        "corev1_api_read_namespaced_pod",
+        "corev1_api_create_namespaced_pod",
+        "corev1_api_delete_namespaced_pod",
+        "corev1_api_list_node",
+        "get_pod_ip",
+    ],
+    ".client": [
+        "get_k8s_api_client",
+        "get_k8s_dynamic_client",
+    ],
+    ".exception": [
+        "KubernetesNodeException",
+        "KubernetesPodException",
+    ],
+})
 
 __all__ = [
     # Kubernetes API
     "corev1_api_list_namespaced_pod",
     "corev1_api_read_namespaced_pod_log",
     "watch_corev1_api_namespaced_pod",
+    "corev1_api_read_namespaced_pod",
+    "corev1_api_create_namespaced_pod",
+    "corev1_api_delete_namespaced_pod",
+    "corev1_api_list_node",
     "get_pod_ip",
 
     # Kubernetes Client
@@ -20,5 +54,6 @@ __all__ = [
     "get_k8s_dynamic_client",
 
     # Kubernetes Exception
+    "KubernetesNodeException",
     "KubernetesPodException",
 ]
@@ -1,8 +1,9 @@
-from typing import Any, Generator, Tuple
+from typing import Any, Dict, Generator, Tuple
 
 from kubernetes import watch
 from kubernetes.client import (
     CoreV1Api,
+    V1NodeList,
     V1Pod,
     V1PodList,
     V1PodStatus
@@ -10,14 +11,15 @@ from kubernetes.client import (
 from kubernetes.client.rest import ApiException
 
 from backend.k8s.client import get_k8s_api_client
-from backend.k8s.exception import KubernetesPodException
+from backend.k8s.exception import KubernetesNodeException, KubernetesPodException
 
 
-def corev1_api_list_namespaced_pod(namespace: str = 'default') -> V1PodList:
+def corev1_api_list_namespaced_pod(namespace: str = 'default', context: str = None) -> V1PodList:
     """List all of Pods in Kubernetes Cluster
 
     Args:
         namespace (str, optional): Namespace. Defaults to 'default'.
+        context (str, optional): kubeconfig context of the cluster. Defaults to None (the current context).
 
     Returns:
         pods (`V1PodList`): All of Pods in Kubernetes Cluster
@@ -27,7 +29,7 @@ def corev1_api_list_namespaced_pod(namespace: str = 'default') -> V1PodList:
     """
 
     try:
-        api_client = get_k8s_api_client()
+        api_client = get_k8s_api_client(context)
 
         corev1_api = CoreV1Api(api_client=api_client)
         pods: V1PodList = corev1_api.list_namespaced_pod(
@@ -76,11 +78,19 @@ def corev1_api_read_namespaced_pod_log(pod: V1Pod):
         raise KubernetesPodException(e.reason, e.body)
 
 
-def watch_corev1_api_namespaced_pod(namespace: str = 'default') -> Tuple[watch.Watch, Generator[Any | dict | str, Any, None]]:
+def watch_corev1_api_namespaced_pod(
+    namespace: str = 'default',
+    context: str = None,
+    label_selector: str = None,
+    timeout_seconds: int = 600
+) -> Tuple[watch.Watch, Generator[Any | dict | str, Any, None]]:
     """Watch Pod in Kubernetes Cluster
 
     Args:
         namespace (`str`, optional): Namespace. Defaults to 'default'.
+        context (`str`, optional): kubeconfig context of the cluster. Defaults to None (the current context).
+        label_selector (`str`, optional): Label selector of the watched Pods. Defaults to None (all Pods).
+        timeout_seconds (`int`, optional): Server-side timeout of the watch, unit: s. Defaults to 600.
 
     Returns:
         w (`watch.Watch`): Watch
@@ -91,15 +101,18 @@ def watch_corev1_api_namespaced_pod(namespace: str = 'default') -> Tuple[watch.W
     """
 
     try:
-        api_client = get_k8s_api_client()
+        api_client = get_k8s_api_client(context)
         corev1_api = CoreV1Api(api_client=api_client)
 
         w = watch.Watch()
 
+        kwargs = {"label_selector": label_selector} if label_selector else {}
+
         return w, w.stream(
             func=corev1_api.list_namespaced_pod,
             namespace=namespace,
-            timeout_seconds=600
+            timeout_seconds=timeout_seconds,
+            **kwargs
         )
     except ApiException as e:
         print(
@@ -108,6 +121,116 @@ def watch_corev1_api_namespaced_pod(namespace: str = 'default') -> Tuple[watch.W
         raise KubernetesPodException(e.reason, e.body)
 
 
+def corev1_api_read_namespaced_pod(name: str, namespace: str = 'default', context: str = None) -> V1Pod:
+    """Read Pod in Kubernetes Cluster
+
+    Args:
+        name (`str`): Pod name
+        namespace (`str`, optional): Namespace. Defaults to 'default'.
+        context (`str`, optional): kubeconfig context of the cluster. Defaults to None (the current context).
+
+    Returns:
+        pod (`V1Pod`): Pod
+
+    Raises:
+        KubernetesPodException: If failed to read the Pod
+    """
+
+    try:
+        api_client = get_k8s_api_client(context)
+        corev1_api = CoreV1Api(api_client=api_client)
+
+        return corev1_api.read_namespaced_pod(name=name, namespace=namespace)
+    except ApiException as e:
+        print(
+            f"Failed to read Pod {name} in the {namespace} namespace: {e}"
+        )
+        raise KubernetesPodException(e.reason, e.body)
+
+
+def corev1_api_create_namespaced_pod(
+    pod_manifest: Dict[str, Any],
+    namespace: str = 'default',
+    context: str = None
+) -> V1Pod:
+    """Create Pod in Kubernetes Cluster
+
+    Args:
+        pod_manifest (`Dict[str, Any]`): Pod manifest
+        namespace (`str`, optional): Namespace. Defaults to 'default'.
+        context (`str`, optional): kubeconfig context of the cluster. Defaults to None (the current context).
+
+    Returns:
+        pod (`V1Pod`): Created Pod
+
+    Raises:
+        KubernetesPodException: If failed to create the Pod
+    """
+
+    try:
+        api_client = get_k8s_api_client(context)
+        corev1_api = CoreV1Api(api_client=api_client)
+
+        return corev1_api.create_namespaced_pod(namespace=namespace, body=pod_manifest)
+    except ApiException as e:
+        print(
+            f"Failed to create Pod in the {namespace} namespace: {e}"
+        )
+        raise KubernetesPodException(e.reason, e.body)
+
+
+def corev1_api_delete_namespaced_pod(name: str, namespace: str = 'default', context: str = None):
+    """Delete Pod in Kubernetes Cluster
+
+    Args:
+        name (`str`): Pod name
+        namespace (`str`, optional): Namespace. Defaults to 'default'.
+        context (`str`, optional): kubeconfig context of the cluster. Defaults to None (the current context).
+
+    Raises:
+        KubernetesPodException: If failed to delete the Pod
+    """
+
+    try:
+        api_client = get_k8s_api_client(context)
+        corev1_api = CoreV1Api(api_client=api_client)
+
+        corev1_api.delete_namespaced_pod(name=name, namespace=namespace)
+    except ApiException as e:
+        print(
+            f"Failed to delete Pod {name} in the {namespace} namespace: {e}"
+        )
+        raise KubernetesPodException(e.reason, e.body)
+
+
+def corev1_api_list_node(context: str = None, label_selector: str = None) -> V1NodeList:
+    """List all of Nodes in Kubernetes Cluster
+
+    Args:
+        context (`str`, optional): kubeconfig context of the cluster. Defaults to None (the current context).
+        label_selector (`str`, optional): Label selector of the listed Nodes. Defaults to None (all Nodes).
+
+    Returns:
+        nodes (`V1NodeList`): All of Nodes in Kubernetes Cluster, with the cached container images in `status.images`
+
+    Raises:
+        KubernetesNodeException: If failed to list all of Nodes
+    """
+
+    try:
+        api_client = get_k8s_api_client(context)
+        corev1_api = CoreV1Api(api_client=api_client)
+
+        kwargs = {"label_selector": label_selector} if label_selector else {}
+
+        return corev1_api.list_node(**kwargs)
+    except ApiException as e:
+        print(
+            f"Failed to list all of Nodes: {e}"
+        )
+        raise KubernetesNodeException(e.reason, e.body)
+
+
 def get_pod_ip(pod: V1Pod) -> str:
     """Get Pod allocated IP in Kubernetes Cluster
 
@@ -2,26 +2,36 @@ from kubernetes import config, dynamic
 from kubernetes.client import api_client
 
 
-def get_k8s_api_client():
+def get_k8s_api_client(context: str = None):
     """Get Kubernetes API client
 
+    Args:
+        context (`str`): kubeconfig context of the cluster. Default is `None` (the current context)
+
     Returns:
         k8s_api_client (`api_client.ApiClient`): Kubernetes API client
     """
 
-    k8s_api_client = api_client.ApiClient(config.load_kube_config())
+    if context is None:
+        k8s_api_client = api_client.ApiClient(config.load_kube_config())
+    else:
+        # 每個 context 使用各自的 Configuration，不覆寫全域的預設設定
+        k8s_api_client = config.new_client_from_config(context=context)
 
     return k8s_api_client
 
 
-def get_k8s_dynamic_client():
+def get_k8s_dynamic_client(context: str = None):
     """Get Kubernetes Dynamic client
 
+    Args:
+        context (`str`): kubeconfig context of the cluster. Default is `None` (the current context)
+
     Returns:
         k8s_dynamic_client (`dynamic.DynamicClient`): Kubernetes Dynamic client
     """
 
-    k8s_api_client = get_k8s_api_client()
+    k8s_api_client = get_k8s_api_client(context)
 
     k8s_dynamic_client = dynamic.DynamicClient(k8s_api_client)
 
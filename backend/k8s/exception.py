@@ -1,3 +1,6 @@
+from typing import Any
+
+
 class KubernetesPodException(Exception):
 
     def __init__(self, error: str, **kwargs):
@@ -12,3 +15,19 @@ class KubernetesPodException(Exception):
 
         self.error = error
         self.kwargs = kwargs
+
+
+class KubernetesNodeException(Exception):
+
+    def __init__(self, error: str, kwargs: Any = None):
+        """Kubernetes Node Exception
+
+        Args:
+            error (str): Error message
+            kwargs (Any): Original error message
+        """
+
+        super().__init__(error, kwargs)
+
+        self.error = error
+        self.kwargs = kwargs
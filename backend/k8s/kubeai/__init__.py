@@ -1,20 +1,46 @@
-from .api import (
-    apply_kubeai_model_custom_resource,
-    create_kubeai_model_custom_resource,
-    list_kubeai_model_custom_resource,
-    patch_kubeai_model_custom_resource,
-    log_kubeai_pod,
-    parse_kubeai_pod_log,
-)
-from .exception import (
-    KubeAIModelException,
-    KubeAIOllamaModelPodException
-)
-from .ollama import (
-    list_kubeai_ollama_model_pod,
-    list_kubeai_ollama_model_filtered_pod
-)
+from typing import TYPE_CHECKING
 
+from shared.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .api import (
+        apply_kubeai_model_custom_resource,
+        create_kubeai_model_custom_resource,
+        list_kubeai_model_custom_resource,
+        patch_kubeai_model_custom_resource,
+        log_kubeai_pod,
+        parse_kubeai_pod_log,
+    )
+    from .exception import (
+        KubeAIModelException,
+        KubeAIOllamaModelPodException
+    )
+    from .ollama import (
+        list_kubeai_ollama_model_pod,
+        list_kubeai_ollama_model_filtered_pod,
+        watch_kubeai_ollama_model_ready_pods
+    )
+
+# 子模組 (以及其相依套件) 於第一次使用時才載入
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".api": [
+        "apply_kubeai_model_custom_resource",
+        "create_kubeai_model_custom_resource",
+        "list_kubeai_model_custom_resource",
+        "patch_kubeai_model_custom_resource",
+        "log_kubeai_pod",
+        "parse_kubeai_pod_log",
+    ],
+    ".exception": [
+        "KubeAIModelException",
+        "KubeAIOllamaModelPodException",
+    ],
+    ".ollama": [
+        "list_kubeai_ollama_model_pod",
+        "list_kubeai_ollama_model_filtered_pod",
+        "watch_kubeai_ollama_model_ready_pods",
+    ],
+})
 
 __all__ = [
     # KubeAI Kubernetes API
@@ -31,6 +57,7 @@ __all__ = [
     # KubeAI Ollama Kubernetes API
     "list_kubeai_ollama_model_pod",
     "list_kubeai_ollama_model_filtered_pod",
+    "watch_kubeai_ollama_model_ready_pods",
 
     # KubeAI Ollama Kubernetes Exception
     "KubeAIOllamaModelPodException",
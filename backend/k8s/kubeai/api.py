@@ -1,5 +1,5 @@
 import re
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 from kubernetes import dynamic
 from kubernetes.client import (
@@ -15,17 +15,18 @@ from backend.k8s.exception import KubernetesPodException
 from backend.k8s.kubeai.exception import KubeAIModelException
 
 
-def create_kubeai_model_custom_resource(model_cr_yaml: Dict[str, Any]):
+def create_kubeai_model_custom_resource(model_cr_yaml: Dict[str, Any], context: str = None):
     """Create KubeAI Model Custom Resource to Kubernetes Cluster
 
     Args:
         model_cr_yaml (`Dict[str, Any]`): KubeAI Model Custom Resource YAML
+        context (`str`, optional): kubeconfig context of the cluster. Defaults to None (the current context).
 
     Raises:
         KubeAIModelException: If failed to create KubeAI Model Custom Resource
     """
 
-    dynamic_client = get_k8s_dynamic_client()
+    dynamic_client = get_k8s_dynamic_client(context)
 
     kubeai_models_client = dynamic_client.resources.get(
         api_version='kubeai.org/v1',
@@ -40,11 +41,12 @@ def create_kubeai_model_custom_resource(model_cr_yaml: Dict[str, Any]):
         raise KubeAIModelException(e.reason, e.body)
 
 
-def list_kubeai_model_custom_resource(namespace: str = "default") -> List[Dict[str, Any]]:
+def list_kubeai_model_custom_resource(namespace: str = "default", context: str = None) -> List[Dict[str, Any]]:
     """List all of KubeAI Model Custom Resources in Kubernetes Cluster
 
     Args:
         namespace (`str`, optional): Namespace. Defaults to 'default'.
+        context (`str`, optional): kubeconfig context of the cluster. Defaults to None (the current context).
 
     Returns:
         model_kind_items (`List[Dict[str, Any]]`): All of KubeAI Model Custom Resources in Kubernetes Cluster
@@ -53,7 +55,7 @@ def list_kubeai_model_custom_resource(namespace: str = "default") -> List[Dict[s
         KubeAIModelException: If failed to list KubeAI Model Custom Resource
     """
 
-    dynamic_client = get_k8s_dynamic_client()
+    dynamic_client = get_k8s_dynamic_client(context)
 
     # Get model resource of KubeAI
     model_resource: dynamic.Resource = dynamic_client.resources.get(
@@ -84,13 +86,15 @@ def list_kubeai_model_custom_resource(namespace: str = "default") -> List[Dict[s
 
 def patch_kubeai_model_custom_resource(
     model_cr_yaml: Dict[str, Any],
-    patch_body: Dict[str, Any] = {}
+    patch_body: Dict[str, Any] = {},
+    context: str = None
 ):
     """Patch KubeAI Model Custom Resource in Kubernetes Cluster
 
     Args:
         model_cr_yaml (`Dict[str, Any]`): KubeAI Model Custom Resource YAML
         patch_body (`Dict[str, Any]`, optional): Patch body. Defaults to {}.
+        context (`str`, optional): kubeconfig context of the cluster. Defaults to None (the current context).
 
     Returns:
         patched_model_kind: Patched KubeAI Model Custom Resource
@@ -99,7 +103,7 @@ def patch_kubeai_model_custom_resource(
         KubeAIModelException: If failed to patch KubeAI Model Custom Resource
     """
 
-    api_client = get_k8s_api_client()
+    api_client = get_k8s_api_client(context)
     custom_obejct_api = CustomObjectsApi(api_client=api_client)
 
     try:
@@ -126,11 +130,18 @@ def patch_kubeai_model_custom_resource(
         raise KubeAIModelException(e.reason, e.body)
 
 
-def apply_kubeai_model_custom_resource(model_cr_yaml: Dict[str, Any]):
+def apply_kubeai_model_custom_resource(
+    model_cr_yaml: Dict[str, Any],
+    context: str = None,
+    on_existing: Callable[[Dict[str, Any]], None] = None
+):
     """Apply KubeAI Model Custom Resource to Kubernetes Cluster
 
     Args:
         model_cr_yaml (`Dict[str, Any]`): KubeAI Model Custom Resource YAML
+        context (`str`, optional): kubeconfig context of the cluster. Defaults to None (the current context).
+        on_existing (`Callable[[Dict[str, Any]], None]`, optional): Called with the existing KubeAI Model Custom
+            Resource before it is patched, Like to update `model_cr_yaml` from its annotations. Defaults to None.
 
     Raises:
         KubeAIModelException: If failed to apply KubeAI Model Custom Resource to Kubernetes Cluster
@@ -138,22 +149,24 @@ def apply_kubeai_model_custom_resource(model_cr_yaml: Dict[str, Any]):
 
     try:
         # Check if the model already exists
-        kubeai_models = list_kubeai_model_custom_resource()
+        kubeai_models = list_kubeai_model_custom_resource(context=context)
 
         # Apply the model to the Kubernetes cluster if it does not exist
         if len(kubeai_models) == 0:
-            create_kubeai_model_custom_resource(model_cr_yaml)
+            create_kubeai_model_custom_resource(model_cr_yaml, context)
         else:
             # Patch the model if it already exists in the Kubernetes cluster
             for kubeai_model in kubeai_models:
                 if kubeai_model["metadata"]["name"] == model_cr_yaml["metadata"]["name"]:
+                    if on_existing is not None:
+                        on_existing(kubeai_model)
                     patch_kubeai_model_custom_resource(
-                        kubeai_model, model_cr_yaml
+                        kubeai_model, model_cr_yaml, context
                     )
                     break
             else:
                 # Create the model if it does not exist in the Kubernetes cluster
-                create_kubeai_model_custom_resource(model_cr_yaml)
+                create_kubeai_model_custom_resource(model_cr_yaml, context)
     except KubeAIModelException as e:
         print(
             f"Failed to apply KubeAI Model Custom Resource: {e.error}\nKubernetes REST ApiException:{e.kwargs}"
@@ -1,3 +1,7 @@
+import threading
+import time
+from typing import Callable, Dict, Mapping, Set
+
 from kubernetes import watch
 from kubernetes.client import (
     V1Pod,
@@ -11,11 +15,12 @@ from backend.k8s.exception import KubernetesPodException
 from backend.k8s.kubeai.exception import KubeAIOllamaModelPodException
 
 
-def list_kubeai_ollama_model_pod(namespace: str = "default") -> V1PodList:
+def list_kubeai_ollama_model_pod(namespace: str = "default", context: str = None) -> V1PodList:
     """List all of KubeAI Ollama Model Pods in Kubernetes Cluster
 
     Args:
         namespace (`str`, optional): Kubernetes Namespace. Defaults to 'default'.
+        context (`str`, optional): kubeconfig context of the cluster. Defaults to None (the current context).
 
     Returns:
         kubeai_ollama_model_pods (`V1PodList`): All of KubeAI Ollama Model Pods in Kubernetes Cluster
@@ -25,7 +30,7 @@ def list_kubeai_ollama_model_pod(namespace: str = "default") -> V1PodList:
     """
 
     try:
-        pods = corev1_api_list_namespaced_pod(namespace=namespace)
+        pods = corev1_api_list_namespaced_pod(namespace=namespace, context=context)
         kubeai_ollama_model_pods: V1PodList = list(filter(
             lambda pod: pod.metadata.labels.get(
                 "app.kubernetes.io/managed-by"
@@ -103,6 +108,97 @@ def watch_kubeai_ollama_model_pod(model_name: str, namespace: str = "default") -
         raise KubeAIOllamaModelPodException(e.error, e.kwargs)
 
 
+def watch_kubeai_ollama_model_ready_pods(
+    replicas: Mapping[str, int],
+    namespace: str = "default",
+    context: str = None,
+    timeout: float = 600.0,
+    on_ready: Callable[[str], None] = None,
+    stop: threading.Event = None,
+    created_after: Mapping[str, float] = None
+) -> Set[str]:
+    """Watch the KubeAI Ollama Model Pods of several models with one shared watch until they are ready
+
+    Args:
+        replicas (`Mapping[str, int]`): KubeAI Model name to the number of ready Pods to wait for,
+            a model removed from it while watching is no longer waited for
+        namespace (`str`, optional): Kubernetes Namespace. Defaults to 'default'.
+        context (`str`, optional): kubeconfig context of the cluster. Defaults to None (the current context).
+        timeout (`float`, optional): Timeout, unit: s. Defaults to 600.0.
+        on_ready (`Callable[[str], None]`, optional): Called with the KubeAI Model name when its Pods are ready.
+            Defaults to None.
+        stop (`threading.Event`, optional): Stop watching when set. Defaults to None.
+        created_after (`Mapping[str, float]`, optional): KubeAI Model name to the Unix timestamp, its Pods created
+            earlier (Like the Pods of the previous resource profile being replaced) are not counted. Defaults to None.
+
+    Returns:
+        ready_models (`Set[str]`): KubeAI Model names whose Pods are ready
+
+    Raises:
+        KubeAIOllamaModelPodException: If failed to watch the KubeAI Ollama Model Pods
+    """
+
+    def _is_ready(pod: V1Pod) -> bool:
+        pod_status: V1PodStatus = pod.status
+        if pod_status is None or pod_status.phase != "Running":
+            return False
+
+        return any(
+            condition.type == "Ready" and condition.status == "True"
+            for condition in (pod_status.conditions or [])
+        )
+
+    def _is_current(name: str, pod: V1Pod) -> bool:
+        since = (created_after or {}).get(name)
+        created = pod.metadata.creation_timestamp
+        # creationTimestamp 只精確到秒
+        return since is None or created is None or created.timestamp() >= since
+
+    # KubeAI Model name -> Ready 的 Pod 名稱
+    ready_pods: Dict[str, Set[str]] = {}
+    ready_models: Set[str] = set()
+    deadline = time.monotonic() + timeout
+
+    def _done() -> bool:
+        return all(name in ready_models for name in list(replicas)) or (stop is not None and stop.is_set())
+
+    try:
+        w, stream = watch_corev1_api_namespaced_pod(
+            namespace=namespace,
+            context=context,
+            label_selector="app.kubernetes.io/managed-by=kubeai,app.kubernetes.io/name=ollama",
+            timeout_seconds=max(int(timeout), 1)
+        )
+
+        # 第一批事件為既有的 Pod (ADDED)，之後為 Pod 狀態的變化
+        for event in stream:
+            pod: V1Pod = event["object"]
+            name = (pod.metadata.labels or {}).get("model")
+
+            if name in replicas and name not in ready_models:
+                pods = ready_pods.setdefault(name, set())
+                if event["type"] != "DELETED" and _is_ready(pod) and _is_current(name, pod):
+                    pods.add(pod.metadata.name)
+                else:
+                    pods.discard(pod.metadata.name)
+
+                if len(pods) >= replicas.get(name, 0):
+                    ready_models.add(name)
+                    if on_ready is not None:
+                        on_ready(name)
+
+            if _done() or time.monotonic() >= deadline:
+                w.stop()
+                break
+
+        return ready_models
+    except KubernetesPodException as e:
+        print(
+            f"Failed to watch KubeAI Ollama Model Pods: {e.error}\nKubernetes REST ApiException:{e.kwargs}"
+        )
+        raise KubeAIOllamaModelPodException(e.error, e.kwargs)
+
+
 def list_kubeai_ollama_model_filtered_pod(model: str, namespace: str = "default"):
     """List filtered KubeAI Ollama Model Pod in Kubernetes Cluster
 
@@ -1,5 +1,21 @@
-from .client import OllamaClient
-from .types import ListResponse, ModelDetails
+from typing import TYPE_CHECKING
+
+from shared.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .client import OllamaClient
+    from .types import ListResponse, ModelDetails
+
+# 子模組 (以及其相依套件) 於第一次使用時才載入
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".client": [
+        "OllamaClient",
+    ],
+    ".types": [
+        "ListResponse",
+        "ModelDetails",
+    ],
+})
 
 __all__ = [
     # Client
@@ -0,0 +1,53 @@
+from typing import TYPE_CHECKING
+
+from shared.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .fakes import FakeKubeAI, FakeOllamaClient, FakePrometheusClient
+    from .recorder import SchedulingRecorder, compact_telemetry, load_records
+    from .replay import ReplayEngine, build_fixture_records
+    from .types import ReplayMismatch, ReplayReport, SchedulingRecord
+
+# 子模組 (以及其相依套件) 於第一次使用時才載入
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".fakes": [
+        "FakeKubeAI",
+        "FakeOllamaClient",
+        "FakePrometheusClient",
+    ],
+    ".recorder": [
+        "SchedulingRecorder",
+        "compact_telemetry",
+        "load_records",
+    ],
+    ".replay": [
+        "ReplayEngine",
+        "build_fixture_records",
+    ],
+    ".types": [
+        "ReplayMismatch",
+        "ReplayReport",
+        "SchedulingRecord",
+    ],
+})
+
+__all__ = [
+    # Fake Backends
+    "FakeKubeAI",
+    "FakeOllamaClient",
+    "FakePrometheusClient",
+
+    # Recorder
+    "SchedulingRecorder",
+    "compact_telemetry",
+    "load_records",
+
+    # Replay
+    "ReplayEngine",
+    "build_fixture_records",
+
+    # Types
+    "ReplayMismatch",
+    "ReplayReport",
+    "SchedulingRecord",
+]
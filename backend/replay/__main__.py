@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+from logging import WARNING, getLogger
+
+from backend.replay.recorder import SchedulingRecorder, load_records
+from backend.replay.replay import ReplayEngine, build_fixture_records
+
+
+def parsed_args():
+    parser = argparse.ArgumentParser(
+        description="Replay the scheduling recordings through the GPU Dispatcher offline"
+    )
+    parser.add_argument("--log", type=str, default=None, help="JSON Lines scheduling recording")
+    parser.add_argument("--store", type=str, default=None, help="Replay the decisions of a telemetry store directory instead")
+    parser.add_argument("--start", type=float, default=None, help="Unix timestamp of the replayed range start (`--store`)")
+    parser.add_argument("--end", type=float, default=None, help="Unix timestamp of the replayed range end (`--store`)")
+    parser.add_argument("--fixture", type=int, default=0, help="Replay N synthetic records on the static fixtures instead")
+    parser.add_argument("--speed", type=float, default=1000.0, help="Replay speed, `0` replays as fast as possible")
+    parser.add_argument("--output", type=str, default=None, help="Write the replayed decisions as a new recording")
+
+    args = parser.parse_args()
+    if not args.log and not args.store and args.fixture < 1:
+        parser.error("Either --log, --store or --fixture is required")
+
+    return args
+
+
+if __name__ == "__main__":
+    args = parsed_args()
+
+    if args.log:
+        replay_records = load_records(args.log)
+    elif args.store:
+        from backend.store.store import TelemetryStore
+
+        replay_records = TelemetryStore(args.store, retention_days=None).query_decisions(args.start, args.end)
+    else:
+        replay_records = build_fixture_records(args.fixture)
+
+    replay_logger = getLogger("GPU Delegater Replay")
+    replay_logger.setLevel(WARNING)
+
+    replay_engine = ReplayEngine(
+        logger=replay_logger,
+        records=replay_records,
+        speed=args.speed,
+        recorder=SchedulingRecorder(args.output) if args.output else None
+    )
+    print(asyncio.run(replay_engine.run()).model_dump_json(indent=4))
@@ -0,0 +1,223 @@
+import copy
+import json
+import os
+from typing import Any, Dict, List
+
+from backend.gpu.monitoring.decoding import VectorSample, vector_samples
+from backend.llm.ollama import ListResponse, ModelDetails
+
+
+FIXTURES_DIR = os.path.dirname(os.path.dirname(__file__))
+"""Directory of the static fixtures (`dcgm_gpu_info.json`、`nodes_gpu_info.json`、`targets.json`)"""
+
+DCGM_GPU_INFO_FIXTURE = os.path.join(FIXTURES_DIR, "dcgm_gpu_info.json")
+"""Raw DCGM Exporter metrics queried from Prometheus"""
+
+NODES_GPU_INFO_FIXTURE = os.path.join(FIXTURES_DIR, "nodes_gpu_info.json")
+"""Expected GPU inventory parsed from `dcgm_gpu_info.json`"""
+
+TARGETS_FIXTURE = os.path.join(FIXTURES_DIR, "targets.json")
+"""Prometheus scrape targets"""
+
+BUILTIN_MODEL_DETAILS: Dict[str, Dict[str, str]] = {
+    "gemma2:2b": {"parameter_size": "2.6B", "quantization_level": "Q4_0"},
+    "gemma2:9b": {"parameter_size": "9.2B", "quantization_level": "Q4_0"},
+    "gemma2:27b": {"parameter_size": "27.2B", "quantization_level": "Q4_0"},
+    "llama3.1:8b": {"parameter_size": "8.0B", "quantization_level": "Q4_K_M"},
+    "llama3.2:3b": {"parameter_size": "3.2B", "quantization_level": "Q4_K_M"},
+    "llama3.3:70b": {"parameter_size": "70.6B", "quantization_level": "Q4_K_M"},
+}
+"""Ollama model details of `OllamaBuiltinModel` reported by the Ollama Parameters Worker"""
+
+
+def load_fixture(file_path: str) -> Any:
+    """Load a JSON fixture.
+
+    Args:
+        file_path (`str`): Fixture file path
+
+    Returns:
+        fixture (`Any`): Parsed fixture
+    """
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class FakePrometheusClient:
+    """Prometheus client which serves the telemetry snapshot from memory instead of the Prometheus Server."""
+
+    def __init__(self, telemetry: Dict[str, List[Dict[str, Any]]] = None, targets: Dict = None):
+        """Initializes the fake Prometheus client.
+
+        Args:
+            telemetry (`Dict[str, List[Dict[str, Any]]]`): PromQL query to the vector result.
+                Default is `None` (`dcgm_gpu_info.json` fixture)
+            targets (`Dict`): Response of `/api/v1/targets`. Default is `None` (`targets.json` fixture, loaded lazily)
+        """
+
+        if telemetry is None:
+            telemetry = {
+                query: response["data"]["result"]
+                for query, response in load_fixture(DCGM_GPU_INFO_FIXTURE).items()
+            }
+
+        self.telemetry = telemetry
+        self._targets = targets
+
+    async def get_targets(self) -> Dict:
+        """Get all of the targets that Prometheus is scraping.
+
+        Returns:
+            targets (`Dict`): Targets that Prometheus is scraping.
+        """
+
+        if self._targets is None:
+            self._targets = load_fixture(TARGETS_FIXTURE)
+
+        return self._targets
+
+    async def execute_query(self, query: str) -> Dict:
+        """Execute a query on the telemetry snapshot.
+
+        Args:
+            query (`str`): PromQL query to execute, only the metric name selector is supported
+
+        Returns:
+            response (`Dict`): Query result in the Prometheus HTTP API format
+        """
+
+        return {
+            "status": "success",
+            "data": {
+                "resultType": "vector",
+                "result": self.telemetry.get(query, [])
+            }
+        }
+
+    async def execute_multiple_queries(self, queries: List[str]) -> Dict[str, Dict]:
+        """Execute multiple queries on the telemetry snapshot.
+
+        Args:
+            queries (`List[str]`): List of PromQL queries to execute
+
+        Returns:
+            queries_response (`Dict[str, Dict]`): Dictionary of query results
+        """
+
+        return {query: await self.execute_query(query) for query in queries}
+
+    async def execute_vector_query(self, query: str) -> List[VectorSample]:
+        """Execute an instant vector query on the telemetry snapshot.
+
+        Args:
+            query (`str`): PromQL query to execute, only the metric name selector is supported
+
+        Returns:
+            samples (`List[VectorSample]`): Samples of the vector result
+        """
+
+        return vector_samples(await self.execute_query(query))
+
+    async def execute_multiple_vector_queries(self, queries: List[str]) -> Dict[str, List[VectorSample]]:
+        """Execute multiple instant vector queries on the telemetry snapshot.
+
+        Args:
+            queries (`List[str]`): List of PromQL queries to execute
+
+        Returns:
+            queries_samples (`Dict[str, List[VectorSample]]`): Dictionary of the samples of the vector results
+        """
+
+        return {query: await self.execute_vector_query(query) for query in queries}
+
+
+class FakeOllamaClient:
+    """Ollama client which serves the model details from memory instead of the Ollama Parameters Worker."""
+
+    def __init__(self, model_details: Dict[str, Dict[str, str]] = None):
+        """Initializes the fake Ollama client.
+
+        Args:
+            model_details (`Dict[str, Dict[str, str]]`): Ollama model name to the model details
+                (`parameter_size`, `quantization_level`). Default is `None` (`BUILTIN_MODEL_DETAILS`)
+        """
+
+        self.model_details = dict(BUILTIN_MODEL_DETAILS if model_details is None else model_details)
+
+    async def list(self) -> ListResponse:
+        """List Ollama Models
+
+        Returns:
+            models (`ListResponse`): List of Ollama Models
+        """
+
+        return ListResponse(models=[
+            ListResponse.Model(model=model_name, details=ModelDetails(**details))
+            for model_name, details in self.model_details.items()
+        ])
+
+
+class FakeKubeAI:
+    """In-memory KubeAI Model Custom Resources instead of the Kubernetes Cluster."""
+
+    def __init__(self):
+        self.models: Dict[str, Dict[str, Any]] = {}
+        """KubeAI Model name to the applied KubeAI Model Custom Resource"""
+
+        self.applied: int = 0
+        """Number of applied KubeAI Model Custom Resources"""
+
+    def list_kubeai_model_custom_resource(self, namespace: str = "default") -> List[Dict[str, Any]]:
+        """List all of KubeAI Model Custom Resources
+
+        Args:
+            namespace (`str`, optional): Namespace. Defaults to 'default'.
+
+        Returns:
+            model_kind_items (`List[Dict[str, Any]]`): All of KubeAI Model Custom Resources in the namespace
+        """
+
+        return [
+            model for model in self.models.values()
+            if model["metadata"].get("namespace", "default") == namespace
+        ]
+
+    def patch_kubeai_model_custom_resource(
+        self,
+        model_cr_yaml: Dict[str, Any],
+        patch_body: Dict[str, Any] = {}
+    ) -> Dict[str, Any]:
+        """Patch (JSON merge patch) KubeAI Model Custom Resource
+
+        Args:
+            model_cr_yaml (`Dict[str, Any]`): KubeAI Model Custom Resource YAML
+            patch_body (`Dict[str, Any]`, optional): Patch body. Defaults to {}.
+
+        Returns:
+            patched_model_kind: Patched KubeAI Model Custom Resource
+        """
+
+        def merge(target: Dict[str, Any], patch: Dict[str, Any]):
+            for key, value in patch.items():
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    merge(target[key], value)
+                elif value is None:
+                    target.pop(key, None)
+                else:
+                    target[key] = copy.deepcopy(value)
+
+        model = self.models.setdefault(model_cr_yaml["metadata"]["name"], copy.deepcopy(model_cr_yaml))
+        merge(model, patch_body)
+
+        return model
+
+    def apply_kubeai_model_custom_resource(self, model_cr_yaml: Dict[str, Any]):
+        """Apply KubeAI Model Custom Resource
+
+        Args:
+            model_cr_yaml (`Dict[str, Any]`): KubeAI Model Custom Resource YAML
+        """
+
+        self.models[model_cr_yaml["metadata"]["name"]] = copy.deepcopy(model_cr_yaml)
+        self.applied += 1
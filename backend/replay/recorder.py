@@ -0,0 +1,157 @@
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Sequence
+
+from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+from backend.gpu.dispatcher.inventory import GPUSnapshot
+from backend.gpu.dispatcher.types import GPUNodeList
+from backend.gpu.monitoring.decoding import VectorSample
+from backend.replay.types import SchedulingRecord
+
+if TYPE_CHECKING:
+    from backend.store.store import TelemetryStore
+
+
+def compact_telemetry(node_gpu_info: Mapping[str, Sequence[VectorSample]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Compact the Prometheus vector samples to the vector results with the labels used by the GPU Dispatcher.
+
+    Args:
+        node_gpu_info (`Mapping[str, Sequence[VectorSample]]`): PromQL query to the vector samples
+
+    Returns:
+        telemetry (`Dict[str, List[Dict[str, Any]]]`): PromQL query to the compacted vector result
+    """
+
+    telemetry: Dict[str, List[Dict[str, Any]]] = {}
+
+    for query, samples in node_gpu_info.items():
+        telemetry[query] = []
+
+        for sample in samples:
+            metric = {
+                "kubernetes_node": sample.node_name,
+                "gpu": sample.gpu,
+                "UUID": sample.uuid,
+                "modelName": sample.model_name,
+            }
+            if sample.mig_instance_id is not None:
+                metric["GPU_I_ID"] = sample.mig_instance_id
+            if sample.mig_profile is not None:
+                metric["GPU_I_PROFILE"] = sample.mig_profile
+
+            # 與 Prometheus HTTP API 相同，sample value 以字串記錄
+            value = str(int(sample.value)) if float(sample.value).is_integer() else repr(float(sample.value))
+            telemetry[query].append({"metric": metric, "value": [sample.timestamp, value]})
+
+    return telemetry
+
+
+def load_records(log_file_path: str) -> List[SchedulingRecord]:
+    """Load the scheduling records from a JSON Lines recording.
+
+    Args:
+        log_file_path (`str`): Scheduling recording file path
+
+    Returns:
+        records (`List[SchedulingRecord]`): Scheduling records sorted by the timestamp
+    """
+
+    records: List[SchedulingRecord] = []
+
+    with open(log_file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(SchedulingRecord.model_validate_json(line))
+
+    records.sort(key=lambda record: record.timestamp)
+
+    return records
+
+
+class SchedulingRecorder:
+    """Record every scheduling input and outcome as compact JSON Lines."""
+
+    def __init__(self, log_file_path: str = "logs/scheduling.jsonl", store: "TelemetryStore" = None):
+        """Initializes the scheduling recorder.
+
+        Args:
+            log_file_path (`str`): Scheduling recording file path. Default is `logs/scheduling.jsonl`
+            store (`TelemetryStore`): Telemetry store to also append the records to. Default is `None`
+        """
+
+        self.log_file_path = log_file_path
+        self.store = store
+
+        log_dir = os.path.dirname(log_file_path)
+        if log_dir and not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+
+    def record(self, record: SchedulingRecord, snapshot: GPUSnapshot = None):
+        """Append the scheduling record to the recording (and the telemetry store).
+
+        Args:
+            record (`SchedulingRecord`): Scheduling record
+            snapshot (`GPUSnapshot`): Telemetry snapshot of the record, stored once for all of its records.
+                Default is `None`
+        """
+
+        with open(self.log_file_path, "a", encoding="utf-8") as f:
+            f.write(record.model_dump_json(exclude_none=True) + "\n")
+
+        if self.store is not None:
+            self.store.append_decision(record, snapshot)
+
+    def record_decision(
+        self,
+        gpu_dispatcher: GPUDispatcher,
+        model_name: str,
+        available_gpus: GPUNodeList = None,
+        resource_profile: str = None,
+        timings: Dict[str, float] = None,
+        priority: int = 0,
+        outcome: str = "placed",
+        timestamp: float = None,
+        snapshot: GPUSnapshot = None
+    ) -> SchedulingRecord:
+        """Record a scheduling decision of the GPU Dispatcher, with the telemetry snapshot it was made on.
+
+        Args:
+            gpu_dispatcher (`GPUDispatcher`): GPU Dispatcher which made the decision
+            model_name (`str`): Ollama model name, Like `gemma2:2b`
+            available_gpus (`GPUNodeList`): Available GPUs returned by the GPU Dispatcher. Default is `None`
+            resource_profile (`str`): Selected KubeAI resource profile. Default is `None`
+            timings (`Dict[str, float]`): Per-stage timings, unit: s. Default is `None`
+            priority (`int`): Priority of the model. Default is `0`
+            outcome (`str`): Scheduling outcome, `placed`、`no_gpu` or `error`. Default is `placed`
+            timestamp (`float`): Unix timestamp of the scheduling request. Default is `None` (now)
+            snapshot (`GPUSnapshot`): Telemetry snapshot the decision was made on. Default is `None`
+                (the latest snapshot of the GPU Dispatcher)
+
+        Returns:
+            record (`SchedulingRecord`): Recorded scheduling record
+        """
+
+        model_details = gpu_dispatcher.ollama_model_details.get(model_name)
+        selected_gpu = available_gpus.gpu_nodes[-1] if available_gpus and available_gpus.gpu_nodes else None
+
+        record = SchedulingRecord(
+            timestamp=time.time() if timestamp is None else timestamp,
+            model=model_name,
+            priority=priority,
+            model_details={
+                "parameter_size": model_details.parameter_size,
+                "quantization_level": model_details.quantization_level
+            } if model_details else None,
+            telemetry=compact_telemetry(snapshot.node_gpu_info if snapshot else gpu_dispatcher.node_gpu_info),
+            outcome=outcome,
+            node_name=selected_gpu.node_name if selected_gpu else None,
+            gpus=[gpu.index for gpu in selected_gpu.gpus] if selected_gpu else [],
+            resource_profile=resource_profile,
+            timings=timings or {}
+        )
+
+        self.record(record, snapshot)
+
+        return record
+
@@ -0,0 +1,222 @@
+import asyncio
+import copy
+import time
+from logging import Logger
+from typing import Any, Dict, List
+
+from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+from backend.llm.models import OllamaBuiltinModel
+from backend.replay.fakes import (
+    BUILTIN_MODEL_DETAILS,
+    FakeKubeAI,
+    FakeOllamaClient,
+    FakePrometheusClient
+)
+from backend.replay.recorder import SchedulingRecorder
+from backend.replay.types import ReplayMismatch, ReplayReport, SchedulingRecord
+
+
+class ReplayEngine:
+    """Replay the scheduling recordings through the GPU Dispatcher offline, against the fake Prometheus, Ollama and KubeAI backends."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        records: List[SchedulingRecord],
+        speed: float = 1000.0,
+        recorder: SchedulingRecorder = None
+    ):
+        """Initializes the replay engine.
+
+        Args:
+            logger (`Logger`): Logger of the replayed GPU Dispatcher
+            records (`List[SchedulingRecord]`): Scheduling records sorted by the timestamp
+            speed (`float`): Replay speed relative to the recording, `0` replays as fast as possible. Default is `1000.0`
+            recorder (`SchedulingRecorder`): Recorder to write the replayed decisions, Like a new regression baseline.
+                Default is `None`
+        """
+
+        self.logger = logger
+        self.records = records
+        self.speed = speed
+        self.recorder = recorder
+
+        self.prometheus_client = FakePrometheusClient(telemetry={})
+        self.ollama_client = FakeOllamaClient()
+        self.kubeai = FakeKubeAI()
+
+        self.gpu_dispatcher = GPUDispatcher(
+            logger=logger,
+            ollama_parameters_worker_url="",
+            prometheus_client=self.prometheus_client,
+            ollama_client=self.ollama_client
+        )
+
+        self._model_yaml: Dict[str, Dict[str, Any]] = {}
+
+    async def run(self) -> ReplayReport:
+        """Replay all of the scheduling records.
+
+        Returns:
+            replay_report (`ReplayReport`): Replay report
+        """
+
+        replay_report = ReplayReport()
+        if not self.records:
+            return replay_report
+
+        first_timestamp = self.records[0].timestamp
+        replay_report.recorded_duration = self.records[-1].timestamp - first_timestamp
+
+        start_time = time.perf_counter()
+
+        for index, record in enumerate(self.records):
+            # 依照紀錄的時間間隔 (除以 replay 速度) 重播
+            if self.speed > 0:
+                delay = (record.timestamp - first_timestamp) / self.speed - (time.perf_counter() - start_time)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            replayed = await self._replay(record)
+            replay_report.records += 1
+
+            decision_latency = sum(
+                replayed.timings.get(stage, 0.0) for stage in ("telemetry", "estimate", "select", "profile")
+            )
+            replay_report.decision_latencies.append(decision_latency)
+            for stage, timing in replayed.timings.items():
+                replay_report.stage_timings[stage] = replay_report.stage_timings.get(stage, 0.0) + timing
+
+            # 只比較實際紀錄的排程結果，`pending` 為尚未排程的合成紀錄
+            if record.outcome == "pending":
+                continue
+
+            if (record.resource_profile, record.node_name) == (replayed.resource_profile, replayed.node_name):
+                replay_report.matched += 1
+            else:
+                replay_report.mismatches.append(ReplayMismatch(
+                    index=index,
+                    model=record.model,
+                    recorded=f"{record.resource_profile}@{record.node_name}",
+                    replayed=f"{replayed.resource_profile}@{replayed.node_name}"
+                ))
+
+        replay_report.wall_time = time.perf_counter() - start_time
+
+        return replay_report
+
+    async def _replay(self, record: SchedulingRecord) -> SchedulingRecord:
+        """Replay a scheduling record through the GPU Dispatcher.
+
+        Args:
+            record (`SchedulingRecord`): Scheduling record
+
+        Returns:
+            replayed (`SchedulingRecord`): Replayed scheduling record
+        """
+
+        if record.telemetry:
+            self.prometheus_client.telemetry = record.telemetry
+
+        if record.model_details:
+            self.ollama_client.model_details[record.model] = record.model_details
+
+        timings: Dict[str, float] = {}
+        available_gpus = await self.gpu_dispatcher.get_available_gpus(record.model, timings)
+
+        resource_profile = None
+        outcome = "no_gpu"
+
+        if available_gpus is not None and len(available_gpus.gpu_nodes) > 0:
+            start_time = time.perf_counter()
+            try:
+                resource_profile = self.gpu_dispatcher.convert_to_kubeai_gpu_resources_name(
+                    selected_gpu=available_gpus.gpu_nodes[-1]
+                )
+                outcome = "placed"
+            except ValueError as e:
+                self.logger.warning(f"Replay error of {record.model}: {e}")
+                outcome = "error"
+            timings["profile"] = time.perf_counter() - start_time
+
+            if resource_profile is not None:
+                start_time = time.perf_counter()
+                model_yaml = self._get_model_yaml(record.model)
+                model_yaml["spec"]["resourceProfile"] = resource_profile
+                self.kubeai.apply_kubeai_model_custom_resource(model_yaml)
+                timings["apply"] = time.perf_counter() - start_time
+
+        if self.recorder is not None:
+            return self.recorder.record_decision(
+                gpu_dispatcher=self.gpu_dispatcher,
+                model_name=record.model,
+                available_gpus=available_gpus,
+                resource_profile=resource_profile,
+                timings=timings,
+                priority=record.priority,
+                outcome=outcome,
+                timestamp=record.timestamp
+            )
+
+        selected_gpu = available_gpus.gpu_nodes[-1] if available_gpus and available_gpus.gpu_nodes else None
+
+        return SchedulingRecord(
+            timestamp=record.timestamp,
+            model=record.model,
+            priority=record.priority,
+            outcome=outcome,
+            node_name=selected_gpu.node_name if selected_gpu else None,
+            gpus=[gpu.index for gpu in selected_gpu.gpus] if selected_gpu else [],
+            resource_profile=resource_profile,
+            timings=timings
+        )
+
+    def _get_model_yaml(self, model_name: str) -> Dict[str, Any]:
+        """Get a copy of the KubeAI Model Custom Resource of the model, the YAML file is parsed once per model.
+
+        Args:
+            model_name (`str`): Ollama model name
+
+        Returns:
+            model_yaml (`Dict[str, Any]`): KubeAI Model Custom Resource
+        """
+
+        if model_name not in self._model_yaml:
+            try:
+                self._model_yaml[model_name] = OllamaBuiltinModel(model_name).yaml
+            except ValueError:
+                self._model_yaml[model_name] = {
+                    "apiVersion": "kubeai.org/v1",
+                    "kind": "Model",
+                    "metadata": {"name": model_name.replace(":", "-").replace(".", "-"), "namespace": "default"},
+                    "spec": {"url": f"ollama://{model_name}"}
+                }
+
+        return copy.deepcopy(self._model_yaml[model_name])
+
+
+def build_fixture_records(count: int, interval: float = 1.0, models: List[str] = None) -> List[SchedulingRecord]:
+    """Build synthetic scheduling records on the static `dcgm_gpu_info.json` fixture.
+
+    Args:
+        count (`int`): Number of records
+        interval (`float`): Seconds between the records, unit: s. Default is `1.0`
+        models (`List[str]`): Ollama model names requested in turn. Default is `None` (all of `BUILTIN_MODEL_DETAILS`)
+
+    Returns:
+        records (`List[SchedulingRecord]`): Synthetic scheduling records with the `pending` outcome
+    """
+
+    telemetry = FakePrometheusClient().telemetry
+    models = models or list(BUILTIN_MODEL_DETAILS.keys())
+
+    return [
+        SchedulingRecord(
+            timestamp=i * interval,
+            model=models[i % len(models)],
+            model_details=BUILTIN_MODEL_DETAILS.get(models[i % len(models)]),
+            telemetry=telemetry,
+            outcome="pending"
+        ) for i in range(count)
+    ]
+
@@ -0,0 +1,101 @@
+import math
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, computed_field
+
+
+class SchedulingRecord(BaseModel):
+
+    timestamp: float
+    """Unix timestamp of the scheduling request"""
+
+    model: str
+    """Ollama model name, Like `gemma2:2b`"""
+
+    priority: int = 0
+    """Priority of the model"""
+
+    model_details: Optional[Dict[str, Optional[str]]] = None
+    """Ollama model details used by the VRAM estimation (`parameter_size`, `quantization_level`)"""
+
+    estimate_vram: Optional[int] = None
+    """Estimated VRAM, unit: MiB"""
+
+    telemetry: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict)
+    """PromQL query to the compacted Prometheus vector result (`metric` labels and `value`)"""
+
+    outcome: str = "placed"
+    """Scheduling outcome, `placed`、`no_gpu` or `error`"""
+
+    node_name: Optional[str] = None
+    """Selected Kubernetes Node name"""
+
+    gpus: List[str] = Field(default_factory=list)
+    """Selected GPU indexes, Like `cuda:0`"""
+
+    resource_profile: Optional[str] = None
+    """Selected KubeAI resource profile, Like `nvidia-gpu-4070-12gb:1`"""
+
+    timings: Dict[str, float] = Field(default_factory=dict)
+    """Per-stage timings, unit: s"""
+
+
+class ReplayMismatch(BaseModel):
+
+    index: int
+    """Index of the record in the recording"""
+
+    model: str
+    """Ollama model name"""
+
+    recorded: Optional[str] = None
+    """Recorded KubeAI resource profile (and node)"""
+
+    replayed: Optional[str] = None
+    """Replayed KubeAI resource profile (and node)"""
+
+
+class ReplayReport(BaseModel):
+
+    records: int = 0
+    """Number of replayed records"""
+
+    matched: int = 0
+    """Number of records whose replayed placement equals the recorded placement"""
+
+    mismatches: List[ReplayMismatch] = Field(default_factory=list)
+    """Records whose replayed placement differs from the recorded placement"""
+
+    decision_latencies: List[float] = Field(default_factory=list, exclude=True)
+    """Replayed scheduling decision latencies, unit: s"""
+
+    stage_timings: Dict[str, float] = Field(default_factory=dict)
+    """Total replayed per-stage timings, unit: s"""
+
+    recorded_duration: float = 0.0
+    """Duration of the recording, unit: s"""
+
+    wall_time: float = 0.0
+    """Wall time of the replay, unit: s"""
+
+    @computed_field
+    @property
+    def speedup(self) -> float:
+        """Recorded duration divided by the replay wall time"""
+
+        return self.recorded_duration / self.wall_time if self.wall_time else 0.0
+
+    @computed_field
+    @property
+    def decision_latency_percentiles(self) -> Dict[str, float]:
+        """Percentiles (`p50`、`p95`、`p99`) of the replayed scheduling decision latencies, unit: s"""
+
+        if not self.decision_latencies:
+            return {}
+
+        latencies = sorted(self.decision_latencies)
+
+        return {
+            f"p{p}": latencies[max(math.ceil(len(latencies) * p / 100) - 1, 0)]
+            for p in (50, 95, 99)
+        }
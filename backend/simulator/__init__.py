@@ -0,0 +1,131 @@
+from typing import TYPE_CHECKING
+
+from shared.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .benchmark import BENCHMARK_CLUSTER_SIZES, benchmark_scheduler
+    from .cluster import (
+        ClusterSimulator,
+        SimulatedCluster,
+        SimulatedPrometheusClient,
+        generate_cluster
+    )
+    from .concurrency import ChurningPrometheusClient, stress_dispatcher
+    from .deployment import DEPLOYMENT_MODELS, SimulatedKubeAIModelClient, benchmark_deployment
+    from .inventory import INVENTORY_CLUSTER_SIZES, INVENTORY_MODES, benchmark_inventory, build_pydantic_snapshot
+    from .logging_overhead import LOGGING_MODES, benchmark_logging_overhead
+    from .telemetry import (
+        TELEMETRY_PATHS,
+        PollingPrometheusClient,
+        SimulatedExporterServer,
+        benchmark_telemetry,
+        benchmark_telemetry_mode
+    )
+    from .types import (
+        ConcurrencyReport,
+        DeploymentBenchmarkReport,
+        InventoryReport,
+        LoggingOverheadReport,
+        SimulatedNodeSpec,
+        SimulationConfig,
+        SimulationReport,
+        TelemetryReport
+    )
+
+# 子模組 (以及其相依套件) 於第一次使用時才載入
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".benchmark": [
+        "BENCHMARK_CLUSTER_SIZES",
+        "benchmark_scheduler",
+    ],
+    ".cluster": [
+        "ClusterSimulator",
+        "SimulatedCluster",
+        "SimulatedPrometheusClient",
+        "generate_cluster",
+    ],
+    ".concurrency": [
+        "ChurningPrometheusClient",
+        "stress_dispatcher",
+    ],
+    ".deployment": [
+        "DEPLOYMENT_MODELS",
+        "SimulatedKubeAIModelClient",
+        "benchmark_deployment",
+    ],
+    ".inventory": [
+        "INVENTORY_CLUSTER_SIZES",
+        "INVENTORY_MODES",
+        "benchmark_inventory",
+        "build_pydantic_snapshot",
+    ],
+    ".logging_overhead": [
+        "LOGGING_MODES",
+        "benchmark_logging_overhead",
+    ],
+    ".telemetry": [
+        "TELEMETRY_PATHS",
+        "PollingPrometheusClient",
+        "SimulatedExporterServer",
+        "benchmark_telemetry",
+        "benchmark_telemetry_mode",
+    ],
+    ".types": [
+        "ConcurrencyReport",
+        "DeploymentBenchmarkReport",
+        "InventoryReport",
+        "LoggingOverheadReport",
+        "SimulatedNodeSpec",
+        "SimulationConfig",
+        "SimulationReport",
+        "TelemetryReport",
+    ],
+})
+
+__all__ = [
+    # Benchmark
+    "BENCHMARK_CLUSTER_SIZES",
+    "benchmark_scheduler",
+
+    # Cluster Simulator
+    "ClusterSimulator",
+    "SimulatedCluster",
+    "SimulatedPrometheusClient",
+    "generate_cluster",
+
+    # Concurrency
+    "ChurningPrometheusClient",
+    "stress_dispatcher",
+
+    # Deployment
+    "DEPLOYMENT_MODELS",
+    "SimulatedKubeAIModelClient",
+    "benchmark_deployment",
+
+    # Inventory
+    "INVENTORY_CLUSTER_SIZES",
+    "INVENTORY_MODES",
+    "benchmark_inventory",
+    "build_pydantic_snapshot",
+
+    # Logging Overhead
+    "LOGGING_MODES",
+    "benchmark_logging_overhead",
+
+    # Telemetry
+    "TELEMETRY_PATHS",
+    "PollingPrometheusClient",
+    "SimulatedExporterServer",
+    "benchmark_telemetry",
+    "benchmark_telemetry_mode",
+
+    # Types
+    "ConcurrencyReport",
+    "DeploymentBenchmarkReport",
+    "InventoryReport",
+    "LoggingOverheadReport",
+    "SimulatedNodeSpec",
+    "SimulationConfig",
+    "SimulationReport",
+    "TelemetryReport",
+]
@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+from logging import WARNING, getLevelName, getLogger
+
+from backend.simulator.benchmark import BENCHMARK_CLUSTER_SIZES, benchmark_scheduler
+from backend.simulator.concurrency import stress_dispatcher
+from backend.simulator.deployment import benchmark_deployment
+from backend.simulator.inventory import benchmark_inventory
+from backend.simulator.logging_overhead import LOGGING_MODES, benchmark_logging_overhead
+from backend.simulator.telemetry import TELEMETRY_PATHS, benchmark_telemetry
+from backend.simulator.types import SimulationConfig
+
+
+def parsed_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the GPU Dispatcher on simulated GPU clusters"
+    )
+    parser.add_argument("--nodes", type=int, nargs="+", default=BENCHMARK_CLUSTER_SIZES)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--arrival_rate", type=float, default=0.05, help="Arrival rate of the 3-node cluster, unit: requests/s")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--logging",
+        type=str,
+        nargs="*",
+        choices=LOGGING_MODES,
+        default=None,
+        help="Benchmark the logging overhead per decision of the logging modes (on the first `--nodes` cluster size)"
+    )
+    parser.add_argument("--log_level", type=str, choices=["DEBUG", "INFO"], default="DEBUG")
+    parser.add_argument(
+        "--image_pull_bandwidth",
+        type=float,
+        default=None,
+        help="Simulate the model image pulls with this bandwidth per node, unit: MiB/s"
+    )
+    parser.add_argument(
+        "--image_cache_aware",
+        action="store_true",
+        help="The GPU Dispatcher prefers the nodes which cache the model image"
+    )
+    parser.add_argument(
+        "--tensor_split",
+        action="store_true",
+        help="The GPU Dispatcher plans the multi-GPU placements with the layer split of the model and the GPU topology"
+    )
+    parser.add_argument(
+        "--inventory",
+        action="store_true",
+        help="Benchmark the build time and the memory of a GPU inventory snapshot (pydantic vs slotted) per `--nodes`"
+    )
+    parser.add_argument(
+        "--stress",
+        type=int,
+        default=None,
+        metavar="CALLS",
+        help="Run CALLS concurrent `get_available_gpus` calls on one GPU Dispatcher per `--nodes` and check the snapshot "
+             "consistency, exit with 1 if inconsistent"
+    )
+    parser.add_argument(
+        "--telemetry",
+        type=str,
+        nargs="*",
+        choices=TELEMETRY_PATHS,
+        default=None,
+        help="Benchmark the snapshot freshness of the telemetry paths (polling Prometheus or scraping the simulated "
+             "DCGM Exporters) per `--nodes`"
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="Duration per telemetry path, unit: s")
+    parser.add_argument("--prometheus_interval", type=float, default=15.0, help="Prometheus scrape interval, unit: s")
+    parser.add_argument(
+        "--scrape_interval",
+        type=float,
+        default=1.0,
+        help="Background scrape interval of `scrape-background`, unit: s"
+    )
+    parser.add_argument(
+        "--deployment",
+        type=str,
+        nargs="*",
+        default=None,
+        metavar="MODEL[=REPLICAS]",
+        help="Benchmark the warm-up time of the parallel multi-model deployment against the sequential one per "
+             "`--nodes`. Default is `DEPLOYMENT_MODELS`"
+    )
+    parser.add_argument("--max_parallel", type=int, default=4, help="Max number of concurrent KubeAI Model applies")
+    parser.add_argument("--time_scale", type=float, default=0.01, help="Wall seconds per simulated second")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parsed_args()
+
+    config = SimulationConfig(
+        requests=args.requests,
+        arrival_rate=args.arrival_rate,
+        seed=args.seed,
+        image_pull_bandwidth=args.image_pull_bandwidth,
+        image_cache_aware=args.image_cache_aware,
+        tensor_split=args.tensor_split
+    )
+
+    if args.logging is not None:
+        logging_overhead_reports = asyncio.run(benchmark_logging_overhead(
+            modes=args.logging,
+            nodes=args.nodes[0],
+            config=config,
+            level=getLevelName(args.log_level)
+        ))
+
+        for logging_overhead_report in logging_overhead_reports:
+            print(logging_overhead_report.model_dump_json())
+
+        exit(0)
+
+    simulator_logger = getLogger("GPU Delegater Simulator")
+    simulator_logger.setLevel(WARNING)
+
+    if args.inventory:
+        inventory_reports = asyncio.run(benchmark_inventory(simulator_logger, cluster_sizes=args.nodes))
+
+        for inventory_report in inventory_reports:
+            print(inventory_report.model_dump_json())
+
+        exit(0)
+
+    if args.stress is not None:
+        concurrency_reports = [
+            asyncio.run(stress_dispatcher(simulator_logger, nodes=nodes, calls=args.stress)) for nodes in args.nodes
+        ]
+
+        for concurrency_report in concurrency_reports:
+            print(concurrency_report.model_dump_json())
+
+        exit(1 if any(concurrency_report.inconsistencies for concurrency_report in concurrency_reports) else 0)
+
+    if args.telemetry is not None:
+        for nodes in args.nodes:
+            telemetry_reports = asyncio.run(benchmark_telemetry(
+                simulator_logger,
+                nodes=nodes,
+                modes=args.telemetry or TELEMETRY_PATHS,
+                duration=args.duration,
+                prometheus_interval=args.prometheus_interval,
+                scrape_interval=args.scrape_interval
+            ))
+
+            for telemetry_report in telemetry_reports:
+                print(telemetry_report.model_dump_json())
+
+        exit(0)
+
+    if args.deployment is not None:
+        from backend.gpu.dispatcher.deployment import parse_model_replicas
+
+        for nodes in args.nodes:
+            deployment_benchmark_report = asyncio.run(benchmark_deployment(
+                simulator_logger,
+                desired=parse_model_replicas(args.deployment) if args.deployment else None,
+                nodes=nodes,
+                max_parallel=args.max_parallel,
+                time_scale=args.time_scale
+            ))
+
+            print(deployment_benchmark_report.model_dump_json())
+
+        exit(0)
+
+    simulation_reports = asyncio.run(benchmark_scheduler(
+        simulator_logger,
+        cluster_sizes=args.nodes,
+        config=config
+    ))
+
+    for simulation_report in simulation_reports:
+        print(simulation_report.model_dump_json())
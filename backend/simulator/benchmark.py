@@ -0,0 +1,38 @@
+from logging import Logger
+from typing import List
+
+from backend.simulator.cluster import ClusterSimulator, generate_cluster
+from backend.simulator.types import SimulationConfig, SimulationReport
+
+
+BENCHMARK_CLUSTER_SIZES = [3, 10, 50, 100, 500]
+"""Number of nodes of the benchmarked clusters"""
+
+
+async def benchmark_scheduler(
+    logger: Logger,
+    cluster_sizes: List[int] = None,
+    config: SimulationConfig = None
+) -> List[SimulationReport]:
+    """Benchmark the GPU Dispatcher on simulated clusters of different sizes.
+
+    The arrival rate is scaled with the number of nodes, so that the larger clusters are loaded as much as the smaller ones.
+
+    Args:
+        logger (`Logger`): Logger of the simulated GPU Dispatcher
+        cluster_sizes (`List[int]`): Number of nodes of the benchmarked clusters. Default is `None` (`BENCHMARK_CLUSTER_SIZES`)
+        config (`SimulationConfig`): Simulation configuration of the 3-node cluster. Default is `None` (`SimulationConfig()`)
+
+    Returns:
+        simulation_reports (`List[SimulationReport]`): Simulation report per cluster size
+    """
+
+    config = config or SimulationConfig()
+    simulation_reports: List[SimulationReport] = []
+
+    for nodes in cluster_sizes or BENCHMARK_CLUSTER_SIZES:
+        cluster_config = config.model_copy(update={"arrival_rate": config.arrival_rate * nodes / 3})
+        simulator = ClusterSimulator(logger, generate_cluster(nodes), cluster_config)
+        simulation_reports.append(await simulator.run())
+
+    return simulation_reports
@@ -0,0 +1,555 @@
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from logging import Logger
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from backend.gpu.dispatcher.catalog import get_gpu_catalog
+from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+from backend.gpu.dispatcher.images import ImageCache, model_image
+from backend.gpu.dispatcher.inventory import GPUState, NodeState
+from backend.gpu.dispatcher.tensor_split import (
+    DEFAULT_MODEL_LAYERS,
+    NodeTopology,
+    TensorSplitPlanner,
+    parse_gpu_groups
+)
+from backend.gpu.dispatcher.types import GPUNode
+from backend.gpu.monitoring.decoding import VectorSample
+from backend.replay.fakes import FakeOllamaClient
+from backend.simulator.types import SimulatedNodeSpec, SimulationConfig, SimulationReport
+from shared.const.format import iB
+
+
+GPU_THROUGHPUT: Dict[str, float] = {
+    "3070ti": 0.85,
+    "3080ti": 1.0,
+    "4070": 1.0,
+    "4080super": 1.35,
+    "4090": 1.8,
+    "t4": 0.45,
+    "l4": 0.8,
+    "a10": 0.95,
+    "a10g": 0.95,
+    "l40s": 2.0,
+    "a100": 2.6,
+    "h100": 3.6,
+}
+"""KubeAI resource profile stem to the token generation throughput relative to the RTX 4070"""
+
+MODEL_TOKENS_PER_SECOND: Dict[str, float] = {
+    "gemma2:2b": 110.0,
+    "llama3.2:3b": 90.0,
+    "llama3.1:8b": 50.0,
+    "gemma2:9b": 45.0,
+    "gemma2:27b": 18.0,
+    "llama3.3:70b": 8.0,
+}
+"""Ollama model name to the token generation rate on a single RTX 4070, unit: tokens/s"""
+
+MULTI_GPU_EFFICIENCY = 0.85
+"""Throughput factor per additional GPU of a layer-split model (PCIe traffic between the GPUs)"""
+
+NODE_TEMPLATES: List[Tuple[str, int]] = [
+    ("NVIDIA GeForce RTX 3070 Ti", 1),
+    ("NVIDIA GeForce RTX 4070", 2),
+    ("NVIDIA GeForce RTX 4090", 1),
+    ("NVIDIA L4", 4),
+    ("NVIDIA A100-SXM4-80GB", 8),
+]
+"""(GPU model, GPU count) of the generated nodes, the first two are the paper's worker nodes"""
+
+NODE_TOPOLOGY: Dict[Tuple[str, int], NodeTopology] = {
+    ("NVIDIA L4", 4): NodeTopology(pcie_switches=parse_gpu_groups("0,1;2,3")),
+    ("NVIDIA A100-SXM4-80GB", 8): NodeTopology(nvlink=parse_gpu_groups("0,1,2,3,4,5,6,7")),
+}
+"""(GPU model, GPU count) to the GPU interconnect topology of the generated nodes, the others are connected through
+the CPU root complex"""
+
+
+def generate_cluster(nodes: int) -> List[SimulatedNodeSpec]:
+    """Generate a heterogeneous GPU cluster.
+
+    Args:
+        nodes (`int`): Number of nodes
+
+    Returns:
+        node_specs (`List[SimulatedNodeSpec]`): Simulated node specifications
+    """
+
+    return [
+        SimulatedNodeSpec(
+            node_name=f"sim-node-{i:04d}",
+            gpu_model=NODE_TEMPLATES[i % len(NODE_TEMPLATES)][0],
+            gpu_count=NODE_TEMPLATES[i % len(NODE_TEMPLATES)][1]
+        ) for i in range(nodes)
+    ]
+
+
+def generate_topology(node_specs: List[SimulatedNodeSpec]) -> Dict[Tuple[Optional[str], str], NodeTopology]:
+    """GPU interconnect topology of the simulated nodes, Like the topology annotations of the nodes.
+
+    Args:
+        node_specs (`List[SimulatedNodeSpec]`): Simulated node specifications
+
+    Returns:
+        topology (`Dict[Tuple[Optional[str], str], NodeTopology]`): (cluster, Kubernetes Node name) to the GPU
+            interconnect topology of the node
+    """
+
+    return {
+        (None, node_spec.node_name): NODE_TOPOLOGY[(node_spec.gpu_model, node_spec.gpu_count)]
+        for node_spec in node_specs if (node_spec.gpu_model, node_spec.gpu_count) in NODE_TOPOLOGY
+    }
+
+
+class SimulatedGPU:
+    """GPU state of the simulated cluster."""
+
+    def __init__(self, node_name: str, index: int, name: str, vram: int, throughput: float):
+        """Initializes the simulated GPU.
+
+        Args:
+            node_name (`str`): Kubernetes Node name
+            index (`int`): GPU index on the node
+            name (`str`): GPU model name
+            vram (`int`): GPU VRAM, unit: MiB
+            throughput (`float`): Token generation throughput relative to the RTX 4070
+        """
+
+        self.node_name = node_name
+        self.index = index
+        self.uuid = f"GPU-{node_name}-{index}"
+        self.name = name
+        self.vram = vram
+        self.throughput = throughput
+
+        self.used_memory = 0
+        self.active_jobs = 0
+        self.busy_since: Optional[float] = None
+
+
+class SimulatedCluster:
+    """Nodes and GPUs of the simulated cluster, exposed as DCGM Exporter metrics."""
+
+    def __init__(self, node_specs: List[SimulatedNodeSpec]):
+        """Initializes the simulated cluster.
+
+        Args:
+            node_specs (`List[SimulatedNodeSpec]`): Simulated node specifications
+
+        Raises:
+            ValueError: If the GPU model is not in the GPU Model Mapping table
+        """
+
+        gpu_catalog = get_gpu_catalog()
+
+        self.gpus: Dict[Tuple[str, str], SimulatedGPU] = {}
+        """(Kubernetes Node name, GPU index like `cuda:0`) to the simulated GPU"""
+
+        for node_spec in node_specs:
+            gpu_model = gpu_catalog.get(node_spec.gpu_model)
+            if gpu_model is None:
+                raise ValueError(f"Unsupported GPU model: {node_spec.gpu_model}")
+
+            for index in range(node_spec.gpu_count):
+                self.gpus[(node_spec.node_name, f"cuda:{index}")] = SimulatedGPU(
+                    node_name=node_spec.node_name,
+                    index=index,
+                    name=gpu_model.model,
+                    vram=gpu_model.vram * iB,
+                    throughput=GPU_THROUGHPUT.get(gpu_model.profile, 1.0)
+                )
+
+        self.node_gpus: Dict[str, List[SimulatedGPU]] = {}
+        """Kubernetes Node name to the simulated GPUs of the node"""
+
+        for gpu in self.gpus.values():
+            self.node_gpus.setdefault(gpu.node_name, []).append(gpu)
+
+        self.nodes = len(node_specs)
+
+    def telemetry(self) -> Dict[str, List[Dict[str, Any]]]:
+        """DCGM Exporter metrics of the current cluster state.
+
+        Returns:
+            telemetry (`Dict[str, List[Dict[str, Any]]]`): PromQL query to the vector result
+        """
+
+        now = time.time()
+        telemetry: Dict[str, List[Dict[str, Any]]] = {
+            "DCGM_FI_DEV_FB_FREE": [],
+            "DCGM_FI_DEV_FB_USED": [],
+            "DCGM_FI_DEV_GPU_TEMP": [],
+            "DCGM_FI_DEV_GPU_UTIL": [],
+            "DCGM_FI_DEV_POWER_USAGE": [],
+        }
+
+        for gpu in self.gpus.values():
+            metric = {
+                "kubernetes_node": gpu.node_name,
+                "gpu": str(gpu.index),
+                "UUID": gpu.uuid,
+                "modelName": gpu.name,
+            }
+            busy = gpu.active_jobs > 0
+
+            for query, value in (
+                ("DCGM_FI_DEV_FB_FREE", gpu.vram - gpu.used_memory),
+                ("DCGM_FI_DEV_FB_USED", gpu.used_memory),
+                ("DCGM_FI_DEV_GPU_TEMP", 70 if busy else 40),
+                ("DCGM_FI_DEV_GPU_UTIL", 100 if busy else 0),
+                ("DCGM_FI_DEV_POWER_USAGE", 200 if busy else 20),
+            ):
+                telemetry[query].append({"metric": metric, "value": [now, str(value)]})
+
+        return telemetry
+
+    def samples(self, node_name: str = None) -> Dict[str, List[VectorSample]]:
+        """DCGM Exporter metrics of the current cluster state as the typed vector samples.
+
+        Args:
+            node_name (`str`): Only the GPUs of the node, Like the DCGM Exporter of the node. Default is `None`
+                (all nodes)
+
+        Returns:
+            samples (`Dict[str, List[VectorSample]]`): PromQL query to the samples of the vector result
+        """
+
+        now = time.time()
+        samples: Dict[str, List[VectorSample]] = {
+            "DCGM_FI_DEV_FB_FREE": [],
+            "DCGM_FI_DEV_FB_USED": [],
+            "DCGM_FI_DEV_GPU_TEMP": [],
+            "DCGM_FI_DEV_GPU_UTIL": [],
+            "DCGM_FI_DEV_POWER_USAGE": [],
+        }
+
+        for gpu in self.gpus.values() if node_name is None else self.node_gpus.get(node_name, []):
+            busy = gpu.active_jobs > 0
+
+            for query, value in (
+                ("DCGM_FI_DEV_FB_FREE", gpu.vram - gpu.used_memory),
+                ("DCGM_FI_DEV_FB_USED", gpu.used_memory),
+                ("DCGM_FI_DEV_GPU_TEMP", 70 if busy else 40),
+                ("DCGM_FI_DEV_GPU_UTIL", 100 if busy else 0),
+                ("DCGM_FI_DEV_POWER_USAGE", 200 if busy else 20),
+            ):
+                samples[query].append(
+                    VectorSample(gpu.node_name, str(gpu.index), gpu.uuid, gpu.name, None, None, now, value)
+                )
+
+        return samples
+
+
+class SimulatedPrometheusClient:
+    """Prometheus client which serves the live DCGM Exporter metrics of the simulated cluster."""
+
+    def __init__(self, cluster: SimulatedCluster):
+        """Initializes the simulated Prometheus client.
+
+        Args:
+            cluster (`SimulatedCluster`): Simulated cluster
+        """
+
+        self.cluster = cluster
+
+    async def execute_query(self, query: str) -> Dict:
+        """Execute a query on the simulated cluster.
+
+        Args:
+            query (`str`): PromQL query to execute, only the DCGM metric names are supported
+
+        Returns:
+            response (`Dict`): Query result in the Prometheus HTTP API format
+        """
+
+        return (await self.execute_multiple_queries([query]))[query]
+
+    async def execute_multiple_queries(self, queries: List[str]) -> Dict[str, Dict]:
+        """Execute multiple queries on the simulated cluster.
+
+        Args:
+            queries (`List[str]`): List of PromQL queries to execute
+
+        Returns:
+            queries_response (`Dict[str, Dict]`): Dictionary of query results
+        """
+
+        telemetry = self.cluster.telemetry()
+
+        return {
+            query: {
+                "status": "success",
+                "data": {"resultType": "vector", "result": telemetry.get(query, [])}
+            } for query in queries
+        }
+
+    async def execute_multiple_vector_queries(self, queries: List[str]) -> Dict[str, List[VectorSample]]:
+        """Execute multiple instant vector queries on the simulated cluster.
+
+        Args:
+            queries (`List[str]`): List of PromQL queries to execute
+
+        Returns:
+            queries_samples (`Dict[str, List[VectorSample]]`): Dictionary of the samples of the vector results
+        """
+
+        samples = self.cluster.samples()
+
+        return {query: samples.get(query, []) for query in queries}
+
+
+class ClusterSimulator:
+    """Discrete-event simulation of the inference requests scheduled by the GPU Dispatcher on a simulated cluster."""
+
+    def __init__(self, logger: Logger, node_specs: List[SimulatedNodeSpec], config: SimulationConfig = None):
+        """Initializes the cluster simulator.
+
+        Args:
+            logger (`Logger`): Logger of the simulated GPU Dispatcher
+            node_specs (`List[SimulatedNodeSpec]`): Simulated node specifications
+            config (`SimulationConfig`): Simulation configuration. Default is `None` (`SimulationConfig()`)
+        """
+
+        self.logger = logger
+        self.config = config or SimulationConfig()
+        self.cluster = SimulatedCluster(node_specs)
+
+        self.node_images: Dict[str, Set[str]] = {}
+        """Kubernetes Node name to the model images pulled on the node"""
+
+        # GPU Dispatcher 的映像檔快取於每次拉取後更新，等同於即時的 Node `status.images`
+        self.image_cache = ImageCache(
+            logger=logger,
+            pull_bandwidth=self.config.image_pull_bandwidth
+        ) if self.config.image_pull_bandwidth is not None and self.config.image_cache_aware else None
+
+        # 不論 GPU Dispatcher 是否使用，都以 Ollama 的 layer 切分檢查多 GPU 的放置
+        self.tensor_split = TensorSplitPlanner(topology=generate_topology(node_specs))
+
+        self.gpu_dispatcher = GPUDispatcher(
+            logger=logger,
+            ollama_parameters_worker_url="",
+            prometheus_client=SimulatedPrometheusClient(self.cluster),
+            ollama_client=FakeOllamaClient(),
+            image_cache=self.image_cache,
+            tensor_split=self.tensor_split if self.config.tensor_split else None
+        )
+
+    async def run(self) -> SimulationReport:
+        """Run the simulation.
+
+        Returns:
+            simulation_report (`SimulationReport`): Simulation report
+        """
+
+        rng = random.Random(self.config.seed)
+        report = SimulationReport(
+            nodes=self.cluster.nodes,
+            gpus=len(self.cluster.gpus),
+            requests=self.config.requests
+        )
+
+        models = list(self.config.model_weights.keys())
+        weights = list(self.config.model_weights.values())
+
+        sequence = itertools.count()
+        events: List[Tuple[float, int, str, Any]] = []
+
+        arrival_time = 0.0
+        for _ in range(self.config.requests):
+            arrival_time += rng.expovariate(self.config.arrival_rate)
+            request = {
+                "model": rng.choices(models, weights)[0],
+                "arrival": arrival_time,
+                "tokens": max(1, int(rng.expovariate(1 / self.config.output_tokens)))
+            }
+            heapq.heappush(events, (arrival_time, next(sequence), "arrival", request))
+
+        queue: Deque[Dict[str, Any]] = deque()
+        first_arrival = events[0][0] if events else 0.0
+        now = first_arrival
+
+        while events:
+            now, _, kind, payload = heapq.heappop(events)
+
+            if kind == "arrival":
+                queue.append(payload)
+            else:
+                self._release(payload, now, report)
+
+            await self._schedule(queue, now, events, sequence, report)
+
+        # 模擬結束時仍在佇列中的請求視為拒絕
+        report.rejected += len(queue)
+        report.makespan = now - first_arrival
+
+        return report
+
+    async def _schedule(
+        self,
+        queue: Deque[Dict[str, Any]],
+        now: float,
+        events: List[Tuple[float, int, str, Any]],
+        sequence: "itertools.count",
+        report: SimulationReport
+    ):
+        """Try to place the queued requests (FIFO) through the GPU Dispatcher.
+
+        Args:
+            queue (`Deque[Dict[str, Any]]`): Queued requests
+            now (`float`): Simulated time, unit: s
+            events (`List[Tuple[float, int, str, Any]]`): Event heap
+            sequence (`itertools.count`): Event sequence for the stable ordering
+            report (`SimulationReport`): Simulation report
+        """
+
+        failed_models = set()
+        remaining: Deque[Dict[str, Any]] = deque()
+
+        while queue:
+            request = queue.popleft()
+
+            if now - request["arrival"] > self.config.max_queue_wait:
+                report.rejected += 1
+                continue
+
+            # 同一輪排程中已經無法放置的模型，不需要再次詢問 GPU Dispatcher
+            if request["model"] in failed_models:
+                remaining.append(request)
+                continue
+
+            start_time = time.perf_counter()
+            available_gpus = await self.gpu_dispatcher.get_available_gpus(request["model"])
+            estimate_vram = await self.gpu_dispatcher.estimate_model_vram(request["model"])
+            report.decision_wall_time += time.perf_counter() - start_time
+            report.decisions += 1
+
+            if available_gpus is None or len(available_gpus.gpu_nodes) < 1:
+                failed_models.add(request["model"])
+                remaining.append(request)
+                continue
+
+            selected_gpu = available_gpus.gpu_nodes[-1]
+            job = self._allocate(selected_gpu, request, estimate_vram, now)
+
+            report.accepted += 1
+            report.queue_waits.append(now - request["arrival"])
+            report.tokens += request["tokens"]
+
+            if job["pull"]:
+                report.image_pulls += 1
+                report.image_pull_seconds += job["pull"]
+
+            if len(job["allocations"]) > 1:
+                report.multi_gpu_placements += 1
+            if job["split_failed"]:
+                report.split_failures += 1
+
+            heapq.heappush(events, (job["end"], next(sequence), "completion", job))
+
+        queue.extend(remaining)
+
+    def _allocate(self, selected_gpu: GPUNode, request: Dict[str, Any], estimate_vram: int, now: float) -> Dict[str, Any]:
+        """Allocate the VRAM of the selected GPUs to the request.
+
+        Args:
+            selected_gpu (`GPUNode`): Selected GPU resources
+            request (`Dict[str, Any]`): Inference request
+            estimate_vram (`int`): Estimated VRAM of the model, unit: MiB
+            now (`float`): Simulated time, unit: s
+
+        Returns:
+            job (`Dict[str, Any]`): Running job with the allocations and the completion time
+        """
+
+        allocations: List[Tuple[SimulatedGPU, int]] = []
+        remaining_vram = estimate_vram
+
+        gpus = [self.cluster.gpus[(selected_gpu.node_name, gpu_info.index)] for gpu_info in selected_gpu.gpus]
+        tensor_split = self.tensor_split.split(
+            NodeState(node_name=selected_gpu.node_name, gpus=()),
+            [
+                GPUState(index=gpu_info.index, uuid=gpu.uuid, name=gpu.name, free_memory=gpu.vram - gpu.used_memory)
+                for gpu_info, gpu in zip(selected_gpu.gpus, gpus)
+            ],
+            estimate_vram,
+            self.tensor_split.model_layers.get(request["model"], DEFAULT_MODEL_LAYERS)
+        )
+        split_memory = {
+            gpu.index: memory for gpu, memory in zip(tensor_split.gpus, tensor_split.memory)
+        } if tensor_split is not None else {}
+
+        # 與 Ollama 相同，依序將模型的 layer 放置到選擇的 GPU 上
+        for gpu_info, gpu in zip(selected_gpu.gpus, gpus):
+            vram = min(gpu.vram - gpu.used_memory, remaining_vram)
+            if gpu_info is selected_gpu.gpus[-1]:
+                vram = remaining_vram
+            if self.config.tensor_split and tensor_split is not None:
+                # 各 GPU 依 layer 切分結果分配 (包含各自的 compute graph)
+                vram = split_memory.get(gpu_info.index, 0)
+
+            gpu.used_memory += vram
+            if gpu.active_jobs == 0:
+                gpu.busy_since = now
+            gpu.active_jobs += 1
+
+            allocations.append((gpu, vram))
+            remaining_vram -= vram
+
+        gpu_count = len(allocations)
+        throughput = min(gpu.throughput for gpu, _ in allocations) * (MULTI_GPU_EFFICIENCY ** (gpu_count - 1))
+        tokens_per_second = MODEL_TOKENS_PER_SECOND.get(request["model"], 30.0) * throughput
+
+        pull = self._pull_image(selected_gpu.node_name, request["model"], estimate_vram)
+        startup = pull + self.config.pod_startup_seconds + estimate_vram / self.config.load_bandwidth
+        end = now + startup + request["tokens"] / tokens_per_second
+
+        return {"allocations": allocations, "end": end, "pull": pull, "split_failed": tensor_split is None}
+
+    def _pull_image(self, node_name: str, model_name: str, estimate_vram: int) -> float:
+        """Pull the model image on the node if it is not cached yet, the images are never evicted.
+
+        Args:
+            node_name (`str`): Kubernetes Node name
+            model_name (`str`): Ollama model name
+            estimate_vram (`int`): Estimated VRAM of the model, the weights baked into the image, unit: MiB
+
+        Returns:
+            pull_seconds (`float`): Image pull time, `0` if the image is cached or the pulls are not simulated, unit: s
+        """
+
+        if self.config.image_pull_bandwidth is None:
+            return 0.0
+
+        image = model_image(model_name) or model_name
+        node_images = self.node_images.setdefault(node_name, set())
+        if image in node_images:
+            return 0.0
+
+        node_images.add(image)
+        if self.image_cache is not None:
+            self.image_cache.mark_pulled(None, node_name, image, estimate_vram)
+
+        return estimate_vram / self.config.image_pull_bandwidth
+
+    def _release(self, job: Dict[str, Any], now: float, report: SimulationReport):
+        """Release the VRAM of the completed job.
+
+        Args:
+            job (`Dict[str, Any]`): Completed job
+            now (`float`): Simulated time, unit: s
+            report (`SimulationReport`): Simulation report
+        """
+
+        for gpu, vram in job["allocations"]:
+            gpu.used_memory -= vram
+            gpu.active_jobs -= 1
+
+            if gpu.active_jobs == 0 and gpu.busy_since is not None:
+                report.gpu_busy_seconds += now - gpu.busy_since
+                gpu.busy_since = None
+
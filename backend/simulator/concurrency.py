@@ -0,0 +1,192 @@
+import asyncio
+import time
+from logging import Logger
+from typing import Dict, List, Optional, Set
+
+from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+from backend.gpu.dispatcher.inventory import GPUSnapshot
+from backend.gpu.dispatcher.types import GPUNodeList
+from backend.gpu.monitoring.decoding import VectorSample
+from backend.replay.fakes import FakeOllamaClient
+from backend.simulator.cluster import (
+    MODEL_TOKENS_PER_SECOND,
+    SimulatedCluster,
+    SimulatedPrometheusClient,
+    generate_cluster
+)
+from backend.simulator.types import ConcurrencyReport
+
+
+class ChurningPrometheusClient(SimulatedPrometheusClient):
+    """Simulated Prometheus client whose every response is a new generation of the telemetry.
+
+    The samples of a response are stamped with its generation (as the timestamp and the used memory), and the
+    queries of a response are answered one by one with a yield in between, so the concurrent refreshes interleave.
+    """
+
+    def __init__(self, cluster: SimulatedCluster, latency: float = 0.002):
+        """Initializes the churning Prometheus client.
+
+        Args:
+            cluster (`SimulatedCluster`): Simulated cluster
+            latency (`float`): Latency of a response, spread over its queries, unit: s. Default is `0.002`
+        """
+
+        super().__init__(cluster)
+
+        self.latency = latency
+        self.generation = 0
+
+    async def execute_multiple_vector_queries(self, queries: List[str]) -> Dict[str, List[VectorSample]]:
+        """Execute multiple instant vector queries on the simulated cluster, as a new generation of the telemetry.
+
+        Args:
+            queries (`List[str]`): List of PromQL queries to execute
+
+        Returns:
+            queries_samples (`Dict[str, List[VectorSample]]`): Dictionary of the samples of the vector results
+        """
+
+        self.generation += 1
+        generation = self.generation
+        samples = self.cluster.samples()
+
+        queries_samples: Dict[str, List[VectorSample]] = {}
+        for query in queries:
+            # 每個 query 之間讓出執行權，讓其他請求的 refresh 與讀取交錯執行
+            await asyncio.sleep(self.latency / len(queries))
+
+            queries_samples[query] = [
+                sample._replace(
+                    timestamp=float(generation),
+                    value=float(generation) if query == "DCGM_FI_DEV_FB_USED" else sample.value
+                ) for sample in samples.get(query, [])
+            ]
+
+        return queries_samples
+
+
+def snapshot_generation(snapshot: GPUSnapshot, gpus: int) -> Optional[int]:
+    """Check that the snapshot is complete and built from a single generation of the telemetry.
+
+    Args:
+        snapshot (`GPUSnapshot`): Telemetry snapshot served by the `ChurningPrometheusClient`
+        gpus (`int`): Number of GPUs of the simulated cluster
+
+    Returns:
+        generation (`Optional[int]`): Generation of the snapshot, `None` if the snapshot is inconsistent
+    """
+
+    generations = {int(sample.timestamp) for samples in snapshot.node_gpu_info.values() for sample in samples}
+    generations.update(gpu.used_memory for gpu_node in snapshot.inventory.nodes for gpu in gpu_node.gpus)
+
+    if len(generations) != 1 or sum(len(gpu_node.gpus) for gpu_node in snapshot.inventory.nodes) != gpus:
+        return None
+
+    return generations.pop()
+
+
+def selection_generations(available_gpus: GPUNodeList) -> Set[int]:
+    """Generations of the telemetry of the GPUs selected by a scheduling decision.
+
+    Args:
+        available_gpus (`GPUNodeList`): Available GPUs returned by the GPU Dispatcher
+
+    Returns:
+        generations (`Set[int]`): Generations of the selected GPUs, a single one if the decision is consistent
+    """
+
+    if available_gpus is None:
+        return set()
+
+    return {gpu.used_memory for gpu_node in available_gpus.gpu_nodes for gpu in gpu_node.gpus}
+
+
+async def stress_dispatcher(
+    logger: Logger,
+    nodes: int = 50,
+    calls: int = 500,
+    latency: float = 0.002,
+    spread: float = 0.2
+) -> ConcurrencyReport:
+    """Run hundreds of concurrent `get_available_gpus` calls on one GPU Dispatcher and check the snapshot consistency.
+
+    Half of the calls refresh the snapshot inside `get_available_gpus`, the other half take a snapshot first and
+    decide on it (Like `app.py` records the decision with the same snapshot). A reader polls the latest snapshot
+    while the refreshes run. Every snapshot must be complete and from a single telemetry generation, every decision
+    must select the GPUs of a single generation (the one of its snapshot if given), and the versions observed by the
+    reader must never decrease.
+
+    Args:
+        logger (`Logger`): Logger of the simulated GPU Dispatcher
+        nodes (`int`): Number of simulated nodes. Default is `50`
+        calls (`int`): Number of concurrent scheduling decisions. Default is `500`
+        latency (`float`): Latency of a Prometheus response, unit: s. Default is `0.002`
+        spread (`float`): The calls start evenly over this window, so the refreshes overlap the decisions and the
+            reads, unit: s. Default is `0.2`
+
+    Returns:
+        concurrency_report (`ConcurrencyReport`): Concurrency report
+    """
+
+    cluster = SimulatedCluster(generate_cluster(nodes))
+    prometheus_client = ChurningPrometheusClient(cluster, latency)
+    gpu_dispatcher = GPUDispatcher(
+        logger=logger,
+        ollama_parameters_worker_url="",
+        prometheus_client=prometheus_client,
+        ollama_client=FakeOllamaClient()
+    )
+
+    gpus = len(cluster.gpus)
+    models = list(MODEL_TOKENS_PER_SECOND)
+    report = ConcurrencyReport(nodes=nodes, gpus=gpus, calls=calls)
+    versions: Set[int] = set()
+    done = asyncio.Event()
+
+    async def _decide(index: int):
+        model_name = models[index % len(models)]
+        await asyncio.sleep(spread * index / calls)
+
+        if index % 2:
+            snapshot = await gpu_dispatcher.get_snapshot()
+            generation = snapshot_generation(snapshot, gpus)
+            available_gpus = await gpu_dispatcher.get_available_gpus(model_name, snapshot=snapshot)
+
+            consistent = generation is not None and selection_generations(available_gpus) <= {generation}
+        else:
+            available_gpus = await gpu_dispatcher.get_available_gpus(model_name)
+
+            consistent = len(selection_generations(available_gpus)) <= 1
+
+        if not consistent:
+            report.inconsistencies += 1
+
+    async def _read():
+        last_version = 0
+
+        while not done.is_set():
+            snapshot = gpu_dispatcher.snapshot
+            if snapshot is not None:
+                versions.add(snapshot.version)
+                report.reads += 1
+
+                if snapshot_generation(snapshot, gpus) is None or snapshot.version < last_version:
+                    report.inconsistencies += 1
+                last_version = snapshot.version
+
+            await asyncio.sleep(0)
+
+    reader = asyncio.ensure_future(_read())
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*[_decide(index) for index in range(calls)])
+    report.wall_time = time.perf_counter() - start_time
+
+    done.set()
+    await reader
+
+    report.refreshes = prometheus_client.generation
+    report.snapshots = len(versions)
+
+    return report
@@ -0,0 +1,214 @@
+import asyncio
+import copy
+from logging import Logger
+from typing import Any, Callable, Dict, Mapping, Set
+
+from backend.gpu.dispatcher.deployment import DeploymentPlanner
+from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+from backend.gpu.dispatcher.types import DeploymentPlan
+from backend.replay.fakes import FakeOllamaClient
+from backend.simulator.cluster import SimulatedCluster, SimulatedPrometheusClient, generate_cluster
+from backend.simulator.types import DeploymentBenchmarkReport
+
+
+DEPLOYMENT_MODELS: Dict[str, int] = {
+    "llama3.3:70b": 1,
+    "gemma2:27b": 2,
+    "gemma2:9b": 2,
+    "llama3.1:8b": 2,
+    "llama3.2:3b": 2,
+    "gemma2:2b": 3,
+}
+"""Default desired models (Ollama model name to the number of replicas) of the warm-up benchmark"""
+
+
+class SimulatedKubeAIModelClient:
+    """KubeAI Model client of a simulated cluster, the Kubernetes API latency and the Pod startup are slept.
+
+    The latency of a list call grows with the number of KubeAI Models, and a Pod is ready `pod_startup_seconds`
+    plus the time to load the model weights after its KubeAI Model is applied. All the times are multiplied by
+    `time_scale`, so a benchmark of minutes of warm-up runs in seconds.
+    """
+
+    def __init__(
+        self,
+        model_vram: Mapping[str, int],
+        list_seconds: float = 0.2,
+        list_seconds_per_model: float = 0.02,
+        apply_seconds: float = 0.5,
+        pod_startup_seconds: float = 10.0,
+        load_bandwidth: float = 512.0,
+        time_scale: float = 0.01
+    ):
+        """Initializes the simulated KubeAI Model client.
+
+        Args:
+            model_vram (`Mapping[str, int]`): KubeAI Model name to the VRAM loaded by its Pods, unit: MiB
+            list_seconds (`float`): Base latency of a list call, unit: s. Default is `0.2`
+            list_seconds_per_model (`float`): Latency of a list call per KubeAI Model, unit: s. Default is `0.02`
+            apply_seconds (`float`): Latency of a create or patch call, unit: s. Default is `0.5`
+            pod_startup_seconds (`float`): Pod scheduling and container startup time, unit: s. Default is `10.0`
+            load_bandwidth (`float`): Model weights loading bandwidth, unit: MiB/s. Default is `512.0`
+            time_scale (`float`): Wall seconds per simulated second. Default is `0.01`
+        """
+
+        self.model_vram = dict(model_vram)
+        self.list_seconds = list_seconds
+        self.list_seconds_per_model = list_seconds_per_model
+        self.apply_seconds = apply_seconds
+        self.pod_startup_seconds = pod_startup_seconds
+        self.load_bandwidth = load_bandwidth
+        self.time_scale = time_scale
+
+        self.models: Dict[str, Dict[str, Any]] = {}
+        """KubeAI Model name to the applied KubeAI Model Custom Resource"""
+
+        self.ready_at: Dict[str, float] = {}
+        """KubeAI Model name to the event loop time when all of its Pods are ready"""
+
+        self.list_calls = 0
+        self.watches = 0
+
+    async def list_models(self) -> Dict[str, Dict[str, Any]]:
+        """List the KubeAI Model Custom Resources.
+
+        Returns:
+            kubeai_models (`Dict[str, Dict[str, Any]]`): KubeAI Model name to the KubeAI Model Custom Resource
+        """
+
+        self.list_calls += 1
+        await asyncio.sleep((self.list_seconds + self.list_seconds_per_model * len(self.models)) * self.time_scale)
+
+        return copy.deepcopy(self.models)
+
+    async def apply_model(self, model_cr_yaml: Dict[str, Any], existing: Dict[str, Any] = None):
+        """Create or patch the KubeAI Model Custom Resource, its Pods start loading the model.
+
+        Args:
+            model_cr_yaml (`Dict[str, Any]`): KubeAI Model Custom Resource YAML
+            existing (`Dict[str, Any]`): Existing KubeAI Model Custom Resource. Default is `None` (create)
+        """
+
+        await asyncio.sleep(self.apply_seconds * self.time_scale)
+
+        name = model_cr_yaml["metadata"]["name"]
+        self.models[name] = copy.deepcopy(model_cr_yaml)
+
+        # 各 replica 的 Pod 於不同 GPU 上同時載入模型
+        startup_seconds = self.pod_startup_seconds + self.model_vram.get(name, 0) / self.load_bandwidth
+        self.ready_at[name] = asyncio.get_running_loop().time() + startup_seconds * self.time_scale
+
+    async def wait_ready(
+        self,
+        replicas: Mapping[str, int],
+        timeout: float = 600.0,
+        on_ready: Callable[[str], None] = None,
+        created_after: Mapping[str, float] = None
+    ) -> Set[str]:
+        """Wait for the Pods of several KubeAI Models with one shared watch.
+
+        Args:
+            replicas (`Mapping[str, int]`): KubeAI Model name to the number of ready Pods to wait for
+            timeout (`float`): Timeout, unit: wall s. Default is `600.0`
+            on_ready (`Callable[[str], None]`): Called with the KubeAI Model name when its Pods are ready.
+                Default is `None`
+            created_after (`Mapping[str, float]`): Unused, the simulated Pods are only ready after their apply.
+                Default is `None`
+
+        Returns:
+            ready_models (`Set[str]`): KubeAI Model names whose Pods are ready
+        """
+
+        self.watches += 1
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        # 尚未套用的模型以 apply 延遲輪詢
+        poll_interval = self.apply_seconds * self.time_scale
+        ready_models: Set[str] = set()
+
+        while True:
+            now = loop.time()
+            for name in list(replicas):
+                if name not in ready_models and self.ready_at.get(name, float("inf")) <= now:
+                    ready_models.add(name)
+                    if on_ready is not None:
+                        on_ready(name)
+
+            pending = [name for name in list(replicas) if name not in ready_models]
+            if not pending or now >= deadline:
+                return ready_models
+
+            wake_at = min([self.ready_at.get(name, now + poll_interval) for name in pending] + [deadline])
+            await asyncio.sleep(max(0.0, wake_at - now))
+
+
+async def benchmark_deployment(
+    logger: Logger,
+    desired: Mapping[str, int] = None,
+    nodes: int = 50,
+    max_parallel: int = 4,
+    time_scale: float = 0.01,
+    ready_timeout: float = 600.0
+) -> DeploymentBenchmarkReport:
+    """Benchmark the warm-up time of the parallel deployment against the sequential one on a simulated cluster.
+
+    The desired models are planned once, then deployed on a fresh simulated KubeAI per mode.
+
+    Args:
+        logger (`Logger`): Logger of the simulated GPU Dispatcher
+        desired (`Mapping[str, int]`): Ollama model name to the number of replicas. Default is `None`
+            (`DEPLOYMENT_MODELS`)
+        nodes (`int`): Number of simulated nodes. Default is `50`
+        max_parallel (`int`): Max number of concurrent KubeAI Model applies. Default is `4`
+        time_scale (`float`): Wall seconds per simulated second. Default is `0.01`
+        ready_timeout (`float`): Readiness timeout, unit: simulated s. Default is `600.0`
+
+    Returns:
+        deployment_benchmark_report (`DeploymentBenchmarkReport`): Deployment benchmark report
+    """
+
+    cluster = SimulatedCluster(generate_cluster(nodes))
+    gpu_dispatcher = GPUDispatcher(
+        logger=logger,
+        ollama_parameters_worker_url="",
+        prometheus_client=SimulatedPrometheusClient(cluster),
+        ollama_client=FakeOllamaClient()
+    )
+
+    def _planner(deployment_plan: DeploymentPlan = None) -> DeploymentPlanner:
+        kubeai_client = SimulatedKubeAIModelClient(
+            model_vram={
+                deployment.name: deployment.estimate_vram for deployment in deployment_plan.deployments
+            } if deployment_plan is not None else {},
+            time_scale=time_scale
+        )
+
+        return DeploymentPlanner(
+            logger=logger,
+            gpu_dispatcher=gpu_dispatcher,
+            max_parallel=max_parallel,
+            ready_timeout=ready_timeout * time_scale,
+            kubeai_clients={None: kubeai_client}
+        )
+
+    deployment_plan = await _planner().plan(DEPLOYMENT_MODELS if desired is None else desired)
+    report = DeploymentBenchmarkReport(
+        nodes=nodes,
+        max_parallel=max_parallel,
+        models=len(deployment_plan.deployments),
+        replicas=sum(deployment.replicas for deployment in deployment_plan.deployments),
+        unplaced=deployment_plan.unplaced
+    )
+
+    for deployment_report in (
+        await _planner(deployment_plan).deploy_sequential(deployment_plan),
+        await _planner(deployment_plan).deploy(deployment_plan)
+    ):
+        # 換算回模擬時間
+        report.list_calls[deployment_report.mode] = deployment_report.list_calls
+        report.apply_seconds[deployment_report.mode] = deployment_report.apply_seconds / time_scale
+        report.warmup_seconds[deployment_report.mode] = deployment_report.warmup_seconds / time_scale
+        report.not_ready[deployment_report.mode] = deployment_report.not_ready
+
+    return report
@@ -0,0 +1,142 @@
+import time
+import tracemalloc
+from logging import Logger
+from typing import Any, Callable, Dict, List, Tuple
+
+from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+from backend.gpu.dispatcher.types import GPU, GPUNode, GPUNodeList
+from backend.gpu.monitoring.decoding import VectorSample
+from backend.replay.fakes import FakeOllamaClient
+from backend.simulator.cluster import SimulatedCluster, SimulatedPrometheusClient, generate_cluster
+from backend.simulator.types import InventoryReport
+
+
+INVENTORY_MODES = ("pydantic", "slotted")
+"""Compared GPU inventory representations"""
+
+INVENTORY_CLUSTER_SIZES = [100, 1000, 5000]
+"""Number of nodes of the benchmarked clusters"""
+
+
+def build_pydantic_snapshot(
+    gpu_dispatcher: GPUDispatcher,
+    node_gpu_info: Dict[str, List[VectorSample]]
+) -> GPUNodeList:
+    """Build the GPU inventory as the validated pydantic models, mutated per metric (the previous representation).
+
+    Args:
+        gpu_dispatcher (`GPUDispatcher`): GPU Dispatcher providing the GPU Model Mapping table
+        node_gpu_info (`Dict[str, List[VectorSample]]`): PromQL query to the vector samples
+
+    Returns:
+        gpu_node_list (`GPUNodeList`): List of Kubernetes GPU Node Information
+    """
+
+    gpu_node_list = GPUNodeList()
+    nodes: Dict[str, GPUNode] = {}
+    gpus: Dict[Tuple[str, str, str], GPU] = {}
+
+    for query, samples in node_gpu_info.items():
+        metrics_name = gpu_dispatcher._prometheus_metrics_name_mapping(query)
+
+        for sample in samples:
+            gpu_node = nodes.get(sample.node_name)
+            if gpu_node is None:
+                gpu_node = nodes[sample.node_name] = GPUNode(node_name=sample.node_name, gpus=[])
+                gpu_node_list.gpu_nodes.append(gpu_node)
+
+            gpu_key = (sample.node_name, sample.gpu, sample.mig_instance_id)
+            gpu_info = gpus.get(gpu_key)
+            if gpu_info is None:
+                gpu_model = gpu_dispatcher._get_gpu_model(sample.model_name)
+                gpu_info = gpus[gpu_key] = GPU(
+                    index=f"cuda:{sample.gpu}",
+                    uuid=sample.uuid,
+                    name=sample.model_name,
+                    free_memory=0,
+                    used_memory=0,
+                    temperature=0,
+                    memory_usage=0,
+                    power_usage=0,
+                    mig_profile=sample.mig_profile,
+                    mig_instance_id=sample.mig_instance_id,
+                    shares=gpu_model.time_slicing_replicas if gpu_model and not sample.mig_profile else 1
+                )
+                gpu_node.gpus.append(gpu_info)
+
+            setattr(gpu_info, metrics_name, int(sample.value))
+
+    return gpu_node_list
+
+
+def _measure(build: Callable[[], Any], repeat: int) -> Tuple[Any, float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        build()
+        best = min(best, time.perf_counter() - start_time)
+
+    # 量測 snapshot 建立後仍保留的記憶體 (不含建立過程中的暫存物件)
+    tracemalloc.start()
+    snapshot = build()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return snapshot, best, memory
+
+
+async def benchmark_inventory(
+    logger: Logger,
+    cluster_sizes: List[int] = None,
+    repeat: int = 3
+) -> List[InventoryReport]:
+    """Measure the build time and the memory of a GPU inventory snapshot on simulated clusters of different sizes.
+
+    Both representations are built from the same DCGM Exporter samples, so only the data model cost is compared.
+
+    Args:
+        logger (`Logger`): Logger of the simulated GPU Dispatcher
+        cluster_sizes (`List[int]`): Number of nodes of the benchmarked clusters. Default is `None` (`INVENTORY_CLUSTER_SIZES`)
+        repeat (`int`): Number of repetitions, the best build time is reported. Default is `3`
+
+    Returns:
+        inventory_reports (`List[InventoryReport]`): Inventory report per cluster size and representation
+    """
+
+    reports: List[InventoryReport] = []
+
+    for nodes in cluster_sizes or INVENTORY_CLUSTER_SIZES:
+        cluster = SimulatedCluster(generate_cluster(nodes))
+        gpu_dispatcher = GPUDispatcher(
+            logger=logger,
+            ollama_parameters_worker_url="",
+            prometheus_client=SimulatedPrometheusClient(cluster),
+            ollama_client=FakeOllamaClient()
+        )
+
+        # 先取得一次 DCGM 指標，之後只量測由 sample 建立 snapshot 的成本
+        await gpu_dispatcher.get_gpu_inventory()
+        node_gpu_info = gpu_dispatcher.node_gpu_info
+
+        for mode, build in (
+            ("pydantic", lambda: build_pydantic_snapshot(gpu_dispatcher, node_gpu_info)),
+            ("slotted", lambda: gpu_dispatcher._build_gpu_inventory(node_gpu_info)),
+        ):
+            snapshot, build_time, memory = _measure(build, repeat)
+
+            conversion_time = 0.0
+            if mode == "slotted":
+                start_time = time.perf_counter()
+                snapshot.to_model()
+                conversion_time = time.perf_counter() - start_time
+
+            reports.append(InventoryReport(
+                mode=mode,
+                nodes=nodes,
+                gpus=len(cluster.gpus),
+                build_time=build_time * 1000,
+                conversion_time=conversion_time * 1000,
+                memory=memory
+            ))
+
+    return reports
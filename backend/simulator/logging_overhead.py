@@ -0,0 +1,122 @@
+import atexit
+import os
+import tempfile
+import time
+from logging import DEBUG, WARNING, FileHandler, Filter, StreamHandler, getLogger
+from typing import List
+
+from backend.simulator.cluster import ClusterSimulator, generate_cluster
+from backend.simulator.types import LoggingOverheadReport, SimulationConfig
+from shared.utils.logger import (
+    ColorfulLoggingFormatter,
+    JSONLinesLoggingFormatter,
+    KubeAIKubernetesClientLogger,
+    PlainTextLoggingFormatter
+)
+
+
+LOGGING_MODES = ("disabled", "sync", "queue", "queue_json")
+"""Compared logging modes, `disabled` is the baseline without any log record"""
+
+
+class _RecordCounter(Filter):
+
+    def __init__(self):
+        super().__init__()
+        self.records = 0
+
+    def filter(self, record) -> bool:
+        self.records += 1
+        return True
+
+
+async def benchmark_logging_overhead(
+    modes: List[str] = None,
+    nodes: int = 50,
+    config: SimulationConfig = None,
+    level: int = DEBUG
+) -> List[LoggingOverheadReport]:
+    """Measure the logging overhead per scheduling decision of the GPU Dispatcher on a simulated cluster.
+
+    Every mode logs at `level` to a console handler (`os.devnull`) and a log file: `sync` formats and writes in the
+    caller, `queue` and `queue_json` only enqueue the records and write them (plain text or JSON lines) on the
+    background writer.
+
+    Args:
+        modes (`List[str]`): Compared logging modes. Default is `None` (`LOGGING_MODES`)
+        nodes (`int`): Number of simulated nodes. Default is `50`
+        config (`SimulationConfig`): Simulation configuration of the 3-node cluster. Default is `None` (`SimulationConfig()`)
+        level (`int`): Logging level of the enabled modes. Default is `DEBUG`
+
+    Returns:
+        logging_overhead_reports (`List[LoggingOverheadReport]`): Logging overhead report per mode
+
+    Raises:
+        ValueError: If the logging mode is not supported
+    """
+
+    modes = modes or list(LOGGING_MODES)
+    for mode in modes:
+        if mode not in LOGGING_MODES:
+            raise ValueError(f"Unsupported logging mode: {mode}")
+
+    config = config or SimulationConfig()
+    config = config.model_copy(update={"arrival_rate": config.arrival_rate * nodes / 3})
+
+    reports: List[LoggingOverheadReport] = []
+
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+        for mode in modes:
+            logger = getLogger(f"GPU Delegater Logging Benchmark ({mode})")
+            logger.propagate = False
+            logger.setLevel(WARNING if mode == "disabled" else level)
+
+            counter = _RecordCounter()
+            logger.addFilter(counter)
+
+            listener = None
+            if mode != "disabled":
+                console_handler = StreamHandler(devnull)
+                console_handler.setFormatter(ColorfulLoggingFormatter())
+
+                file_handler = FileHandler(os.path.join(log_dir, f"{mode}.log"), encoding="utf-8")
+                file_handler.setFormatter(
+                    JSONLinesLoggingFormatter() if mode == "queue_json" else PlainTextLoggingFormatter()
+                )
+
+                listener = KubeAIKubernetesClientLogger.attach_handlers(
+                    logger,
+                    [console_handler, file_handler],
+                    use_queue=mode != "sync"
+                )
+
+            simulation_report = await ClusterSimulator(logger, generate_cluster(nodes), config).run()
+
+            start_time = time.perf_counter()
+            if listener is not None:
+                atexit.unregister(listener.stop)
+                listener.stop()
+            drain_time = time.perf_counter() - start_time
+
+            for handler in list(logger.handlers) + list(listener.handlers if listener else []):
+                handler.close()
+                logger.removeHandler(handler)
+            logger.removeFilter(counter)
+
+            reports.append(LoggingOverheadReport(
+                mode=mode,
+                nodes=nodes,
+                decisions=simulation_report.decisions,
+                records=counter.records,
+                decision_wall_time=simulation_report.decision_wall_time,
+                drain_time=drain_time
+            ))
+
+    baseline = next((report for report in reports if report.mode == "disabled"), None)
+    if baseline is not None and baseline.decisions:
+        baseline_time = baseline.decision_wall_time / baseline.decisions
+        for report in reports:
+            if report.decisions:
+                report.overhead_per_decision = (report.decision_wall_time / report.decisions - baseline_time) * 1000
+
+    return reports
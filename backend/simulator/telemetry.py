@@ -0,0 +1,299 @@
+import asyncio
+import json
+import time
+from logging import Logger
+from typing import Dict, List
+
+from backend.gpu.dispatcher.dispatcher import GPUDispatcher
+from backend.gpu.dispatcher.inventory import GPUSnapshot
+from backend.gpu.monitoring.decoding import VectorSample, decode_vector_response
+from backend.gpu.monitoring.exposition import render_exposition
+from backend.gpu.monitoring.scraper import DCGMExporterClient, ScrapeTarget
+from backend.replay.fakes import FakeOllamaClient
+from backend.simulator.cluster import SimulatedCluster, SimulatedGPU, generate_cluster
+from backend.simulator.types import TelemetryReport
+
+
+TELEMETRY_PATHS = ("prometheus", "scrape", "scrape-background")
+"""Benchmarked telemetry paths: polling Prometheus, scraping the DCGM Exporters on demand or in the background"""
+
+
+class SimulatedExporterServer:
+    """Local HTTP server exposing the `/metrics` of a DCGM Exporter per node of the simulated cluster."""
+
+    def __init__(self, cluster: SimulatedCluster, host: str = "127.0.0.1", port: int = 0):
+        """Initializes the simulated DCGM Exporter server.
+
+        Args:
+            cluster (`SimulatedCluster`): Simulated cluster
+            host (`str`): Listening host. Default is `127.0.0.1`
+            port (`int`): Listening port. Default is `0` (a free port)
+        """
+
+        self.cluster = cluster
+        self.host = host
+        self.port = port
+
+        self.requests = 0
+        self._server: asyncio.AbstractServer = None
+
+    async def __aenter__(self) -> "SimulatedExporterServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    @property
+    def targets(self) -> List[ScrapeTarget]:
+        """`/metrics` endpoint of every node, Like the DCGM Exporter targets discovered from Prometheus"""
+
+        return [
+            ScrapeTarget(f"http://{self.host}:{self.port}/{node_name}/metrics", node_name)
+            for node_name in self.cluster.node_gpus
+        ]
+
+    async def start(self):
+        """Start listening."""
+
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop listening."""
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            path = head.split(b" ", 2)[1].decode("latin-1")
+            node_name = path.strip("/").split("/")[0]
+
+            self.requests += 1
+
+            if node_name not in self.cluster.node_gpus:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                return
+
+            payload = render_exposition(self.cluster.samples(node_name)).encode()
+            writer.write(
+                f"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+class PollingPrometheusClient:
+    """Prometheus polling path of the simulated cluster.
+
+    Like Prometheus, the DCGM Exporters are scraped every `scrape_interval` in the background, and every query
+    answers with the samples of the last scrape, encoded and decoded as a Prometheus HTTP API response.
+    """
+
+    def __init__(self, targets: List[ScrapeTarget], scrape_interval: float = 15.0):
+        """Initializes the polling Prometheus client.
+
+        Args:
+            targets (`List[ScrapeTarget]`): DCGM Exporter endpoints
+            scrape_interval (`float`): Prometheus scrape interval, unit: s. Default is `15.0`
+        """
+
+        self.exporter_client = DCGMExporterClient(targets=targets, interval=scrape_interval)
+
+    async def execute_multiple_vector_queries(self, queries: List[str]) -> Dict[str, List[VectorSample]]:
+        """Execute multiple instant vector queries on the samples of the last Prometheus scrape.
+
+        Args:
+            queries (`List[str]`): List of PromQL queries to execute
+
+        Returns:
+            queries_samples (`Dict[str, List[VectorSample]]`): Dictionary of the samples of the vector results
+        """
+
+        queries_samples = await self.exporter_client.execute_multiple_vector_queries(queries)
+
+        return {
+            query: decode_vector_response(json.dumps({
+                "status": "success",
+                "data": {
+                    "resultType": "vector",
+                    "result": [
+                        {
+                            "metric": {
+                                "__name__": query,
+                                "kubernetes_node": sample.node_name,
+                                "gpu": sample.gpu,
+                                "UUID": sample.uuid,
+                                "modelName": sample.model_name,
+                            },
+                            "value": [sample.timestamp, f"{sample.value:g}"],
+                        } for sample in samples
+                    ],
+                },
+            }).encode()) for query, samples in queries_samples.items()
+        }
+
+    async def aclose(self):
+        """Stop the background scrapes."""
+
+        await self.exporter_client.aclose()
+
+
+def probed_used_memory(snapshot: GPUSnapshot, probe: SimulatedGPU) -> int:
+    """Used memory of the probed GPU in a telemetry snapshot.
+
+    Args:
+        snapshot (`GPUSnapshot`): Telemetry snapshot
+        probe (`SimulatedGPU`): Probed GPU
+
+    Returns:
+        used_memory (`int`): Used memory of the probed GPU, `-1` if the GPU is missing
+    """
+
+    for gpu_node in snapshot.inventory.nodes:
+        if gpu_node.node_name == probe.node_name:
+            for gpu in gpu_node.gpus:
+                if gpu.uuid == probe.uuid:
+                    return gpu.used_memory
+
+    return -1
+
+
+async def benchmark_telemetry_mode(
+    logger: Logger,
+    mode: str,
+    nodes: int = 50,
+    duration: float = 30.0,
+    prometheus_interval: float = 15.0,
+    scrape_interval: float = 1.0,
+    change_interval: float = 0.5,
+    read_interval: float = 0.1
+) -> TelemetryReport:
+    """Measure the freshness of the GPU Dispatcher snapshots through a telemetry path.
+
+    The used memory of a probed GPU changes every `change_interval` to the number of its changes, and the GPU
+    Dispatcher takes a snapshot every `read_interval`. The staleness of a snapshot is the time since the first change
+    it does not show yet.
+
+    Args:
+        logger (`Logger`): Logger of the simulated GPU Dispatcher
+        mode (`str`): Telemetry path, one of `TELEMETRY_PATHS`
+        nodes (`int`): Number of simulated nodes. Default is `50`
+        duration (`float`): Duration of the measurement, unit: s. Default is `30.0`
+        prometheus_interval (`float`): Prometheus scrape interval of the polling path, unit: s. Default is `15.0`
+        scrape_interval (`float`): Background scrape interval of `scrape-background`, unit: s. Default is `1.0`
+        change_interval (`float`): Interval between the changes of the probed GPU, unit: s. Default is `0.5`
+        read_interval (`float`): Interval between the snapshots, unit: s. Default is `0.1`
+
+    Returns:
+        telemetry_report (`TelemetryReport`): Telemetry report
+
+    Raises:
+        ValueError: If the telemetry path is not supported
+    """
+
+    if mode not in TELEMETRY_PATHS:
+        raise ValueError(f"Unsupported telemetry mode: {mode}, expected one of {TELEMETRY_PATHS}")
+
+    cluster = SimulatedCluster(generate_cluster(nodes))
+    probe = next(iter(cluster.gpus.values()))
+    report = TelemetryReport(mode=mode, nodes=nodes)
+
+    async with SimulatedExporterServer(cluster) as server:
+        if mode == "prometheus":
+            telemetry_client = PollingPrometheusClient(server.targets, prometheus_interval)
+            exporter_client = telemetry_client.exporter_client
+        else:
+            telemetry_client = exporter_client = DCGMExporterClient(
+                targets=server.targets,
+                interval=scrape_interval if mode == "scrape-background" else None
+            )
+
+        gpu_dispatcher = GPUDispatcher(
+            logger=logger,
+            ollama_parameters_worker_url="",
+            prometheus_client=telemetry_client,
+            ollama_client=FakeOllamaClient()
+        )
+
+        # 第 n 次變更的時間，第 0 次為初始狀態
+        change_times: List[float] = [time.time()]
+        done = asyncio.Event()
+
+        async def _change():
+            while not done.is_set():
+                await asyncio.sleep(change_interval)
+                probe.used_memory = len(change_times)
+                change_times.append(time.time())
+
+        changer = asyncio.ensure_future(_change())
+        end_time = time.perf_counter() + duration
+
+        try:
+            while time.perf_counter() < end_time:
+                start_time = time.perf_counter()
+                snapshot = await gpu_dispatcher.get_snapshot()
+                report.latencies.append(time.perf_counter() - start_time)
+
+                read_time = time.time()
+                generation = probed_used_memory(snapshot, probe)
+                # 快照顯示第 `generation` 次變更，錯過的第一個變更為第 `generation + 1` 次
+                missed = generation + 1
+                report.staleness.append(
+                    max(0.0, read_time - change_times[missed]) if 0 <= missed < len(change_times) else 0.0
+                )
+                report.reads += 1
+
+                await asyncio.sleep(max(0.0, read_interval - (time.perf_counter() - start_time)))
+        finally:
+            done.set()
+            changer.cancel()
+            await telemetry_client.aclose()
+
+        report.changes = len(change_times) - 1
+        report.scrapes = exporter_client.scrapes
+
+    return report
+
+
+async def benchmark_telemetry(
+    logger: Logger,
+    nodes: int = 50,
+    modes: List[str] = TELEMETRY_PATHS,
+    duration: float = 30.0,
+    prometheus_interval: float = 15.0,
+    scrape_interval: float = 1.0
+) -> List[TelemetryReport]:
+    """Benchmark the freshness of the telemetry paths on the same simulated cluster size.
+
+    Args:
+        logger (`Logger`): Logger of the simulated GPU Dispatcher
+        nodes (`int`): Number of simulated nodes. Default is `50`
+        modes (`List[str]`): Telemetry paths. Default is `TELEMETRY_PATHS`
+        duration (`float`): Duration of the measurement per path, unit: s. Default is `30.0`
+        prometheus_interval (`float`): Prometheus scrape interval of the polling path, unit: s. Default is `15.0`
+        scrape_interval (`float`): Background scrape interval of `scrape-background`, unit: s. Default is `1.0`
+
+    Returns:
+        telemetry_reports (`List[TelemetryReport]`): Telemetry report per path
+    """
+
+    return [
+        await benchmark_telemetry_mode(
+            logger,
+            mode,
+            nodes=nodes,
+            duration=duration,
+            prometheus_interval=prometheus_interval,
+            scrape_interval=scrape_interval
+        ) for mode in modes
+    ]
@@ -0,0 +1,331 @@
+import math
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, computed_field
+
+
+class SimulatedNodeSpec(BaseModel):
+
+    node_name: str
+    """Kubernetes Node name"""
+
+    gpu_model: str
+    """GPU model name in the GPU Model Mapping table, Like `NVIDIA GeForce RTX 4070`"""
+
+    gpu_count: int = 1
+    """Number of GPUs on the node"""
+
+
+class SimulationConfig(BaseModel):
+
+    requests: int = 200
+    """Number of simulated inference requests"""
+
+    arrival_rate: float = 1.0
+    """Poisson arrival rate of the requests, unit: requests/s"""
+
+    model_weights: Dict[str, float] = Field(default_factory=lambda: {
+        "gemma2:2b": 4.0,
+        "llama3.2:3b": 3.0,
+        "llama3.1:8b": 2.0,
+        "gemma2:9b": 2.0,
+        "gemma2:27b": 1.0,
+        "llama3.3:70b": 0.5,
+    })
+    """Ollama model name to the weight of the request mix"""
+
+    output_tokens: int = 256
+    """Mean number of generated tokens per request"""
+
+    pod_startup_seconds: float = 8.0
+    """KubeAI model pod startup latency before loading the weights, unit: s"""
+
+    load_bandwidth: float = 1024.0
+    """Model weights loading bandwidth, unit: MiB/s"""
+
+    max_queue_wait: float = 600.0
+    """Requests waiting longer than this in the queue are rejected, unit: s"""
+
+    image_pull_bandwidth: Optional[float] = None
+    """Image pull bandwidth of a node, the first placement of a model on a node pulls its image (as large as the
+    estimated VRAM), unit: MiB/s. `None` if the images are cached on all nodes"""
+
+    image_cache_aware: bool = False
+    """The GPU Dispatcher prefers the nodes which cache the model image"""
+
+    tensor_split: bool = False
+    """The GPU Dispatcher plans the multi-GPU placements with the layer split of the model and the GPU topology"""
+
+    seed: int = 0
+    """Random seed"""
+
+
+class SimulationReport(BaseModel):
+
+    nodes: int = 0
+    """Number of simulated nodes"""
+
+    gpus: int = 0
+    """Number of simulated GPUs"""
+
+    requests: int = 0
+    """Number of simulated requests"""
+
+    accepted: int = 0
+    """Number of requests placed on a GPU"""
+
+    rejected: int = 0
+    """Number of requests rejected (never fit, or waited longer than `max_queue_wait`)"""
+
+    decisions: int = 0
+    """Number of GPU Dispatcher scheduling decisions (including the retries of the queued requests)"""
+
+    decision_wall_time: float = 0.0
+    """Wall time spent in the GPU Dispatcher, unit: s"""
+
+    queue_waits: List[float] = Field(default_factory=list, exclude=True)
+    """Queue wait of the accepted requests, unit: s (simulated time)"""
+
+    gpu_busy_seconds: float = 0.0
+    """Sum of the busy time of all GPUs, unit: s (simulated time)"""
+
+    makespan: float = 0.0
+    """Simulated time from the first arrival to the last completion, unit: s"""
+
+    tokens: int = 0
+    """Number of generated tokens"""
+
+    image_pulls: int = 0
+    """Number of placements which pulled the model image"""
+
+    image_pull_seconds: float = 0.0
+    """Sum of the image pull time of the placements, unit: s (simulated time)"""
+
+    multi_gpu_placements: int = 0
+    """Number of placements split across several GPUs"""
+
+    split_failures: int = 0
+    """Number of placements whose layers do not fit the selected GPUs as Ollama splits them (offloaded to the CPU)"""
+
+    @computed_field
+    @property
+    def decisions_per_second(self) -> float:
+        """GPU Dispatcher decisions per wall-clock second"""
+
+        return self.decisions / self.decision_wall_time if self.decision_wall_time else 0.0
+
+    @computed_field
+    @property
+    def acceptance_rate(self) -> float:
+        """Fraction of the requests placed on a GPU"""
+
+        return self.accepted / self.requests if self.requests else 0.0
+
+    @computed_field
+    @property
+    def queue_wait(self) -> Dict[str, float]:
+        """Mean and percentiles (`p50`、`p95`、`p99`) of the queue wait, unit: s (simulated time)"""
+
+        if not self.queue_waits:
+            return {}
+
+        waits = sorted(self.queue_waits)
+        queue_wait = {"mean": sum(waits) / len(waits)}
+        for p in (50, 95, 99):
+            queue_wait[f"p{p}"] = waits[max(math.ceil(len(waits) * p / 100) - 1, 0)]
+
+        return queue_wait
+
+    @computed_field
+    @property
+    def gpu_utilisation(self) -> float:
+        """Fraction of the GPU time busy with the requests"""
+
+        capacity = self.gpus * self.makespan
+
+        return self.gpu_busy_seconds / capacity if capacity else 0.0
+
+
+class LoggingOverheadReport(BaseModel):
+
+    mode: str
+    """Logging mode, `disabled`, `sync`, `queue` or `queue_json`"""
+
+    nodes: int = 0
+    """Number of simulated nodes"""
+
+    decisions: int = 0
+    """Number of GPU Dispatcher scheduling decisions"""
+
+    records: int = 0
+    """Number of emitted log records"""
+
+    decision_wall_time: float = 0.0
+    """Wall time spent in the GPU Dispatcher, unit: s"""
+
+    drain_time: float = 0.0
+    """Wall time of the background writer to write out the queued records after the simulation, unit: s"""
+
+    overhead_per_decision: float = 0.0
+    """Extra wall time per decision compared with the `disabled` mode, unit: ms"""
+
+    @computed_field
+    @property
+    def decisions_per_second(self) -> float:
+        """GPU Dispatcher decisions per wall-clock second"""
+
+        return self.decisions / self.decision_wall_time if self.decision_wall_time else 0.0
+
+
+class InventoryReport(BaseModel):
+
+    mode: str
+    """GPU inventory representation, `pydantic` or `slotted`"""
+
+    nodes: int = 0
+    """Number of simulated nodes"""
+
+    gpus: int = 0
+    """Number of simulated GPUs"""
+
+    build_time: float = 0.0
+    """Best wall time to build a snapshot from the DCGM Exporter samples, unit: ms"""
+
+    conversion_time: float = 0.0
+    """Wall time to convert the snapshot to the pydantic models at the API boundary, unit: ms"""
+
+    memory: int = 0
+    """Memory retained by a snapshot, unit: bytes"""
+
+    @computed_field
+    @property
+    def bytes_per_gpu(self) -> float:
+        """Memory retained by a snapshot per GPU, unit: bytes"""
+
+        return self.memory / self.gpus if self.gpus else 0.0
+
+
+class ConcurrencyReport(BaseModel):
+
+    nodes: int = 0
+    """Number of simulated nodes"""
+
+    gpus: int = 0
+    """Number of simulated GPUs"""
+
+    calls: int = 0
+    """Number of concurrent `get_available_gpus` calls"""
+
+    refreshes: int = 0
+    """Number of Prometheus fetches, the concurrent calls share the in-flight refresh"""
+
+    snapshots: int = 0
+    """Number of distinct snapshots observed by the reader"""
+
+    reads: int = 0
+    """Number of reads of the latest snapshot while the refreshes run"""
+
+    inconsistencies: int = 0
+    """Number of half-built or mixed snapshots and decisions, must be `0`"""
+
+    wall_time: float = 0.0
+    """Wall time of all calls, unit: s"""
+
+    @computed_field
+    @property
+    def decisions_per_second(self) -> float:
+        """Scheduling decisions per second of wall time"""
+
+        return self.calls / self.wall_time if self.wall_time else 0.0
+
+
+class TelemetryReport(BaseModel):
+
+    mode: str
+    """Telemetry path, `prometheus` (polling), `scrape` (on demand) or `scrape-background`"""
+
+    nodes: int = 0
+    """Number of simulated nodes (DCGM Exporter endpoints)"""
+
+    reads: int = 0
+    """Number of telemetry snapshots taken by the GPU Dispatcher"""
+
+    changes: int = 0
+    """Number of changes of the probed GPU"""
+
+    staleness: List[float] = Field(default_factory=list, exclude=True)
+    """Time since the first change missed by each snapshot (`0` if up to date), unit: s"""
+
+    latencies: List[float] = Field(default_factory=list, exclude=True)
+    """Wall time of each snapshot refresh, unit: s"""
+
+    scrapes: int = 0
+    """Number of `/metrics` scrapes of the DCGM Exporters"""
+
+    @computed_field
+    @property
+    def freshness(self) -> Dict[str, float]:
+        """Mean, percentiles (`p50`、`p95`) and max of the snapshot staleness, unit: s"""
+
+        return _distribution(self.staleness)
+
+    @computed_field
+    @property
+    def refresh_latency(self) -> Dict[str, float]:
+        """Mean, percentiles (`p50`、`p95`) and max of the snapshot refresh wall time, unit: ms"""
+
+        return {name: value * 1000 for name, value in _distribution(self.latencies).items()}
+
+
+
+class DeploymentBenchmarkReport(BaseModel):
+
+    nodes: int
+    """Number of simulated nodes"""
+
+    max_parallel: int
+    """Max number of concurrent KubeAI Model applies of the parallel deployment"""
+
+    models: int = 0
+    """Number of planned models"""
+
+    replicas: int = 0
+    """Number of planned replicas"""
+
+    unplaced: Dict[str, int] = Field(default_factory=dict)
+    """Ollama model name to the number of replicas which do not fit in the simulated cluster"""
+
+    list_calls: Dict[str, int] = Field(default_factory=dict)
+    """Deployment mode (`sequential`, `parallel`) to the number of KubeAI Model list calls"""
+
+    apply_seconds: Dict[str, float] = Field(default_factory=dict)
+    """Deployment mode to the time spent applying the KubeAI Models, unit: simulated s"""
+
+    warmup_seconds: Dict[str, float] = Field(default_factory=dict)
+    """Deployment mode to the time until every model is ready, unit: simulated s"""
+
+    not_ready: Dict[str, List[str]] = Field(default_factory=dict)
+    """Deployment mode to the KubeAI Model names which are not ready before the timeout"""
+
+    @computed_field
+    @property
+    def speedup(self) -> Optional[float]:
+        """Sequential warm-up time divided by the parallel one"""
+
+        if not self.warmup_seconds.get("parallel"):
+            return None
+
+        return self.warmup_seconds.get("sequential", 0.0) / self.warmup_seconds["parallel"]
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+
+    values = sorted(values)
+    distribution = {"mean": sum(values) / len(values)}
+    for p in (50, 95):
+        distribution[f"p{p}"] = values[max(math.ceil(len(values) * p / 100) - 1, 0)]
+    distribution["max"] = values[-1]
+
+    return distribution
@@ -0,0 +1,38 @@
+from typing import TYPE_CHECKING
+
+from shared.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .benchmark import benchmark_store
+    from .store import PARTITION_FORMAT, TelemetryStore, partition_name
+    from .types import RequestRecord, StoreBenchmark
+
+# 子模組 (以及其相依套件) 於第一次使用時才載入
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".benchmark": [
+        "benchmark_store",
+    ],
+    ".store": [
+        "PARTITION_FORMAT",
+        "TelemetryStore",
+        "partition_name",
+    ],
+    ".types": [
+        "RequestRecord",
+        "StoreBenchmark",
+    ],
+})
+
+__all__ = [
+    # Benchmark
+    "benchmark_store",
+
+    # Store
+    "PARTITION_FORMAT",
+    "TelemetryStore",
+    "partition_name",
+
+    # Types
+    "RequestRecord",
+    "StoreBenchmark",
+]
@@ -0,0 +1,68 @@
+import argparse
+import json
+import time
+
+from backend.store.benchmark import benchmark_store
+from backend.store.store import TelemetryStore
+
+
+def parsed_args():
+    parser = argparse.ArgumentParser(
+        description="Query the telemetry store, or benchmark it against the JSON Lines recording"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for table, help in (
+        ("decisions", "Scheduling decisions (with the telemetry they were made on) as a JSON Lines recording"),
+        ("requests", "Request latencies as JSON Lines"),
+        ("samples", "Telemetry samples as JSON Lines"),
+    ):
+        table_parser = subparsers.add_parser(table, help=help)
+        table_parser.add_argument("--dir", type=str, default="logs/store", help="Directory of the telemetry store")
+        table_parser.add_argument("--start", type=float, default=None, help="Unix timestamp of the range start")
+        table_parser.add_argument("--end", type=float, default=None, help="Unix timestamp of the range end")
+        table_parser.add_argument("--hours", type=float, default=None, help="Query the last N hours instead of `--start`")
+
+        if table == "samples":
+            table_parser.add_argument("--metrics", type=str, nargs="*", default=None)
+            table_parser.add_argument("--node", type=str, default=None)
+        else:
+            table_parser.add_argument("--model", type=str, default=None)
+
+    benchmark_parser = subparsers.add_parser(
+        "benchmark",
+        help="Compare the write time, size and time range query time with the JSON Lines recording"
+    )
+    benchmark_parser.add_argument("--records", type=int, default=10000)
+    benchmark_parser.add_argument("--snapshot_every", type=int, default=1, help="Records made on the same snapshot")
+    benchmark_parser.add_argument("--query_fraction", type=float, default=0.1)
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parsed_args()
+
+    if args.command == "benchmark":
+        print(benchmark_store(
+            records=args.records,
+            snapshot_every=args.snapshot_every,
+            query_fraction=args.query_fraction
+        ).model_dump_json(indent=4))
+        exit(0)
+
+    # 查詢不刪除任何 partition
+    store = TelemetryStore(args.dir, retention_days=None)
+    start = time.time() - args.hours * 3600 if args.hours is not None else args.start
+
+    match args.command:
+        case "decisions":
+            for record in store.query_decisions(start, args.end, args.model):
+                print(record.model_dump_json(exclude_none=True))
+        case "requests":
+            for request in store.query_requests(start, args.end, args.model):
+                print(request.model_dump_json(exclude_none=True))
+        case "samples":
+            for metric, samples in store.query_samples(start, args.end, args.metrics, args.node).items():
+                for sample in samples:
+                    print(json.dumps({"metric": metric, **sample._asdict()}))
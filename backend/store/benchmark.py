@@ -0,0 +1,100 @@
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from backend.replay.recorder import SchedulingRecorder, load_records
+from backend.replay.replay import build_fixture_records
+from backend.store.store import TelemetryStore
+from backend.store.types import StoreBenchmark
+
+
+def _disk_usage(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    return sum(os.path.getsize(os.path.join(path, file_name)) for file_name in os.listdir(path))
+
+
+def benchmark_store(
+    records: int = 10000,
+    snapshot_every: int = 1,
+    interval: float = 1.0,
+    query_fraction: float = 0.1
+) -> StoreBenchmark:
+    """Compare the telemetry store with the JSON Lines recording on synthetic scheduling records.
+
+    The records are written to both formats, then the records of the last `query_fraction` of the time range are
+    queried: the JSON Lines recording has to be loaded as a whole and filtered, the store only reads the range.
+
+    Args:
+        records (`int`): Number of scheduling records. Default is `10000`
+        snapshot_every (`int`): Number of consecutive records made on the same telemetry snapshot. Default is `1`
+            (every record has its own snapshot, the worst case of the store)
+        interval (`float`): Seconds between the records, unit: s. Default is `1.0`
+        query_fraction (`float`): Fraction of the time range queried. Default is `0.1`
+
+    Returns:
+        store_benchmark (`StoreBenchmark`): Benchmark result
+
+    Raises:
+        ValueError: If the number of records or `snapshot_every` is not positive
+    """
+
+    if records < 1 or snapshot_every < 1:
+        raise ValueError(f"Records and snapshot_every must be positive: {records}, {snapshot_every}")
+
+    scheduling_records = build_fixture_records(records, interval=interval)
+
+    # 以現在為結束時間，並讓每 `snapshot_every` 筆記錄共用一個 telemetry 物件
+    base = time.time() - records * interval
+    telemetry: Dict[str, List[Dict[str, Any]]] = {}
+    for i, record in enumerate(scheduling_records):
+        if i % snapshot_every == 0:
+            telemetry = {query: list(samples) for query, samples in record.telemetry.items()}
+        record.timestamp += base
+        record.telemetry = telemetry
+
+    benchmark = StoreBenchmark(records=records, snapshots=(records + snapshot_every - 1) // snapshot_every)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        recording_path = os.path.join(temp_dir, "scheduling.jsonl")
+        store_dir = os.path.join(temp_dir, "store")
+
+        recorder = SchedulingRecorder(recording_path)
+        start_time = time.perf_counter()
+        for record in scheduling_records:
+            recorder.record(record)
+        benchmark.write_seconds["jsonl"] = time.perf_counter() - start_time
+
+        store = TelemetryStore(store_dir, retention_days=None)
+        start_time = time.perf_counter()
+        for record in scheduling_records:
+            store.append_decision(record)
+        store.flush()
+        benchmark.write_seconds["store"] = time.perf_counter() - start_time
+
+        benchmark.bytes["jsonl"] = _disk_usage(recording_path)
+        benchmark.bytes["store"] = _disk_usage(store_dir)
+
+        query_start = scheduling_records[int(records * (1 - query_fraction))].timestamp
+        query_end = scheduling_records[-1].timestamp + interval
+
+        start_time = time.perf_counter()
+        jsonl_records = [
+            record for record in load_records(recording_path)
+            if query_start <= record.timestamp < query_end
+        ]
+        benchmark.query_seconds["jsonl"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        store_records = store.query_decisions(query_start, query_end)
+        benchmark.query_seconds["store"] = time.perf_counter() - start_time
+
+        if len(store_records) != len(jsonl_records):
+            raise RuntimeError(f"Store returned {len(store_records)} records instead of {len(jsonl_records)}")
+        benchmark.query_records = len(store_records)
+
+        store.close()
+
+    return benchmark
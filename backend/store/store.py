@@ -0,0 +1,711 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from logging import Logger, getLogger
+from queue import SimpleQueue
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from backend.gpu.monitoring.decoding import VectorSample
+from backend.replay.types import SchedulingRecord
+from backend.store.types import RequestRecord
+
+if TYPE_CHECKING:
+    from backend.gpu.dispatcher.inventory import GPUSnapshot
+
+
+PARTITION_FORMAT = "%Y-%m%d"
+"""Date format of the partition names, Like the log directories `logs/2025-0101`"""
+
+PARTITION_SUFFIX = ".sqlite3"
+"""File name suffix of the partition databases"""
+
+SERIES_LABELS = ("kubernetes_node", "gpu", "UUID", "modelName", "GPU_I_ID", "GPU_I_PROFILE")
+"""DCGM Exporter labels of a time series, in the column order of the `series` table"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    node_name TEXT,
+    gpu TEXT,
+    uuid TEXT,
+    model_name TEXT,
+    mig_instance_id TEXT,
+    mig_profile TEXT
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    sample_timestamp REAL
+);
+CREATE INDEX IF NOT EXISTS snapshots_timestamp ON snapshots (timestamp);
+CREATE TABLE IF NOT EXISTS samples (
+    snapshot INTEGER NOT NULL,
+    metric INTEGER NOT NULL,
+    series INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (snapshot, metric, series)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS decisions (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    model TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    node_name TEXT,
+    gpus TEXT,
+    resource_profile TEXT,
+    estimate_vram INTEGER,
+    model_details TEXT,
+    timings TEXT,
+    snapshot INTEGER
+);
+CREATE INDEX IF NOT EXISTS decisions_timestamp ON decisions (timestamp);
+CREATE TABLE IF NOT EXISTS requests (
+    timestamp REAL NOT NULL,
+    model TEXT NOT NULL,
+    ttft REAL,
+    inter_token_latency REAL,
+    e2e REAL,
+    output_tokens INTEGER NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS requests_timestamp ON requests (timestamp);
+"""
+
+_SNAPSHOT_CACHE_SIZE = 64
+"""Number of the recently written telemetry snapshots the writer remembers to not write them again"""
+
+
+def partition_name(timestamp: float) -> str:
+    """Name of the daily partition of a timestamp (local time).
+
+    Args:
+        timestamp (`float`): Unix timestamp
+
+    Returns:
+        partition_name (`str`): Partition name, Like `2025-0101`
+    """
+
+    return datetime.fromtimestamp(timestamp).strftime(PARTITION_FORMAT)
+
+
+def _telemetry_rows(
+    telemetry: Mapping[str, Sequence[Any]]
+) -> Iterator[Tuple[str, Tuple[Optional[str], ...], float, float]]:
+    """Flatten the vector samples, or the compacted vector results of a scheduling record, to the stored columns.
+
+    Yields:
+        row (`Tuple[str, Tuple[Optional[str], ...], float, float]`): Metric name, series labels, sample timestamp and value
+    """
+
+    for query, samples in telemetry.items():
+        for sample in samples:
+            if isinstance(sample, VectorSample):
+                yield query, (
+                    sample.node_name,
+                    sample.gpu,
+                    sample.uuid,
+                    sample.model_name,
+                    sample.mig_instance_id,
+                    sample.mig_profile
+                ), float(sample.timestamp), float(sample.value)
+            else:
+                metric = sample["metric"]
+                yield (
+                    query,
+                    tuple(metric.get(label) for label in SERIES_LABELS),
+                    float(sample["value"][0]),
+                    float(sample["value"][1])
+                )
+
+
+class _Partition:
+    """Partition database opened by the writer, with its dictionaries of the metric names and the series labels."""
+
+    __slots__ = ("name", "connection", "metrics", "series")
+
+    def __init__(self, name: str, connection: sqlite3.Connection):
+        self.name = name
+        self.connection = connection
+
+        self.metrics: Dict[str, int] = {
+            name: metric_id for metric_id, name in connection.execute("SELECT id, name FROM metrics")
+        }
+        self.series: Dict[Tuple[Optional[str], ...], int] = {
+            tuple(row[1:]): row[0] for row in connection.execute(
+                "SELECT id, node_name, gpu, uuid, model_name, mig_instance_id, mig_profile FROM series"
+            )
+        }
+
+    def metric_id(self, name: str) -> int:
+        metric_id = self.metrics.get(name)
+        if metric_id is None:
+            metric_id = self.metrics[name] = self.connection.execute(
+                "INSERT INTO metrics (name) VALUES (?)", (name,)
+            ).lastrowid
+
+        return metric_id
+
+    def series_id(self, labels: Tuple[Optional[str], ...]) -> int:
+        series_id = self.series.get(labels)
+        if series_id is None:
+            series_id = self.series[labels] = self.connection.execute(
+                "INSERT INTO series (node_name, gpu, uuid, model_name, mig_instance_id, mig_profile) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                labels
+            ).lastrowid
+
+        return series_id
+
+
+class TelemetryStore:
+    """Embedded on-disk store of the telemetry samples, scheduling decisions and request latencies.
+
+    The rows are appended to a SQLite database (WAL mode) per day, so the retention drops the whole partitions
+    and a time range query only opens the partitions of the range. The telemetry is stored once per snapshot,
+    whichever number of decisions were made on it, as compact `(snapshot, metric, series, value)` rows with the
+    metric names and the series labels dictionary-encoded.
+
+    The appends only enqueue the rows and never block the event loop. A background thread writes everything queued
+    so far in one transaction (group commit), and the range queries read the committed rows concurrently.
+    """
+
+    def __init__(
+        self,
+        store_dir: str = "logs/store",
+        retention_days: Optional[int] = 30,
+        batch_size: int = 1024,
+        logger: Logger = None
+    ):
+        """Initializes the telemetry store.
+
+        Args:
+            store_dir (`str`): Directory of the partition databases. Default is `logs/store`
+            retention_days (`Optional[int]`): Days to keep the partitions, `None` keeps them all. Default is `30`
+            batch_size (`int`): Max number of queued rows written in one transaction. Default is `1024`
+            logger (`Logger`): Logger of the write failures. Default is `None` (the `GPU Delegater Telemetry Store` logger)
+
+        Raises:
+            ValueError: If the retention or the batch size is not positive
+        """
+
+        if retention_days is not None and retention_days < 1:
+            raise ValueError(f"Retention must be at least 1 day: {retention_days}")
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be positive: {batch_size}")
+
+        self.store_dir = store_dir
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.logger = logger or getLogger("GPU Delegater Telemetry Store")
+
+        os.makedirs(store_dir, exist_ok=True)
+
+        self._queue: SimpleQueue = SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread = None
+        self._closed = False
+
+        # 以下只由背景 writer 存取
+        self._partitions: Dict[str, _Partition] = {}
+        self._snapshot_ids: "OrderedDict[Tuple[str, int], Tuple[Any, int]]" = OrderedDict()
+
+        self.written = 0
+        """Number of written rows (snapshots, decisions and requests)"""
+
+        self.dropped = 0
+        """Number of rows dropped by the failed transactions"""
+
+        self.enforce_retention()
+
+    # ============================== Properties ==============================
+
+    @property
+    def partitions(self) -> List[str]:
+        """Names of the partitions on disk, sorted by date"""
+
+        return sorted(
+            file_name[:-len(PARTITION_SUFFIX)]
+            for file_name in os.listdir(self.store_dir)
+            if file_name.endswith(PARTITION_SUFFIX)
+        )
+
+    @property
+    def running(self) -> bool:
+        """Whether the background writer is running"""
+
+        return self._thread is not None and self._thread.is_alive()
+
+    # ============================== Public Methods ==============================
+
+    def append_snapshot(self, snapshot: "GPUSnapshot"):
+        """Enqueue the samples of a telemetry snapshot, a snapshot already written recently is skipped.
+
+        Args:
+            snapshot (`GPUSnapshot`): Telemetry snapshot of the GPU Dispatcher
+        """
+
+        self._put(("snapshot", snapshot.timestamp, snapshot, snapshot.node_gpu_info))
+
+    def append_decision(self, record: SchedulingRecord, snapshot: "GPUSnapshot" = None):
+        """Enqueue a scheduling decision, with the telemetry it was made on.
+
+        Args:
+            record (`SchedulingRecord`): Scheduling record
+            snapshot (`GPUSnapshot`): Telemetry snapshot the decision was made on, stored once for all of its decisions.
+                Default is `None` (the compacted telemetry of the record, stored once per telemetry object)
+        """
+
+        if snapshot is not None:
+            self._put(("decision", record, snapshot.timestamp, snapshot, snapshot.node_gpu_info))
+        else:
+            self._put(("decision", record, record.timestamp, record.telemetry, record.telemetry))
+
+    def append_request(self, request: RequestRecord):
+        """Enqueue the latencies of a request.
+
+        Args:
+            request (`RequestRecord`): Request latencies
+        """
+
+        self._put(("request", request))
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until the rows enqueued so far are committed.
+
+        Args:
+            timeout (`float`): Max time to wait, unit: s. Default is `None` (no limit)
+
+        Returns:
+            flushed (`bool`): Whether the rows are committed before the timeout, `False` if some rows are dropped
+        """
+
+        if not self.running:
+            return self._queue.empty()
+
+        dropped = self.dropped
+        flushed = threading.Event()
+        self._queue.put(("flush", flushed))
+
+        return flushed.wait(timeout) and self.dropped == dropped
+
+    def close(self):
+        """Commit the queued rows, stop the background writer and close the partition databases."""
+
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+
+        if thread is not None:
+            atexit.unregister(self.close)
+            self._queue.put(None)
+            thread.join()
+
+    def enforce_retention(self, now: float = None) -> List[str]:
+        """Delete the partitions older than the retention.
+
+        Args:
+            now (`float`): Unix timestamp of today. Default is `None` (now)
+
+        Returns:
+            deleted (`List[str]`): Names of the deleted partitions
+        """
+
+        if self.retention_days is None:
+            return []
+
+        oldest = partition_name((time.time() if now is None else now) - (self.retention_days - 1) * 86400)
+        deleted: List[str] = []
+
+        # 名稱格式 `%Y-%m%d` 依字串排序即為日期排序
+        for name in self.partitions:
+            if name >= oldest or name in self._partitions:
+                continue
+
+            for suffix in (PARTITION_SUFFIX, f"{PARTITION_SUFFIX}-wal", f"{PARTITION_SUFFIX}-shm"):
+                path = os.path.join(self.store_dir, name + suffix)
+                if os.path.exists(path):
+                    os.remove(path)
+            deleted.append(name)
+
+        return deleted
+
+    def query_samples(
+        self,
+        start: float = None,
+        end: float = None,
+        metrics: Sequence[str] = None,
+        node_name: str = None
+    ) -> Dict[str, List[VectorSample]]:
+        """Query the stored telemetry samples of a time range.
+
+        Args:
+            start (`float`): Unix timestamp of the range start, inclusive. Default is `None` (unbounded)
+            end (`float`): Unix timestamp of the range end, exclusive. Default is `None` (unbounded)
+            metrics (`Sequence[str]`): DCGM metric names. Default is `None` (all metrics)
+            node_name (`str`): Kubernetes Node name. Default is `None` (all nodes)
+
+        Returns:
+            metrics_samples (`Dict[str, List[VectorSample]]`): Metric name to the samples sorted by the time,
+                timestamped with the time of their snapshot
+        """
+
+        conditions, parameters = self._range_conditions("p.timestamp", start, end)
+        if metrics:
+            conditions.append(f"m.name IN ({', '.join('?' * len(metrics))})")
+            parameters.extend(metrics)
+        if node_name is not None:
+            conditions.append("s.node_name = ?")
+            parameters.append(node_name)
+
+        sql = (
+            "SELECT m.name, s.node_name, s.gpu, s.uuid, s.model_name, s.mig_instance_id, s.mig_profile, "
+            "p.timestamp, v.value FROM snapshots p "
+            "JOIN samples v ON v.snapshot = p.id "
+            "JOIN metrics m ON m.id = v.metric "
+            "JOIN series s ON s.id = v.series"
+            f"{self._where(conditions)} ORDER BY p.timestamp, v.metric, v.series"
+        )
+
+        metrics_samples: Dict[str, List[VectorSample]] = defaultdict(list)
+        for connection in self._read_partitions(start, end):
+            for row in connection.execute(sql, parameters):
+                metrics_samples[row[0]].append(VectorSample(*row[1:]))
+
+        return dict(metrics_samples)
+
+    def query_decisions(self, start: float = None, end: float = None, model: str = None) -> List[SchedulingRecord]:
+        """Query the stored scheduling decisions of a time range, with the telemetry they were made on.
+
+        The records of the same snapshot share its telemetry object, so they must not be mutated.
+
+        Args:
+            start (`float`): Unix timestamp of the range start, inclusive. Default is `None` (unbounded)
+            end (`float`): Unix timestamp of the range end, exclusive. Default is `None` (unbounded)
+            model (`str`): Ollama model name. Default is `None` (all models)
+
+        Returns:
+            records (`List[SchedulingRecord]`): Scheduling records sorted by the timestamp, Like `load_records`
+        """
+
+        conditions, parameters = self._range_conditions("timestamp", start, end)
+        if model is not None:
+            conditions.append("model = ?")
+            parameters.append(model)
+
+        sql = (
+            "SELECT timestamp, model, priority, outcome, node_name, gpus, resource_profile, estimate_vram, "
+            f"model_details, timings, snapshot FROM decisions{self._where(conditions)} ORDER BY timestamp"
+        )
+
+        records: List[SchedulingRecord] = []
+        for connection in self._read_partitions(start, end):
+            telemetries: Dict[int, Dict[str, List[Dict[str, Any]]]] = {}
+
+            for row in connection.execute(sql, parameters).fetchall():
+                snapshot_id = row[10]
+                if snapshot_id is not None and snapshot_id not in telemetries:
+                    telemetries[snapshot_id] = self._load_telemetry(connection, snapshot_id)
+
+                records.append(SchedulingRecord.model_construct(
+                    timestamp=row[0],
+                    model=row[1],
+                    priority=row[2],
+                    outcome=row[3],
+                    node_name=row[4],
+                    gpus=json.loads(row[5]) if row[5] else [],
+                    resource_profile=row[6],
+                    estimate_vram=row[7],
+                    model_details=json.loads(row[8]) if row[8] else None,
+                    timings=json.loads(row[9]) if row[9] else {},
+                    telemetry=telemetries.get(snapshot_id, {})
+                ))
+
+        return records
+
+    def query_requests(self, start: float = None, end: float = None, model: str = None) -> List[RequestRecord]:
+        """Query the stored request latencies of a time range.
+
+        Args:
+            start (`float`): Unix timestamp of the range start, inclusive. Default is `None` (unbounded)
+            end (`float`): Unix timestamp of the range end, exclusive. Default is `None` (unbounded)
+            model (`str`): Ollama model name. Default is `None` (all models)
+
+        Returns:
+            requests (`List[RequestRecord]`): Request latencies sorted by the timestamp
+        """
+
+        conditions, parameters = self._range_conditions("timestamp", start, end)
+        if model is not None:
+            conditions.append("model = ?")
+            parameters.append(model)
+
+        sql = (
+            "SELECT timestamp, model, ttft, inter_token_latency, e2e, output_tokens, error "
+            f"FROM requests{self._where(conditions)} ORDER BY timestamp"
+        )
+
+        requests: List[RequestRecord] = []
+        for connection in self._read_partitions(start, end):
+            for row in connection.execute(sql, parameters):
+                requests.append(RequestRecord(
+                    timestamp=row[0],
+                    model=row[1],
+                    ttft=row[2],
+                    inter_token_latency=row[3],
+                    e2e=row[4],
+                    output_tokens=row[5],
+                    error=row[6]
+                ))
+
+        return requests
+
+    def arrivals(self, start: float = None, end: float = None) -> Dict[str, List[float]]:
+        """Request arrivals of the stored scheduling decisions, Like `load_arrivals` for the pre-warming evaluation.
+
+        Args:
+            start (`float`): Unix timestamp of the range start, inclusive. Default is `None` (unbounded)
+            end (`float`): Unix timestamp of the range end, exclusive. Default is `None` (unbounded)
+
+        Returns:
+            arrivals (`Dict[str, List[float]]`): Ollama model name to the sorted arrival timestamps
+        """
+
+        conditions, parameters = self._range_conditions("timestamp", start, end)
+        sql = f"SELECT model, timestamp FROM decisions{self._where(conditions)} ORDER BY timestamp"
+
+        arrivals: Dict[str, List[float]] = defaultdict(list)
+        for connection in self._read_partitions(start, end):
+            for model, timestamp in connection.execute(sql, parameters):
+                arrivals[model].append(timestamp)
+
+        return dict(arrivals)
+
+    # ============================== Private Methods ==============================
+
+    def _put(self, item: Tuple):
+        with self._lock:
+            if self._closed:
+                raise ValueError("The telemetry store is closed")
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="telemetry-store-writer", daemon=True)
+                self._thread.start()
+                # 程式結束前寫出佇列中剩餘的資料
+                atexit.register(self.close)
+
+        self._queue.put(item)
+
+    def _run(self):
+        stopped = False
+
+        while not stopped:
+            # 一次寫出佇列中已有的所有資料 (group commit)，負載低時每筆資料各自立即寫出
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get())
+
+            flushed: List[threading.Event] = []
+            items: List[Tuple] = []
+            for item in batch:
+                if item is None:
+                    stopped = True
+                elif item[0] == "flush":
+                    flushed.append(item[1])
+                else:
+                    items.append(item)
+
+            try:
+                self._write(items)
+            except Exception as e:
+                # 寫入失敗只丟棄這一批資料，writer 繼續處理後續的資料
+                self.dropped += len(items)
+                self.logger.warning("Failed to write %d row(s) to the telemetry store (%s)", len(items), repr(e))
+                # 失敗的交易已回滾，快取的快照 id 可能已不存在，重新開啟 partition
+                self._reset_partitions()
+            finally:
+                for event in flushed:
+                    event.set()
+
+        self._reset_partitions()
+
+    def _reset_partitions(self):
+        for partition in self._partitions.values():
+            partition.connection.close()
+        self._partitions.clear()
+        self._snapshot_ids.clear()
+
+    def _write(self, items: List[Tuple]):
+        partitions: Dict[str, List[Tuple]] = defaultdict(list)
+        for item in items:
+            timestamp = item[1].timestamp if item[0] in ("decision", "request") else item[1]
+            partitions[partition_name(timestamp)].append(item)
+
+        for name, partition_items in partitions.items():
+            partition = self._partition(name)
+
+            with partition.connection:
+                for item in partition_items:
+                    if item[0] == "snapshot":
+                        self._write_snapshot(partition, *item[1:])
+                    elif item[0] == "decision":
+                        record = item[1]
+                        snapshot_id = self._write_snapshot(partition, *item[2:])
+
+                        partition.connection.execute(
+                            "INSERT INTO decisions (timestamp, model, priority, outcome, node_name, gpus, "
+                            "resource_profile, estimate_vram, model_details, timings, snapshot) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (
+                                record.timestamp,
+                                record.model,
+                                record.priority,
+                                record.outcome,
+                                record.node_name,
+                                json.dumps(record.gpus) if record.gpus else None,
+                                record.resource_profile,
+                                record.estimate_vram,
+                                json.dumps(record.model_details) if record.model_details else None,
+                                json.dumps(record.timings) if record.timings else None,
+                                snapshot_id
+                            )
+                        )
+                    else:
+                        request: RequestRecord = item[1]
+                        partition.connection.execute(
+                            "INSERT INTO requests (timestamp, model, ttft, inter_token_latency, e2e, output_tokens, "
+                            "error) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (
+                                request.timestamp,
+                                request.model,
+                                request.ttft,
+                                request.inter_token_latency,
+                                request.e2e,
+                                request.output_tokens,
+                                request.error
+                            )
+                        )
+
+                    self.written += 1
+
+    def _write_snapshot(
+        self,
+        partition: _Partition,
+        timestamp: float,
+        source: Any,
+        telemetry: Mapping[str, Sequence[Any]]
+    ) -> Optional[int]:
+        if not telemetry:
+            return None
+
+        # 同一個快照 (或同一個 telemetry 物件) 的多個決策只寫入一次；保留物件的參照，避免 id 被重複使用
+        key = (partition.name, id(source))
+        cached = self._snapshot_ids.get(key)
+        if cached is not None and cached[0] is source:
+            self._snapshot_ids.move_to_end(key)
+            return cached[1]
+
+        rows = list(_telemetry_rows(telemetry))
+        snapshot_id = partition.connection.execute(
+            "INSERT INTO snapshots (timestamp, sample_timestamp) VALUES (?, ?)",
+            (timestamp, rows[0][2] if rows else None)
+        ).lastrowid
+        partition.connection.executemany(
+            "INSERT OR REPLACE INTO samples (snapshot, metric, series, value) VALUES (?, ?, ?, ?)",
+            [
+                (snapshot_id, partition.metric_id(metric), partition.series_id(labels), value)
+                for metric, labels, _, value in rows
+            ]
+        )
+
+        self._snapshot_ids[key] = (source, snapshot_id)
+        if len(self._snapshot_ids) > _SNAPSHOT_CACHE_SIZE:
+            self._snapshot_ids.popitem(last=False)
+
+        return snapshot_id
+
+    def _partition(self, name: str) -> _Partition:
+        partition = self._partitions.get(name)
+        if partition is not None:
+            return partition
+
+        connection = sqlite3.connect(os.path.join(self.store_dir, name + PARTITION_SUFFIX))
+        connection.execute("PRAGMA journal_mode=WAL")
+        # WAL 模式下 NORMAL 只在 checkpoint 時 fsync，程式中止不會損壞資料庫
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+
+        partition = self._partitions[name] = _Partition(name, connection)
+
+        # 換日時關閉較舊的 partition (只保留最近兩天，容許跨日的資料)，並刪除超過保存期限的 partition
+        for stale_name in sorted(self._partitions)[:-2]:
+            if stale_name != name:
+                self._partitions.pop(stale_name).connection.close()
+        self.enforce_retention()
+
+        return partition
+
+    def _read_partitions(self, start: Optional[float], end: Optional[float]) -> Iterator[sqlite3.Connection]:
+        first = partition_name(start) if start is not None else None
+        last = partition_name(end) if end is not None else None
+
+        for name in self.partitions:
+            if (first is not None and name < first) or (last is not None and name > last):
+                continue
+
+            connection = sqlite3.connect(os.path.join(self.store_dir, name + PARTITION_SUFFIX))
+            try:
+                yield connection
+            finally:
+                connection.close()
+
+    @staticmethod
+    def _load_telemetry(connection: sqlite3.Connection, snapshot_id: int) -> Dict[str, List[Dict[str, Any]]]:
+        telemetry: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+        sample_timestamp = connection.execute(
+            "SELECT COALESCE(sample_timestamp, timestamp) FROM snapshots WHERE id = ?", (snapshot_id,)
+        ).fetchone()[0]
+
+        for row in connection.execute(
+            "SELECT m.name, s.node_name, s.gpu, s.uuid, s.model_name, s.mig_instance_id, s.mig_profile, v.value "
+            "FROM samples v JOIN metrics m ON m.id = v.metric JOIN series s ON s.id = v.series "
+            "WHERE v.snapshot = ? ORDER BY v.metric, v.series",
+            (snapshot_id,)
+        ):
+            metric = {label: value for label, value in zip(SERIES_LABELS, row[1:7]) if value is not None}
+            value = row[7]
+            # 與 `compact_telemetry` 相同，sample value 以字串記錄
+            telemetry[row[0]].append({
+                "metric": metric,
+                "value": [sample_timestamp, str(int(value)) if value.is_integer() else repr(value)]
+            })
+
+        return dict(telemetry)
+
+    @staticmethod
+    def _range_conditions(column: str, start: Optional[float], end: Optional[float]) -> Tuple[List[str], List[Any]]:
+        conditions: List[str] = []
+        parameters: List[Any] = []
+
+        if start is not None:
+            conditions.append(f"{column} >= ?")
+            parameters.append(start)
+        if end is not None:
+            conditions.append(f"{column} < ?")
+            parameters.append(end)
+
+        return conditions, parameters
+
+    @staticmethod
+    def _where(conditions: List[str]) -> str:
+        return f" WHERE {' AND '.join(conditions)}" if conditions else ""
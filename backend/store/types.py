@@ -0,0 +1,58 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field, computed_field
+
+
+class RequestRecord(BaseModel):
+
+    timestamp: float
+    """Unix timestamp when the request is issued"""
+
+    model: str
+    """Ollama model name, Like `gemma2:2b`"""
+
+    ttft: Optional[float] = None
+    """Time to first token, unit: s"""
+
+    inter_token_latency: Optional[float] = None
+    """Mean gap between the consecutive tokens, unit: s"""
+
+    e2e: Optional[float] = None
+    """End-to-end latency, unit: s"""
+
+    output_tokens: int = 0
+    """Number of generated tokens (non-empty stream chunks)"""
+
+    error: Optional[str] = None
+    """Error of the request, `None` if succeeded"""
+
+
+class StoreBenchmark(BaseModel):
+
+    records: int = 0
+    """Number of written scheduling records"""
+
+    snapshots: int = 0
+    """Number of distinct telemetry snapshots of the records"""
+
+    write_seconds: Dict[str, float] = Field(default_factory=dict)
+    """Format (`jsonl`, `store`) to the wall time to write the records (and flush them to disk), unit: s"""
+
+    bytes: Dict[str, int] = Field(default_factory=dict)
+    """Format to the size on disk, unit: B"""
+
+    query_records: int = 0
+    """Number of records in the queried time range"""
+
+    query_seconds: Dict[str, float] = Field(default_factory=dict)
+    """Format to the wall time of the time range query, unit: s. The JSON Lines recording is loaded and filtered"""
+
+    @computed_field
+    @property
+    def query_speedup(self) -> Optional[float]:
+        """Time range query time of the JSON Lines recording divided by the store's"""
+
+        if not self.query_seconds.get("store"):
+            return None
+
+        return self.query_seconds.get("jsonl", 0.0) / self.query_seconds["store"]
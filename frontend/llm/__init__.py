@@ -1,11 +1,97 @@
-from .auth import auth_signin, generate_openai_api_key
-from .chat import chat_completions
+from typing import TYPE_CHECKING
+
+from shared.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .auth import auth_signin, generate_openai_api_key
+    from .cache import ResponseCache, StreamCoalescer, normalize_prompt, prompt_cache_key
+    from .chat import chat_completions
+    from .fake_server import FaultInjectingServer, FaultProfile
+    from .gateway import DEFAULT_OLLAMA_NUM_PARALLEL, ChatGateway, ollama_num_parallel
+    from .resilience import (
+        CircuitBreaker,
+        CircuitOpenError,
+        ResilientChat,
+        RetryPolicy,
+        StreamStalledError,
+        is_retryable
+    )
+    from .routing import BoundedLoadHashRing, PrefixRouter, approximate_tokens, prompt_prefix
+
+# 子模組 (以及其相依套件) 於第一次使用時才載入
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".auth": [
+        "auth_signin",
+        "generate_openai_api_key",
+    ],
+    ".cache": [
+        "ResponseCache",
+        "StreamCoalescer",
+        "normalize_prompt",
+        "prompt_cache_key",
+    ],
+    ".chat": [
+        "chat_completions",
+    ],
+    ".fake_server": [
+        "FaultInjectingServer",
+        "FaultProfile",
+    ],
+    ".gateway": [
+        "DEFAULT_OLLAMA_NUM_PARALLEL",
+        "ChatGateway",
+        "ollama_num_parallel",
+    ],
+    ".resilience": [
+        "CircuitBreaker",
+        "CircuitOpenError",
+        "ResilientChat",
+        "RetryPolicy",
+        "StreamStalledError",
+        "is_retryable",
+    ],
+    ".routing": [
+        "BoundedLoadHashRing",
+        "PrefixRouter",
+        "approximate_tokens",
+        "prompt_prefix",
+    ],
+})
 
 __all__ = [
     # Auth
     "auth_signin",
     "generate_openai_api_key",
 
+    # Cache
+    "ResponseCache",
+    "StreamCoalescer",
+    "normalize_prompt",
+    "prompt_cache_key",
+
     # Chat
     "chat_completions",
+
+    # Fake Server
+    "FaultInjectingServer",
+    "FaultProfile",
+
+    # Gateway
+    "DEFAULT_OLLAMA_NUM_PARALLEL",
+    "ChatGateway",
+    "ollama_num_parallel",
+
+    # Resilience
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "ResilientChat",
+    "RetryPolicy",
+    "StreamStalledError",
+    "is_retryable",
+
+    # Routing
+    "BoundedLoadHashRing",
+    "PrefixRouter",
+    "approximate_tokens",
+    "prompt_prefix",
 ]
@@ -0,0 +1,269 @@
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from langchain_core.messages import AIMessageChunk
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize the prompt for the response cache lookup.
+
+    Args:
+        prompt (`str`): Prompt, Like `  What is   the largest country? `
+
+    Returns:
+        normalized_prompt (`str`): Normalized prompt, Like `What is the largest country?`
+    """
+
+    return " ".join(prompt.split())
+
+
+def prompt_cache_key(model: str, system_prompt: str, user_prompt: str) -> str:
+    """Hash the model and the normalized prompts into the response cache key.
+
+    Args:
+        model (`str`): Model name, Like `gemma2:2b`
+        system_prompt (`str`): System sentence
+        user_prompt (`str`): User sentence
+
+    Returns:
+        cache_key (`str`): SHA-256 hex digest
+    """
+
+    payload = json.dumps(
+        [model, normalize_prompt(system_prompt), normalize_prompt(user_prompt)],
+        ensure_ascii=False
+    )
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """LRU cache of the deterministic (`temperature=0`) responses, bounded by the entries and the size."""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, cache_dir: str = None):
+        """Initializes the response cache.
+
+        Args:
+            max_entries (`int`): Max number of the cached responses in memory. Default is `1024`
+            max_bytes (`int`): Max total size of the cached responses in memory, unit: bytes. Default is `64 MiB`
+            cache_dir (`str`): Directory of the on-disk store, the responses survive the restarts.
+                Default is `None` (memory only)
+
+        Raises:
+            ValueError: If the bounds are invalid
+        """
+
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("`max_entries` and `max_bytes` must be positive")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+
+        self._entries: OrderedDict[str, List[str]] = OrderedDict()
+        """Cache key to the chunk contents, the least recently used first"""
+
+        self._sizes: Dict[str, int] = {}
+        """Cache key to the size of the response, unit: bytes"""
+
+        self._total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Get the cached response, the on-disk store is looked up on the memory miss.
+
+        Args:
+            key (`str`): Cache key
+
+        Returns:
+            chunks (`Optional[List[str]]`): Chunk contents of the response, `None` if not cached
+        """
+
+        chunks = self._entries.get(key)
+        if chunks is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return chunks
+
+        chunks = self._read_disk(key)
+        if chunks is not None:
+            self._put_memory(key, chunks)
+            self.hits += 1
+            return chunks
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, chunks: List[str]):
+        """Cache the response.
+
+        Args:
+            key (`str`): Cache key
+            chunks (`List[str]`): Chunk contents of the response
+        """
+
+        self._put_memory(key, chunks)
+        self._write_disk(key, chunks)
+
+    def _put_memory(self, key: str, chunks: List[str]):
+        size = sum(len(chunk.encode("utf-8")) for chunk in chunks)
+        # 單一回應超過上限時不放入記憶體，避免清空整個快取
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._total_bytes -= self._sizes.pop(key)
+            del self._entries[key]
+
+        self._entries[key] = chunks
+        self._sizes[key] = size
+        self._total_bytes += size
+
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(evicted_key)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[List[str]]:
+        if not self.cache_dir or not os.path.exists(self._disk_path(key)):
+            return None
+
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, chunks: List[str]):
+        if not self.cache_dir:
+            return
+
+        # 先寫入暫存檔再取代，避免其他行程讀到寫到一半的檔案
+        temp_path = f"{self._disk_path(key)}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(chunks, f, ensure_ascii=False)
+        os.replace(temp_path, self._disk_path(key))
+
+
+class _InflightStream:
+    """Upstream stream shared by the identical concurrent requests."""
+
+    def __init__(self):
+        self.chunks: List["AIMessageChunk"] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.condition = asyncio.Condition()
+
+    async def subscribe(self) -> AsyncIterator["AIMessageChunk"]:
+        """Replay the received chunks, then follow the upstream until it is finished."""
+
+        index = 0
+
+        while True:
+            async with self.condition:
+                await self.condition.wait_for(lambda: index < len(self.chunks) or self.done)
+                chunks = self.chunks[index:]
+                done = self.done
+
+            index += len(chunks)
+            for chunk in chunks:
+                yield chunk
+
+            if done and index >= len(self.chunks):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class StreamCoalescer:
+    """Serve the identical requests from the response cache, or share one in-flight upstream stream among them."""
+
+    def __init__(self, cache: ResponseCache = None):
+        """Initializes the stream coalescer.
+
+        Args:
+            cache (`ResponseCache`): Response cache of the finished streams. Default is `None` (coalescing only)
+        """
+
+        self.cache = cache
+
+        self._inflight: Dict[str, _InflightStream] = {}
+        """Cache key to the in-flight upstream stream"""
+
+        self._tasks = set()
+        """Running upstream tasks, referenced until they are finished"""
+
+        self.coalesced = 0
+
+    async def stream(self, key: str, upstream: Callable[[], AsyncIterator]) -> AsyncIterator:
+        """Stream the response of the request.
+
+        Args:
+            key (`str`): Cache key of the request, see `prompt_cache_key`
+            upstream (`Callable[[], AsyncIterator]`): Start the upstream stream, only called on the cache miss
+                without an identical in-flight request
+
+        Returns:
+            stream (`AsyncIterator`): Chunks with a `content` attribute
+        """
+
+        if self.cache is not None:
+            chunks = self.cache.get(key)
+            if chunks is not None:
+                from langchain_core.messages import AIMessageChunk
+
+                for content in chunks:
+                    yield AIMessageChunk(content=content)
+                return
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = _InflightStream()
+            self._inflight[key] = inflight
+            # 上游串流由背景工作讀取，即使某個訂閱者中途取消，其他訂閱者仍能收到完整回應
+            task = asyncio.create_task(self._pump(key, inflight, upstream()))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            self.coalesced += 1
+
+        async for chunk in inflight.subscribe():
+            yield chunk
+
+    async def _pump(self, key: str, inflight: _InflightStream, stream: AsyncIterator):
+        completed = False
+
+        try:
+            async for chunk in stream:
+                async with inflight.condition:
+                    inflight.chunks.append(chunk)
+                    inflight.condition.notify_all()
+            completed = True
+        except Exception as e:
+            inflight.error = e
+        finally:
+            # 先移除 in-flight 紀錄再通知，之後的相同請求改由快取提供
+            self._inflight.pop(key, None)
+            if completed and self.cache is not None:
+                self.cache.put(key, [str(chunk.content) for chunk in inflight.chunks])
+            elif not completed and inflight.error is None:
+                inflight.error = RuntimeError("Upstream stream is cancelled")
+
+            async with inflight.condition:
+                inflight.done = True
+                inflight.condition.notify_all()
@@ -1,6 +1,3 @@
-from langchain_openai.chat_models import ChatOpenAI
-
-
 async def chat_completions(
     model: str,
     system_prompt: str,
@@ -20,6 +17,9 @@ async def chat_completions(
         timeout (float, optional): Timeout. Defaults to 600.0.
     """
 
+    # langchain_openai 載入時間較長，只在實際推理時載入
+    from langchain_openai.chat_models import ChatOpenAI
+
     print(f"Using model: {model}")
     llm = ChatOpenAI(
         model=model,
@@ -36,5 +36,5 @@ async def chat_completions(
         ("human", user_prompt),
     ]
 
-    for chunk in llm.stream(messages):
+    async for chunk in llm.astream(messages):
         yield chunk
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import random
+import time
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class FaultProfile(BaseModel):
+
+    first_token_delay: float = 0.05
+    """Latency of the first token, unit: s"""
+
+    token_delay: float = 0.01
+    """Latency between the tokens, unit: s"""
+
+    output_tokens: int = 16
+    """Generated tokens per request"""
+
+    slow_rate: float = 0.0
+    """Fraction of the requests with a late first token (Like a stuck or cold pod)"""
+
+    slow_delay: float = 5.0
+    """Latency of the late first token, unit: s"""
+
+    error_rate: float = 0.0
+    """Fraction of the requests failed with `error_status`"""
+
+    error_status: int = 503
+    """HTTP status code of the failed requests"""
+
+    stall_rate: float = 0.0
+    """Fraction of the requests stalled forever in the middle of the stream"""
+
+    reset_rate: float = 0.0
+    """Fraction of the requests whose connection is closed without a response"""
+
+    seed: int = 0
+    """Random seed of the injected faults"""
+
+
+class FaultInjectingServer:
+    """Local OpenAI-compatible chat completions server injecting latency, errors, stalls and connection resets."""
+
+    def __init__(self, profile: FaultProfile = None, host: str = "127.0.0.1", port: int = 0):
+        """Initializes the fault-injecting server.
+
+        Args:
+            profile (`FaultProfile`): Injected faults. Default is `FaultProfile()` (no fault)
+            host (`str`): Listening host. Default is `127.0.0.1`
+            port (`int`): Listening port. Default is `0` (a free port)
+        """
+
+        self.profile = profile or FaultProfile()
+        self.host = host
+        self.port = port
+
+        self.requests = 0
+        self.faults: Dict[str, int] = {"slow": 0, "error": 0, "stall": 0, "reset": 0}
+
+        self._rng = random.Random(self.profile.seed)
+        self._server: asyncio.AbstractServer = None
+
+    async def __aenter__(self) -> "FaultInjectingServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    @property
+    def url(self) -> str:
+        """OpenAI API base URL of the server"""
+
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self):
+        """Start listening."""
+
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop listening."""
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _fault(self) -> str:
+        roll = self._rng.random()
+        for fault, rate in (
+            ("reset", self.profile.reset_rate),
+            ("error", self.profile.error_rate),
+            ("stall", self.profile.stall_rate),
+            ("slow", self.profile.slow_rate),
+        ):
+            if roll < rate:
+                self.faults[fault] += 1
+                return fault
+            roll -= rate
+
+        return None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            headers = {
+                name.strip().lower(): value.strip()
+                for name, _, value in (line.partition(":") for line in head.decode("latin-1").split("\r\n")[1:] if line)
+            }
+            body = json.loads(await reader.readexactly(int(headers.get("content-length", 0))) or b"{}")
+
+            self.requests += 1
+            fault = self._fault()
+
+            if fault == "reset":
+                return
+
+            if fault == "error":
+                payload = json.dumps({"error": {"message": "Injected fault", "type": "server_error"}}).encode()
+                writer.write(
+                    f"HTTP/1.1 {self.profile.error_status} Injected Fault\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+                return
+
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                b"Connection: close\r\n\r\n"
+            )
+            await writer.drain()
+
+            await asyncio.sleep(self.profile.slow_delay if fault == "slow" else self.profile.first_token_delay)
+
+            model = body.get("model", "fake")
+            for i in range(self.profile.output_tokens):
+                if fault == "stall" and i == self.profile.output_tokens // 2:
+                    # 串流中途停止回應，直到用戶端關閉連線
+                    await reader.read()
+                    return
+
+                writer.write(self._event(model, {"role": "assistant", "content": f"token{i} "}, None))
+                await writer.drain()
+                await asyncio.sleep(self.profile.token_delay)
+
+            writer.write(self._event(model, {}, "stop") + b"data: [DONE]\n\n")
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # 用戶端中途關閉連線 (Like hedged request 的落敗者) 或伺服器停止
+            pass
+        finally:
+            writer.close()
+
+    def _event(self, model: str, delta: Dict, finish_reason: str) -> bytes:
+        chunk = {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+
+        return f"data: {json.dumps(chunk)}\n\n".encode()
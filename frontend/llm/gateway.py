@@ -0,0 +1,271 @@
+import asyncio
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Optional
+
+import httpx
+
+if TYPE_CHECKING:
+    from langchain_openai.chat_models import ChatOpenAI
+
+
+DEFAULT_OLLAMA_NUM_PARALLEL = 4
+"""Concurrent requests of an Ollama runner when `OLLAMA_NUM_PARALLEL` is not set"""
+
+_END = object()
+"""End of the demultiplexed stream"""
+
+
+def ollama_num_parallel(model_cr_yaml: Dict[str, Any]) -> int:
+    """Get the concurrent requests of the Ollama runner from the KubeAI Model Custom Resource.
+
+    Args:
+        model_cr_yaml (`Dict[str, Any]`): KubeAI Model Custom Resource YAML
+
+    Returns:
+        num_parallel (`int`): `OLLAMA_NUM_PARALLEL` of the model, `DEFAULT_OLLAMA_NUM_PARALLEL` if not set
+    """
+
+    env = model_cr_yaml.get("spec", {}).get("env") or {}
+
+    return int(env.get("OLLAMA_NUM_PARALLEL", DEFAULT_OLLAMA_NUM_PARALLEL))
+
+
+class _GatewayRequest:
+    """Request waiting in the model lane, its chunks are demultiplexed into its own queue."""
+
+    def __init__(self, system_prompt: str, user_prompt: str):
+        self.system_prompt = system_prompt
+        self.user_prompt = user_prompt
+        self.chunks: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+        self.cancelled = False
+
+
+class _ModelLane:
+    """Batch the requests of a model and forward them with bounded parallelism."""
+
+    def __init__(self, gateway: "ChatGateway", model: str, num_parallel: int):
+        self.gateway = gateway
+        self.model = model
+        self.num_parallel = num_parallel
+
+        self.pending: asyncio.Queue = asyncio.Queue()
+        self.semaphore = asyncio.Semaphore(num_parallel)
+        self.batches: List[int] = []
+        """Size of the dispatched batches"""
+
+        self.task = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self.pending.get()]
+
+            # 在批次時間窗內收集同一模型的請求，最多 `max_batch_size` 個
+            deadline = loop.time() + self.gateway.batch_window
+            while len(batch) < self.gateway.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.pending.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.batches.append(len(batch))
+
+            for request in batch:
+                # 同時進行的請求數不超過 Ollama runner 的 `OLLAMA_NUM_PARALLEL`，其餘請求在 gateway 排隊
+                await self.semaphore.acquire()
+                # 呼叫端在排隊時已離開，不再送出請求
+                if request.cancelled:
+                    self.semaphore.release()
+                    continue
+                request.task = asyncio.create_task(self._forward(request))
+
+    async def _forward(self, request: _GatewayRequest):
+        try:
+            stream = self.gateway.stream_factory(self.model, request.system_prompt, request.user_prompt)
+            async for chunk in stream:
+                await request.chunks.put(chunk)
+            await request.chunks.put(_END)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await request.chunks.put(e)
+        finally:
+            self.semaphore.release()
+
+
+class ChatGateway:
+    """Per-model micro-batching gateway of the chat completions.
+
+    The concurrent requests of a model are collected over a small time window (or up to a max batch size),
+    and forwarded through one pooled client with at most `OLLAMA_NUM_PARALLEL` requests in flight,
+    the streamed chunks are demultiplexed back to each caller.
+    """
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = None,
+        timeout: float = 600.0,
+        batch_window: float = 0.01,
+        max_batch_size: int = 8,
+        num_parallel: Dict[str, int] = None,
+        racing_requests: int = 1,
+        stream_factory: Callable[[str, str, str], AsyncIterator] = None
+    ):
+        """Initializes the chat gateway.
+
+        Args:
+            api_key (`str`): OpenAI API key. Default is `None`
+            base_url (`str`): OpenAI API base URL. Default is `None`
+            timeout (`float`): Timeout. Default is `600.0`
+            batch_window (`float`): Time window to collect a batch, unit: s. Default is `0.01`
+            max_batch_size (`int`): Max number of requests of a batch. Default is `8`
+            num_parallel (`Dict[str, int]`): Model name to the concurrent requests of its Ollama runner.
+                Default is `None` (`DEFAULT_OLLAMA_NUM_PARALLEL` for every model)
+            racing_requests (`int`): Max upstream requests racing for each forwarded request, Like 2 for a primary
+                and a hedged or fallback request of `ResilientChat`. The pooled clients hold `racing_requests` times
+                `OLLAMA_NUM_PARALLEL` connections. Default is `1`
+            stream_factory (`Callable[[str, str, str], AsyncIterator]`): Start the upstream stream of
+                (model, system prompt, user prompt), Like a fake backend of the benchmark.
+                Default is `None` (a pooled `ChatOpenAI` per model)
+
+        Raises:
+            ValueError: If the batching parameters are invalid
+        """
+
+        if batch_window < 0 or max_batch_size < 1:
+            raise ValueError("`batch_window` must be non-negative and `max_batch_size` must be positive")
+        if racing_requests < 1:
+            raise ValueError("`racing_requests` must be positive")
+
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.num_parallel = num_parallel or {}
+        self.racing_requests = racing_requests
+        self.stream_factory = stream_factory or self._chat_openai_stream
+
+        self._lanes: Dict[str, _ModelLane] = {}
+        """Model name to the model lane"""
+
+        self._llms: Dict[str, "ChatOpenAI"] = {}
+        """Model name to the pooled `ChatOpenAI` client"""
+
+        self._http_clients: Dict[str, httpx.AsyncClient] = {}
+        """Model name to the pooled HTTP client"""
+
+    # ============================== Properties ==============================
+
+    @property
+    def batches(self) -> Dict[str, List[int]]:
+        """Model name to the size of the dispatched batches"""
+
+        return {model: lane.batches for model, lane in self._lanes.items()}
+
+    # ============================== Public Methods ==============================
+
+    async def stream(self, model: str, system_prompt: str, user_prompt: str) -> AsyncIterator:
+        """Stream the chat completions through the model lane.
+
+        Args:
+            model (`str`): KubeAI model name
+            system_prompt (`str`): System sentence
+            user_prompt (`str`): User sentence
+
+        Returns:
+            stream (`AsyncIterator`): Chunks with a `content` attribute
+        """
+
+        lane = self._lanes.get(model)
+        if lane is None:
+            lane = _ModelLane(self, model, self.num_parallel.get(model, DEFAULT_OLLAMA_NUM_PARALLEL))
+            self._lanes[model] = lane
+
+        request = _GatewayRequest(system_prompt, user_prompt)
+        await lane.pending.put(request)
+
+        finished = False
+        try:
+            while True:
+                chunk = await request.chunks.get()
+                if chunk is _END:
+                    finished = True
+                    return
+                if isinstance(chunk, Exception):
+                    finished = True
+                    raise chunk
+
+                yield chunk
+        finally:
+            # 呼叫端提前結束時取消上游請求，釋出 Ollama runner 的 slot；仍在排隊的請求由 lane 略過
+            if not finished:
+                request.cancelled = True
+                if request.task is not None:
+                    request.task.cancel()
+
+    async def aclose(self):
+        """Stop the model lanes and close the pooled connections."""
+
+        for lane in self._lanes.values():
+            lane.task.cancel()
+        for http_client in self._http_clients.values():
+            await http_client.aclose()
+
+        self._lanes.clear()
+        self._llms.clear()
+        self._http_clients.clear()
+
+    def http_client(self, model: str) -> httpx.AsyncClient:
+        """Get the pooled HTTP client of the model, at most `racing_requests` times `OLLAMA_NUM_PARALLEL` connections.
+
+        Args:
+            model (`str`): KubeAI model name
+
+        Returns:
+            http_client (`httpx.AsyncClient`): Pooled HTTP client, closed by `aclose`
+        """
+
+        http_client = self._http_clients.get(model)
+        if http_client is None:
+            # 模型 lane 限制同時轉送的請求數，額外的連線保留給 hedged request 與 fallback endpoint，避免與主要請求互相排隊
+            max_connections = self.num_parallel.get(model, DEFAULT_OLLAMA_NUM_PARALLEL) * self.racing_requests
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+                timeout=self.timeout
+            )
+            self._http_clients[model] = http_client
+
+        return http_client
+
+    # ============================== Private Methods ==============================
+
+    async def _chat_openai_stream(self, model: str, system_prompt: str, user_prompt: str):
+        llm = self._llms.get(model)
+        if llm is None:
+            from langchain_openai.chat_models import ChatOpenAI
+
+            llm = ChatOpenAI(
+                model=model,
+                temperature=0,
+                max_tokens=None,
+                timeout=self.timeout,
+                max_retries=2,
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_async_client=self.http_client(model),
+            )
+            self._llms[model] = llm
+
+        messages = [
+            ("system", system_prompt),
+            ("human", user_prompt),
+        ]
+
+        async for chunk in llm.astream(messages):
+            yield chunk
@@ -0,0 +1,492 @@
+import asyncio
+import random
+import sys
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+if TYPE_CHECKING:
+    from langchain_openai.chat_models import ChatOpenAI
+
+from shared.utils.metrics import LatencyHistogram
+from shared.utils.network import RETRYABLE_STATUS_CODES
+
+
+class CircuitOpenError(Exception):
+    """No endpoint is available, the circuit breakers of all endpoints are open."""
+
+
+class StreamStalledError(TimeoutError):
+    """The stream did not produce the next chunk in time."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Classify the failure of an inference call.
+
+    Timeouts, connection failures, open circuits and the transient HTTP status codes (Like `429`, `503`)
+    are retryable, the other failures (Like `400`, `401`, `404`) are not.
+
+    Args:
+        error (`BaseException`): Failure of the inference call
+
+    Returns:
+        retryable (`bool`): The request can be retried
+    """
+
+    if isinstance(error, (
+        TimeoutError,
+        asyncio.TimeoutError,
+        CircuitOpenError,
+        httpx.TimeoutException,
+        httpx.TransportError,
+    )):
+        return True
+
+    # 尚未載入 openai 時不可能收到 openai 的例外，不需要為了型別檢查而載入
+    openai = sys.modules.get("openai")
+    if openai is not None and isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in RETRYABLE_STATUS_CODES
+
+    return False
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.2, max_delay: float = 5.0):
+        """Initializes the retry policy.
+
+        Args:
+            max_attempts (`int`): Max number of attempts including the first one. Default is `3`
+            base_delay (`float`): Backoff of the first retry, unit: s. Default is `0.2`
+            max_delay (`float`): Max backoff, unit: s. Default is `5.0`
+
+        Raises:
+            ValueError: If the parameters are invalid
+        """
+
+        if max_attempts < 1:
+            raise ValueError("`max_attempts` must be positive")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, rng: random.Random = random) -> float:
+        """Backoff before the attempt.
+
+        Args:
+            attempt (`int`): Attempt index, `1` is the first retry
+            rng (`random.Random`): Random generator. Default is the `random` module
+
+        Returns:
+            delay (`float`): Backoff, uniformly drawn from `[0, min(max_delay, base_delay * 2 ** (attempt - 1))]`
+        """
+
+        return rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Circuit breaker of an endpoint.
+
+    The circuit opens after `failure_threshold` consecutive failures, and lets a single probe request through
+    (half-open) after `recovery_timeout`, the probe closes the circuit on success or reopens it on failure.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initializes the circuit breaker.
+
+        Args:
+            failure_threshold (`int`): Consecutive failures to open the circuit. Default is `5`
+            recovery_timeout (`float`): Time before the half-open probe, unit: s. Default is `30.0`
+            clock (`Callable[[], float]`): Monotonic clock. Default is `time.monotonic`
+        """
+
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """`closed`, `open` or `half_open`"""
+
+        if self._opened_at is None:
+            return "closed"
+        if self.clock() - self._opened_at >= self.recovery_timeout:
+            return "half_open"
+
+        return "open"
+
+    def allow(self) -> bool:
+        """Check whether a request can be sent to the endpoint, the half-open circuit lets a single probe through."""
+
+        match self.state:
+            case "closed":
+                return True
+            case "half_open" if not self._probing:
+                self._probing = True
+                return True
+            case _:
+                return False
+
+    def record_success(self):
+        """Record a successful request, the circuit is closed."""
+
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        """Record a failed request, the circuit is opened after the consecutive failures or a failed probe."""
+
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self._opened_at = self.clock()
+            self._probing = False
+
+    def release_probe(self):
+        """Release the half-open probe without an outcome (Like a cancelled request or a non-retryable failure),
+        the next request is let through as the probe."""
+
+        self._probing = False
+
+
+class ResilientChat:
+    """Inference calls with latency-aware timeouts, hedging, per-endpoint circuit breakers and classified retries.
+
+    The first token must arrive within a timeout derived from the observed TTFT percentile of the model.
+    When it is later than the hedging percentile, a hedged request is sent to the next endpoint (placement)
+    and the first one to answer wins. Once a token is streamed the request is not retried.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[str],
+        api_key: str = None,
+        retry_policy: RetryPolicy = None,
+        ttft_percentile: float = 99,
+        ttft_multiplier: float = 2.0,
+        min_ttft_timeout: float = 5.0,
+        max_ttft_timeout: float = 120.0,
+        cold_ttft_timeout: float = None,
+        hedge_percentile: float = 95,
+        stall_timeout: float = 60.0,
+        min_samples: int = 20,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        stream_factory: Callable[[str, str, str, str], AsyncIterator] = None,
+        http_client: Callable[[str], httpx.AsyncClient] = None,
+        seed: int = None
+    ):
+        """Initializes the resilient chat client.
+
+        Args:
+            endpoints (`List[str]`): OpenAI API base URLs of the placements, the first one is preferred
+            api_key (`str`): OpenAI API key. Default is `None`
+            retry_policy (`RetryPolicy`): Retry policy. Default is `RetryPolicy()`
+            ttft_percentile (`float`): Observed TTFT percentile of the first token timeout. Default is `99`
+            ttft_multiplier (`float`): Multiplier of the TTFT percentile of the first token timeout. Default is `2.0`
+            min_ttft_timeout (`float`): Min first token timeout, unit: s. Default is `5.0`
+            max_ttft_timeout (`float`): Max first token timeout, also used before `min_samples` TTFTs are observed,
+                unit: s. Default is `120.0`
+            cold_ttft_timeout (`float`): First token timeout before any TTFT of the model is observed, Like the first
+                requests to a freshly applied model which is still loading, unit: s. Default is `None` (no timeout)
+            hedge_percentile (`float`): Observed TTFT percentile to send the hedged request. Default is `95`
+            stall_timeout (`float`): Max gap between the chunks after the first token, unit: s. Default is `60.0`
+            min_samples (`int`): Min observed TTFTs of the model before the timeouts adapt and hedging starts.
+                Default is `20`
+            failure_threshold (`int`): Consecutive failures to open the circuit of an endpoint. Default is `5`
+            recovery_timeout (`float`): Time before probing an open endpoint again, unit: s. Default is `30.0`
+            stream_factory (`Callable[[str, str, str, str], AsyncIterator]`): Start the upstream stream of
+                (endpoint, model, system prompt, user prompt). Default is `None` (a `ChatOpenAI` per endpoint)
+            http_client (`Callable[[str], httpx.AsyncClient]`): Get the pooled HTTP client of a model shared by all
+                endpoints, Like `ChatGateway.http_client`. Default is `None` (a client per `ChatOpenAI`)
+            seed (`int`): Random seed of the retry jitter. Default is `None`
+
+        Raises:
+            ValueError: If there is no endpoint
+        """
+
+        if not endpoints:
+            raise ValueError("At least one endpoint is required")
+
+        self.endpoints = endpoints
+        self.api_key = api_key
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.ttft_percentile = ttft_percentile
+        self.ttft_multiplier = ttft_multiplier
+        self.min_ttft_timeout = min_ttft_timeout
+        self.max_ttft_timeout = max_ttft_timeout
+        self.cold_ttft_timeout = cold_ttft_timeout
+        self.hedge_percentile = hedge_percentile
+        self.stall_timeout = stall_timeout
+        self.min_samples = min_samples
+        self.stream_factory = stream_factory or self._chat_openai_stream
+        self.http_client = http_client
+
+        self.breakers: Dict[str, CircuitBreaker] = {
+            endpoint: CircuitBreaker(failure_threshold, recovery_timeout) for endpoint in endpoints
+        }
+        """Endpoint to the circuit breaker"""
+
+        self._ttft: Dict[str, LatencyHistogram] = {}
+        """Model name to the observed TTFT histogram"""
+
+        self._llms: Dict[Tuple[str, str], "ChatOpenAI"] = {}
+        """(Endpoint, model name) to the `ChatOpenAI` client"""
+
+        self._rng = random.Random(seed)
+
+        self.retries = 0
+        self.hedges = 0
+        self.hedges_won = 0
+
+    # ============================== Public Methods ==============================
+
+    def ttft_timeout(self, model: str) -> Optional[float]:
+        """First token timeout of the model.
+
+        Args:
+            model (`str`): Model name
+
+        Returns:
+            timeout (`Optional[float]`): `ttft_multiplier` times the observed TTFT percentile, clamped to
+                `[min_ttft_timeout, max_ttft_timeout]`, unit: s. `cold_ttft_timeout` if no TTFT is observed
+        """
+
+        # 尚未觀察到 TTFT 的模型可能仍在載入，逾時重送只會在載入中的模型前累積重複的請求
+        if model not in self._ttft:
+            return self.cold_ttft_timeout
+
+        ttft = self._observed_ttft(model, self.ttft_percentile)
+        if ttft is None:
+            return self.max_ttft_timeout
+
+        return min(max(ttft * self.ttft_multiplier, self.min_ttft_timeout), self.max_ttft_timeout)
+
+    def hedge_delay(self, model: str) -> Optional[float]:
+        """Delay before sending the hedged request of the model.
+
+        Args:
+            model (`str`): Model name
+
+        Returns:
+            delay (`Optional[float]`): Observed TTFT percentile, unit: s. `None` if not enough TTFTs are observed
+        """
+
+        return self._observed_ttft(model, self.hedge_percentile)
+
+    async def stream(self, model: str, system_prompt: str, user_prompt: str) -> AsyncIterator:
+        """Stream the chat completions with retries, hedging and circuit breaking.
+
+        Args:
+            model (`str`): Model name
+            system_prompt (`str`): System sentence
+            user_prompt (`str`): User sentence
+
+        Returns:
+            stream (`AsyncIterator`): Chunks with a `content` attribute
+
+        Raises:
+            CircuitOpenError: If the circuits of all endpoints are open after the retries
+            TimeoutError: If no first token arrives in time after the retries, or the stream stalls
+            Exception: The last non-retryable failure of the upstream
+        """
+
+        last_error: Exception = None
+
+        for attempt in range(self.retry_policy.max_attempts):
+            if attempt > 0:
+                self.retries += 1
+                await asyncio.sleep(self.retry_policy.delay(attempt, self._rng))
+
+            try:
+                first_chunk, stream, endpoint = await self._first_chunk(model, system_prompt, user_prompt, attempt)
+            except Exception as e:
+                last_error = e
+                if not is_retryable(e):
+                    raise
+                continue
+
+            try:
+                if first_chunk is not None:
+                    yield first_chunk
+
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(anext(stream), self.stall_timeout)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        raise StreamStalledError(f"No chunk from {endpoint} within {self.stall_timeout:.1f}s")
+
+                    yield chunk
+            except Exception as e:
+                # 已經輸出部分回應，不重試以避免重複的內容
+                if is_retryable(e):
+                    self.breakers[endpoint].record_failure()
+                raise
+            finally:
+                await stream.aclose()
+                # 使用者停止讀取或被取消時，probe 沒有結果也必須釋放
+                self.breakers[endpoint].release_probe()
+
+            self.breakers[endpoint].record_success()
+            return
+
+        raise last_error
+
+    # ============================== Private Methods ==============================
+
+    def _observed_ttft(self, model: str, percentile: float) -> Optional[float]:
+        histogram = self._ttft.get(model)
+        if histogram is None or histogram.count < self.min_samples:
+            return None
+
+        return histogram.percentile(percentile)
+
+    def _candidates(self, attempt: int) -> List[str]:
+        # 每次重試從下一個 endpoint 開始，並略過 circuit 開啟中的 endpoint
+        rotated = self.endpoints[attempt % len(self.endpoints):] + self.endpoints[:attempt % len(self.endpoints)]
+        return [endpoint for endpoint in rotated if self.breakers[endpoint].state != "open"]
+
+    async def _first_chunk(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        attempt: int
+    ) -> Tuple[object, AsyncIterator, str]:
+        """Race the primary request (and the hedged request) to the first chunk.
+
+        Returns:
+            first_chunk (`Tuple[object, AsyncIterator, str]`): First chunk (`None` for an empty response),
+                the winning stream and its endpoint
+        """
+
+        loop = asyncio.get_running_loop()
+
+        candidates = self._candidates(attempt)
+        # 只有一個 endpoint 時，hedged request 仍送往同一個 KubeAI endpoint，由 KubeAI 分配到其他 replica
+        hedge_endpoints = candidates[1:] or candidates[:1]
+
+        racers: Dict[asyncio.Task, Tuple[str, AsyncIterator, float, bool]] = {}
+        """Racing task to the (endpoint, stream, start time, hedged)"""
+
+        errors: List[Exception] = []
+
+        def start(endpoint: str, hedged: bool = False) -> bool:
+            if not self.breakers[endpoint].allow():
+                return False
+
+            stream = self.stream_factory(endpoint, model, system_prompt, user_prompt)
+            racers[asyncio.ensure_future(anext(stream))] = (endpoint, stream, loop.time(), hedged)
+            return True
+
+        primary = next((endpoint for endpoint in candidates if start(endpoint)), None)
+        if primary is None:
+            raise CircuitOpenError(f"Circuits of all endpoints are open: {self.endpoints}")
+
+        timeout = self.ttft_timeout(model)
+        deadline = loop.time() + timeout if timeout is not None else None
+        hedge_delay = self.hedge_delay(model)
+        hedge_at = loop.time() + hedge_delay if hedge_delay is not None else None
+
+        try:
+            while racers:
+                wake_at = min((t for t in (deadline, hedge_at) if t is not None), default=None)
+                done, _ = await asyncio.wait(
+                    racers,
+                    timeout=max(wake_at - loop.time(), 0) if wake_at is not None else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    endpoint, stream, started_at, hedged = racers.pop(task)
+                    try:
+                        first_chunk = task.result()
+                    except StopAsyncIteration:
+                        first_chunk = None
+                    except Exception as e:
+                        # 4xx 等不可重試的錯誤是請求本身的問題，不代表 endpoint 故障
+                        if is_retryable(e):
+                            self.breakers[endpoint].record_failure()
+                        else:
+                            self.breakers[endpoint].release_probe()
+                        errors.append(e)
+                        await stream.aclose()
+                        continue
+
+                    self._ttft.setdefault(model, LatencyHistogram()).observe(loop.time() - started_at)
+                    self.hedges_won += hedged
+
+                    return first_chunk, stream, endpoint
+
+                if done:
+                    continue
+
+                if hedge_at is not None and loop.time() >= hedge_at:
+                    hedge_at = None
+                    hedge_endpoint = next(
+                        (endpoint for endpoint in hedge_endpoints if endpoint != primary), hedge_endpoints[0]
+                    )
+                    if start(hedge_endpoint, hedged=True):
+                        self.hedges += 1
+                    continue
+
+                if deadline is not None and loop.time() >= deadline:
+                    for endpoint, _, _, _ in racers.values():
+                        self.breakers[endpoint].record_failure()
+                    raise asyncio.TimeoutError(f"No first token of {model} within {timeout:.1f}s")
+
+            raise errors[-1]
+        finally:
+            # 落敗的 hedged request 與被取消的請求沒有結果，釋放其 probe
+            for task, (endpoint, stream, _, _) in racers.items():
+                task.cancel()
+                try:
+                    await task
+                except BaseException:
+                    pass
+                await stream.aclose()
+                self.breakers[endpoint].release_probe()
+
+    async def _chat_openai_stream(self, endpoint: str, model: str, system_prompt: str, user_prompt: str):
+        llm = self._llms.get((endpoint, model))
+        if llm is None:
+            from langchain_openai.chat_models import ChatOpenAI
+
+            # 重試與首個 token、串流中斷的逾時由 ResilientChat 處理，client 本身不重試也不限制讀取時間
+            llm = ChatOpenAI(
+                model=model,
+                temperature=0,
+                max_tokens=None,
+                timeout=httpx.Timeout(None, connect=5.0),
+                max_retries=0,
+                api_key=self.api_key,
+                base_url=endpoint,
+                http_async_client=self.http_client(model) if self.http_client is not None else None,
+            )
+            self._llms[(endpoint, model)] = llm
+
+        messages = [
+            ("system", system_prompt),
+            ("human", user_prompt),
+        ]
+
+        async for chunk in llm.astream(messages):
+            yield chunk
@@ -0,0 +1,267 @@
+import bisect
+import hashlib
+import math
+import re
+from typing import Any, Dict, List, Tuple
+
+from frontend.llm.cache import normalize_prompt
+
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+|\S")
+"""Approximate tokenizer, an ASCII word or any other non-space character (Like a CJK character) is a token"""
+
+
+def approximate_tokens(text: str) -> List[str]:
+    """Split the text into the approximate tokens.
+
+    Args:
+        text (`str`): Text
+
+    Returns:
+        tokens (`List[str]`): Approximate tokens
+    """
+
+    return _TOKEN_PATTERN.findall(text)
+
+
+def prompt_prefix(system_prompt: str, user_prompt: str, prefix_tokens: int = 16) -> str:
+    """Get the prompt prefix shared by the requests, the system prompt and the first N tokens of the user prompt.
+
+    Args:
+        system_prompt (`str`): System sentence
+        user_prompt (`str`): User sentence
+        prefix_tokens (`int`): Number of the leading user prompt tokens in the prefix. Default is `16`
+
+    Returns:
+        prefix (`str`): Prompt prefix
+    """
+
+    user_prefix = " ".join(approximate_tokens(user_prompt)[:prefix_tokens])
+
+    return f"{normalize_prompt(system_prompt)}\n{user_prefix}"
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class BoundedLoadHashRing:
+    """Consistent hashing with bounded loads.
+
+    A key is routed to the first endpoint clockwise on the ring whose in-flight load stays within
+    `load_factor` times the mean load (and within `max_load`), so the hot prefixes spill over to the next endpoints
+    instead of overloading one.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[str] = None,
+        virtual_nodes: int = 128,
+        load_factor: float = 1.25,
+        max_load: int = None
+    ):
+        """Initializes the hash ring.
+
+        Args:
+            endpoints (`List[str]`): Endpoints, Like the model pod names. Default is `None` (empty)
+            virtual_nodes (`int`): Number of the points of each endpoint on the ring. Default is `128`
+            load_factor (`float`): Max in-flight load of an endpoint relative to the mean load. Default is `1.25`
+            max_load (`int`): Max in-flight load of an endpoint, Like the Ollama slots (`OLLAMA_NUM_PARALLEL`) of a
+                model pod, a request beyond it waits in the pod queue. Default is `None` (unbounded)
+
+        Raises:
+            ValueError: If the parameters are invalid
+        """
+
+        if virtual_nodes < 1:
+            raise ValueError("`virtual_nodes` must be positive")
+        if load_factor < 1:
+            raise ValueError("`load_factor` must be at least 1")
+        if max_load is not None and max_load < 1:
+            raise ValueError("`max_load` must be positive")
+
+        self.virtual_nodes = virtual_nodes
+        self.load_factor = load_factor
+        self.max_load = max_load
+
+        self._ring: List[Tuple[int, str]] = []
+        """Sorted (hash, endpoint) points"""
+
+        self._loads: Dict[str, int] = {}
+        """Endpoint to the in-flight load"""
+
+        for endpoint in endpoints or []:
+            self.add(endpoint)
+
+    # ============================== Properties ==============================
+
+    @property
+    def endpoints(self) -> List[str]:
+        """Endpoints on the ring"""
+
+        return list(self._loads)
+
+    @property
+    def loads(self) -> Dict[str, int]:
+        """Endpoint to the in-flight load"""
+
+        return dict(self._loads)
+
+    # ============================== Public Methods ==============================
+
+    def add(self, endpoint: str):
+        """Add an endpoint to the ring, nothing is changed if it is already on the ring.
+
+        Args:
+            endpoint (`str`): Endpoint
+        """
+
+        if endpoint in self._loads:
+            return
+
+        self._loads[endpoint] = 0
+        for i in range(self.virtual_nodes):
+            bisect.insort(self._ring, (_hash(f"{endpoint}#{i}"), endpoint))
+
+    def remove(self, endpoint: str):
+        """Remove an endpoint from the ring.
+
+        Args:
+            endpoint (`str`): Endpoint
+        """
+
+        if self._loads.pop(endpoint, None) is None:
+            return
+
+        self._ring = [point for point in self._ring if point[1] != endpoint]
+
+    def capacity(self) -> int:
+        """Max in-flight load of an endpoint after accepting one more request"""
+
+        total_load = sum(self._loads.values()) + 1
+        capacity = math.ceil(self.load_factor * total_load / len(self._loads))
+
+        return min(capacity, self.max_load) if self.max_load is not None else capacity
+
+    def get(self, key: str) -> str:
+        """Get the endpoint of the key without acquiring it.
+
+        Args:
+            key (`str`): Routing key, Like the prompt prefix
+
+        Returns:
+            endpoint (`str`): Endpoint
+
+        Raises:
+            ValueError: If there is no endpoint on the ring
+        """
+
+        if not self._ring:
+            raise ValueError("No endpoint on the hash ring")
+
+        capacity = self.capacity()
+        start = bisect.bisect(self._ring, (_hash(key), ""))
+        visited = set()
+
+        for i in range(len(self._ring)):
+            endpoint = self._ring[(start + i) % len(self._ring)][1]
+            if endpoint in visited:
+                continue
+            if self._loads[endpoint] + 1 <= capacity:
+                return endpoint
+
+            visited.add(endpoint)
+            if len(visited) == len(self._loads):
+                break
+
+        # 所有節點的 slot 都已佔滿時，退回負載最小的節點排隊
+        return min(self._loads, key=self._loads.get)
+
+    def acquire(self, key: str) -> str:
+        """Route the key and count the in-flight request on the endpoint.
+
+        Args:
+            key (`str`): Routing key, Like the prompt prefix
+
+        Returns:
+            endpoint (`str`): Endpoint, call `release` when the request is finished
+        """
+
+        endpoint = self.get(key)
+        self._loads[endpoint] += 1
+
+        return endpoint
+
+    def release(self, endpoint: str):
+        """Finish the in-flight request on the endpoint.
+
+        Args:
+            endpoint (`str`): Endpoint returned by `acquire`
+        """
+
+        if self._loads.get(endpoint, 0) > 0:
+            self._loads[endpoint] -= 1
+
+
+class PrefixRouter:
+    """Route the requests sharing a prompt prefix to the same model pod to reuse the Ollama KV cache."""
+
+    def __init__(
+        self,
+        endpoints: List[str] = None,
+        prefix_tokens: int = 16,
+        load_factor: float = 1.25,
+        max_load: int = None
+    ):
+        """Initializes the prefix router.
+
+        Args:
+            endpoints (`List[str]`): Model pod endpoints. Default is `None` (empty)
+            prefix_tokens (`int`): Number of the leading user prompt tokens in the prefix. Default is `16`
+            load_factor (`float`): Max in-flight load of a pod relative to the mean load. Default is `1.25`
+            max_load (`int`): Max in-flight load of a pod, Like its `OLLAMA_NUM_PARALLEL`. Default is `None` (unbounded)
+        """
+
+        self.prefix_tokens = prefix_tokens
+        self.ring = BoundedLoadHashRing(endpoints, load_factor=load_factor, max_load=max_load)
+
+    def acquire(self, system_prompt: str, user_prompt: str) -> str:
+        """Route the request to a model pod.
+
+        Args:
+            system_prompt (`str`): System sentence
+            user_prompt (`str`): User sentence
+
+        Returns:
+            endpoint (`str`): Model pod endpoint, call `release` when the request is finished
+        """
+
+        return self.ring.acquire(prompt_prefix(system_prompt, user_prompt, self.prefix_tokens))
+
+    def release(self, endpoint: str):
+        """Finish the request on the model pod.
+
+        Args:
+            endpoint (`str`): Model pod endpoint returned by `acquire`
+        """
+
+        self.ring.release(endpoint)
+
+    def kubeai_load_balancing(self) -> Dict[str, Any]:
+        """Get the equivalent KubeAI Model `spec.loadBalancing`, so that the KubeAI gateway routes by the prefix in-cluster.
+
+        KubeAI hashes a character prefix of the last user message, so the prefix covers about the first N tokens.
+
+        Returns:
+            load_balancing (`Dict[str, Any]`): KubeAI Model `spec.loadBalancing`
+        """
+
+        return {
+            "strategy": "PrefixHash",
+            "prefixHash": {
+                "meanLoadFactor": int(self.ring.load_factor * 100),
+                "replication": self.ring.virtual_nodes,
+                # 以英文平均每個 token 約 4 個字元估算
+                "prefixCharLength": self.prefix_tokens * 4,
+            },
+        }
@@ -0,0 +1,106 @@
+from typing import TYPE_CHECKING
+
+from shared.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .batching import BATCHING_MODES, FakeOllamaRunner, benchmark_batching
+    from .driver import (
+        LoadDriver,
+        load_prompts,
+        measure_chat_stream,
+        parse_model_weights,
+        write_load_report
+    )
+    from .prefix import (
+        DEFAULT_SYSTEM_PROMPTS,
+        PREFIX_ROUTING_STRATEGIES,
+        benchmark_prefix_routing,
+        replay_prefix_routing,
+        synthetic_prompts
+    )
+    from .resilience import RESILIENCE_MODES, benchmark_resilience
+    from .types import (
+        BatchingConfig,
+        BatchingReport,
+        LoadProfile,
+        LoadReport,
+        PrefixRoutingConfig,
+        PrefixRoutingReport,
+        RequestMetrics,
+        ResilienceConfig,
+        ResilienceReport
+    )
+
+# 子模組 (以及其相依套件) 於第一次使用時才載入
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".batching": [
+        "BATCHING_MODES",
+        "FakeOllamaRunner",
+        "benchmark_batching",
+    ],
+    ".driver": [
+        "LoadDriver",
+        "load_prompts",
+        "measure_chat_stream",
+        "parse_model_weights",
+        "write_load_report",
+    ],
+    ".prefix": [
+        "DEFAULT_SYSTEM_PROMPTS",
+        "PREFIX_ROUTING_STRATEGIES",
+        "benchmark_prefix_routing",
+        "replay_prefix_routing",
+        "synthetic_prompts",
+    ],
+    ".resilience": [
+        "RESILIENCE_MODES",
+        "benchmark_resilience",
+    ],
+    ".types": [
+        "BatchingConfig",
+        "BatchingReport",
+        "LoadProfile",
+        "LoadReport",
+        "PrefixRoutingConfig",
+        "PrefixRoutingReport",
+        "RequestMetrics",
+        "ResilienceConfig",
+        "ResilienceReport",
+    ],
+})
+
+__all__ = [
+    # Load Driver
+    "LoadDriver",
+    "load_prompts",
+    "measure_chat_stream",
+    "parse_model_weights",
+    "write_load_report",
+
+    # Batching Benchmark
+    "BATCHING_MODES",
+    "FakeOllamaRunner",
+    "benchmark_batching",
+
+    # Prefix Routing Benchmark
+    "DEFAULT_SYSTEM_PROMPTS",
+    "PREFIX_ROUTING_STRATEGIES",
+    "benchmark_prefix_routing",
+    "replay_prefix_routing",
+    "synthetic_prompts",
+
+    # Resilience Benchmark
+    "RESILIENCE_MODES",
+    "benchmark_resilience",
+
+    # Types
+    "BatchingConfig",
+    "BatchingReport",
+    "LoadProfile",
+    "LoadReport",
+    "PrefixRoutingConfig",
+    "PrefixRoutingReport",
+    "RequestMetrics",
+    "ResilienceConfig",
+    "ResilienceReport",
+]
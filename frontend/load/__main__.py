@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+
+from frontend.load.batching import BATCHING_MODES, benchmark_batching
+from frontend.load.driver import load_prompts
+from frontend.load.prefix import benchmark_prefix_routing
+from frontend.load.resilience import RESILIENCE_MODES, benchmark_resilience
+from frontend.load.types import BatchingConfig, PrefixRoutingConfig, ResilienceConfig
+
+
+def parsed_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the client-side request routing on simulated model pods"
+    )
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    prefix_parser = subparsers.add_parser(
+        "prefix",
+        help="Compare the prefill latency of the round-robin, least-loaded and prefix-aware routing"
+    )
+    prefix_parser.add_argument("--prompts", type=str, default=None, help="User prompts file, defaults to the synthetic prompts")
+    prefix_parser.add_argument("--requests", type=int, default=2000)
+    prefix_parser.add_argument("--arrival_rate", type=float, default=2.0)
+    prefix_parser.add_argument("--pods", type=int, default=4)
+    prefix_parser.add_argument("--parallel", type=int, default=4)
+    prefix_parser.add_argument("--prefix_tokens", type=int, default=16)
+    prefix_parser.add_argument("--load_factor", type=float, default=1.25)
+    prefix_parser.add_argument("--seed", type=int, default=0)
+
+    batching_parser = subparsers.add_parser(
+        "batching",
+        help="Compare the aggregate tokens/s of one request per connection and the micro-batching gateway"
+    )
+    batching_parser.add_argument("--requests", type=int, default=64)
+    batching_parser.add_argument("--num_parallel", type=int, default=4)
+    batching_parser.add_argument("--output_tokens", type=int, default=64)
+    batching_parser.add_argument("--batch_window", type=float, default=0.01)
+    batching_parser.add_argument("--max_batch_size", type=int, default=8)
+
+    resilience_parser = subparsers.add_parser(
+        "resilience",
+        help="Compare the baseline client and the resilient client against a local fault-injecting server"
+    )
+    resilience_parser.add_argument("--requests", type=int, default=200)
+    resilience_parser.add_argument("--concurrency", type=int, default=8)
+    resilience_parser.add_argument("--slow_rate", type=float, default=0.05)
+    resilience_parser.add_argument("--error_rate", type=float, default=0.05)
+    resilience_parser.add_argument("--stall_rate", type=float, default=0.02)
+    resilience_parser.add_argument("--reset_rate", type=float, default=0.02)
+    resilience_parser.add_argument("--timeout", type=float, default=10.0)
+    resilience_parser.add_argument("--seed", type=int, default=0)
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parsed_args()
+
+    match args.benchmark:
+        case "prefix":
+            prefix_routing_reports = benchmark_prefix_routing(
+                prompts=load_prompts(args.prompts) if args.prompts else None,
+                config=PrefixRoutingConfig(
+                    requests=args.requests,
+                    arrival_rate=args.arrival_rate,
+                    pods=args.pods,
+                    parallel=args.parallel,
+                    prefix_tokens=args.prefix_tokens,
+                    load_factor=args.load_factor,
+                    seed=args.seed
+                )
+            )
+
+            for prefix_routing_report in prefix_routing_reports:
+                print(prefix_routing_report.model_dump_json())
+        case "batching":
+            batching_config = BatchingConfig(
+                requests=args.requests,
+                num_parallel=args.num_parallel,
+                output_tokens=args.output_tokens,
+                batch_window=args.batch_window,
+                max_batch_size=args.max_batch_size
+            )
+
+            for mode in BATCHING_MODES:
+                batching_report = asyncio.run(benchmark_batching(mode, batching_config))
+                print(batching_report.model_dump_json())
+        case "resilience":
+            resilience_config = ResilienceConfig(
+                requests=args.requests,
+                concurrency=args.concurrency,
+                slow_rate=args.slow_rate,
+                error_rate=args.error_rate,
+                stall_rate=args.stall_rate,
+                reset_rate=args.reset_rate,
+                timeout=args.timeout,
+                seed=args.seed
+            )
+
+            for mode in RESILIENCE_MODES:
+                resilience_report = asyncio.run(benchmark_resilience(mode, resilience_config))
+                print(resilience_report.model_dump_json())
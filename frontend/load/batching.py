@@ -0,0 +1,170 @@
+import asyncio
+import time
+from typing import List, Set
+
+from langchain_core.messages import AIMessageChunk
+from langchain_openai.chat_models import ChatOpenAI
+
+from frontend.llm.gateway import ChatGateway
+from frontend.load.driver import summarize
+from frontend.load.types import BatchingConfig, BatchingReport
+
+
+BATCHING_MODES = ("per_connection", "gateway")
+"""Compared request modes"""
+
+
+class FakeOllamaRunner:
+    """Ollama runner with continuous batching, at most `num_parallel` sequences are decoded together."""
+
+    def __init__(self, config: BatchingConfig):
+        """Initializes the fake Ollama runner.
+
+        Args:
+            config (`BatchingConfig`): Benchmark configuration
+        """
+
+        self.config = config
+        self.connections = 0
+
+        self._slots = asyncio.Semaphore(config.num_parallel)
+        self._active: Set[asyncio.Queue] = set()
+        self._wakeup = asyncio.Event()
+        self._engine = asyncio.create_task(self._decode())
+
+    async def connect(self):
+        """Open a new connection to the runner."""
+
+        self.connections += 1
+        await asyncio.sleep(self.config.connect_latency)
+
+    async def generate(self):
+        """Generate the tokens of a request, the request waits for a free slot of the runner."""
+
+        async with self._slots:
+            tokens: asyncio.Queue = asyncio.Queue()
+            self._active.add(tokens)
+            self._wakeup.set()
+
+            for _ in range(self.config.output_tokens):
+                yield AIMessageChunk(content=await tokens.get())
+
+    async def aclose(self):
+        self._engine.cancel()
+
+    async def _decode(self):
+        remaining = {}
+
+        while True:
+            if not self._active:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            # 每個 decode step 為批次內所有序列各產生一個 token，批次越大 step 越慢但總吞吐量越高
+            batch = list(self._active)
+            await asyncio.sleep(self.config.step_time * (1 + self.config.batch_overhead * (len(batch) - 1)))
+
+            for tokens in batch:
+                remaining[tokens] = remaining.get(tokens, self.config.output_tokens) - 1
+                tokens.put_nowait("token ")
+                if remaining[tokens] == 0:
+                    self._active.discard(tokens)
+                    del remaining[tokens]
+
+
+async def _measure(stream, start: float, ttfts: List[float], e2es: List[float]) -> int:
+    tokens = 0
+    async for chunk in stream:
+        if tokens == 0:
+            ttfts.append(time.perf_counter() - start)
+        tokens += 1
+
+    e2es.append(time.perf_counter() - start)
+
+    return tokens
+
+
+async def benchmark_batching(mode: str, config: BatchingConfig = None) -> BatchingReport:
+    """Send a burst of concurrent requests of the same model to a fake Ollama runner.
+
+    `per_connection` builds a `ChatOpenAI` client and opens a connection for every request (the client setup
+    runs on the event loop), `gateway` sends the requests through the micro-batching gateway with one pooled client
+    and at most `num_parallel` connections.
+
+    Args:
+        mode (`str`): Request mode, `per_connection` or `gateway`
+        config (`BatchingConfig`): Benchmark configuration. Default is `BatchingConfig()`
+
+    Returns:
+        batching_report (`BatchingReport`): Batching report
+
+    Raises:
+        ValueError: If the request mode is not supported
+    """
+
+    if mode not in BATCHING_MODES:
+        raise ValueError(f"Unsupported request mode: {mode}")
+
+    config = config or BatchingConfig()
+    runner = FakeOllamaRunner(config)
+
+    ttfts: List[float] = []
+    e2es: List[float] = []
+
+    async def per_connection_stream():
+        ChatOpenAI(model="benchmark", temperature=0, api_key="benchmark", base_url="http://127.0.0.1")
+        await runner.connect()
+        async for chunk in runner.generate():
+            yield chunk
+
+    # gateway 模式共用一個 client，連線於第一次使用時建立並保持連線
+    pool: asyncio.Queue = asyncio.Queue()
+    for _ in range(config.num_parallel):
+        pool.put_nowait(False)
+
+    async def pooled_stream(model: str, system_prompt: str, user_prompt: str):
+        connected = await pool.get()
+        try:
+            if not connected:
+                await runner.connect()
+                connected = True
+            async for chunk in runner.generate():
+                yield chunk
+        finally:
+            pool.put_nowait(connected)
+
+    gateway = None
+    if mode == "gateway":
+        ChatOpenAI(model="benchmark", temperature=0, api_key="benchmark", base_url="http://127.0.0.1")
+        gateway = ChatGateway(
+            batch_window=config.batch_window,
+            max_batch_size=config.max_batch_size,
+            num_parallel={"benchmark": config.num_parallel},
+            stream_factory=pooled_stream
+        )
+
+    start = time.perf_counter()
+
+    if gateway is None:
+        tokens = await asyncio.gather(*[
+            _measure(per_connection_stream(), start, ttfts, e2es) for _ in range(config.requests)
+        ])
+    else:
+        tokens = await asyncio.gather(*[
+            _measure(gateway.stream("benchmark", "", f"request {i}"), start, ttfts, e2es)
+            for i in range(config.requests)
+        ])
+        await gateway.aclose()
+
+    duration = time.perf_counter() - start
+    await runner.aclose()
+
+    return BatchingReport(
+        mode=mode,
+        requests=len(tokens),
+        connections=runner.connections,
+        duration=duration,
+        token_throughput=sum(tokens) / duration if duration > 0 else 0.0,
+        ttft=summarize(ttfts),
+        e2e=summarize(e2es)
+    )
@@ -0,0 +1,318 @@
+import asyncio
+import csv
+import json
+import math
+import random
+import time
+from logging import Logger
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from frontend.load.types import LoadProfile, LoadReport, RequestMetrics
+from shared.utils.metrics import StreamMetrics, StreamMetricsCollector, get_stream_metrics_collector
+
+
+PERCENTILES = (50, 90, 95, 99)
+"""Reported percentiles of the latencies"""
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Mean and percentiles (nearest rank) of the values.
+
+    Args:
+        values (`List[float]`): Values
+
+    Returns:
+        summary (`Dict[str, float]`): `mean`, `p50`, `p90`, `p95` and `p99`, empty if there is no value
+    """
+
+    if not values:
+        return {}
+
+    values = sorted(values)
+    summary = {"mean": sum(values) / len(values)}
+    for p in PERCENTILES:
+        summary[f"p{p}"] = values[max(math.ceil(len(values) * p / 100) - 1, 0)]
+
+    return summary
+
+
+def load_prompts(file_path: str) -> List[str]:
+    """Load the user prompts from a file.
+
+    `.jsonl` files contain a JSON object with a `prompt` field per line, the other files contain a prompt per line.
+
+    Args:
+        file_path (`str`): Prompt file path
+
+    Returns:
+        prompts (`List[str]`): User prompts
+
+    Raises:
+        ValueError: If the file has no prompt
+    """
+
+    prompts: List[str] = []
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            prompts.append(json.loads(line)["prompt"] if file_path.endswith(".jsonl") else line)
+
+    if not prompts:
+        raise ValueError(f"No prompt found in {file_path}")
+
+    return prompts
+
+
+def parse_model_weights(model_mix: str) -> Dict[str, float]:
+    """Parse the model mix, Like `gemma2:2b=3,llama3.2:3b=1`.
+
+    Args:
+        model_mix (`str`): Comma separated `model=weight`, the weight defaults to `1`
+
+    Returns:
+        model_weights (`Dict[str, float]`): Ollama model name to the weight
+    """
+
+    model_weights: Dict[str, float] = {}
+
+    for item in model_mix.split(","):
+        item = item.strip()
+        if not item:
+            continue
+
+        model_name, _, weight = item.partition("=")
+        model_weights[model_name.strip()] = float(weight) if weight else 1.0
+
+    return model_weights
+
+
+async def measure_chat_stream(
+    model: str,
+    stream: AsyncIterator,
+    stream_metrics: StreamMetrics = None,
+    collector: StreamMetricsCollector = None
+) -> RequestMetrics:
+    """Consume a chat completions stream and measure its latencies.
+
+    Args:
+        model (`str`): Ollama model name
+        stream (`AsyncIterator`): Chat completions stream (chunks with a `content` attribute)
+        stream_metrics (`StreamMetrics`): Streaming metrics tagged with the placement, filled with the same latencies
+            and recorded into the collector once the stream has a resource profile (Like not a cached response).
+            Default is `None`
+        collector (`StreamMetricsCollector`): Streaming metrics collector. Default is the process-wide collector
+
+    Returns:
+        request_metrics (`RequestMetrics`): Request metrics
+    """
+
+    request_metrics = RequestMetrics(model=model, start=time.time())
+    start_time = time.perf_counter()
+    last_token_time = None
+
+    try:
+        async for chunk in stream:
+            if not chunk.content:
+                continue
+
+            now = time.perf_counter()
+            if last_token_time is None:
+                request_metrics.ttft = now - start_time
+            else:
+                request_metrics.inter_token_latencies.append(now - last_token_time)
+
+            last_token_time = now
+            request_metrics.output_tokens += 1
+    except Exception as e:
+        request_metrics.error = f"{type(e).__name__}: {e}"
+
+    request_metrics.e2e = time.perf_counter() - start_time
+
+    if stream_metrics is not None and stream_metrics.resource_profile is not None:
+        stream_metrics.ttft = request_metrics.ttft
+        stream_metrics.inter_token_latencies = request_metrics.inter_token_latencies
+        stream_metrics.output_tokens = request_metrics.output_tokens
+        stream_metrics.e2e = request_metrics.e2e
+        stream_metrics.error = request_metrics.error
+        (collector or get_stream_metrics_collector()).record(stream_metrics)
+
+    return request_metrics
+
+
+class LoadDriver:
+    """Drive the inference requests with an open-loop (Poisson) or closed-loop (N users) load profile."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        profile: LoadProfile,
+        prompts: List[str],
+        request: Callable[[str, str], Awaitable[RequestMetrics]],
+        seed: int = None
+    ):
+        """Initializes the load driver.
+
+        Args:
+            logger (`Logger`): Logger
+            profile (`LoadProfile`): Load profile
+            prompts (`List[str]`): User prompts, picked uniformly for each request
+            request (`Callable[[str, str], Awaitable[RequestMetrics]]`): Send a request of (model name, user prompt)
+            seed (`int`): Random seed. Default is `None`
+
+        Raises:
+            ValueError: If the load profile is invalid
+        """
+
+        if profile.mode not in ("open", "closed"):
+            raise ValueError(f"Invalid load mode: {profile.mode}")
+        if not profile.model_weights:
+            raise ValueError("The model mix of the load profile is empty")
+
+        self.logger = logger
+        self.profile = profile
+        self.prompts = prompts
+        self.request = request
+
+        self._rng = random.Random(seed)
+        self._issued = 0
+        self._results: List[RequestMetrics] = []
+
+    async def run(self) -> LoadReport:
+        """Run the load profile.
+
+        Returns:
+            load_report (`LoadReport`): Load report
+        """
+
+        self._issued = 0
+        self._results = []
+
+        start_time = time.perf_counter()
+
+        if self.profile.mode == "open":
+            await self._run_open_loop(start_time + self.profile.duration)
+        else:
+            await self._run_closed_loop(start_time + self.profile.duration)
+
+        return self._report(time.perf_counter() - start_time)
+
+    # ============================== Private Methods ==============================
+
+    def _next_request(self) -> Optional[Tuple[str, str]]:
+        """Pick the (model name, user prompt) of the next request, `None` if `max_requests` is reached."""
+
+        if self.profile.max_requests is not None and self._issued >= self.profile.max_requests:
+            return None
+
+        self._issued += 1
+
+        model_name = self._rng.choices(
+            list(self.profile.model_weights.keys()),
+            list(self.profile.model_weights.values())
+        )[0]
+
+        return model_name, self._rng.choice(self.prompts)
+
+    async def _send(self, model_name: str, user_prompt: str):
+        """Send a request and collect its metrics."""
+
+        try:
+            request_metrics = await self.request(model_name, user_prompt)
+        except Exception as e:
+            request_metrics = RequestMetrics(model=model_name, start=time.time(), error=f"{type(e).__name__}: {e}")
+
+        self._results.append(request_metrics)
+
+    async def _run_open_loop(self, deadline: float):
+        """Issue the requests at Poisson arrivals until the deadline, regardless of the completions."""
+
+        tasks: List[asyncio.Task] = []
+        next_arrival = time.perf_counter()
+
+        while True:
+            next_arrival += self._rng.expovariate(self.profile.arrival_rate)
+            if next_arrival >= deadline:
+                break
+
+            await asyncio.sleep(max(next_arrival - time.perf_counter(), 0))
+
+            next_request = self._next_request()
+            if next_request is None:
+                break
+
+            tasks.append(asyncio.create_task(self._send(*next_request)))
+
+        await asyncio.gather(*tasks)
+
+    async def _run_closed_loop(self, deadline: float):
+        """Run N users, each sends the next request after the previous one completes (and the think time)."""
+
+        async def user():
+            while time.perf_counter() < deadline:
+                next_request = self._next_request()
+                if next_request is None:
+                    return
+
+                await self._send(*next_request)
+
+                if self.profile.think_time > 0:
+                    await asyncio.sleep(self.profile.think_time)
+
+        await asyncio.gather(*[user() for _ in range(self.profile.users)])
+
+    def _report(self, duration: float) -> LoadReport:
+        """Aggregate the request metrics into the load report."""
+
+        succeeded = [result for result in self._results if result.error is None]
+        per_model: Dict[str, int] = {}
+        for result in self._results:
+            per_model[result.model] = per_model.get(result.model, 0) + 1
+
+        return LoadReport(
+            profile=self.profile,
+            requests=len(self._results),
+            errors=len(self._results) - len(succeeded),
+            duration=duration,
+            throughput=len(succeeded) / duration if duration else 0.0,
+            token_throughput=sum(result.output_tokens for result in succeeded) / duration if duration else 0.0,
+            ttft=summarize([result.ttft for result in succeeded if result.ttft is not None]),
+            inter_token_latency=summarize([
+                latency for result in succeeded for latency in result.inter_token_latencies
+            ]),
+            e2e=summarize([result.e2e for result in succeeded if result.e2e is not None]),
+            per_model=per_model
+        )
+
+
+def write_load_report(load_report: LoadReport, file_path: str):
+    """Write the load report as JSON (`.json`) or CSV (`.csv`, one row per metric).
+
+    Args:
+        load_report (`LoadReport`): Load report
+        file_path (`str`): Report file path
+    """
+
+    if not file_path.endswith(".csv"):
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(load_report.model_dump_json(indent=4))
+        return
+
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["metric", "mean", *[f"p{p}" for p in PERCENTILES]])
+
+        for metric, summary in (
+            ("ttft", load_report.ttft),
+            ("inter_token_latency", load_report.inter_token_latency),
+            ("e2e", load_report.e2e),
+        ):
+            writer.writerow([metric, summary.get("mean"), *[summary.get(f"p{p}") for p in PERCENTILES]])
+
+        writer.writerow(["throughput", load_report.throughput])
+        writer.writerow(["token_throughput", load_report.token_throughput])
+        writer.writerow(["requests", load_report.requests])
+        writer.writerow(["errors", load_report.errors])
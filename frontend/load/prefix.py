@@ -0,0 +1,201 @@
+import heapq
+import itertools
+import random
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+from frontend.llm.routing import BoundedLoadHashRing, approximate_tokens, prompt_prefix
+from frontend.load.driver import summarize
+from frontend.load.types import PrefixRoutingConfig, PrefixRoutingReport
+
+
+PREFIX_ROUTING_STRATEGIES = ("round_robin", "least_loaded", "prefix")
+"""Compared routing strategies"""
+
+DEFAULT_SYSTEM_PROMPTS: List[Tuple[str, float]] = [
+    (
+        "You are a helpful assistant that answers user questions. "
+        "Please answer according to the user's question using Traditional Chinese.",
+        0.7
+    ),
+    ("You are a senior software engineer. Review the code in the user's message and point out the bugs.", 0.15),
+    ("You are a translator. Translate the user's message into English, keep the original formatting.", 0.1),
+    ("You are a summarizer. Summarize the user's message in three bullet points.", 0.05),
+]
+"""(System prompt, weight) of the synthetic workload, the default system prompt of the client dominates"""
+
+_SYNTHETIC_USER_PROMPTS = [
+    "What is the largest country in the world? Please also list its neighbouring countries and the population of each.",
+    "Explain the difference between a process and a thread, and give an example of when to use each of them.",
+    "Write a short poem about the autumn in Taipei, the poem should have four lines and mention the rain.",
+    "Summarize the history of the Kubernetes project from its first release to the graduation from the CNCF.",
+    "How does the KV cache speed up the token generation of a transformer model, and what limits its size?",
+    "Give me a recipe of beef noodle soup, including the ingredients, the steps and the cooking time of each step.",
+    "Compare the NVIDIA A100 and H100 GPUs for the LLM inference in terms of the memory and the throughput.",
+    "List five common mistakes of the Python asyncio programs and how to avoid each of them.",
+]
+
+
+def synthetic_prompts(count: int, seed: int = 0) -> List[str]:
+    """Generate the synthetic user prompts sharing a few leading sentences.
+
+    Args:
+        count (`int`): Number of the user prompts
+        seed (`int`): Random seed. Default is `0`
+
+    Returns:
+        prompts (`List[str]`): User prompts
+    """
+
+    rng = random.Random(seed)
+
+    return [
+        f"{rng.choice(_SYNTHETIC_USER_PROMPTS)} (request {i})"
+        for i in range(count)
+    ]
+
+
+def _common_prefix_length(a: List[str], b: List[str]) -> int:
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+
+    return length
+
+
+def replay_prefix_routing(
+    strategy: str,
+    workload: List[Tuple[str, str]],
+    config: PrefixRoutingConfig
+) -> PrefixRoutingReport:
+    """Replay the workload on the simulated model pods with the routing strategy.
+
+    Each pod serves `parallel` requests FIFO and each slot keeps the KV cache of its last prompt,
+    so a request only evaluates the prompt tokens after the longest prefix cached on its pod.
+
+    Args:
+        strategy (`str`): Routing strategy, `round_robin`, `least_loaded` or `prefix`
+        workload (`List[Tuple[str, str]]`): (System prompt, user prompt) of the requests
+        config (`PrefixRoutingConfig`): Benchmark configuration
+
+    Returns:
+        prefix_routing_report (`PrefixRoutingReport`): Prefix routing report
+
+    Raises:
+        ValueError: If the routing strategy is not supported
+    """
+
+    if strategy not in PREFIX_ROUTING_STRATEGIES:
+        raise ValueError(f"Unsupported routing strategy: {strategy}")
+
+    rng = random.Random(config.seed)
+    pods = [f"pod-{i}" for i in range(config.pods)]
+
+    # 超過 slot 數的請求只能排隊，改送往仍有空 slot 的 pod
+    ring = BoundedLoadHashRing(pods, load_factor=config.load_factor, max_load=config.parallel)
+    round_robin = itertools.cycle(pods)
+
+    slots: Dict[str, List[float]] = {pod: [0.0] * config.parallel for pod in pods}
+    """Pod to the free time of its slots (min-heap)"""
+
+    kv_caches: Dict[str, Deque[List[str]]] = {pod: deque(maxlen=config.parallel) for pod in pods}
+    """Pod to the prompt tokens cached by its slots, the oldest is evicted first"""
+
+    loads: Dict[str, int] = {pod: 0 for pod in pods}
+    """Pod to the in-flight requests"""
+
+    inflight: List[Tuple[float, str]] = []
+    """(Finish time, pod) of the in-flight requests (min-heap)"""
+
+    report = PrefixRoutingReport(strategy=strategy, requests_per_pod={pod: 0 for pod in pods})
+    prefill_latencies: List[float] = []
+    ttfts: List[float] = []
+    hits = 0
+
+    now = 0.0
+    for system_prompt, user_prompt in workload[:config.requests]:
+        now += rng.expovariate(config.arrival_rate)
+
+        while inflight and inflight[0][0] <= now:
+            _, pod = heapq.heappop(inflight)
+            loads[pod] -= 1
+            ring.release(pod)
+
+        prefix = prompt_prefix(system_prompt, user_prompt, config.prefix_tokens)
+
+        match strategy:
+            case "round_robin":
+                pod = next(round_robin)
+            case "least_loaded":
+                pod = min(pods, key=loads.get)
+            case "prefix":
+                pod = ring.acquire(prefix)
+
+        loads[pod] += 1
+        report.max_load = max(report.max_load, loads[pod])
+        report.requests_per_pod[pod] += 1
+
+        system_tokens = approximate_tokens(system_prompt)
+        user_tokens = approximate_tokens(user_prompt)
+        prompt_tokens = system_tokens + user_tokens
+
+        start = max(now, heapq.heappop(slots[pod]))
+
+        # Ollama 只重用與 slot 上一個 prompt 相同的最長前綴
+        kv_cache = kv_caches[pod]
+        reused_tokens = max((_common_prefix_length(prompt_tokens, cached) for cached in kv_cache), default=0)
+        if reused_tokens >= len(system_tokens) + min(config.prefix_tokens, len(user_tokens)):
+            hits += 1
+
+        kv_cache.append(prompt_tokens)
+        prefill_tokens = max(len(prompt_tokens) - reused_tokens, 1)
+
+        prefill = prefill_tokens / config.prefill_rate
+        finish = start + prefill + config.output_tokens / config.decode_rate
+
+        heapq.heappush(slots[pod], finish)
+        heapq.heappush(inflight, (finish, pod))
+
+        report.requests += 1
+        report.prefill_tokens += prefill_tokens
+        prefill_latencies.append(prefill)
+        ttfts.append(start - now + prefill)
+
+    report.cache_hit_rate = hits / report.requests if report.requests else 0.0
+    report.prefill = summarize(prefill_latencies)
+    report.ttft = summarize(ttfts)
+
+    return report
+
+
+def benchmark_prefix_routing(
+    prompts: List[str] = None,
+    system_prompts: List[Tuple[str, float]] = None,
+    config: PrefixRoutingConfig = None
+) -> List[PrefixRoutingReport]:
+    """Compare the prefill latency of the routing strategies on the same replayed workload.
+
+    Args:
+        prompts (`List[str]`): User prompts, picked uniformly for each request. Default is the synthetic prompts
+        system_prompts (`List[Tuple[str, float]]`): (System prompt, weight). Default is `DEFAULT_SYSTEM_PROMPTS`
+        config (`PrefixRoutingConfig`): Benchmark configuration. Default is `PrefixRoutingConfig()`
+
+    Returns:
+        prefix_routing_reports (`List[PrefixRoutingReport]`): Prefix routing report of each strategy
+    """
+
+    config = config or PrefixRoutingConfig()
+    prompts = prompts or synthetic_prompts(config.requests, config.seed)
+    system_prompts = system_prompts or DEFAULT_SYSTEM_PROMPTS
+
+    rng = random.Random(config.seed)
+    workload = [
+        (
+            rng.choices([prompt for prompt, _ in system_prompts], weights=[w for _, w in system_prompts])[0],
+            rng.choice(prompts)
+        ) for _ in range(config.requests)
+    ]
+
+    return [replay_prefix_routing(strategy, workload, config) for strategy in PREFIX_ROUTING_STRATEGIES]
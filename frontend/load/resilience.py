@@ -0,0 +1,98 @@
+import asyncio
+import time
+from typing import List
+
+from frontend.llm.chat import chat_completions
+from frontend.llm.fake_server import FaultInjectingServer, FaultProfile
+from frontend.llm.resilience import ResilientChat, RetryPolicy
+from frontend.load.driver import measure_chat_stream, summarize
+from frontend.load.types import ResilienceConfig, ResilienceReport
+
+
+RESILIENCE_MODES = ("baseline", "resilient")
+"""Compared client modes"""
+
+
+async def benchmark_resilience(mode: str, config: ResilienceConfig = None) -> ResilienceReport:
+    """Send the requests to a local fault-injecting server and measure the latencies and the failures.
+
+    `baseline` uses `chat_completions` (two client retries and a fixed timeout) against the faulty endpoint,
+    `resilient` uses `ResilientChat` with a second, healthy endpoint as the hedging placement.
+
+    Args:
+        mode (`str`): Client mode, `baseline` or `resilient`
+        config (`ResilienceConfig`): Benchmark configuration. Default is `ResilienceConfig()`
+
+    Returns:
+        resilience_report (`ResilienceReport`): Resilience report
+
+    Raises:
+        ValueError: If the client mode is not supported
+    """
+
+    if mode not in RESILIENCE_MODES:
+        raise ValueError(f"Unsupported client mode: {mode}")
+
+    config = config or ResilienceConfig()
+
+    faulty_server = FaultInjectingServer(FaultProfile(
+        slow_rate=config.slow_rate,
+        slow_delay=config.slow_delay,
+        error_rate=config.error_rate,
+        stall_rate=config.stall_rate,
+        reset_rate=config.reset_rate,
+        seed=config.seed
+    ))
+    healthy_server = FaultInjectingServer(FaultProfile(seed=config.seed))
+
+    async with faulty_server, healthy_server:
+        resilient_chat = ResilientChat(
+            endpoints=[faulty_server.url, healthy_server.url],
+            api_key="benchmark",
+            retry_policy=RetryPolicy(max_attempts=3, base_delay=0.05, max_delay=0.5),
+            min_ttft_timeout=0.5,
+            max_ttft_timeout=config.timeout,
+            cold_ttft_timeout=config.timeout,
+            stall_timeout=1.0,
+            seed=config.seed
+        )
+
+        def request(i: int):
+            if mode == "baseline":
+                return chat_completions(
+                    model="benchmark",
+                    system_prompt="",
+                    user_prompt=f"request {i}",
+                    api_key="benchmark",
+                    base_url=faulty_server.url,
+                    timeout=config.timeout
+                )
+
+            return resilient_chat.stream("benchmark", "", f"request {i}")
+
+        semaphore = asyncio.Semaphore(config.concurrency)
+
+        async def run(i: int):
+            async with semaphore:
+                return await measure_chat_stream("benchmark", request(i))
+
+        start = time.perf_counter()
+        request_metrics_list = await asyncio.gather(*[run(i) for i in range(config.requests)])
+        duration = time.perf_counter() - start
+
+    ttfts: List[float] = [
+        request_metrics.ttft for request_metrics in request_metrics_list
+        if request_metrics.error is None and request_metrics.ttft is not None
+    ]
+
+    return ResilienceReport(
+        mode=mode,
+        requests=len(request_metrics_list),
+        errors=sum(request_metrics.error is not None for request_metrics in request_metrics_list),
+        retries=resilient_chat.retries,
+        hedges=resilient_chat.hedges,
+        hedges_won=resilient_chat.hedges_won,
+        duration=duration,
+        ttft=summarize(ttfts),
+        e2e=summarize([request_metrics.e2e for request_metrics in request_metrics_list])
+    )
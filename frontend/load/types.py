@@ -0,0 +1,255 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class LoadProfile(BaseModel):
+
+    mode: str = "open"
+    """Load mode, `open` (open-loop Poisson arrivals) or `closed` (closed-loop N users)"""
+
+    arrival_rate: float = 1.0
+    """Poisson arrival rate of the open-loop mode, unit: requests/s"""
+
+    users: int = 1
+    """Number of concurrent users of the closed-loop mode"""
+
+    think_time: float = 0.0
+    """Think time of each user between the requests of the closed-loop mode, unit: s"""
+
+    duration: float = 60.0
+    """Duration to issue the requests, unit: s"""
+
+    max_requests: Optional[int] = None
+    """Max number of requests, `None` means unlimited"""
+
+    model_weights: Dict[str, float] = Field(default_factory=dict)
+    """Ollama model name to the weight of the request mix"""
+
+
+class RequestMetrics(BaseModel):
+
+    model: str
+    """Ollama model name"""
+
+    start: float
+    """Unix timestamp when the request is issued"""
+
+    ttft: Optional[float] = None
+    """Time to first token, unit: s"""
+
+    inter_token_latencies: List[float] = Field(default_factory=list)
+    """Gaps between the consecutive tokens, unit: s"""
+
+    e2e: Optional[float] = None
+    """End-to-end latency, unit: s"""
+
+    output_tokens: int = 0
+    """Number of generated tokens (non-empty stream chunks)"""
+
+    error: Optional[str] = None
+    """Error of the request, `None` if succeeded"""
+
+
+class LoadReport(BaseModel):
+
+    profile: LoadProfile
+    """Load profile"""
+
+    requests: int = 0
+    """Number of issued requests"""
+
+    errors: int = 0
+    """Number of failed requests"""
+
+    duration: float = 0.0
+    """Wall time from the first request to the last completion, unit: s"""
+
+    throughput: float = 0.0
+    """Completed requests per second"""
+
+    token_throughput: float = 0.0
+    """Generated tokens per second"""
+
+    ttft: Dict[str, float] = Field(default_factory=dict)
+    """Mean and percentiles of the time to first token, unit: s"""
+
+    inter_token_latency: Dict[str, float] = Field(default_factory=dict)
+    """Mean and percentiles of the inter-token latency, unit: s"""
+
+    e2e: Dict[str, float] = Field(default_factory=dict)
+    """Mean and percentiles of the end-to-end latency, unit: s"""
+
+    per_model: Dict[str, int] = Field(default_factory=dict)
+    """Ollama model name to the number of issued requests"""
+
+
+class PrefixRoutingConfig(BaseModel):
+
+    requests: int = 2000
+    """Number of replayed requests"""
+
+    arrival_rate: float = 2.0
+    """Poisson arrival rate, unit: requests/s"""
+
+    pods: int = 4
+    """Number of model pods"""
+
+    parallel: int = 4
+    """Concurrent requests per pod (`OLLAMA_NUM_PARALLEL`), each slot keeps the KV cache of its last prefix"""
+
+    prefix_tokens: int = 16
+    """Number of the leading user prompt tokens in the routing prefix"""
+
+    prefill_rate: float = 1500.0
+    """Prompt evaluation throughput of a pod, unit: tokens/s"""
+
+    decode_rate: float = 30.0
+    """Generation throughput of a request, unit: tokens/s"""
+
+    output_tokens: int = 128
+    """Generated tokens per request"""
+
+    load_factor: float = 1.25
+    """Max in-flight load of a pod relative to the mean load of the bounded-load hashing"""
+
+    seed: int = 0
+    """Random seed"""
+
+
+class PrefixRoutingReport(BaseModel):
+
+    strategy: str
+    """Routing strategy, `round_robin`, `least_loaded` or `prefix`"""
+
+    requests: int = 0
+    """Number of replayed requests"""
+
+    cache_hit_rate: float = 0.0
+    """Fraction of the requests reusing the KV cache of the whole routing prefix"""
+
+    prefill_tokens: int = 0
+    """Number of evaluated prompt tokens"""
+
+    prefill: Dict[str, float] = Field(default_factory=dict)
+    """Mean and percentiles of the prefill latency (prompt evaluation), unit: s"""
+
+    ttft: Dict[str, float] = Field(default_factory=dict)
+    """Mean and percentiles of the queue wait plus the prefill latency, unit: s"""
+
+    max_load: int = 0
+    """Max in-flight requests of a pod"""
+
+    requests_per_pod: Dict[str, int] = Field(default_factory=dict)
+    """Pod to the number of routed requests"""
+
+
+class BatchingConfig(BaseModel):
+
+    requests: int = 64
+    """Number of concurrent requests of the same model"""
+
+    num_parallel: int = 4
+    """Concurrent requests of the Ollama runner (`OLLAMA_NUM_PARALLEL`)"""
+
+    output_tokens: int = 64
+    """Generated tokens per request"""
+
+    step_time: float = 0.01
+    """Decode step time of a single sequence, unit: s"""
+
+    batch_overhead: float = 0.15
+    """Relative step time increase per additional sequence of the decode batch"""
+
+    connect_latency: float = 0.05
+    """Latency to open a new connection (TCP and client setup), unit: s"""
+
+    batch_window: float = 0.01
+    """Time window of the gateway to collect a batch, unit: s"""
+
+    max_batch_size: int = 8
+    """Max number of requests of a gateway batch"""
+
+
+class BatchingReport(BaseModel):
+
+    mode: str
+    """Request mode, `per_connection` (one request per connection) or `gateway` (micro-batching gateway)"""
+
+    requests: int = 0
+    """Number of completed requests"""
+
+    connections: int = 0
+    """Number of opened connections"""
+
+    duration: float = 0.0
+    """Wall time of all requests, unit: s"""
+
+    token_throughput: float = 0.0
+    """Aggregate generated tokens per second"""
+
+    ttft: Dict[str, float] = Field(default_factory=dict)
+    """Mean and percentiles of the time to first token, unit: s"""
+
+    e2e: Dict[str, float] = Field(default_factory=dict)
+    """Mean and percentiles of the end-to-end latency, unit: s"""
+
+
+class ResilienceConfig(BaseModel):
+
+    requests: int = 200
+    """Number of requests"""
+
+    concurrency: int = 8
+    """Number of concurrent requests"""
+
+    slow_rate: float = 0.05
+    """Fraction of the requests with a late first token on the faulty endpoint"""
+
+    slow_delay: float = 3.0
+    """Latency of the late first token, unit: s"""
+
+    error_rate: float = 0.05
+    """Fraction of the requests failed with `503` on the faulty endpoint"""
+
+    stall_rate: float = 0.02
+    """Fraction of the requests stalled in the middle of the stream on the faulty endpoint"""
+
+    reset_rate: float = 0.02
+    """Fraction of the requests whose connection is reset on the faulty endpoint"""
+
+    timeout: float = 10.0
+    """Request timeout of the baseline client, unit: s"""
+
+    seed: int = 0
+    """Random seed"""
+
+
+class ResilienceReport(BaseModel):
+
+    mode: str
+    """Client mode, `baseline` (client retries only) or `resilient` (timeouts, hedging, circuit breakers)"""
+
+    requests: int = 0
+    """Number of requests"""
+
+    errors: int = 0
+    """Number of failed requests"""
+
+    retries: int = 0
+    """Number of retries of the resilient client"""
+
+    hedges: int = 0
+    """Number of hedged requests of the resilient client"""
+
+    hedges_won: int = 0
+    """Number of hedged requests answering first"""
+
+    duration: float = 0.0
+    """Wall time of all requests, unit: s"""
+
+    ttft: Dict[str, float] = Field(default_factory=dict)
+    """Mean and percentiles of the time to first token of the succeeded requests, unit: s"""
+
+    e2e: Dict[str, float] = Field(default_factory=dict)
+    """Mean and percentiles of the end-to-end latency of all requests, unit: s"""
@@ -1,7 +1,8 @@
-from .types import Config
+from .types import ClusterConfig, Config
 from .parser import parse_config
 
 __all__ = [
+    'ClusterConfig',
     'Config',
     'parse_config'
 ]
@@ -17,6 +17,4 @@ def parse_config(config_file_path: str = 'shared/config/config.yaml') -> Config:
         parsed_config = yaml.load(f, Loader=yaml.SafeLoader)
         parsed_config = Config.from_dict(parsed_config)
 
-        print(parsed_config.json())
-
     return parsed_config
@@ -1,7 +1,25 @@
 import json
-from typing import Dict
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class ClusterConfig(BaseModel):
+
+    name: str
+    """Cluster name, Like `lab-a`"""
+
+    prometheus_url: str
+    """Prometheus Server URL of the cluster, Like `http://10.20.1.93:30090`"""
+
+    base_url: str
+    """OpenAI API base URL of the KubeAI on the cluster, Like `http://10.20.1.93:32000/openai`"""
+
+    kube_context: Optional[str] = None
+    """kubeconfig context of the cluster. `None` uses the current context"""
+
+    prometheus_timeout: float = 5.0
+    """Timeout to fetch the telemetry of the cluster, the cluster is left out of the decision if exceeded, unit: s"""
 
 
 class Config(BaseModel):
@@ -18,6 +36,9 @@ class Config(BaseModel):
 
     concurrent: int = 1
 
+    clusters: List[ClusterConfig] = Field(default_factory=list)
+    """Federated GPU clusters. Empty uses the single cluster of `base_url` and the current kubeconfig context"""
+
     @classmethod
     def from_dict(cls, config: Dict) -> 'Config':
         webui_url = config.get('webui_url', "http://10.20.1.93:32000/api/v1")
@@ -29,6 +50,7 @@ class Config(BaseModel):
             "http://10.20.1.93:31434"
         )
         concurrent = config.get('concurrent', 1)
+        clusters = [ClusterConfig(**cluster) for cluster in config.get('clusters') or []]
 
         return cls(
             webui_url=webui_url,
@@ -36,7 +58,8 @@ class Config(BaseModel):
             timeout=timeout,
             user=user,
             ollama_parameters_worker_url=ollama_parameters_worker_url,
-            concurrent=concurrent
+            concurrent=concurrent,
+            clusters=clusters
         )
 
     def json(self, use_load: bool = False):
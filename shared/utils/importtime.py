@@ -0,0 +1,124 @@
+import argparse
+import json
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+
+HEAVY_MODULES = ("langchain_openai", "langchain_core", "openai", "kubernetes", "ollama")
+"""Modules which must not be imported at the CLI startup, only by the code paths using them"""
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure_import_time(module: str = "app", python: str = sys.executable) -> Dict[str, Any]:
+    """Import the module in a fresh interpreter with `python -X importtime` and parse the report.
+
+    Args:
+        module (`str`): Imported module. Default is `app`
+        python (`str`): Python interpreter. Default is the current interpreter
+
+    Returns:
+        report (`Dict[str, Any]`): Cumulative import time of the module and of its direct imports (unit: ms),
+            and the imported module names
+
+    Raises:
+        ValueError: If the module failed to import
+    """
+
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        raise ValueError(f"Failed to import {module}:\n{completed.stderr}")
+
+    total_us = 0
+    imports: List[Tuple[str, int]] = []
+    direct_imports: List[Tuple[str, int]] = []
+    modules: List[str] = []
+
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+
+        _, cumulative, indent, name = match.groups()
+        modules.append(name)
+
+        # 子模組的行先於其父模組輸出，最外層 (縮排為一個空白) 的行結束一組 import
+        if len(indent) == 3:
+            imports.append((name, int(cumulative)))
+        elif len(indent) == 1:
+            if name == module:
+                total_us = int(cumulative)
+                direct_imports = imports
+            imports = []
+
+    return {
+        "module": module,
+        "total_ms": total_us / 1000,
+        "imports_ms": {name: cumulative / 1000 for name, cumulative in direct_imports},
+        "modules": modules,
+    }
+
+
+def check_import_time(
+    module: str = "app",
+    threshold_ms: float = 300.0,
+    heavy_modules: Tuple[str, ...] = HEAVY_MODULES,
+    repeat: int = 3
+) -> Tuple[bool, Dict[str, Any]]:
+    """Check the CLI startup import time against the regression threshold.
+
+    Args:
+        module (`str`): Imported module. Default is `app`
+        threshold_ms (`float`): Max cumulative import time of the module, unit: ms. Default is `300.0`
+        heavy_modules (`Tuple[str, ...]`): Modules which must not be imported. Default is `HEAVY_MODULES`
+        repeat (`int`): Number of repetitions, the best one is reported. Default is `3`
+
+    Returns:
+        passed (`bool`): Whether the import time is under the threshold and no heavy module is imported
+        result (`Dict[str, Any]`): Import time, slowest direct imports and the imported heavy modules
+    """
+
+    reports = [measure_import_time(module) for _ in range(repeat)]
+    best = min(reports, key=lambda report: report["total_ms"])
+
+    imported_heavy_modules = sorted({
+        name for name in best["modules"]
+        if name.split(".")[0] in heavy_modules
+    })
+
+    result = {
+        "module": module,
+        "total_ms": best["total_ms"],
+        "threshold_ms": threshold_ms,
+        "slowest": sorted(best["imports_ms"].items(), key=lambda item: item[1], reverse=True)[:10],
+        "heavy_modules": imported_heavy_modules,
+    }
+
+    return best["total_ms"] <= threshold_ms and not imported_heavy_modules, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check the CLI startup import time (`python -X importtime`) against a regression threshold"
+    )
+    parser.add_argument("--module", type=str, default="app")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=300.0,
+        help="Max cumulative import time of the module, unit: ms"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    passed, result = check_import_time(args.module, args.threshold, repeat=args.repeat)
+    print(json.dumps(result, indent=4))
+
+    if not passed:
+        sys.exit(1)
@@ -0,0 +1,36 @@
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, List[str]]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Build the module `__getattr__` and `__dir__` (PEP 562) of a package which imports its submodules on first use.
+
+    Like `__getattr__, __dir__ = lazy_exports(__name__, {".chat": ["chat_completions"]})` in `__init__.py`,
+    so `from package import chat_completions` only imports `package.chat` (and its heavy dependencies) when used.
+
+    Args:
+        package (`str`): Package name, `__name__` of the `__init__.py`
+        exports (`Dict[str, List[str]]`): Relative submodule name to the exported attribute names
+
+    Returns:
+        module_getattr (`Callable[[str], Any]`): Module `__getattr__`
+        module_dir (`Callable[[], List[str]]`): Module `__dir__`
+    """
+
+    attributes = {name: module for module, names in exports.items() for name in names}
+
+    def module_getattr(name: str) -> Any:
+        module = attributes.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module, package), name)
+        # 快取到 package 的 namespace，之後不再經過 `__getattr__`
+        setattr(importlib.import_module(package), name, value)
+
+        return value
+
+    def module_dir() -> List[str]:
+        return sorted(set(vars(importlib.import_module(package))) | set(attributes))
+
+    return module_getattr, module_dir
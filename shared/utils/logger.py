@@ -1,3 +1,5 @@
+import atexit
+import json
 import os
 import sys
 from datetime import datetime
@@ -8,14 +10,49 @@ from logging import (
     INFO,
     WARNING,
     Formatter,
+    Handler,
+    LogRecord,
     StreamHandler,
     getLogger
 )
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
+from typing import Any, List, Optional
 
 from shared.const.format import MiB
 
 
+_LOG_RECORD_ATTRIBUTES = frozenset(vars(LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+"""Built-in attributes of the log record, the other attributes are the `extra` fields"""
+
+
+class LazyJSON:
+    """Serialize the payload only when the log record is formatted.
+
+    Like `logger.debug("Available GPUs:\\n%s", LazyJSON(available_gpus))`, the payload is not serialized at all
+    when the level is disabled, and is serialized by the background writer when the queue-based logging is used.
+    """
+
+    __slots__ = ("payload", "indent")
+
+    def __init__(self, payload: Any, indent: int = 4):
+        """Initializes the lazy JSON payload.
+
+        Args:
+            payload (`Any`): Pydantic model or JSON-serializable object
+            indent (`int`): JSON indentation. Default is `4`
+        """
+
+        self.payload = payload
+        self.indent = indent
+
+    def __str__(self) -> str:
+        if hasattr(self.payload, "model_dump_json"):
+            return self.payload.model_dump_json(indent=self.indent)
+
+        return json.dumps(self.payload, indent=self.indent, ensure_ascii=False, default=str)
+
+
 class ColorfulLoggingFormatter(Formatter):
 
     grey = "\x1b[38;20m"
@@ -33,12 +70,17 @@ class ColorfulLoggingFormatter(Formatter):
         CRITICAL: bold_red + format + reset
     }
 
+    def __init__(self):
+        super().__init__()
+
+        # 每個等級的 Formatter 只建立一次
+        self._formatters = {
+            level: Formatter(fmt=log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
+            for level, log_fmt in self.FORMATS.items()
+        }
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = Formatter(
-            fmt=log_fmt,
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
+        formatter = self._formatters.get(record.levelno) or self._formatters[DEBUG]
         return formatter.format(record)
 
 
@@ -51,29 +93,82 @@ class PlainTextLoggingFormatter(Formatter):
         )
 
 
+class JSONLinesLoggingFormatter(Formatter):
+    """Format the log record as a JSON object per line, the `extra` fields are kept as structured fields."""
+
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+
+        for key, value in vars(record).items():
+            if key not in _LOG_RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Enqueue the log record without formatting it, the message is formatted by the background writer.
+
+    The logged arguments must not be mutated after the logging call.
+    """
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        return record
+
+
 class KubeAIKubernetesClientLogger:
 
-    def __init__(self, log_dir: str = "logs"):
+    _listener: QueueListener = None
+    """Background writer of the queue-based logging"""
+
+    def __init__(
+        self,
+        log_dir: str = "logs",
+        json_lines: bool = False,
+        use_queue: bool = True,
+        console_level: int = DEBUG,
+        file_level: int = DEBUG
+    ):
         """Initialize KubeAI Kubernetes Client Logger Instance
 
         Args:
             log_dir (str): The directory path to store the log file
+            json_lines (bool): Write the log file as JSON lines (structured mode). Default is `False` (plain text)
+            use_queue (bool): Write the logs by a background thread, the caller only enqueues the log records.
+                Default is `True`
+            console_level (int): Level of the console logs. Default is `DEBUG`
+            file_level (int): Level of the file logs. Default is `DEBUG`
         """
 
         self.log_dir = log_dir
 
         self.logger = getLogger("KubeAI Kubernetes Client")
-        self.logger.setLevel(DEBUG)
+        # Logger 的等級為 handler 的最低等級，讓停用等級的 LazyJSON payload 完全不被序列化
+        self.logger.setLevel(min(console_level, file_level))
+
+        # 重複初始化時不重複加入 handler
+        if self.logger.handlers:
+            return
 
         colorful_formatter = ColorfulLoggingFormatter()
         console_handler = StreamHandler(sys.stdout)
         console_handler.setFormatter(colorful_formatter)
-        console_handler.setLevel(DEBUG)
+        console_handler.setLevel(console_level)
 
         log_filename_prefix = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}"
         totay_log_dir = self.create_totay_log_dir(self.log_dir)
-        log_filename = f"{totay_log_dir}/{log_filename_prefix}-gpu-delegater.log"
-        plaintext_formatter = PlainTextLoggingFormatter()
+        log_filename = f"{totay_log_dir}/{log_filename_prefix}-gpu-delegater.{'jsonl' if json_lines else 'log'}"
         file_handler = RotatingFileHandler(
             filename=log_filename,
             mode="a",
@@ -81,15 +176,55 @@ class KubeAIKubernetesClientLogger:
             backupCount=999999,
             encoding="utf-8"
         )
-        file_handler.setFormatter(plaintext_formatter)
-        file_handler.setLevel(DEBUG)
+        file_handler.setFormatter(JSONLinesLoggingFormatter() if json_lines else PlainTextLoggingFormatter())
+        file_handler.setLevel(file_level)
 
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
+        KubeAIKubernetesClientLogger._listener = self.attach_handlers(
+            self.logger,
+            [console_handler, file_handler],
+            use_queue
+        )
 
     def getLogger(self):
         return self.logger
 
+    @staticmethod
+    def attach_handlers(logger, handlers: List[Handler], use_queue: bool = True) -> Optional[QueueListener]:
+        """Attach the handlers to the logger, through a queue and a background writer if `use_queue`.
+
+        Args:
+            logger (`Logger`): Logger
+            handlers (`List[Handler]`): Handlers writing the logs
+            use_queue (`bool`): Write the logs by a background thread. Default is `True`
+
+        Returns:
+            listener (`Optional[QueueListener]`): Started background writer, `None` if not `use_queue`
+        """
+
+        if not use_queue:
+            for handler in handlers:
+                logger.addHandler(handler)
+            return None
+
+        log_queue = SimpleQueue()
+        logger.addHandler(DeferredQueueHandler(log_queue))
+
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        # 程式結束前寫出佇列中剩餘的 log
+        atexit.register(listener.stop)
+
+        return listener
+
+    @classmethod
+    def flush(cls):
+        """Write out the queued log records and stop the background writer."""
+
+        if cls._listener is not None:
+            atexit.unregister(cls._listener.stop)
+            cls._listener.stop()
+            cls._listener = None
+
     def create_totay_log_dir(self, log_dir: str = "logs"):
         """檢查今天日期的 Log 目錄是否存在，若不存在則進行建立
 
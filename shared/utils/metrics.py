@@ -0,0 +1,289 @@
+import bisect
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field, computed_field
+
+
+LATENCY_BUCKETS: List[float] = [
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 0.75,
+    1.0, 1.5, 2.5, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0, 120.0
+]
+"""Upper bounds of the latency histogram buckets, unit: s"""
+
+
+class LatencyHistogram(BaseModel):
+
+    bounds: List[float] = Field(default_factory=lambda: list(LATENCY_BUCKETS))
+    """Upper bounds of the buckets, the last bucket is unbounded"""
+
+    counts: List[int] = Field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    """Number of observations per bucket"""
+
+    count: int = 0
+    """Number of observations"""
+
+    sum: float = 0.0
+    """Sum of the observations"""
+
+    def observe(self, value: float):
+        """Observe a value.
+
+        Args:
+            value (`float`): Observed value
+        """
+
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Estimate the percentile as the upper bound of the bucket containing it.
+
+        Args:
+            p (`float`): Percentile, Like `95`
+
+        Returns:
+            percentile (`Optional[float]`): Estimated percentile, `None` if there is no observation
+        """
+
+        if self.count == 0:
+            return None
+
+        rank = self.count * p / 100
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and count > 0:
+                return self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+
+        return self.bounds[-1]
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean of the observations, `None` if there is no observation"""
+
+        return self.sum / self.count if self.count else None
+
+
+class StreamMetrics(BaseModel):
+
+    model: str
+    """Ollama model name, Like `gemma2:2b`"""
+
+    resource_profile: Optional[str] = None
+    """KubeAI resource profile of the placement, Like `nvidia-gpu-4070-12gb:2`"""
+
+    node_name: Optional[str] = None
+    """Kubernetes Node name of the placement"""
+
+    ttft: Optional[float] = None
+    """Time to first token, unit: s"""
+
+    inter_token_latencies: List[float] = Field(default_factory=list)
+    """Gaps between the consecutive tokens, unit: s"""
+
+    output_tokens: int = 0
+    """Number of generated tokens (non-empty stream chunks)"""
+
+    e2e: Optional[float] = None
+    """End-to-end latency, unit: s"""
+
+    error: Optional[str] = None
+    """Error of the stream, `None` if succeeded"""
+
+    @computed_field
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Decode throughput after the first token, unit: tokens/s"""
+
+        decode_time = sum(self.inter_token_latencies)
+        if self.output_tokens < 2 or decode_time <= 0:
+            return None
+
+        return (self.output_tokens - 1) / decode_time
+
+
+class ProfileStats(BaseModel):
+
+    requests: int = 0
+    """Number of recorded streams"""
+
+    errors: int = 0
+    """Number of failed streams"""
+
+    output_tokens: int = 0
+    """Number of generated tokens"""
+
+    decode_seconds: float = 0.0
+    """Sum of the decode time after the first token, unit: s"""
+
+    ttft: LatencyHistogram = Field(default_factory=LatencyHistogram)
+    """Time to first token histogram"""
+
+    inter_token_latency: LatencyHistogram = Field(default_factory=LatencyHistogram)
+    """Inter-token latency histogram"""
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Mean decode throughput, unit: tokens/s. `None` if there is no decode time"""
+
+        decode_tokens = self.output_tokens - (self.requests - self.errors)
+        return decode_tokens / self.decode_seconds if self.decode_seconds > 0 else None
+
+
+class StreamMetricsCollector:
+    """Aggregate the streaming metrics into per resource profile (and per model) histograms."""
+
+    def __init__(self, min_samples: int = 5):
+        """Initializes the streaming metrics collector.
+
+        Args:
+            min_samples (`int`): Min number of recorded streams before the throughput is reported. Default is `5`
+        """
+
+        self.min_samples = min_samples
+
+        self._stats: Dict[Tuple[str, str], ProfileStats] = {}
+        """(Ollama model name, KubeAI resource profile) to the stats, `*` aggregates all models"""
+
+    def record(self, stream_metrics: StreamMetrics):
+        """Record the metrics of a stream.
+
+        Args:
+            stream_metrics (`StreamMetrics`): Streaming metrics
+        """
+
+        resource_profile = stream_metrics.resource_profile or "unknown"
+
+        for key in ((stream_metrics.model, resource_profile), ("*", resource_profile)):
+            stats = self._stats.setdefault(key, ProfileStats())
+            stats.requests += 1
+
+            if stream_metrics.error is not None:
+                stats.errors += 1
+                continue
+
+            stats.output_tokens += stream_metrics.output_tokens
+            stats.decode_seconds += sum(stream_metrics.inter_token_latencies)
+
+            if stream_metrics.ttft is not None:
+                stats.ttft.observe(stream_metrics.ttft)
+            for latency in stream_metrics.inter_token_latencies:
+                stats.inter_token_latency.observe(latency)
+
+    def stats(self, resource_profile: str, model_name: str = "*") -> Optional[ProfileStats]:
+        """Get the stats of the resource profile.
+
+        Args:
+            resource_profile (`str`): KubeAI resource profile, Like `nvidia-gpu-4070-12gb:2`
+            model_name (`str`): Ollama model name, `*` aggregates all models. Default is `*`
+
+        Returns:
+            stats (`Optional[ProfileStats]`): Stats, `None` if nothing is recorded
+        """
+
+        return self._stats.get((model_name, resource_profile))
+
+    def throughput(self, model_name: str, resource_profile: str) -> Optional[float]:
+        """Observed decode throughput of the model on the resource profile.
+
+        Args:
+            model_name (`str`): Ollama model name
+            resource_profile (`str`): KubeAI resource profile
+
+        Returns:
+            tokens_per_second (`Optional[float]`): Decode throughput, unit: tokens/s.
+                `None` if less than `min_samples` streams are recorded
+        """
+
+        stats = self._stats.get((model_name, resource_profile))
+        if stats is None or stats.requests - stats.errors < self.min_samples:
+            return None
+
+        return stats.tokens_per_second
+
+    def ttft_percentile(self, model_name: str, resource_profile: str, p: float) -> Optional[float]:
+        """Observed TTFT percentile of the model on the resource profile.
+
+        Args:
+            model_name (`str`): Ollama model name
+            resource_profile (`str`): KubeAI resource profile
+            p (`float`): Percentile, Like `95`
+
+        Returns:
+            ttft (`Optional[float]`): TTFT percentile, unit: s. `None` if less than `min_samples` streams are recorded
+        """
+
+        stats = self._stats.get((model_name, resource_profile))
+        if stats is None or stats.ttft.count < self.min_samples:
+            return None
+
+        return stats.ttft.percentile(p)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per resource profile summary of the stats (all models).
+
+        Returns:
+            summary (`Dict[str, Dict]`): KubeAI resource profile to the requests, throughput and latency percentiles
+        """
+
+        return {
+            resource_profile: {
+                "requests": stats.requests,
+                "errors": stats.errors,
+                "tokens_per_second": stats.tokens_per_second,
+                "ttft": {f"p{p}": stats.ttft.percentile(p) for p in (50, 95, 99)},
+                "inter_token_latency": {f"p{p}": stats.inter_token_latency.percentile(p) for p in (50, 95, 99)},
+            } for (model_name, resource_profile), stats in self._stats.items() if model_name == "*"
+        }
+
+    def dump(self, file_path: str):
+        """Persist the stats as JSON.
+
+        Args:
+            file_path (`str`): Stats file path
+        """
+
+        file_dir = os.path.dirname(file_path)
+        if file_dir and not os.path.exists(file_dir):
+            os.makedirs(file_dir)
+
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump([
+                {"model": model_name, "resource_profile": resource_profile, "stats": stats.model_dump()}
+                for (model_name, resource_profile), stats in self._stats.items()
+            ], f)
+
+    def load(self, file_path: str):
+        """Load the persisted stats, nothing is loaded if the file does not exist.
+
+        Args:
+            file_path (`str`): Stats file path
+        """
+
+        if not os.path.exists(file_path):
+            return
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            for item in json.load(f):
+                self._stats[(item["model"], item["resource_profile"])] = ProfileStats.model_validate(item["stats"])
+
+
+_stream_metrics_collector: StreamMetricsCollector = None
+
+
+def get_stream_metrics_collector() -> StreamMetricsCollector:
+    """Get the process-wide streaming metrics collector.
+
+    Returns:
+        stream_metrics_collector (`StreamMetricsCollector`): Streaming metrics collector
+    """
+
+    global _stream_metrics_collector
+
+    if _stream_metrics_collector is None:
+        _stream_metrics_collector = StreamMetricsCollector()
+
+    return _stream_metrics_collector
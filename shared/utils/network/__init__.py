@@ -1,8 +1,9 @@
 from .aclient import post, set_headers
-from .exception import NetworkException
+from .exception import RETRYABLE_STATUS_CODES, NetworkException
 
 __all__ = [
     "post",
     "set_headers",
+    "RETRYABLE_STATUS_CODES",
     "NetworkException"
 ]
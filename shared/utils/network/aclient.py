@@ -73,12 +73,19 @@ async def post(
         except httpx.HTTPStatusError as e:
             print(f"HTTP Status Error: {e.response}")
             raise NetworkException("HTTP Status Error", e.response.status_code)
+        # `httpx.RequestError` 的子類別需先處理，才能區分可重試的錯誤類型
+        except httpx.TimeoutException as e:
+            print(f"Timeout Error: {e.request}")
+            raise NetworkException("Timeout Error", 504)
+        except httpx.ConnectError as e:
+            print(f"Connect Error: {e.request}")
+            raise NetworkException("Connect Error", 503)
+        except httpx.RemoteProtocolError as e:
+            print(f"Remote Protocol Error: {e.request}")
+            raise NetworkException("Remote Protocol Error", 502)
         except httpx.RequestError as e:
             print(f"Request Error: {e.request}")
             raise NetworkException("Request Error", 400)
-        except httpx.RemoteProtocolError as e:
-            print(f"Remote Protocol Error: {e.request}")
-            raise NetworkException("Remote Protocol Error", 500)
         except Exception as e:
             print(f"Unknown Error: {e}")
             raise NetworkException("Unknown Error", 500)
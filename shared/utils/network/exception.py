@@ -1,3 +1,7 @@
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+"""HTTP status codes of the transient failures, the request can be retried"""
+
+
 class NetworkException(Exception):
 
     def __init__(self, error: str, status_code: int, **kwargs):
@@ -9,8 +13,14 @@ class NetworkException(Exception):
             kwargs (Dict[str, Any]): Original error message
         """
 
-        super().__init__(self.error, self.status_code, self.kwargs)
-
         self.error = error
         self.status_code = status_code
         self.kwargs = kwargs
+
+        super().__init__(self.error, self.status_code, self.kwargs)
+
+    @property
+    def retryable(self) -> bool:
+        """The failure is transient (timeout, connection or server error) and the request can be retried"""
+
+        return self.status_code in RETRYABLE_STATUS_CODES